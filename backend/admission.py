@@ -0,0 +1,261 @@
+# admission.py
+"""
+Admission control for the LLM endpoints.
+
+Each operation (evaluate, compare, find_category) has a concurrency limit
+sized to what the model provider accepts. Requests over the limit wait in a
+bounded queue with a deadline; when the queue is full, the deadline passes or
+one client already holds too many places, the request is rejected at once
+with AdmissionRejected (429 + Retry-After) instead of piling up on the
+provider and failing there.
+
+Free slots are handed out round-robin across clients, so one client
+submitting twenty evaluations cannot starve the rest of the class.
+
+The controller is per process and works from plain threads (Flask) and from
+any event loop (ASGI, Flask async views): waiters are woken through a
+callback, never by polling.
+
+    ADMISSION_LIMITS="evaluate=8,compare=4,find_category=8"
+    ADMISSION_MAX_QUEUE=32         waiting requests per operation
+    ADMISSION_QUEUE_TIMEOUT=20     seconds a request may wait for a slot
+    ADMISSION_MAX_PER_CLIENT=2     running + waiting requests per client and operation
+"""
+from __future__ import annotations
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from functools import wraps
+from typing import Callable, Deque, Dict, Optional
+
+from request_timing import phase
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    limits = {}
+    for part in (spec or "").split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip():
+            limits[name.strip()] = max(1, int(value))
+    return limits
+
+
+ADMISSION_LIMITS = parse_limits(os.getenv("ADMISSION_LIMITS", "evaluate=8,compare=4,find_category=8"))
+ADMISSION_DEFAULT_LIMIT = int(os.getenv("ADMISSION_DEFAULT_LIMIT", "8"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "20"))
+ADMISSION_MAX_PER_CLIENT = int(os.getenv("ADMISSION_MAX_PER_CLIENT", "2"))
+
+
+class AdmissionRejected(Exception):
+    """The request was not admitted; retry_after is a hint in whole seconds."""
+
+    def __init__(self, operation: str, reason: str, retry_after: int):
+        super().__init__(f"{operation}: {reason}")
+        self.operation = operation
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("client", "wake", "granted")
+
+    def __init__(self, client: str, wake: Callable[[], None]):
+        self.client = client
+        self.wake = wake
+        self.granted = False
+
+
+class _Operation:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.queued = 0
+        # client -> its waiters; the order of the keys is the round-robin order
+        self.queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self.per_client: Dict[str, int] = {}
+        self.service_time = 5.0  # EWMA of seconds a slot is held
+        self.admitted = 0
+        self.rejected = 0
+
+
+class AdmissionController:
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default_limit: int = ADMISSION_DEFAULT_LIMIT,
+                 max_queue: int = ADMISSION_MAX_QUEUE, queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+                 max_per_client: int = ADMISSION_MAX_PER_CLIENT):
+        self.limits = dict(ADMISSION_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_per_client = max_per_client
+        self._lock = threading.Lock()
+        self._operations: Dict[str, _Operation] = {}
+
+    def _operation(self, name: str) -> _Operation:
+        op = self._operations.get(name)
+        if op is None:
+            op = _Operation(self.limits.get(name, self.default_limit))
+            self._operations[name] = op
+        return op
+
+    def _retry_after(self, op: _Operation) -> int:
+        # time for the queue ahead to drain through `limit` slots
+        return max(1, math.ceil(op.service_time * (op.queued + 1) / op.limit))
+
+    def _reject(self, name: str, op: _Operation, reason: str) -> AdmissionRejected:
+        op.rejected += 1
+        return AdmissionRejected(name, reason, self._retry_after(op))
+
+    def _enter(self, name: str, client: str, wake: Callable[[], None]):
+        """Takes a slot (returns None) or queues a waiter (returns it). Caller holds the lock."""
+        op = self._operation(name)
+        if self.max_per_client and op.per_client.get(client, 0) >= self.max_per_client:
+            raise self._reject(name, op, "too many requests from this client")
+        if op.active < op.limit and not op.queued:
+            op.active += 1
+            op.admitted += 1
+            op.per_client[client] = op.per_client.get(client, 0) + 1
+            return None
+        if op.queued >= self.max_queue:
+            raise self._reject(name, op, "queue is full")
+        waiter = _Waiter(client, wake)
+        op.queues.setdefault(client, deque()).append(waiter)
+        op.queued += 1
+        op.per_client[client] = op.per_client.get(client, 0) + 1
+        return waiter
+
+    def _dispatch(self, op: _Operation) -> None:
+        """Hands free slots to waiters, one client at a time. Caller holds the lock."""
+        while op.active < op.limit and op.queues:
+            client, queue = next(iter(op.queues.items()))
+            waiter = queue.popleft()
+            if queue:
+                op.queues.move_to_end(client)
+            else:
+                del op.queues[client]
+            op.queued -= 1
+            op.active += 1
+            op.admitted += 1
+            waiter.granted = True
+            waiter.wake()
+
+    def _drop_client(self, op: _Operation, client: str) -> None:
+        count = op.per_client.get(client, 0) - 1
+        if count > 0:
+            op.per_client[client] = count
+        else:
+            op.per_client.pop(client, None)
+
+    def _abandon(self, name: str, waiter: _Waiter) -> bool:
+        """
+        Removes a waiter that gave up. Returns True if it had been granted a slot
+        in the meantime (the caller then owns that slot). Caller holds the lock.
+        """
+        op = self._operation(name)
+        if waiter.granted:
+            return True
+        queue = op.queues.get(waiter.client)
+        if queue is not None:
+            queue.remove(waiter)
+            if not queue:
+                del op.queues[waiter.client]
+        op.queued -= 1
+        self._drop_client(op, waiter.client)
+        return False
+
+    def release(self, name: str, client: str, held_for: float) -> None:
+        with self._lock:
+            op = self._operation(name)
+            op.active -= 1
+            op.service_time = 0.8 * op.service_time + 0.2 * held_for
+            self._drop_client(op, client)
+            self._dispatch(op)
+
+    def acquire(self, name: str, client: str, timeout: Optional[float] = None) -> None:
+        """Blocks the calling thread until a slot of `name` is free."""
+        event = threading.Event()
+        with self._lock:
+            waiter = self._enter(name, client, event.set)
+        if waiter is None:
+            return
+        event.wait(self.queue_timeout if timeout is None else timeout)
+        with self._lock:
+            if not self._abandon(name, waiter):
+                raise self._reject(name, self._operation(name), "timed out waiting for a slot")
+
+    async def acquire_async(self, name: str, client: str, timeout: Optional[float] = None) -> None:
+        """Waits on the running event loop until a slot of `name` is free."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        with self._lock:
+            waiter = self._enter(name, client, wake)
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(future, self.queue_timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if not self._abandon(name, waiter):
+                    raise self._reject(name, self._operation(name), "timed out waiting for a slot")
+        except BaseException:
+            # client went away while waiting
+            with self._lock:
+                granted = self._abandon(name, waiter)
+            if granted:
+                self.release(name, client, 0.0)
+            raise
+
+    @contextmanager
+    def slot(self, name: str, client: str):
+        with phase("queue"):
+            self.acquire(name, client)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(name, client, time.monotonic() - started)
+
+    @asynccontextmanager
+    async def async_slot(self, name: str, client: str):
+        with phase("queue"):
+            await self.acquire_async(name, client)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(name, client, time.monotonic() - started)
+
+    def admitted(self, name: str):
+        """
+        Decorator for async operations: the wrapped coroutine runs inside a slot
+        of `name`. The client is taken from the `client_key` keyword argument.
+        """
+        def decorator(fn):
+            @wraps(fn)
+            async def wrapper(*args, client_key: Optional[str] = None, **kwargs):
+                async with self.async_slot(name, client_key or "anonymous"):
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "limit": op.limit,
+                    "active": op.active,
+                    "queued": op.queued,
+                    "admitted": op.admitted,
+                    "rejected": op.rejected,
+                    "service_time": round(op.service_time, 3),
+                }
+                for name, op in self._operations.items()
+            }
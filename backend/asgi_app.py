@@ -0,0 +1,266 @@
+# asgi_app.py
+"""
+ASGI serving mode.
+
+    pip install -r requirements-asgi.txt
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000 --workers 2
+
+The slow endpoints (/evaluate, /evaluation, /compareprojects, /findoutcategory) run natively
+on the event loop: aiohttp downloads, pdfplumber in worker threads, async
+LangChain calls (ainvoke), and PoolProjectStore for their project reads and
+writes (evaluation context, stored evaluation, project cohort, saving the
+evaluation or relationships) on an aiomysql connection pool.
+One process can therefore keep hundreds of LLM/PDF requests in flight.
+/changes is native too, so open change-feed streams wait on the event loop
+instead of holding WSGI threads.
+
+Still blocking, in worker threads: the evaluation cache (evaluation_cache.py),
+the extracted document texts, change-feed publishing and response cache
+invalidation. Categories are served from the in-process cache; only its
+periodic version check reaches the database.
+
+Every other endpoint is the unchanged Flask app (pymysql), mounted as WSGI
+under the same URLs, so payloads and behaviour are identical in both serving
+modes.
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+import aiomysql
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+
+from a2wsgi import WSGIMiddleware
+
+import category_stats
+import change_feed
+import json_codec
+import llm_models
+import rankingprojects
+import request_timing
+from request_timing import timed
+from database import db_config
+
+ASGI_DB_POOL_MIN = int(os.getenv("ASGI_DB_POOL_MIN", "1"))
+ASGI_DB_POOL_MAX = int(os.getenv("ASGI_DB_POOL_MAX", "20"))
+# Threads handed to the mounted Flask app for the remaining (fast, blocking) endpoints
+ASGI_WSGI_WORKERS = int(os.getenv("ASGI_WSGI_WORKERS", "16"))
+
+NATIVE_PATHS = {
+    "/rankingprojects/evaluate",
+    "/rankingprojects/evaluation",
+    "/rankingprojects/compareprojects",
+    "/rankingprojects/findoutcategory",
+    "/rankingprojects/changes",
+}
+
+db_pool = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global db_pool
+    llm_models.ASYNC_CLIENTS = True
+    db_pool = await aiomysql.create_pool(
+        host=db_config["host"],
+        user=db_config["user"],
+        password=db_config["password"],
+        db=db_config["database"],
+        minsize=ASGI_DB_POOL_MIN,
+        maxsize=ASGI_DB_POOL_MAX,
+        autocommit=True,
+    )
+    try:
+        yield
+    finally:
+        db_pool.close()
+        await db_pool.wait_closed()
+
+
+async def execute(sql, params):
+    async with db_pool.acquire() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute(sql, params)
+
+
+async def fetchone(sql, params):
+    async with db_pool.acquire() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute(sql, params)
+            return await cursor.fetchone()
+
+
+class PoolProjectStore:
+    """rankingprojects.ThreadedProjectStore on the aiomysql pool."""
+
+    @timed("db")
+    async def evaluation_context(self, project_id):
+        return rankingprojects.evaluation_context_row(await fetchone(rankingprojects.EVALUATION_CONTEXT_SQL, (project_id,)))
+
+    @timed("db")
+    async def project_evaluation(self, project_id):
+        row = await fetchone("SELECT evaluation FROM projects WHERE id = %s", (project_id,))
+        return row[0] if row else None
+
+    async def project_cohort(self, project_id):
+        cohort_id = rankingprojects.project_cohorts.get(str(project_id).strip())
+        if cohort_id is None:
+            row = await fetchone("SELECT cohort_id FROM projects WHERE id = %s", (project_id,))
+            cohort_id = rankingprojects.remember_project_cohort(project_id, row[0] if row else None)
+        return cohort_id
+
+    @timed("db")
+    async def save_evaluation(self, project_id, score, evaluation_json):
+        # One transaction with the category_stats delta (the pool is autocommit otherwise)
+        async with db_pool.acquire() as connection:
+            await connection.begin()
+            try:
+                async with connection.cursor() as cursor:
+                    async with category_stats.tracked_async(cursor, "id = %s", (project_id,)):
+                        await cursor.execute(
+                            "UPDATE projects SET score = %s, evaluation = %s WHERE id = %s",
+                            (score, evaluation_json, project_id)
+                        )
+                await connection.commit()
+            except Exception:
+                await connection.rollback()
+                raise
+
+    @timed("db")
+    async def save_relationships(self, project_id, relationships_json, is_global):
+        column = "relationships_global" if is_global else "relationships_local"
+        await execute(f"UPDATE projects SET {column} = %s, {column}_at = NOW() WHERE id = %s",
+                      (relationships_json, project_id))
+
+
+pool_store = PoolProjectStore()
+
+
+def json_response(payload, status):
+    return Response(json_codec.dumps(payload), status_code=status, media_type="application/json")
+
+
+async def read_json(request: Request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=rankingprojects.CORS_ORIGINS,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+# The natively async routes are timed here; the mounted Flask app times its own requests
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    if request.url.path not in NATIVE_PATHS:
+        return await call_next(request)
+    token = request_timing.start(request.method, request.url.path)
+    try:
+        response = await call_next(request)
+    except Exception:
+        request_timing.finish(token, 500)
+        raise
+    server_timing_header = request_timing.finish(token, response.status_code)
+    if server_timing_header:
+        response.headers["Server-Timing"] = server_timing_header
+    return response
+
+
+def client_key(request: Request):
+    return rankingprojects.admission_client_key(
+        request.headers.get("Authorization", ""), request.client.host if request.client else None
+    )
+
+
+@app.exception_handler(rankingprojects.AdmissionRejected)
+async def admission_rejected(request: Request, e):
+    response = json_response(rankingprojects.admission_rejected_payload(e), 429)
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response
+
+
+@app.exception_handler(rankingprojects.DeadlineExceeded)
+async def deadline_exceeded(request: Request, e):
+    return json_response(rankingprojects.deadline_exceeded_payload(e), 504)
+
+
+# Endpoint to EVALUATE
+@app.post("/rankingprojects/evaluate")
+async def evaluate_project(request: Request):
+    data = await read_json(request)
+    payload, status = await rankingprojects.run_evaluation(data, pool_store, client_key=client_key(request))
+    return json_response(payload, status)
+
+
+# Endpoint to GET THE EVALUATION OF A PROJECT IN ANOTHER LANGUAGE
+@app.get("/rankingprojects/evaluation")
+async def localized_evaluation(request: Request):
+    data = {"project": request.query_params.get("project"), "lang": request.query_params.get("lang")}
+    payload, status = await rankingprojects.run_localized_evaluation(data, pool_store, client_key=client_key(request))
+    return json_response(payload, status)
+
+
+# Endpoint to COMPARE PROJECTS
+@app.post("/rankingprojects/compareprojects")
+async def compare_projects(request: Request):
+    data = await read_json(request)
+    payload, status = await rankingprojects.run_compare(data, pool_store, client_key=client_key(request))
+    return json_response(payload, status)
+
+
+# Endpoint to FIND OUT CATEGORY OF THE PROJECT
+@app.post("/rankingprojects/findoutcategory")
+async def findoutcategory_project(request: Request):
+    data = await read_json(request)
+    payload, status = await rankingprojects.run_find_category(data, client_key=client_key(request))
+    return json_response(payload, status)
+
+
+# Endpoint to FOLLOW CHANGES (Server-Sent Events, or long polling with ?after=&timeout=)
+@app.get("/rankingprojects/changes")
+async def get_changes(request: Request):
+    feed = rankingprojects.change_feed
+    stream = "text/event-stream" in request.headers.get("accept", "")
+    try:
+        after, timeout = rankingprojects.changes_request_params(
+            request.headers.get("last-event-id"), request.query_params.get("after"), request.query_params.get("timeout")
+        )
+    except ValueError:
+        return json_response({"ok": False, "error": "after must be an integer and timeout a number"}, 400)
+
+    if after is None:
+        after = await asyncio.to_thread(feed.last_id)
+        if not stream:
+            return json_response(rankingprojects.changes_payload(after, []), 200)
+    if not stream:
+        return json_response(rankingprojects.changes_payload(after, await feed.wait_async(after, timeout)), 200)
+
+    async def generate(last):
+        yield f"retry: {change_feed.SSE_RETRY_MS}\n\n"
+        loop = asyncio.get_running_loop()
+        until = loop.time() + change_feed.CHANGE_FEED_STREAM_SECONDS
+        while (remaining := until - loop.time()) > 0:
+            if await request.is_disconnected():
+                return
+            events = await feed.wait_async(last, min(change_feed.CHANGE_FEED_HEARTBEAT, remaining))
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                yield change_feed.format_sse(event)
+                last = event.id
+
+    return StreamingResponse(generate(after), media_type="text/event-stream", headers=change_feed.SSE_HEADERS)
+
+
+# Everything else: the Flask app, same URLs and payloads
+app.mount("/", WSGIMiddleware(rankingprojects.app, workers=ASGI_WSGI_WORKERS))
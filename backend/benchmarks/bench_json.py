@@ -0,0 +1,146 @@
+# bench_json.py
+"""
+Serialization and compression benchmark for the /projects payload.
+
+Builds a synthetic cohort shaped like the /projects entries
+(project_stream.project_list_item: evaluation text, conversation, likes and
+relationships JSON) and reports:
+  - encode time: Flask-style stdlib jsonify vs json_codec (json / orjson)
+  - decode time of the JSON text columns: old utf-8/latin-1 path vs parse_json_column
+  - bytes on the wire: identity, gzip and brotli (when installed)
+
+Usage:
+    python backend/benchmarks/bench_json.py [--projects 5000] [--repeat 5]
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import json_codec
+from http_compression import brotli, compress
+
+CATEGORIES = ["health", "education", "social", "sustainability", "saas", "marketplaces", "culture", "govtech"]
+WORDS = ("platform community learning inclusive data circular local digital support "
+         "impact users model revenue pilot municipal energy health teachers market").split()
+
+
+def sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def make_project(rng, pid):
+    likes = [{"user": rng.randint(1, 5000), "name": f"user{rng.randint(1, 5000)}"} for _ in range(rng.randint(0, 12))]
+    conversation = [{"user": rng.randint(1, 5000), "name": "Reviewer", "text": sentence(rng, 25)} for _ in range(rng.randint(0, 6))]
+    relationships = [{
+        "title": f"Project {rng.randint(1, 5000)}",
+        "match": rng.randint(0, 100),
+        "similarities": sentence(rng, 30),
+        "differences": [sentence(rng, 12) for _ in range(3)],
+        "collaboration": [sentence(rng, 12) for _ in range(2)],
+    } for _ in range(rng.randint(0, 5))]
+    evaluation = json.dumps({
+        "score": rng.randint(0, 100),
+        "evaluation": sentence(rng, 80),
+        "strengths": [sentence(rng, 15) for _ in range(4)],
+        "weaknesses": [sentence(rng, 15) for _ in range(4)],
+        "recommendations": [sentence(rng, 15) for _ in range(4)],
+    }, ensure_ascii=False)
+    return {
+        "id": pid,
+        "email": f"owner{pid}@example.com",
+        "category_id": rng.choice(CATEGORIES),
+        "title": f"Project {pid}: " + sentence(rng, 6),
+        "description": sentence(rng, 30)[:200],
+        "authors": "Ana Pérez, Jordi Martí",
+        "link": "",
+        "pitch": "https://www.youtube.com/watch?v=K5NgaIyiAEY",
+        "canvas": f"https://example.com/docs/{pid}/CANVAS.pdf",
+        "summary": f"https://example.com/docs/{pid}/SUMMARY.pdf",
+        "script": sentence(rng, 150),
+        "detail": sentence(rng, 40),
+        "score": rng.randint(0, 100),
+        "evaluation": evaluation,
+        "conversation": conversation,
+        "likes": likes,
+        "local": relationships,
+        "global": relationships[:2],
+    }
+
+
+def legacy_parse(likes_data):
+    # parse_likes_data before json_codec: decode utf-8, json.loads, latin-1 retry
+    if isinstance(likes_data, bytes):
+        try:
+            return json.loads(likes_data.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            try:
+                return json.loads(likes_data.decode("latin-1"))
+            except Exception:
+                return []
+    return json.loads(likes_data)
+
+
+def best_of(repeat, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000.0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    payload = [make_project(rng, pid) for pid in range(1, args.projects + 1)]
+    columns = [json.dumps(p[k]).encode("utf-8") for p in payload for k in ("conversation", "likes", "local", "global")]
+
+    print(f"projects={args.projects} serializers={sorted(json_codec.SERIALIZERS)} brotli={'yes' if brotli else 'no'}")
+    print()
+    print(f"{'encode':<32}{'ms':>10}{'bytes':>14}")
+
+    # Flask's DefaultJSONProvider: ensure_ascii=True, sort_keys=True
+    ms, body = best_of(args.repeat, lambda: json.dumps(payload, ensure_ascii=True, sort_keys=True).encode("utf-8"))
+    print(f"{'stdlib jsonify (baseline)':<32}{ms:>10.1f}{len(body):>14,}")
+    for name in sorted(json_codec.SERIALIZERS):
+        json_codec.set_serializer(name)
+        ms, body = best_of(args.repeat, lambda: json_codec.dumps(payload))
+        print(f"{'json_codec ' + name:<32}{ms:>10.1f}{len(body):>14,}")
+
+    print()
+    print(f"{'decode text columns':<32}{'ms':>10}")
+    ms, _ = best_of(args.repeat, lambda: [legacy_parse(c) for c in columns])
+    print(f"{'legacy parse_likes_data':<32}{ms:>10.1f}")
+    for name in sorted(json_codec.SERIALIZERS):
+        json_codec.set_serializer(name)
+        ms, _ = best_of(args.repeat, lambda: [json_codec.parse_json_column(c, []) for c in columns])
+        print(f"{'parse_json_column ' + name:<32}{ms:>10.1f}")
+
+    print()
+    print(f"{'wire':<32}{'ms':>10}{'bytes':>14}")
+    json_codec.set_serializer("orjson")
+    body = json_codec.dumps(payload)
+    print(f"{'identity':<32}{0.0:>10.1f}{len(body):>14,}")
+    ms, out = best_of(args.repeat, lambda: compress(body, "gzip"))
+    print(f"{'gzip (level 6)':<32}{ms:>10.1f}{len(out):>14,}")
+    ms, out = best_of(args.repeat, lambda: gzip.compress(body, compresslevel=1))
+    print(f"{'gzip (level 1)':<32}{ms:>10.1f}{len(out):>14,}")
+    if brotli is not None:
+        ms, out = best_of(args.repeat, lambda: compress(body, "br"))
+        print(f"{'brotli (quality 5)':<32}{ms:>10.1f}{len(out):>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench_login.py
+"""
+Login throughput benchmark: bcrypt on the request thread vs the bounded pool.
+
+Simulates a login burst with --clients concurrent request threads, each
+verifying a password, while a probe thread does a cheap unit of work
+(a small JSON response) every 10 ms to show how other requests are delayed.
+
+Usage:
+    python backend/benchmarks/bench_login.py [--clients 32] [--logins 200] [--rounds 12]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import bcrypt
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def run(label, check, clients, logins, pw_hash):
+    probe_latencies = []
+    stop = threading.Event()
+
+    def probe():
+        while not stop.is_set():
+            start = time.perf_counter()
+            json.dumps({"ok": True, "projects": list(range(50))})
+            probe_latencies.append((time.perf_counter() - start) * 1000.0)
+            time.sleep(0.01)
+
+    probe_thread = threading.Thread(target=probe, daemon=True)
+    probe_thread.start()
+
+    login_latencies = []
+
+    def login(_):
+        start = time.perf_counter()
+        assert check("correct horse battery", pw_hash)
+        login_latencies.append((time.perf_counter() - start) * 1000.0)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as request_threads:
+        list(request_threads.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    probe_thread.join()
+
+    print(f"{label:<26}{logins / elapsed:>10.1f}{statistics.median(login_latencies):>12.1f}"
+          f"{percentile(login_latencies, 99):>12.1f}{percentile(probe_latencies, 99):>14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    import password_hashing
+
+    pw_hash = bcrypt.hashpw(b"correct horse battery", bcrypt.gensalt(rounds=args.rounds)).decode("utf-8")
+
+    def direct(password, h):
+        return bcrypt.checkpw(password.encode("utf-8"), h.encode("utf-8"))
+
+    def pooled(password, h):
+        while True:
+            try:
+                return password_hashing.check_password(password, h)
+            except password_hashing.HashingBusy:
+                time.sleep(0.05)  # a real client honours Retry-After
+
+    print(f"cpus={os.cpu_count()} rounds={args.rounds} clients={args.clients} logins={args.logins} "
+          f"pool_workers={password_hashing.BCRYPT_WORKERS}")
+    print(f"{'mode':<26}{'logins/s':>10}{'p50 ms':>12}{'p99 ms':>12}{'probe p99 ms':>14}")
+    run("request thread (before)", direct, args.clients, args.logins, pw_hash)
+    run("bounded pool (after)", pooled, args.clients, args.logins, pw_hash)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# bench_projects_stream.py
+"""
+Peak memory of building the /projects response, buffered vs streamed, for a
+growing number of projects.
+
+  buffered   the old path: fetchall() of SELECT *, a list of dicts, one JSON string
+  cached     "".join(iter_projects_json(cohort)): what a response-cache miss builds now
+  stream     iter_projects_json(cohort) sent chunk by chunk (?stream=1)
+  ndjson     iter_projects_ndjson(cohort) (?format=ndjson)
+
+Peaks are measured with tracemalloc, so they count Python allocations only
+(rows held by the driver, dicts, strings), not the MySQL server.
+
+--source synthetic (default) needs no database: pymysql.connect is replaced by
+an in-memory connection whose rows are shaped like bench_json.make_project.
+Like pymysql, its default cursor materializes every row on execute() and its
+SSCursor produces them as they are fetched; every row is in the default cohort.
+--source db reads the default cohort of the real table (db_config in
+database.py), seeded with seed_db.py; --projects is then ignored.
+Generating synthetic rows dominates the ms column.
+
+Usage:
+    python backend/benchmarks/bench_projects_stream.py [--projects 1000,5000] [--source synthetic|db]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pymysql
+import pymysql.cursors
+
+import json_codec
+import project_stream
+from bench_json import make_project
+from cohorts import COHORT_DEFAULT
+from database import db_config
+
+# projects columns in table order, for the synthetic SELECT *
+TABLE_COLUMNS = (
+    "id", "email", "created_at", "category_id", "title", "description", "authors", "link", "pitch", "canvas",
+    "summary", "script", "detail", "score", "evaluation", "conversation", "likes", "relationships_local",
+    "relationships_global", "like_count", "content_updated_at", "relationships_local_at",
+    "relationships_global_at", "updated_at", "cohort_id",
+)
+JSON_COLUMNS = {"conversation": "conversation", "likes": "likes",
+                "relationships_local": "local", "relationships_global": "global"}
+
+
+def synthetic_row(pid, columns):
+    project = make_project(random.Random(pid), pid)
+    values = []
+    for column in columns:
+        if column in JSON_COLUMNS:
+            values.append(json.dumps(project[JSON_COLUMNS[column]], ensure_ascii=False).encode("utf-8"))
+        elif column in project:
+            values.append(project[column])
+        elif column == "like_count":
+            values.append(len(project["likes"]))
+        elif column == "cohort_id":
+            values.append(COHORT_DEFAULT)
+        else:
+            values.append("2026-01-01 00:00:00")
+    return tuple(values)
+
+
+class SyntheticCursor:
+    def __init__(self, connection, unbuffered):
+        self.connection = connection
+        self.unbuffered = unbuffered
+        self._rows = iter(())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, args=None):
+        select = sql.split("SELECT", 1)[1].split("FROM", 1)[0].strip()
+        columns = TABLE_COLUMNS if select == "*" else [c.strip() for c in select.split(",")]
+        rows = (synthetic_row(pid, columns) for pid in range(1, self.connection.projects + 1))
+        # pymysql's default cursor reads the whole result set here
+        self._rows = rows if self.unbuffered else iter(list(rows))
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchmany(self, size):
+        return [row for _, row in zip(range(size), self._rows)]
+
+
+class SyntheticConnection:
+    projects = 0
+
+    def __init__(self, **kwargs):
+        self.unbuffered = kwargs.get("cursorclass") is pymysql.cursors.SSCursor
+
+    def cursor(self):
+        return SyntheticCursor(self, self.unbuffered)
+
+    def close(self):
+        pass
+
+
+def buffered_body():
+    # get_all_projects() + build_projects_payload() + dumps, as before project_stream
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM projects WHERE cohort_id = %s", (COHORT_DEFAULT,))
+            projects = cursor.fetchall()
+    finally:
+        connection.close()
+    projects_list = []
+    for project in projects:
+        projects_list.append(project_stream.project_list_item(project[:2] + project[3:]))
+    return json_codec.dumps_text(projects_list)
+
+
+def cached_body():
+    return "".join(project_stream.iter_projects_json(COHORT_DEFAULT))
+
+
+def consume(chunks):
+    sent = 0
+    for chunk in chunks:
+        sent += len(chunk)
+    return sent
+
+
+PATHS = {
+    "buffered": lambda: len(buffered_body()),
+    "cached": lambda: len(cached_body()),
+    "stream": lambda: consume(project_stream.iter_projects_json(COHORT_DEFAULT)),
+    "ndjson": lambda: consume(project_stream.iter_projects_ndjson(COHORT_DEFAULT)),
+}
+
+
+def measure(fn):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", default="1000,5000", help="Comma separated cohort sizes (synthetic)")
+    parser.add_argument("--source", choices=("synthetic", "db"), default="synthetic")
+    parser.add_argument("--paths", default=",".join(PATHS))
+    args = parser.parse_args()
+
+    paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    if args.source == "synthetic":
+        pymysql.connect = SyntheticConnection
+        sizes = [int(n) for n in args.projects.split(",")]
+    else:
+        sizes = [None]
+
+    if args.source == "synthetic":
+        SyntheticConnection.projects = 200
+        assert buffered_body() == cached_body(), "streamed JSON differs from the buffered payload"
+
+    print(f"source={args.source} serializer={json_codec.get_serializer()}")
+    print(f"{'projects':>10}  {'path':<10}{'body MiB':>10}{'peak MiB':>10}{'peak/body':>11}{'ms':>10}")
+    for n in sizes:
+        SyntheticConnection.projects = n or 0
+        for name in paths:
+            size, peak, elapsed = measure(PATHS[name])
+            print(f"{n or '-':>10}  {name:<10}{size / 1024 / 1024:>10.1f}{peak / 1024 / 1024:>10.1f}"
+                  f"{peak / size if size else 0:>11.2f}{elapsed * 1000:>10.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# bench_router.py
+"""
+Tail latency of the find_category chain when one provider degrades:
+model_router with a single route, with failover order only, with the
+"fastest" policy and with hedging.
+
+Starts two stub_llm providers in-process:
+
+    primary     --latency-ms 400, and --slow-rate of its answers take --slow-ms longer
+    secondary   --latency-ms 600, never slow
+
+and sends --calls find_category calls (--concurrency at a time) through a
+fresh ModelRouter per scenario, reporting p50/p95/p99 latency and the extra
+calls (hedges and retries) it cost. Needs langchain-openai; no key or network.
+
+Usage:
+    python backend/benchmarks/bench_router.py [--calls 300] [--concurrency 8] [--slow-rate 0.04] [--slow-ms 4000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+from aiohttp import web
+from pydantic import BaseModel, Field
+
+import llm_models
+from model_router import ModelRouter, Route
+from stub_llm import create_app
+
+
+class FindCategoryResult(BaseModel):
+    category_id: str = Field(description="The selected category number id.")
+    category_name: str = Field(description="The selected category name id.")
+    category_description: str = Field(description="A short explanation of why this category fits.")
+    project_short_description: str = Field(description="A one-paragraph summary of the project.")
+
+
+QUERY = "Pick the category of this project: a platform that connects local farmers with schools."
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_stub(latency_ms, slow_rate, slow_ms, seed):
+    port = free_port()
+    runner = web.AppRunner(create_app(latency_ms, latency_ms / 4, 0.0, 0.0, seed, slow_rate, slow_ms))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner, Route("openai", f"stub-{port}", f"http://127.0.0.1:{port}/v1")
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+async def run(label, router, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await router.ainvoke("find_category", {"query": QUERY})
+                latencies.append((time.perf_counter() - started) * 1000.0)
+            except Exception:
+                failures += 1
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    routes = router.snapshot()["find_category"]["routes"]
+    extra = sum(r["hedges"] for r in routes.values()) + sum(r["failures"] for r in routes.values())
+    print(f"{label:<28}{percentile(latencies, 50):>8.0f}{percentile(latencies, 95):>8.0f}"
+          f"{percentile(latencies, 99):>8.0f}{extra:>8}{failures:>8}")
+
+
+async def main_async(args):
+    llm_models.ASYNC_CLIENTS = True
+    # the losing side of a hedge is cancelled, which the stubs log as a lost connection
+    logging.getLogger("aiohttp.server").setLevel(logging.CRITICAL)
+    primary_runner, primary = await start_stub(400, args.slow_rate, args.slow_ms, 1)
+    secondary_runner, secondary = await start_stub(600, 0.0, 0.0, 2)
+    schemas = {"find_category": FindCategoryResult}
+    both = {"find_category": [primary, secondary]}
+    scenarios = [
+        ("single route", ModelRouter(schemas, {"find_category": [primary]}, {}, set())),
+        ("ordered + failover", ModelRouter(schemas, both, {"find_category": "ordered"}, set())),
+        ("fastest", ModelRouter(schemas, both, {"find_category": "fastest"}, set())),
+        ("ordered + hedge at p95", ModelRouter(schemas, both, {"find_category": "ordered"}, {"find_category"})),
+        ("fastest + hedge at p95", ModelRouter(schemas, both, {"find_category": "fastest"}, {"find_category"})),
+    ]
+    print(f"calls={args.calls} concurrency={args.concurrency} primary slow {args.slow_rate:.0%} by {args.slow_ms:.0f} ms")
+    print(f"{'scenario':<28}{'p50':>8}{'p95':>8}{'p99':>8}{'extra':>8}{'failed':>8}")
+    try:
+        for label, router in scenarios:
+            await run(label, router, args.calls, args.concurrency)
+    finally:
+        await primary_runner.cleanup()
+        await secondary_runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--slow-rate", type=float, default=0.04)
+    parser.add_argument("--slow-ms", type=float, default=4000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# bench_search.py
+"""
+Search index benchmark on a synthetic cohort (no database): build time,
+memory and query latency of search_index.SearchIndex.
+
+Projects mix English, Spanish and Catalan text drawn from a Zipf-distributed
+vocabulary (--vocabulary words per language). The real words below, which
+is what the queries use, sit at rank --query-rank, so each of them appears in
+roughly a fifth of the projects at the defaults. Every project gets a script
+and --doc-words words of "extracted PDF text".
+
+Usage:
+    python backend/benchmarks/bench_search.py [--projects 100000] [--doc-words 600] [--queries 200] [--memory]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from search_index import SearchIndex
+
+VOCABULARY = {
+    "en": ("platform community learning inclusive data circular local digital support impact users "
+           "model revenue pilot municipal energy health teachers market schools students waste water "
+           "mobility tourism elderly care farmers food sensors recycling").split(),
+    "es": ("plataforma comunidad aprendizaje inclusiva datos circular local digital apoyo impacto usuarios "
+           "modelo ingresos piloto municipal energía salud profesores mercado escuelas estudiantes residuos "
+           "agua movilidad turismo mayores cuidados agricultores comida sensores reciclaje").split(),
+    "ca": ("plataforma comunitat aprenentatge inclusiva dades circular local digital suport impacte usuaris "
+           "model ingressos pilot municipal energia salut professors mercat escoles estudiants residus aigua "
+           "mobilitat turisme gent gran cures pagesos menjar sensors reciclatge").split(),
+}
+GLUE = {"en": "the and of for with".split(), "es": "el la de para con y".split(), "ca": "el la de per amb i".split()}
+SYLLABLES = "ba be bi bo bu ca ce ci co cu da de di do du fa fe fi la le li lo lu ma me mi mo mu na ne ni no ra re ri ro sa se si so ta te ti to".split()
+
+
+def zipf_vocabulary(rng, lang, size, query_rank):
+    """(words, cumulative weights): filler words with the real ones from rank query_rank on."""
+    filler = {"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + lang for _ in range(size)}
+    words = sorted(filler)
+    rng.shuffle(words)
+    words[query_rank:query_rank] = VOCABULARY[lang]
+    cumulative, total = [], 0.0
+    for rank in range(len(words)):
+        total += 1.0 / (rank + 1)
+        cumulative.append(total)
+    return words, cumulative
+
+
+def sentence(rng, vocabulary, lang, words):
+    vocab, cumulative = vocabulary[lang]
+    glue = GLUE[lang]
+    drawn = rng.choices(vocab, cum_weights=cumulative, k=words)
+    return " ".join(rng.choice(glue) if rng.random() < 0.3 else word for word in drawn)
+
+
+def build(projects, doc_words, seed, vocabulary_size=20000, query_rank=300):
+    rng = random.Random(seed)
+    vocabulary = {lang: zipf_vocabulary(rng, lang, vocabulary_size, query_rank) for lang in VOCABULARY}
+    index = SearchIndex()
+    for project_id in range(1, projects + 1):
+        lang = rng.choice(("en", "es", "ca"))
+        index.add(project_id, {
+            "title": sentence(rng, vocabulary, lang, 3).title(),
+            "description": sentence(rng, vocabulary, lang, 25),
+            "authors": f"Author {project_id}",
+            "script": sentence(rng, vocabulary, lang, 120),
+            "documents": sentence(rng, vocabulary, lang, doc_words),
+        }, category_id=str(rng.randint(1, 8)), score=rng.randint(0, 100))
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100000)
+    parser.add_argument("--doc-words", type=int, default=600)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--query-rank", type=int, default=300)
+    parser.add_argument("--memory", action="store_true", help="Trace allocations during the build (much slower)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    index = build(args.projects, args.doc_words, args.seed, args.vocabulary, args.query_rank)
+    build_seconds = time.perf_counter() - started
+    summary = f"built {len(index)} projects in {build_seconds:.1f}s, {len(index.postings)} terms"
+    if args.memory:
+        summary += f", {tracemalloc.get_traced_memory()[0] / 1024 / 1024:.0f} MiB"
+        tracemalloc.stop()
+    print(summary)
+
+    rng = random.Random(args.seed + 1)
+    cases = {
+        "1 word": lambda lang: rng.choice(VOCABULARY[lang]),
+        "3 words": lambda lang: " ".join(rng.sample(VOCABULARY[lang], 3)),
+        "3 words + category + min_score": lambda lang: " ".join(rng.sample(VOCABULARY[lang], 3)),
+    }
+    for name, make_query in cases.items():
+        filters = {"category": "3", "min_score": 50} if "category" in name else {}
+        latencies = []
+        for _ in range(args.queries):
+            query = make_query(rng.choice(("en", "es", "ca")))
+            started = time.perf_counter()
+            index.search(query, limit=20, **filters)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        print(f"{name:<34} p50 {statistics.median(latencies):7.1f} ms   "
+              f"p95 {latencies[int(0.95 * (len(latencies) - 1))]:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
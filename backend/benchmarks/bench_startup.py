@@ -0,0 +1,66 @@
+# bench_startup.py
+"""
+Startup benchmark: worker import time and first-request latency.
+
+Every run is a fresh interpreter, so nothing is shared between samples.
+Reports, per run:
+  - import:        `import rankingprojects` (what a worker pays at boot)
+  - first_request: first GET /rankingprojects/hello through the Flask test client
+  - first_chain:   building the evaluation chain (what the first LLM request
+                   pays on top of the model call; no request is sent)
+
+Usage:
+    python backend/benchmarks/bench_startup.py [--runs 5] [--warmup]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import rankingprojects
+t1 = time.perf_counter()
+client = rankingprojects.app.test_client()
+client.get("/rankingprojects/hello")
+t2 = time.perf_counter()
+rankingprojects.get_chain("evaluation")
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_request": t2 - t1, "first_chain": t3 - t2}))
+"""
+
+
+def run_once(warmup):
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET", "bench")
+    env.setdefault("OPENAI_API_KEY", "sk-bench")
+    if warmup:
+        env["LLM_WARMUP"] = "1"
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env,
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="Start with LLM_WARMUP=1")
+    args = parser.parse_args()
+
+    samples = [run_once(args.warmup) for _ in range(args.runs)]
+    print(f"{args.runs} runs, LLM_WARMUP={'1' if args.warmup else '0'}")
+    for key in ("import", "first_request", "first_chain"):
+        values = [s[key] * 1000 for s in samples]
+        print(f"  {key:<14} median {statistics.median(values):8.1f} ms   "
+              f"min {min(values):8.1f} ms   max {max(values):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
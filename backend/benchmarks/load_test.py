@@ -0,0 +1,240 @@
+# load_test.py
+"""
+Load driver for the backend: runs a weighted mix of endpoints at a fixed
+concurrency and reports p50/p95/p99 latency and throughput per endpoint.
+
+Offline setup (no model provider, no hosted PDFs):
+
+    python backend/benchmarks/stub_llm.py --port 8001 --latency-ms 1500 &
+    python backend/benchmarks/pdf_server.py --port 8002 &
+    python backend/benchmarks/seed_db.py --projects 500 --pdf-base http://127.0.0.1:8002 --wipe
+    cd backend && LLM_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=stub JWT_SECRET=bench \\
+        uvicorn asgi_app:app --port 5000 &
+    python backend/benchmarks/load_test.py --concurrency 64 --duration 60
+
+--mix takes name=weight pairs from ENDPOINTS; for example, only the LLM
+endpoints: --mix evaluate=5,compare=1,findoutcategory=3
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import aiohttp
+
+BENCH_PASSWORD = "benchmark-password"
+
+DEFAULT_MIX = ("projects=15,categories=5,leaderboard=10,projectdetail=20,getlikes=10,getconversation=5,"
+               "login=3,session=5,addlike=5,evaluate=3,compare=1,findoutcategory=2")
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip():
+            if name.strip() not in ENDPOINTS:
+                raise SystemExit(f"Unknown endpoint in --mix: {name} (known: {', '.join(ENDPOINTS)})")
+            mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class Client:
+    """Per-worker state: which bench user it is and its token once logged in."""
+
+    def __init__(self, args, rng, worker):
+        self.args = args
+        self.rng = rng
+        self.user = worker % args.projects + 1
+        self.token = None
+
+    def project(self):
+        return self.rng.randint(1, self.args.projects)
+
+    def pdf(self, name):
+        return f"{self.args.pdf_base}/{name}.pdf"
+
+
+# Each endpoint: async (session, client) -> (method, path, kwargs)
+async def req_projects(session, c):
+    return "GET", "/projects", {}
+
+async def req_categories(session, c):
+    return "GET", "/categories", {}
+
+async def req_leaderboard(session, c):
+    return "GET", "/leaderboard", {"params": {"limit": 20, "project": c.project()}}
+
+async def req_projectdetail(session, c):
+    return "GET", "/projectdetail", {"params": {"project": c.project(), "user": c.user}}
+
+async def req_getlikes(session, c):
+    return "GET", "/getlikes", {"params": {"project": c.project()}}
+
+async def req_getconversation(session, c):
+    return "GET", "/getconversation", {"params": {"project": c.project()}}
+
+async def req_login(session, c):
+    return "POST", "/auth/login", {"json": {"email": f"bench{c.user}@example.com", "password": BENCH_PASSWORD}}
+
+async def req_session(session, c):
+    if c.token is None:
+        async with session.post(c.args.base + "/auth/login",
+                                json={"email": f"bench{c.user}@example.com", "password": BENCH_PASSWORD}) as r:
+            c.token = (await r.json()).get("token") if r.status == 200 else ""
+    return "GET", "/me/session", {"headers": {"Authorization": f"Bearer {c.token}"}}
+
+async def req_addlike(session, c):
+    return "POST", "/addlike", {"json": {"user": c.user, "project": c.project()}}
+
+async def req_evaluate(session, c):
+    project = c.project()
+    return "POST", "/evaluate", {"json": {
+        "project": project, "prompt": "Evaluate this project.", "lang": "en",
+        "rubric": c.pdf("rubrics/health"), "canvas": c.pdf(f"docs/{project}_canvas"),
+        "summary": c.pdf(f"docs/{project}_summary"), "script": "Pitch script.",
+    }}
+
+async def req_compare(session, c):
+    project = c.project()
+    others = [c.project() for _ in range(c.args.compare_with)]
+    return "POST", "/compareprojects", {"json": {
+        "project": project, "title": f"Project {project}", "is_global": False,
+        "prompt": "Compare these projects.", "lang": "en",
+        "canvas": c.pdf(f"docs/{project}_canvas"), "summary": c.pdf(f"docs/{project}_summary"),
+        "other_projects": [
+            {"title": f"Project {o}", "canvas": c.pdf(f"docs/{o}_canvas"), "summary": c.pdf(f"docs/{o}_summary")}
+            for o in others
+        ],
+    }}
+
+async def req_findoutcategory(session, c):
+    project = c.project()
+    return "POST", "/findoutcategory", {"json": {
+        "prompt": "Which category fits?", "lang": "en",
+        "canvas": c.pdf(f"docs/{project}_canvas"), "summary": c.pdf(f"docs/{project}_summary"),
+        "script": "Pitch script.",
+    }}
+
+
+ENDPOINTS = {
+    "projects": req_projects,
+    "categories": req_categories,
+    "leaderboard": req_leaderboard,
+    "projectdetail": req_projectdetail,
+    "getlikes": req_getlikes,
+    "getconversation": req_getconversation,
+    "login": req_login,
+    "session": req_session,
+    "addlike": req_addlike,
+    "evaluate": req_evaluate,
+    "compare": req_compare,
+    "findoutcategory": req_findoutcategory,
+}
+
+
+async def worker(worker_id, session, args, mix, deadline, results):
+    rng = random.Random(args.seed * 1000 + worker_id)
+    client = Client(args, rng, worker_id)
+    names, weights = list(mix), list(mix.values())
+    while time.monotonic() < deadline:
+        name = rng.choices(names, weights)[0]
+        method, path, kwargs = await ENDPOINTS[name](session, client)
+        started = time.perf_counter()
+        try:
+            async with session.request(method, args.base + path, **kwargs) as response:
+                await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            status = 0
+        results[name].append((time.perf_counter() - started, status))
+
+
+def report(results, elapsed):
+    rows = []
+    for name in sorted(results):
+        samples = results[name]
+        latencies = [s[0] * 1000 for s in samples if 200 <= s[1] < 300]
+        rows.append({
+            "endpoint": name,
+            "requests": len(samples),
+            "ok": len(latencies),
+            "429": sum(1 for s in samples if s[1] == 429),
+            "errors": sum(1 for s in samples if not (200 <= s[1] < 300) and s[1] != 429),
+            "rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": statistics.mean(latencies) if latencies else 0.0,
+        })
+    return rows
+
+
+def print_report(rows, elapsed, concurrency):
+    print(f"{elapsed:.1f} s, concurrency {concurrency} (latencies of 2xx answers)")
+    print(f"{'endpoint':<16}{'reqs':>8}{'ok':>8}{'429':>6}{'err':>6}{'ok/s':>9}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for r in rows:
+        print(f"{r['endpoint']:<16}{r['requests']:>8}{r['ok']:>8}{r['429']:>6}{r['errors']:>6}{r['rps']:>9.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+    total_ok = sum(r["ok"] for r in rows)
+    print(f"{'total':<16}{sum(r['requests'] for r in rows):>8}{total_ok:>8}"
+          f"{sum(r['429'] for r in rows):>6}{sum(r['errors'] for r in rows):>6}{total_ok / elapsed:>9.1f}")
+
+
+async def run(args):
+    mix = parse_mix(args.mix)
+    results = defaultdict(list)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        if args.warmup > 0:
+            await asyncio.gather(*[
+                worker(i, session, args, mix, time.monotonic() + args.warmup, defaultdict(list))
+                for i in range(args.concurrency)
+            ])
+        started = time.monotonic()
+        await asyncio.gather(*[
+            worker(i, session, args, mix, started + args.duration, results)
+            for i in range(args.concurrency)
+        ])
+        elapsed = time.monotonic() - started
+    return report(results, elapsed), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default="http://127.0.0.1:5000/rankingprojects")
+    parser.add_argument("--pdf-base", default="http://127.0.0.1:8002")
+    parser.add_argument("--projects", type=int, default=500, help="Seeded project/user ids are 1..N")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=5)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--compare-with", type=int, default=5, help="Other projects per compare request")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    args.base = args.base.rstrip("/")
+    args.pdf_base = args.pdf_base.rstrip("/")
+
+    rows, elapsed = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps({"elapsed": elapsed, "concurrency": args.concurrency, "endpoints": rows}, indent=2))
+    else:
+        print_report(rows, elapsed, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
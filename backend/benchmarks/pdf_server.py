@@ -0,0 +1,100 @@
+# pdf_server.py
+"""
+Local static server for generated project documents.
+
+Every path ending in .pdf returns a deterministic text PDF (the path seeds the
+content), so rubrics, canvases and summaries can be downloaded and parsed by
+the backend without hosting real files:
+
+    python backend/benchmarks/pdf_server.py --port 8002 --pages 3
+    curl http://127.0.0.1:8002/docs/17_canvas.pdf -o canvas.pdf
+
+Documents are built once per path and kept in memory; --latency-ms adds a
+fixed delay to every download.
+"""
+import argparse
+import asyncio
+import random
+
+from aiohttp import web
+
+WORDS = ("customer segment value proposition channel revenue stream cost structure key "
+         "partners activities resources pilot impact community market growth evidence "
+         "municipal school health energy platform service local digital").split()
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(seed, title, pages=3, lines_per_page=40):
+    """A valid PDF with `pages` pages of Helvetica text; no dependencies."""
+    rng = random.Random(seed)
+    objects = []  # bodies of objects 1..n
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # filled in once the kids are known
+    page_ids = []
+    for page_number in range(1, pages + 1):
+        lines = [f"{title} - page {page_number}"]
+        lines += [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14))) for _ in range(lines_per_page)]
+        lines.append(f"Page {page_number} of {pages}")
+        stream = "BT /F1 10 Tf 12 TL 50 790 Td " + " ".join(f"({_escape(line)}) '" for line in lines) + " ET"
+        stream_bytes = stream.encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream_bytes), stream_bytes))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref)
+    return bytes(out)
+
+
+def create_app(pages, latency_ms):
+    documents = {}
+
+    async def serve_pdf(request):
+        path = request.match_info["path"]
+        if not path.endswith(".pdf"):
+            raise web.HTTPNotFound()
+        body = documents.get(path)
+        if body is None:
+            title = path.rsplit("/", 1)[-1][:-4].replace("_", " ")
+            body = documents[path] = make_pdf(path, title, pages=pages)
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000.0)
+        return web.Response(body=body, content_type="application/pdf")
+
+    app = web.Application()
+    app.router.add_get("/{path:.+}", serve_pdf)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+    web.run_app(create_app(args.pages, args.latency_ms), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
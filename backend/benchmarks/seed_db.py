@@ -0,0 +1,136 @@
+# seed_db.py
+"""
+Seeds the database (db_config in database.py) with a synthetic cohort for
+load testing, through bulk_io.import_ndjson. With --cohorts N the projects,
+their users and a copy of the categories are spread over N cohorts
+(programs), to check that one program's latency does not grow with the others.
+
+Every project's canvas/summary and every category rubric point at the local
+PDF server (pdf_server.py). All users share one password so the load driver
+can log in as any of them:
+
+    python backend/benchmarks/seed_db.py --projects 500 --pdf-base http://127.0.0.1:8002 --wipe
+    python backend/benchmarks/seed_db.py --projects 50000 --cohorts 20 --wipe
+
+Users are bench<N>@example.com with password "benchmark-password".
+--wipe empties categories, users and projects first: only use it on a
+throwaway database.
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pymysql
+
+import json_codec
+from bulk_io import import_ndjson, print_progress
+from database import db_config
+from password_hashing import hash_password
+
+BENCH_PASSWORD = "benchmark-password"
+
+CATEGORIES = [
+    ("health", "#C7EDE6", "Health, well-being and mental health"),
+    ("education", "#E6D8FF", "Education, EdTech and training"),
+    ("social", "#FFE1C6", "Social impact, inclusion and community"),
+    ("sustainability", "#D8F5C8", "Sustainability and circular economy"),
+    ("saas", "#CDE3FF", "B2B SaaS and productivity"),
+    ("marketplaces", "#FFD6E0", "Marketplaces and platforms"),
+    ("culture", "#F5E6C8", "Culture, heritage and creative industries"),
+    ("govtech", "#E0E0E0", "GovTech and participation"),
+]
+WORDS = ("platform community learning inclusive data circular local digital support "
+         "impact users model revenue pilot municipal energy health teachers market").split()
+
+
+def bench_email(i):
+    return f"bench{i}@example.com"
+
+
+def bench_cohort(i, cohorts):
+    return (i - 1) % cohorts + 1
+
+
+def generate_rows(projects, pdf_base, likes_per_project, seed, cohorts=1):
+    rng = random.Random(seed)
+    pw_hash = hash_password(BENCH_PASSWORD)
+
+    for cohort_id in range(1, cohorts + 1):
+        for position, (category_id, color, label) in enumerate(CATEGORIES):
+            yield {"table": "categories", "row": {
+                "uid": (cohort_id - 1) * len(CATEGORIES) + position, "id": category_id, "color": color,
+                "labelShort": f"{position + 1}. {category_id.capitalize()}",
+                "labelActiveShort": f"{position + 1}. {label}",
+                "labelLong": f"{position + 1}. {label}",
+                "rubric": f"{pdf_base}/rubrics/{category_id}.pdf",
+                "traits": "{ }",
+                "cohort_id": cohort_id,
+            }}
+
+    for i in range(1, projects + 1):
+        yield {"table": "users", "row": {
+            "id": i, "name": f"Bench {i}", "email": bench_email(i), "password": pw_hash,
+            "session": "{}", "validated": 1, "cohort_id": bench_cohort(i, cohorts),
+        }}
+
+    for i in range(1, projects + 1):
+        title = " ".join(rng.choice(WORDS) for _ in range(3)).title() + f" {i}"
+        likes = rng.sample(range(1, projects + 1), min(projects, rng.randint(0, likes_per_project)))
+        yield {"table": "projects", "row": {
+            "id": i,
+            "email": bench_email(i),
+            "category_id": rng.choice(CATEGORIES)[0],
+            "title": title,
+            "description": " ".join(rng.choice(WORDS) for _ in range(20))[:200],
+            "authors": f"Bench {i}",
+            "link": "",
+            "pitch": "",
+            "canvas": f"{pdf_base}/docs/{i}_canvas.pdf",
+            "summary": f"{pdf_base}/docs/{i}_summary.pdf",
+            "script": " ".join(rng.choice(WORDS) for _ in range(150)),
+            "detail": "",
+            "score": rng.randint(0, 100),
+            "evaluation": "",
+            "conversation": "[]",
+            "likes": json_codec.dumps_text([{"user": u, "name": f"Bench {u}"} for u in likes]),
+            "relationships_local": "",
+            "relationships_global": "",
+            "cohort_id": bench_cohort(i, cohorts),
+        }}
+
+
+def wipe():
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            for table in ("projects", "users", "categories"):
+                cursor.execute(f"DELETE FROM `{table}`")
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=500)
+    parser.add_argument("--likes-per-project", type=int, default=20)
+    parser.add_argument("--pdf-base", default="http://127.0.0.1:8002")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cohorts", type=int, default=1, help="Spread the projects over this many cohorts")
+    parser.add_argument("--wipe", action="store_true", help="Delete existing categories, users and projects first")
+    args = parser.parse_args()
+
+    if args.wipe:
+        wipe()
+    lines = (json_codec.dumps_text(record) for record in
+             generate_rows(args.projects, args.pdf_base.rstrip("/"), args.likes_per_project, args.seed,
+                           max(1, args.cohorts)))
+    counts = import_ndjson(lines, mode="replace", progress=print_progress)
+    print(counts)
+
+
+if __name__ == "__main__":
+    main()
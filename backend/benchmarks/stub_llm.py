@@ -0,0 +1,183 @@
+# stub_llm.py
+"""
+OpenAI-compatible stand-in for the model provider.
+
+Answers POST /v1/chat/completions with valid EvaluationResult,
+EvaluationTranslation, CompareProjectsResult or FindCategoryResult JSON
+(picked from the format instructions in the prompt) after a configurable latency, so the backend can
+be load tested offline and at no cost.
+
+Point the backend at it with the openai registry backend:
+
+    python backend/benchmarks/stub_llm.py --port 8001 --latency-ms 1500 --jitter-ms 500
+    LLM_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=stub python backend/rankingprojects.py
+
+--error-rate / --rate-limit-rate inject 500 and 429 answers to exercise the
+error paths. --slow-rate / --slow-ms make a share of the answers much slower,
+like a degraded provider (see bench_router.py).
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+
+from aiohttp import web
+
+WORDS = ("clear market impact model pilot users revenue team partners scale data "
+         "community risk channel growth evidence").split()
+
+
+def sentence(rng, n=8):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def evaluation_result(rng, prompt):
+    return {
+        "score": rng.randint(40, 95),
+        "evaluation": " ".join(sentence(rng, 12) for _ in range(4)),
+        "strengths": [sentence(rng) for _ in range(3)],
+        "weaknesses": [sentence(rng) for _ in range(3)],
+        "recommendations": [sentence(rng) for _ in range(3)],
+        "criteria": [
+            {"name": f"Criterion {n}", "score": rng.randint(30, 100), "comment": sentence(rng)}
+            for n in range(1, 5)
+        ],
+    }
+
+
+def translation_result(rng, prompt):
+    # echoes the texts to translate, tagged with the target language
+    target = re.search(r"into (\w+)\.", prompt)
+    tag = f"[{target.group(1) if target else '?'}] "
+    match = re.search(r"EVALUATION JSON:\s*(\{.*\})\s*$", prompt, re.S)
+    texts = json.loads(match.group(1)) if match else {}
+
+    def tagged(value):
+        if isinstance(value, str):
+            return tag + value
+        if isinstance(value, list):
+            return [tagged(item) for item in value]
+        if isinstance(value, dict):
+            return {key: tagged(item) for key, item in value.items()}
+        return value
+    return tagged(texts)
+
+
+def compare_result(rng, prompt):
+    titles = []
+    match = re.search(r"Allowed titles JSON:\s*(\[.*?\])\s*$", prompt, re.S)
+    if match:
+        try:
+            titles = json.loads(match.group(1))
+        except ValueError:
+            titles = []
+    return {
+        "results": [
+            {
+                "title": title,
+                "match": rng.randint(0, 100),
+                "similarities": sentence(rng, 14),
+                "differences": [sentence(rng) for _ in range(2)],
+                "collaboration": [sentence(rng) for _ in range(2)],
+            }
+            for title in titles
+        ]
+    }
+
+
+def find_category_result(rng, prompt):
+    options = re.findall(r"category_id:\s*([^,\s]+),\s*category_name:\s*([^,\s]+)", prompt)
+    category_id, category_name = rng.choice(options) if options else ("0", "health")
+    return {
+        "category_id": category_id,
+        "category_name": category_name,
+        "category_description": sentence(rng, 14),
+        "project_short_description": " ".join(sentence(rng, 12) for _ in range(3)),
+    }
+
+
+def pick_result(prompt):
+    # the format instructions embed the pydantic JSON schema of the expected answer
+    if "Translate the project evaluation" in prompt:
+        return translation_result
+    if '"results"' in prompt:
+        return compare_result
+    if '"category_id"' in prompt:
+        return find_category_result
+    return evaluation_result
+
+
+def create_app(latency_ms, jitter_ms, error_rate, rate_limit_rate, seed, slow_rate=0.0, slow_ms=0.0):
+    rng = random.Random(seed)
+    stats = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    async def chat_completions(request):
+        body = await request.json()
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        stats["requests"] += 1
+
+        delay = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000.0
+        if rng.random() < slow_rate:
+            delay += slow_ms / 1000.0
+        await asyncio.sleep(delay)
+
+        roll = rng.random()
+        if roll < rate_limit_rate:
+            stats["rate_limited"] += 1
+            return web.json_response({"error": {"message": "Rate limit reached", "type": "requests"}},
+                                     status=429, headers={"Retry-After": "1"})
+        if roll < rate_limit_rate + error_rate:
+            stats["errors"] += 1
+            return web.json_response({"error": {"message": "Stub server error", "type": "server_error"}}, status=500)
+
+        content = json.dumps(pick_result(prompt)(rng, prompt), ensure_ascii=False)
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        return web.json_response({
+            "id": f"chatcmpl-stub-{stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    async def get_stats(request):
+        return web.json_response(stats)
+
+    app = web.Application(client_max_size=64 * 1024 * 1024)
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=1500)
+    parser.add_argument("--jitter-ms", type=float, default=500)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate, args.seed,
+                     args.slow_rate, args.slow_ms)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+# blob_store.py
+"""
+Local content-addressed store for the canvas, summary and rubric PDFs.
+
+A blob is a file named after the sha256 of its bytes, so uploading the same
+PDF twice stores it once:
+
+    BLOB_DIR/ab/cd/abcd1234...      (first two byte pairs fan the files out)
+
+Uploads (POST /rankingprojects/blobs) return a URL of the form
+.../rankingprojects/blobs/<sha256>.pdf, which is what projects.canvas,
+projects.summary and categories.rubric store. GET on that URL serves the file
+with Range support and immutable caching.
+
+read_document(url) is what the LLM operations use:
+  - a blob URL (any host) is read straight from disk
+  - any other URL is downloaded once, stored as a blob and recorded in
+    blob_mirrors; later reads come from disk. The first download still pays
+    for the remote host; `python blob_store.py mirror` pre-fetches every
+    document referenced by projects and categories.
+
+    BLOB_DIR=backend/blob_data
+    BLOB_BASE_URL=                   public origin for blob URLs (default: the upload request's host)
+    BLOB_MAX_BYTES=20971520          largest accepted upload / mirrored file
+    BLOB_MIRROR=1                    0 always downloads remote URLs
+    BLOB_MIRROR_MAX_AGE_HOURS=0      re-download mirrors older than this (0: never)
+    BLOB_DOWNLOAD_TIMEOUT=60         seconds a download may take; inside an operation the
+                                     "download" share of its deadline (deadline.py) when shorter
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import BinaryIO, Iterable, List, Optional, Set, Tuple
+
+import pymysql
+
+import deadline
+from database import db_config
+from request_timing import phase, timed
+
+BLOB_DIR = os.getenv("BLOB_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "blob_data")
+BLOB_MAX_BYTES = int(os.getenv("BLOB_MAX_BYTES", str(20 * 1024 * 1024)))
+BLOB_BASE_URL = os.getenv("BLOB_BASE_URL") or None
+BLOB_MIRROR = os.getenv("BLOB_MIRROR", "1") != "0"
+BLOB_MIRROR_MAX_AGE_HOURS = int(os.getenv("BLOB_MIRROR_MAX_AGE_HOURS", "0"))
+BLOB_DOWNLOAD_TIMEOUT = float(os.getenv("BLOB_DOWNLOAD_TIMEOUT", "60"))
+
+BLOB_ROUTE = "/rankingprojects/blobs"
+BLOB_URL_RE = re.compile(r"/rankingprojects/blobs/([0-9a-f]{64})(?:\.pdf)?(?:[?#].*)?$")
+BLOB_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+CHUNK_SIZE = 1024 * 1024
+PDF_MAGIC = b"%PDF-"
+
+
+class BlobTooLarge(Exception):
+    pass
+
+
+class NotAPdf(Exception):
+    pass
+
+
+def blob_path(blob_id: str) -> str:
+    return os.path.join(BLOB_DIR, blob_id[:2], blob_id[2:4], blob_id)
+
+
+def blob_exists(blob_id: str) -> bool:
+    return bool(BLOB_ID_RE.match(blob_id or "")) and os.path.isfile(blob_path(blob_id))
+
+
+def local_blob_id(url: Optional[str]) -> Optional[str]:
+    """The blob a URL points at when it is one of our blob URLs, whatever the host."""
+    match = BLOB_URL_RE.search((url or "").strip())
+    return match.group(1) if match else None
+
+
+def blob_url(base_url: str, blob_id: str) -> str:
+    return f"{base_url.rstrip('/')}{BLOB_ROUTE}/{blob_id}.pdf"
+
+
+def put_stream(stream: BinaryIO, max_bytes: int = BLOB_MAX_BYTES, require_pdf: bool = False) -> Tuple[str, int, bool]:
+    """
+    Stores the bytes read from `stream`. Returns (blob_id, size, created); created
+    is False when the same content was already stored. Raises BlobTooLarge, and
+    NotAPdf when require_pdf is set and the content does not start like a PDF.
+    """
+    os.makedirs(BLOB_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    # Written next to the blobs so the final rename stays on one filesystem (atomic)
+    fd, tmp_path = tempfile.mkstemp(prefix=".upload-", dir=BLOB_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if require_pdf and len(head) < len(PDF_MAGIC):
+                    head += chunk[:len(PDF_MAGIC) - len(head)]
+                    if not PDF_MAGIC.startswith(head):
+                        raise NotAPdf("not a PDF file")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise BlobTooLarge(f"larger than {max_bytes} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+        if require_pdf and head != PDF_MAGIC:
+            raise NotAPdf("not a PDF file")
+        blob_id = digest.hexdigest()
+        path = blob_path(blob_id)
+        if os.path.exists(path):
+            return blob_id, size, False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        return blob_id, size, True
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def put_bytes(data: bytes, max_bytes: int = BLOB_MAX_BYTES) -> Tuple[str, int, bool]:
+    return put_stream(io.BytesIO(data), max_bytes)
+
+
+def read_blob(blob_id: str) -> bytes:
+    with open(blob_path(blob_id), "rb") as f:
+        return f.read()
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+@timed("db")
+def lookup_mirror(url: str) -> Optional[str]:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            sql = "SELECT sha256 FROM blob_mirrors WHERE url_hash = %s AND url = %s"
+            if BLOB_MIRROR_MAX_AGE_HOURS > 0:
+                sql += f" AND mirrored_at > NOW() - INTERVAL {BLOB_MIRROR_MAX_AGE_HOURS} HOUR"
+            cursor.execute(sql, (url_hash(url), url))
+            row = cursor.fetchone()
+            return row[0] if row else None
+    finally:
+        connection.close()
+
+
+@timed("db")
+def save_mirror(url: str, blob_id: str, size: int) -> None:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO blob_mirrors (url_hash, url, sha256, size)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE url = VALUES(url), sha256 = VALUES(sha256),
+                                        size = VALUES(size), mirrored_at = NOW()
+                """,
+                (url_hash(url), url, blob_id, size),
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+async def download(url: str, timeout: float = BLOB_DOWNLOAD_TIMEOUT) -> Tuple[int, bytes]:
+    import aiohttp
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        async with session.get(url) as resp:
+            return resp.status, await resp.read()
+
+
+async def read_document(url: str) -> bytes:
+    """The bytes of a document URL: from disk when it is (or was mirrored as) a blob."""
+    url = (url or "").strip()
+    blob_id = local_blob_id(url)
+    if blob_id is None and BLOB_MIRROR:
+        try:
+            blob_id = await asyncio.to_thread(lookup_mirror, url)
+        except Exception as e:
+            print("blob_store lookup error:", repr(e))
+    if blob_id is not None and blob_exists(blob_id):
+        with phase("blob_read"):
+            return await asyncio.to_thread(read_blob, blob_id)
+
+    budget = deadline.stage_budget("download")
+    timeout = BLOB_DOWNLOAD_TIMEOUT if budget is None else min(budget, BLOB_DOWNLOAD_TIMEOUT)
+    with phase("download"):
+        status, data = await deadline.within("download", download(url, timeout), timeout)
+    if BLOB_MIRROR and status == 200 and data.startswith(PDF_MAGIC) and len(data) <= BLOB_MAX_BYTES:
+        # the document was read either way; a failed mirror only means downloading it again next time
+        try:
+            await asyncio.to_thread(mirror_bytes, url, data)
+        except Exception as e:
+            print("blob_store mirror error:", repr(e))
+    return data
+
+
+def mirror_bytes(url: str, data: bytes) -> str:
+    blob_id, size, _ = put_bytes(data)
+    save_mirror(url, blob_id, size)
+    return blob_id
+
+
+def referenced_urls() -> List[str]:
+    """Every document URL stored in projects and categories."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT canvas, summary FROM projects")
+            urls = [url for row in cursor.fetchall() for url in row]
+            cursor.execute("SELECT rubric FROM categories")
+            urls += [row[0] for row in cursor.fetchall()]
+        return sorted({url.strip() for url in urls if url and url.strip().startswith("http")})
+    finally:
+        connection.close()
+
+
+def referenced_blobs(urls: Iterable[str]) -> Set[str]:
+    blobs = {blob_id for blob_id in (local_blob_id(url) for url in urls) if blob_id}
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sha256 FROM blob_mirrors")
+            blobs.update(row[0] for row in cursor.fetchall())
+    finally:
+        connection.close()
+    return blobs
+
+
+def stored_blobs() -> Iterable[Tuple[str, int, float]]:
+    """(blob_id, size, mtime) of every stored blob."""
+    for root, _, files in os.walk(BLOB_DIR):
+        for name in files:
+            if BLOB_ID_RE.match(name):
+                stat = os.stat(os.path.join(root, name))
+                yield name, stat.st_size, stat.st_mtime
+
+
+async def mirror_all(urls: List[str], concurrency: int) -> Tuple[int, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    done = failed = 0
+
+    async def one(url):
+        nonlocal done, failed
+        async with semaphore:
+            try:
+                await read_document(url)
+                done += 1
+            except Exception as e:
+                failed += 1
+                print(f"{url}: {e!r}")
+
+    await asyncio.gather(*(one(url) for url in urls))
+    return done, failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local document store tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    mirror = sub.add_parser("mirror", help="Download every remote document referenced by projects and categories once")
+    mirror.add_argument("--concurrency", type=int, default=4)
+    gc = sub.add_parser("gc", help="Delete blobs no project, category or mirror refers to")
+    gc.add_argument("--min-age-hours", type=float, default=24,
+                    help="Keep newer blobs: uploads are stored before the project form is saved")
+    gc.add_argument("--dry-run", action="store_true")
+    sub.add_parser("stats", help="Count and size of the stored blobs")
+    args = parser.parse_args(argv)
+
+    if args.command == "mirror":
+        urls = [url for url in referenced_urls() if local_blob_id(url) is None]
+        done, failed = asyncio.run(mirror_all(urls, args.concurrency))
+        print(f"{done} documents available locally, {failed} failed")
+        return 1 if failed else 0
+
+    if args.command == "gc":
+        keep = referenced_blobs(referenced_urls())
+        removed = freed = 0
+        cutoff = time.time() - args.min_age_hours * 3600
+        for blob_id, size, mtime in list(stored_blobs()):
+            if blob_id not in keep and mtime < cutoff:
+                removed += 1
+                freed += size
+                if not args.dry_run:
+                    os.remove(blob_path(blob_id))
+        print(f"{'would remove' if args.dry_run else 'removed'} {removed} blobs, {freed / 1024 / 1024:.1f} MiB")
+        return 0
+
+    blobs = list(stored_blobs())
+    print(f"{len(blobs)} blobs, {sum(size for _, size, _ in blobs) / 1024 / 1024:.1f} MiB in {BLOB_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+# bulk_io.py
+"""
+Streaming NDJSON export and batched import of categories, users and projects.
+
+Every line is one row: {"table": "projects", "row": {...}}
+
+    python bulk_io.py export [--tables categories,users,projects] [--cohort 2] [--out dump.ndjson]
+    python bulk_io.py import dump.ndjson [--batch-size 1000] [--mode insert|replace|upsert] [--skip-derived]
+
+Export reads through an unbuffered server-side cursor, so memory stays flat
+whatever the table size. Import groups rows per table and sends them with
+executemany (one multi-row INSERT per batch), committing once per batch.
+Importing projects ends with a category_stats recompute. Rows keep their
+cohort_id (cohorts missing on the target get a placeholder row); --cohort
+exports a single cohort.
+"""
+from __future__ import annotations
+import argparse
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+import pymysql
+import pymysql.cursors
+
+import category_stats
+import cohorts
+import json_codec
+from database import db_config, bump_cache_version
+
+EXPORT_TABLES = ("categories", "users", "projects")
+
+# Columns that are computed from other data. like_count is always rebuilt from
+# likes on import; with --skip-derived the LLM results are reset as well so
+# they get recomputed on the target server.
+DERIVED_COLUMNS: Dict[str, Dict[str, Any]] = {
+    "projects": {
+        "score": 0,
+        "evaluation": "",
+        "relationships_local": "",
+        "relationships_global": "",
+        "relationships_local_at": None,
+        "relationships_global_at": None,
+    },
+}
+
+# Flush a batch before it gets close to the default max_allowed_packet
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+
+def iter_table_ndjson(table: str, batch_size: int = 1000, cohort_id: Optional[int] = None,
+                      exclude: Iterable[str] = ()) -> Iterator[str]:
+    """
+    Yields one NDJSON line per row of `table` (of one cohort, if given), read
+    with a server-side cursor, without the `exclude` columns.
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table: {table}")
+
+    connection = pymysql.connect(**db_config, cursorclass=pymysql.cursors.SSDictCursor)
+    try:
+        with connection.cursor() as cursor:
+            if cohort_id is None:
+                cursor.execute(f"SELECT * FROM `{table}`")
+            else:
+                cursor.execute(f"SELECT * FROM `{table}` WHERE cohort_id = %s", (cohort_id,))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    for column in exclude:
+                        row.pop(column, None)
+                    yield json_codec.dumps_text({"table": table, "row": row}, default=str) + "\n"
+    finally:
+        connection.close()
+
+
+def export_ndjson(out: TextIO, tables: Iterable[str] = EXPORT_TABLES,
+                  progress: Optional[Callable[[str, int, float], None]] = None,
+                  cohort_id: Optional[int] = None) -> Dict[str, int]:
+    counts = {}
+    for table in tables:
+        started = time.perf_counter()
+        count = 0
+        for line in iter_table_ndjson(table, cohort_id=cohort_id):
+            out.write(line)
+            count += 1
+            if progress and count % 10000 == 0:
+                progress(table, count, time.perf_counter() - started)
+        counts[table] = count
+        if progress:
+            progress(table, count, time.perf_counter() - started)
+    return counts
+
+
+def get_table_columns(cursor, table: str) -> List[str]:
+    cursor.execute(f"SHOW COLUMNS FROM `{table}`")
+    return [row[0] for row in cursor.fetchall()]
+
+
+def build_insert_sql(table: str, columns: List[str], mode: str) -> str:
+    column_list = ", ".join(f"`{c}`" for c in columns)
+    placeholders = ", ".join(["%s"] * len(columns))
+    verb = "REPLACE" if mode == "replace" else "INSERT"
+    sql = f"{verb} INTO `{table}` ({column_list}) VALUES ({placeholders})"
+    if mode == "upsert":
+        sql += " ON DUPLICATE KEY UPDATE " + ", ".join(f"`{c}`=VALUES(`{c}`)" for c in columns)
+    return sql
+
+
+def prepare_row(table: str, row: Dict[str, Any], skip_derived: bool) -> Dict[str, Any]:
+    row = dict(row)
+    if skip_derived:
+        row.update(DERIVED_COLUMNS.get(table, {}))
+    if table == "projects":
+        likes = json_codec.parse_json_column(row.get("likes"), [])
+        row["like_count"] = len(likes) if isinstance(likes, list) else 0
+        # Stamped by the target server, so its search index picks the rows up
+        row.pop("updated_at", None)
+    return row
+
+
+def import_ndjson(lines: Iterable[str], batch_size: int = 1000, mode: str = "insert",
+                  skip_derived: bool = False,
+                  progress: Optional[Callable[[str, int, float], None]] = None) -> Dict[str, int]:
+    """
+    Loads NDJSON rows in executemany batches, one transaction per batch.
+    Column names are checked against the live table, unknown keys are dropped.
+    """
+    if mode not in ("insert", "replace", "upsert"):
+        raise ValueError(f"Unknown import mode: {mode}")
+
+    connection = pymysql.connect(**db_config)
+    counts: Dict[str, int] = {}
+    table_columns: Dict[str, List[str]] = {}
+    batches: Dict[str, List[Dict[str, Any]]] = {}
+    batch_bytes: Dict[str, int] = {}
+    cohort_ids = set()
+    started = time.perf_counter()
+
+    def flush(cursor, table):
+        rows = batches.get(table)
+        if not rows:
+            return
+        columns = [c for c in table_columns[table] if c in rows[0]]
+        cursor.executemany(
+            build_insert_sql(table, columns, mode),
+            [tuple(r.get(c) for c in columns) for r in rows]
+        )
+        connection.commit()
+        counts[table] = counts.get(table, 0) + len(rows)
+        batches[table] = []
+        batch_bytes[table] = 0
+        if progress:
+            progress(table, counts[table], time.perf_counter() - started)
+
+    try:
+        with connection.cursor() as cursor:
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json_codec.loads(line)
+                table = record.get("table")
+                if table not in EXPORT_TABLES:
+                    raise ValueError(f"Unknown table in input: {table}")
+                if table not in table_columns:
+                    table_columns[table] = get_table_columns(cursor, table)
+
+                row = prepare_row(table, record.get("row") or {}, skip_derived)
+                if row.get("cohort_id") is not None:
+                    cohort_ids.add(row["cohort_id"])
+                batch = batches.setdefault(table, [])
+                # executemany needs the same columns in every row of a batch
+                if batch and row.keys() != batch[0].keys():
+                    flush(cursor, table)
+                batches[table].append(row)
+                batch_bytes[table] = batch_bytes.get(table, 0) + len(line)
+                if len(batches[table]) >= batch_size or batch_bytes[table] >= MAX_BATCH_BYTES:
+                    flush(cursor, table)
+
+            for table in list(batches):
+                flush(cursor, table)
+            if cohort_ids:
+                cohorts.ensure_cohorts(cursor, cohort_ids)
+                connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    if "categories" in counts:
+        bump_cache_version("categories")
+    if "projects" in counts:
+        # Imported rows bypass the incremental updates
+        category_stats.recompute()
+    return counts
+
+
+def print_progress(table: str, count: int, elapsed: float) -> None:
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"[bulk_io] {table}: {count:,} rows ({rate:,.0f} rows/s)", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="NDJSON export/import of categories, users and projects.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    exp = sub.add_parser("export", help="Stream tables to NDJSON")
+    exp.add_argument("--tables", default=",".join(EXPORT_TABLES))
+    exp.add_argument("--cohort", type=int, default=None, help="Only export this cohort")
+    exp.add_argument("--out", default="-", help="Output file (default: stdout)")
+
+    imp = sub.add_parser("import", help="Load NDJSON in batches")
+    imp.add_argument("input", help="Input file ('-' for stdin)")
+    imp.add_argument("--batch-size", type=int, default=1000)
+    imp.add_argument("--mode", choices=("insert", "replace", "upsert"), default="insert")
+    imp.add_argument("--skip-derived", action="store_true",
+                     help="Reset score, evaluation and relationships so they are recomputed")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+        out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+        try:
+            export_ndjson(out, tables, progress=print_progress, cohort_id=args.cohort)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return 0
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    try:
+        import_ndjson(source, batch_size=args.batch_size, mode=args.mode,
+                      skip_derived=args.skip_derived, progress=print_progress)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# cache_store.py
+from __future__ import annotations
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# invalidate() bumps the generation of the key's stripe, so the counters stay
+# bounded whatever the keys; a collision only skips storing one load
+GENERATION_STRIPES = 1024
+
+
+class VersionedCache:
+    """
+    Read-through cache for a single value that rarely changes (e.g. categories).
+
+    - Within `ttl` seconds the cached value is returned without any I/O.
+    - After `ttl`, `version_reader()` is called (a cheap primary-key lookup) and
+      the value is reloaded with `loader()` only if the version moved.
+    - `invalidate()` drops the local copy; writers also bump the shared version
+      so every other worker reloads on its next check.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        version_reader: Callable[[], Any],
+        ttl: float = 300.0,
+    ):
+        self.loader = loader
+        self.version_reader = version_reader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._version: Any = None
+        self._checked_at = 0.0
+        self._loaded = False
+
+    def get(self) -> Any:
+        if self._loaded and time.monotonic() - self._checked_at < self.ttl:
+            return self._value
+
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._loaded and time.monotonic() - self._checked_at < self.ttl:
+                return self._value
+
+            version = self.version_reader()
+            if not self._loaded or version != self._version:
+                self._value = self.loader()
+                self._version = version
+                self._loaded = True
+            self._checked_at = time.monotonic()
+            return self._value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded = False
+            self._value = None
+            self._version = None
+
+    @property
+    def version(self) -> Optional[Any]:
+        return self._version
+
+
+class LRUBackend:
+    """In-process, bounded, thread-safe key/value store (least recently used is evicted)."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            entry, expires_at = item
+            if time.time() >= expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Any, expire: float) -> None:
+        with self._lock:
+            self._data[key] = (entry, time.time() + expire)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+
+class RemoteBackend:
+    """
+    Shared store on a local Redis-compatible or memcached server, so that every
+    worker sees the same entries and invalidations.
+    URL examples: redis://127.0.0.1:6379/0, memcached://127.0.0.1:11211
+    """
+
+    def __init__(self, url: str, prefix: str = "rankingprojects:"):
+        self.prefix = prefix
+        if url.startswith(("redis://", "rediss://", "unix://")):
+            import redis
+            self._client = redis.Redis.from_url(url)
+            self._is_redis = True
+        elif url.startswith("memcached://"):
+            from pymemcache.client.base import Client
+            host, _, port = url[len("memcached://"):].partition(":")
+            self._client = Client((host, int(port or 11211)))
+            self._is_redis = False
+        else:
+            raise ValueError(f"Unsupported cache URL: {url}")
+
+    def get(self, key: str) -> Any:
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, entry: Any, expire: float) -> None:
+        raw = json.dumps(entry)
+        if self._is_redis:
+            self._client.set(self.prefix + key, raw, ex=max(1, int(expire)))
+        else:
+            self._client.set(self.prefix + key, raw, expire=max(1, int(expire)))
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        if self._is_redis:
+            self._client.delete(*[self.prefix + k for k in keys])
+        else:
+            self._client.delete_many([self.prefix + k for k in keys])
+
+
+class ResponseCache:
+    """
+    Caches serialized responses by key.
+
+    - Fresh entries (younger than `ttl`) are served directly.
+    - Stale entries (up to `stale_ttl`) are served immediately while a single
+      background thread reloads them (stale-while-revalidate).
+    - Misses are loaded once per key; concurrent callers wait for that load
+      instead of all reaching the database.
+    - `invalidate(*keys)` is called from write paths and removes entries at once,
+      so the next reader always sees the write.
+
+    Per-key load locks only exist while someone is loading or waiting for the
+    key, so client-chosen keys cannot grow the process.
+    """
+
+    def __init__(self, backend: Any, ttl: float = 30.0, stale_ttl: float = 300.0):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # key -> [lock, holders and waiters]
+        self._locks: Dict[str, List[Any]] = {}
+        self._locks_guard = threading.Lock()
+        self._refreshing: Set[str] = set()
+        # Bumped by invalidate(); a load that started before the bump is not stored
+        self._generations: List[int] = [0] * GENERATION_STRIPES
+
+    @contextmanager
+    def _key_lock(self, key: str):
+        with self._locks_guard:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    @staticmethod
+    def _stripe(key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % GENERATION_STRIPES
+
+    def _generation(self, key: str) -> int:
+        with self._locks_guard:
+            return self._generations[self._stripe(key)]
+
+    def _store(self, key: str, value: Any, generation: int) -> None:
+        if self._generation(key) != generation:
+            return
+        now = time.time()
+        entry = {"value": value, "fresh_until": now + self.ttl}
+        self.backend.set(key, entry, expire=self.ttl + self.stale_ttl)
+
+    def _revalidate(self, key: str, loader: Callable[[], Any]) -> None:
+        try:
+            generation = self._generation(key)
+            self._store(key, loader(), generation)
+        except Exception as e:
+            print(f"ResponseCache::revalidate {key} failed: {e!r}")
+        finally:
+            with self._locks_guard:
+                self._refreshing.discard(key)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        entry = self.backend.get(key)
+        if entry is not None:
+            if time.time() >= entry["fresh_until"]:
+                with self._locks_guard:
+                    start = key not in self._refreshing
+                    self._refreshing.add(key)
+                if start:
+                    threading.Thread(target=self._revalidate, args=(key, loader), daemon=True).start()
+            return entry["value"]
+
+        with self._key_lock(key):
+            # Someone else may have loaded it while we were waiting
+            entry = self.backend.get(key)
+            if entry is not None:
+                return entry["value"]
+            generation = self._generation(key)
+            value = loader()
+            self._store(key, value, generation)
+            return value
+
+    def invalidate(self, *keys: str) -> None:
+        with self._locks_guard:
+            for key in keys:
+                self._generations[self._stripe(key)] += 1
+        self.backend.delete(*keys)
+
+
+def create_response_cache(
+    url: Optional[str] = None,
+    ttl: float = 30.0,
+    stale_ttl: float = 300.0,
+    max_entries: int = 1024,
+) -> ResponseCache:
+    """In-process LRU by default; a shared backend when `url` is given."""
+    backend = RemoteBackend(url) if url else LRUBackend(max_entries)
+    return ResponseCache(backend, ttl=ttl, stale_ttl=stale_ttl)
@@ -0,0 +1,285 @@
+# category_stats.py
+"""
+Per-category statistics kept up to date by the project writes, so the stats
+endpoint reads a few small rows whatever the number of projects.
+
+    category_stats          (cohort_id, category_id) -> projects, evaluated, score_sum, likes
+    category_score_counts   (cohort_id, category_id, score) -> evaluated projects with that score
+
+A project contributes to its category in its cohort: one project, one like per entry in
+likes, and when it has an evaluation, one evaluated project with its score.
+Writes that can change a contribution (evaluation, likes, project save and
+delete) run inside tracked():
+
+    with category_stats.tracked(cursor, "id = %s", (project_id,)):
+        cursor.execute("UPDATE projects SET score = ... WHERE id = %s", ...)
+
+which locks the touched project rows (SELECT ... FOR UPDATE), reads their
+contribution before and after the write, and adds the difference to the
+aggregates in the same transaction. `where` should name rows by primary key:
+any other predicate locks every row the scan walks through. A project
+inserted in the transaction is added with created(cursor, project_id). The increments are relative
+(x = x + delta), so concurrent writes to one category do not lose updates.
+
+Mean, median, coverage and the histogram are derived from these rows when read:
+the median from the per-score counts, the histogram by summing them into
+CATEGORY_STATS_BUCKET wide bins.
+
+Writes that bypass tracked() (bulk_io imports, manual SQL) leave the
+aggregates behind; rebuild them from projects with
+
+    python category_stats.py check          lists what a recompute would change
+    python category_stats.py recompute
+
+    CATEGORY_STATS_BUCKET=10    histogram bin width, in score points
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pymysql
+
+from database import db_config
+from request_timing import timed
+
+CATEGORY_STATS_BUCKET = int(os.getenv("CATEGORY_STATS_BUCKET", "10"))
+MAX_SCORE = 100
+
+SNAPSHOT_SQL = ("SELECT id, cohort_id, category_id, score, evaluation <> '', like_count FROM projects "
+                "WHERE {where} FOR UPDATE")
+
+UPSERT_STATS_SQL = """
+    INSERT INTO category_stats (cohort_id, category_id, projects, evaluated, score_sum, likes)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE projects = projects + VALUES(projects), evaluated = evaluated + VALUES(evaluated),
+                            score_sum = score_sum + VALUES(score_sum), likes = likes + VALUES(likes)
+"""
+UPSERT_SCORE_SQL = """
+    INSERT INTO category_score_counts (cohort_id, category_id, score, projects) VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE projects = projects + VALUES(projects)
+"""
+
+RECOMPUTE_SQL = (
+    "DELETE FROM category_score_counts",
+    "DELETE FROM category_stats",
+    """
+    INSERT INTO category_stats (cohort_id, category_id, projects, evaluated, score_sum, likes)
+    SELECT cohort_id, category_id, COUNT(*), SUM(evaluation <> ''), SUM(IF(evaluation <> '', score, 0)), SUM(like_count)
+    FROM projects GROUP BY cohort_id, category_id
+    """,
+    """
+    INSERT INTO category_score_counts (cohort_id, category_id, score, projects)
+    SELECT cohort_id, category_id, score, COUNT(*) FROM projects WHERE evaluation <> ''
+    GROUP BY cohort_id, category_id, score
+    """,
+)
+
+
+@dataclass(frozen=True)
+class Contribution:
+    cohort_id: int
+    category_id: str
+    score: int
+    evaluated: bool
+    likes: int
+
+
+def _contributions(rows: Iterable[Sequence[Any]]) -> Dict[int, Contribution]:
+    return {
+        row[0]: Contribution(int(row[1]), row[2] or "", int(row[3] or 0), bool(row[4]), int(row[5] or 0))
+        for row in rows
+    }
+
+
+def delta_statements(before: Dict[int, Contribution], after: Dict[int, Contribution]) -> List[Tuple[str, tuple]]:
+    """The upserts that move the aggregates from `before` to `after`, in a fixed (lock) order."""
+    stats: Dict[Tuple[int, str], List[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    scores: Counter = Counter()
+    for sign, contributions in ((-1, before), (1, after)):
+        for c in contributions.values():
+            totals = stats[(c.cohort_id, c.category_id)]
+            totals[0] += sign
+            totals[3] += sign * c.likes
+            if c.evaluated:
+                totals[1] += sign
+                totals[2] += sign * c.score
+                scores[(c.cohort_id, c.category_id, c.score)] += sign
+
+    statements = [(UPSERT_STATS_SQL, (*key, *totals))
+                  for key, totals in sorted(stats.items()) if any(totals)]
+    statements += [(UPSERT_SCORE_SQL, (*key, delta))
+                   for key, delta in sorted(scores.items()) if delta]
+    return statements
+
+
+@contextmanager
+def tracked(cursor, where: str, params: tuple):
+    """Applies the change the block makes to the projects matching `where` to the aggregates."""
+    cursor.execute(SNAPSHOT_SQL.format(where=where), params)
+    before = _contributions(cursor.fetchall())
+    yield
+    cursor.execute(SNAPSHOT_SQL.format(where=where), params)
+    after = _contributions(cursor.fetchall())
+    for sql, args in delta_statements(before, after):
+        cursor.execute(sql, args)
+
+
+def created(cursor, project_id: int) -> None:
+    """Adds the contribution of a project inserted in the current transaction."""
+    cursor.execute(SNAPSHOT_SQL.format(where="id = %s"), (project_id,))
+    for sql, args in delta_statements({}, _contributions(cursor.fetchall())):
+        cursor.execute(sql, args)
+
+
+@asynccontextmanager
+async def tracked_async(cursor, where: str, params: tuple):
+    """tracked() for an aiomysql cursor."""
+    await cursor.execute(SNAPSHOT_SQL.format(where=where), params)
+    before = _contributions(await cursor.fetchall())
+    yield
+    await cursor.execute(SNAPSHOT_SQL.format(where=where), params)
+    after = _contributions(await cursor.fetchall())
+    for sql, args in delta_statements(before, after):
+        await cursor.execute(sql, args)
+
+
+def recompute() -> int:
+    """Rebuilds both tables from projects in one transaction; returns the number of categories."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            for sql in RECOMPUTE_SQL:
+                cursor.execute(sql)
+            cursor.execute("SELECT COUNT(*) FROM category_stats")
+            categories = cursor.fetchone()[0]
+        connection.commit()
+        return categories
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def median_from_counts(counts: Sequence[Tuple[int, int]]) -> Optional[float]:
+    """Median of the scores given as (score, projects) pairs sorted by score."""
+    total = sum(n for _, n in counts)
+    if total <= 0:
+        return None
+    # positions (0-based) of the middle value(s)
+    wanted = sorted({(total - 1) // 2, total // 2})
+    values = []
+    seen = 0
+    for score, n in counts:
+        while wanted and wanted[0] < seen + n:
+            values.append(score)
+            wanted.pop(0)
+        seen += n
+    return sum(values) / len(values)
+
+
+def histogram(counts: Sequence[Tuple[int, int]], bucket: int = CATEGORY_STATS_BUCKET) -> List[Dict[str, int]]:
+    """Evaluated projects per score bin; the last bin includes MAX_SCORE."""
+    bins = [{"from": start, "to": min(start + bucket - 1, MAX_SCORE), "projects": 0}
+            for start in range(0, MAX_SCORE, bucket)]
+    bins[-1]["to"] = MAX_SCORE
+    for score, n in counts:
+        position = min(max(score, 0) // bucket, len(bins) - 1)
+        bins[position]["projects"] += n
+    return bins
+
+
+def summarize(category_id: Optional[str], totals: Sequence[int], counts: Sequence[Tuple[int, int]]) -> Dict[str, Any]:
+    projects, evaluated, score_sum, likes = totals
+    return {
+        "category": category_id,
+        "projects": projects,
+        "evaluated": evaluated,
+        "coverage": round(evaluated / projects, 4) if projects else 0.0,
+        "mean_score": round(score_sum / evaluated, 2) if evaluated else None,
+        "median_score": median_from_counts(counts),
+        "likes": likes,
+        "histogram": histogram(counts),
+    }
+
+
+def read_stats(cursor, cohort_id: int, category_id: Optional[str] = None) -> Dict[str, Any]:
+    where, params = "WHERE cohort_id = %s", (cohort_id,)
+    if category_id is not None:
+        where, params = where + " AND category_id = %s", params + (category_id,)
+    cursor.execute(
+        f"SELECT category_id, projects, evaluated, score_sum, likes FROM category_stats {where} "
+        "ORDER BY category_id", params)
+    totals = {row[0]: [int(v) for v in row[1:]] for row in cursor.fetchall()}
+    cursor.execute(
+        f"SELECT category_id, score, projects FROM category_score_counts {where} "
+        "AND projects > 0 ORDER BY category_id, score", params)
+    counts: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    overall: Counter = Counter()
+    for cat, score, n in cursor.fetchall():
+        counts[cat].append((int(score), int(n)))
+        overall[int(score)] += int(n)
+
+    categories = [summarize(cat, values, counts.get(cat, [])) for cat, values in totals.items() if values[0] > 0]
+    all_totals = [sum(values[i] for values in totals.values()) for i in range(4)]
+    return {"categories": categories, "global": summarize(None, all_totals, sorted(overall.items()))}
+
+
+@timed("db")
+def load_stats(cohort_id: int, category_id: Optional[str] = None) -> Dict[str, Any]:
+    """The stats of every category of a cohort (or one) and of all of them together."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            return read_stats(cursor, cohort_id, category_id)
+    finally:
+        connection.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Category statistics maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("recompute", help="Rebuild category_stats and category_score_counts from projects")
+    sub.add_parser("check", help="Compare the stored aggregates with a recompute (changes nothing)")
+    args = parser.parse_args(argv)
+
+    if args.command == "recompute":
+        print(f"recomputed the statistics of {recompute()} categories")
+        return 0
+
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT cohort_id FROM category_stats UNION SELECT DISTINCT cohort_id FROM projects")
+            cohort_ids = sorted(row[0] for row in cursor.fetchall())
+            stored = {cohort_id: read_stats(cursor, cohort_id) for cohort_id in cohort_ids}
+            # recomputed inside a transaction that is rolled back
+            for sql in RECOMPUTE_SQL:
+                cursor.execute(sql)
+            fresh = {cohort_id: read_stats(cursor, cohort_id) for cohort_id in cohort_ids}
+        connection.rollback()
+    finally:
+        connection.close()
+
+    stored_by_category = {(cohort_id, c["category"]): c
+                          for cohort_id, stats in stored.items() for c in stats["categories"]}
+    fresh_by_category = {(cohort_id, c["category"]): c
+                         for cohort_id, stats in fresh.items() for c in stats["categories"]}
+    differences = 0
+    for cohort_id, category_id in sorted(set(stored_by_category) | set(fresh_by_category)):
+        before = stored_by_category.get((cohort_id, category_id))
+        after = fresh_by_category.get((cohort_id, category_id))
+        if before != after:
+            differences += 1
+            print(f"cohort {cohort_id} {category_id}: stored {before} != recomputed {after}")
+    print(f"{differences} categories differ")
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
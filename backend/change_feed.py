@@ -0,0 +1,290 @@
+# change_feed.py
+"""
+Change feed: small deltas published by the write endpoints, so clients can
+patch what they show instead of reloading /projects, /getlikes or
+/getconversation after every action.
+
+    change_feed.publish("like_added", project_id, {"user": 3, "name": "Ana", "like_count": 5})
+
+appends a row to change_events. Its AUTO_INCREMENT id is the event id, so ids
+grow monotonically across every worker and a client resumes from the last id
+it saw (SSE Last-Event-ID, or ?after= when long polling).
+
+Each process runs one poller thread. It reads new rows with one indexed
+query every CHANGE_FEED_POLL_INTERVAL seconds, or at once after a local
+publish. It keeps the last CHANGE_FEED_BUFFER events in memory and wakes the
+waiting clients, so open streams do not add database load. Ids are taken at
+INSERT but rows only become visible at commit, so a later id can appear
+before an earlier one. The poller holds events back behind such a gap for up
+to CHANGE_FEED_GAP_GRACE seconds, because an id lost to a rollback never
+fills.
+
+Kinds: like_added, like_removed, comment_added, evaluation, relationships,
+project_updated, project_deleted.
+
+    CHANGE_FEED_POLL_INTERVAL=1       seconds between polls of change_events
+    CHANGE_FEED_BUFFER=2000           events kept in memory for resuming clients
+    CHANGE_FEED_GAP_GRACE=5           seconds to wait for a missing id
+    CHANGE_FEED_RETENTION_HOURS=48    older rows are deleted by the poller
+
+GET /rankingprojects/changes streams the events as Server-Sent Events when
+the client accepts text/event-stream. Otherwise it long-polls: it answers
+as soon as there are events after ?after=, or after ?timeout= seconds.
+
+    CHANGE_FEED_LONG_POLL_TIMEOUT=25  longest long poll
+    CHANGE_FEED_STREAM_SECONDS=300    an SSE stream is closed after this; the browser reconnects
+    CHANGE_FEED_HEARTBEAT=15          seconds between SSE keepalive comments
+"""
+from __future__ import annotations
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+import pymysql
+
+from database import db_config
+from request_timing import timed
+
+CHANGE_FEED_POLL_INTERVAL = float(os.getenv("CHANGE_FEED_POLL_INTERVAL", "1"))
+CHANGE_FEED_BUFFER = int(os.getenv("CHANGE_FEED_BUFFER", "2000"))
+CHANGE_FEED_GAP_GRACE = float(os.getenv("CHANGE_FEED_GAP_GRACE", "5"))
+CHANGE_FEED_RETENTION_HOURS = int(os.getenv("CHANGE_FEED_RETENTION_HOURS", "48"))
+CHANGE_FEED_LONG_POLL_TIMEOUT = float(os.getenv("CHANGE_FEED_LONG_POLL_TIMEOUT", "25"))
+CHANGE_FEED_STREAM_SECONDS = float(os.getenv("CHANGE_FEED_STREAM_SECONDS", "300"))
+CHANGE_FEED_HEARTBEAT = float(os.getenv("CHANGE_FEED_HEARTBEAT", "15"))
+
+# Rows read per query, by the poller and by clients catching up from the table
+READ_BATCH = 500
+PRUNE_INTERVAL = 3600
+SSE_RETRY_MS = 3000
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    id: int
+    kind: str
+    project_id: Optional[int]
+    data: Dict[str, Any]
+    created_at: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "kind": self.kind, "project": self.project_id,
+                "data": self.data, "at": self.created_at}
+
+
+def format_sse(event: ChangeEvent) -> str:
+    """One Server-Sent Events message; the id is what the browser sends back as Last-Event-ID."""
+    payload = json.dumps(event.to_dict(), ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {payload}\n\n"
+
+
+def _row_to_event(row) -> ChangeEvent:
+    event_id, kind, project_id, data, created_at = row
+    return ChangeEvent(int(event_id), kind, project_id, json.loads(data) if data else {},
+                       created_at.isoformat() if hasattr(created_at, "isoformat") else str(created_at))
+
+
+@timed("db")
+def read_events(after: int, limit: int = READ_BATCH, up_to: Optional[int] = None) -> List[ChangeEvent]:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            sql = "SELECT id, kind, project_id, data, created_at FROM change_events WHERE id > %s"
+            params: List[Any] = [after]
+            if up_to is not None:
+                sql += " AND id <= %s"
+                params.append(up_to)
+            cursor.execute(sql + " ORDER BY id LIMIT %s", (*params, limit))
+            return [_row_to_event(row) for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+def max_event_id() -> int:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM change_events")
+            return int(cursor.fetchone()[0])
+    finally:
+        connection.close()
+
+
+def prune_events(retention_hours: int = CHANGE_FEED_RETENTION_HOURS) -> int:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            deleted = cursor.execute(
+                "DELETE FROM change_events WHERE created_at < NOW() - INTERVAL %s HOUR LIMIT 10000",
+                (retention_hours,),
+            )
+        connection.commit()
+        return deleted
+    finally:
+        connection.close()
+
+
+class ChangeFeed:
+    def __init__(self, poll_interval: float = CHANGE_FEED_POLL_INTERVAL, buffer_size: int = CHANGE_FEED_BUFFER,
+                 gap_grace: float = CHANGE_FEED_GAP_GRACE):
+        self.poll_interval = poll_interval
+        self.gap_grace = gap_grace
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._events: Deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self._last_id = 0        # highest id handed to clients
+        self._gap_since: Optional[float] = None
+        self._waiters: List[Callable[[], None]] = []
+        self._poke = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pruned_at = 0.0
+
+    # ---- publishing
+
+    @timed("db")
+    def publish(self, kind: str, project_id: Optional[int] = None, data: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """
+        Records a change and returns its event id. Called after the write itself
+        succeeded; a failure here is logged and does not fail the request.
+        """
+        try:
+            connection = pymysql.connect(**db_config)
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO change_events (kind, project_id, data) VALUES (%s, %s, %s)",
+                        (kind, project_id, json.dumps(data or {}, ensure_ascii=False)),
+                    )
+                    event_id = cursor.lastrowid
+                connection.commit()
+            finally:
+                connection.close()
+        except Exception as e:
+            print("change_feed publish error:", repr(e))
+            return None
+        self._poke.set()
+        return event_id
+
+    # ---- polling
+
+    def start(self) -> None:
+        """Starts the poller on first use; events older than this are read from the table."""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._last_id = max_event_id()
+            self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._poke.wait(self.poll_interval)
+            self._poke.clear()
+            try:
+                self.poll()
+                if time.monotonic() - self._pruned_at > PRUNE_INTERVAL:
+                    self._pruned_at = time.monotonic()
+                    prune_events()
+            except Exception as e:
+                print("change_feed poll error:", repr(e))
+                time.sleep(self.poll_interval)
+
+    def poll(self) -> int:
+        """Reads committed events past the watermark and hands out the contiguous ones."""
+        staged = {event.id: event for event in read_events(self._last_id)}
+        delivered = 0
+        with self._lock:
+            while staged:
+                event = staged.pop(self._last_id + 1, None)
+                if event is None:
+                    # a smaller id is not committed yet (or was rolled back)
+                    now = time.monotonic()
+                    if self._gap_since is None:
+                        self._gap_since = now
+                    if now - self._gap_since < self.gap_grace:
+                        break
+                    event = staged.pop(min(staged))
+                self._gap_since = None
+                self._events.append(event)
+                self._last_id = event.id
+                delivered += 1
+            waiters, self._waiters = (self._waiters, []) if delivered else (None, self._waiters)
+        if waiters:
+            for wake in waiters:
+                wake()
+        return delivered
+
+    # ---- reading
+
+    def last_id(self) -> int:
+        self.start()
+        return self._last_id
+
+    def read(self, after: int, limit: int = READ_BATCH) -> List[ChangeEvent]:
+        """Events with id > after that have been handed out, oldest first."""
+        with self._lock:
+            last_id = self._last_id
+            if after >= last_id:
+                return []
+            if self._events and after >= self._events[0].id - 1:
+                return [event for event in self._events if event.id > after][:limit]
+        # older than the buffer: catch up from the table, never past the watermark
+        return read_events(after, limit, up_to=last_id)
+
+    def _subscribe(self, wake: Callable[[], None]) -> None:
+        with self._lock:
+            self._waiters.append(wake)
+
+    def _unsubscribe(self, wake: Callable[[], None]) -> None:
+        with self._lock:
+            if wake in self._waiters:
+                self._waiters.remove(wake)
+
+    def wait(self, after: int, timeout: float, limit: int = READ_BATCH) -> List[ChangeEvent]:
+        """Blocks the calling thread until there are events after `after` or `timeout` passes."""
+        self.start()
+        deadline = time.monotonic() + timeout
+        while True:
+            flag = threading.Event()
+            self._subscribe(flag.set)
+            try:
+                events = self.read(after, limit)
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events
+                flag.wait(remaining)
+            finally:
+                self._unsubscribe(flag.set)
+
+    async def wait_async(self, after: int, timeout: float, limit: int = READ_BATCH) -> List[ChangeEvent]:
+        """Same as wait(), on the running event loop."""
+        if self._thread is None:
+            await asyncio.to_thread(self.start)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            future = loop.create_future()
+
+            def wake():
+                loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+            self._subscribe(wake)
+            try:
+                events = await asyncio.to_thread(self.read, after, limit)
+                remaining = deadline - loop.time()
+                if events or remaining <= 0:
+                    return events
+                try:
+                    await asyncio.wait_for(future, remaining)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                self._unsubscribe(wake)
@@ -0,0 +1,161 @@
+# cohorts.py
+"""
+Cohorts: the programs that share one install.
+
+Users, projects and categories carry a cohort_id. Reads are scoped to one
+cohort and walk indexes that lead with cohort_id, so what a program pays for
+its project list, leaderboard, stats, graph and search depends on its own
+size, not on the size of the install. Response cache entries, search indexes
+and the relationship scheduler's candidate blocks are per cohort too.
+
+The cohort of a request:
+  - ?cohort=<id> on the public reads, "cohort" in the /findoutcategory body
+  - the owner's cohort (users.cohort_id) for /my/project; login returns it
+  - COHORT_DEFAULT when none is given
+
+Migration 011 puts every existing row in cohort 1. With many programs the
+projects table can also be LIST-partitioned by cohort (optional, see
+migration 012); `create` then adds the new cohort's partition.
+
+    python cohorts.py list
+    python cohorts.py create "Spring accelerator"
+    python cohorts.py partition        partitions projects by cohort (one partition per cohort)
+    python cohorts.py partitions       rows per partition
+
+    COHORT_DEFAULT=1
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+from typing import Any, List, Optional, Tuple
+
+import pymysql
+
+from database import db_config
+from request_timing import timed
+
+COHORT_DEFAULT = int(os.getenv("COHORT_DEFAULT", "1"))
+
+
+def parse_cohort(value: Any) -> int:
+    """The cohort id sent by a client; COHORT_DEFAULT when empty. Raises ValueError."""
+    if value is None or str(value).strip() == "":
+        return COHORT_DEFAULT
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        raise ValueError("cohort must be an integer") from None
+
+
+@timed("db")
+def cohort_exists(cohort_id: int) -> bool:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM cohorts WHERE id = %s", (cohort_id,))
+            return cursor.fetchone() is not None
+    finally:
+        connection.close()
+
+
+def list_cohorts() -> List[Tuple[int, str, int]]:
+    """(id, name, projects) of every cohort."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT id, name FROM cohorts ORDER BY id")
+            cohorts = cursor.fetchall()
+            cursor.execute("SELECT cohort_id, COUNT(*) FROM projects GROUP BY cohort_id")
+            projects = dict(cursor.fetchall())
+            return [(row[0], row[1], projects.get(row[0], 0)) for row in cohorts]
+    finally:
+        connection.close()
+
+
+def partition_names(cursor) -> List[Tuple[str, int]]:
+    """(partition, rows) of projects; empty when the table is not partitioned."""
+    cursor.execute(
+        "SELECT PARTITION_NAME, TABLE_ROWS FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'projects' AND PARTITION_NAME IS NOT NULL "
+        "ORDER BY PARTITION_ORDINAL_POSITION"
+    )
+    return [(row[0], row[1]) for row in cursor.fetchall()]
+
+
+def partition_sql(cohort_ids: List[int]) -> List[str]:
+    """
+    Statements that LIST-partition projects with one partition per cohort. The
+    partitioning column has to be part of every unique key, hence the primary
+    key (id, cohort_id); id stays AUTO_INCREMENT and unique.
+    """
+    partitions = ", ".join(f"PARTITION p{cohort_id} VALUES IN ({cohort_id})" for cohort_id in sorted(cohort_ids))
+    return [
+        "ALTER TABLE projects DROP PRIMARY KEY, ADD PRIMARY KEY (id, cohort_id)",
+        f"ALTER TABLE projects PARTITION BY LIST (cohort_id) ({partitions})",
+    ]
+
+
+def ensure_cohorts(cursor, cohort_ids) -> None:
+    """Adds a placeholder row for cohort ids that rows were loaded with but that have no cohort yet."""
+    cursor.executemany(
+        "INSERT IGNORE INTO cohorts (id, name) VALUES (%s, %s)",
+        [(cohort_id, f"Cohort {cohort_id}") for cohort_id in sorted(set(cohort_ids))]
+    )
+
+
+def create_cohort(name: str) -> int:
+    """Adds a cohort (and its partition when projects is partitioned); returns its id."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO cohorts (name) VALUES (%s)", (name,))
+            cohort_id = cursor.lastrowid
+            connection.commit()
+            if partition_names(cursor):
+                # DDL commits on its own; a cohort without its partition cannot take projects yet
+                cursor.execute(f"ALTER TABLE projects ADD PARTITION (PARTITION p{cohort_id} VALUES IN ({cohort_id}))")
+            return cohort_id
+    finally:
+        connection.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cohort maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Cohorts and their number of projects")
+    create = sub.add_parser("create", help="Add a cohort")
+    create.add_argument("name")
+    partition = sub.add_parser("partition", help="LIST-partition projects by cohort")
+    partition.add_argument("--print", action="store_true", help="Only print the statements")
+    sub.add_parser("partitions", help="Partitions of projects and their rows")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for cohort_id, name, projects in list_cohorts():
+            print(f"{cohort_id:>6}  {projects:>8} projects  {name}")
+        return 0
+    if args.command == "create":
+        print(f"created cohort {create_cohort(args.name)}")
+        return 0
+
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            if args.command == "partitions":
+                for partition_name, rows in partition_names(cursor):
+                    print(f"{partition_name:<12}{rows:>10} rows")
+                return 0
+            cursor.execute("SELECT id FROM cohorts UNION SELECT DISTINCT cohort_id FROM projects")
+            statements = partition_sql([row[0] for row in cursor.fetchall()])
+            for sql in statements:
+                print(sql + ";")
+                if not args.print:
+                    cursor.execute(sql)
+        return 0
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+# database.py
+import pymysql
+
+# Database configuration
+db_config = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'test'
+}
+
+def get_cache_version(name: str):
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT version FROM cache_versions WHERE name=%s", (name,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+    finally:
+        connection.close()
+
+def bump_cache_version(name: str):
+    """Tells every worker that the cached copy of `name` is outdated."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO cache_versions (name, version) VALUES (%s, 1) "
+                "ON DUPLICATE KEY UPDATE version=version+1",
+                (name,)
+            )
+        connection.commit()
+        return True
+    finally:
+        connection.close()
@@ -0,0 +1,212 @@
+# deadline.py
+"""
+End-to-end deadlines for the LLM operations.
+
+Each operation gets a time budget when it starts running (after admission):
+
+    @admission.admitted("evaluate")
+    @deadline.bounded("evaluate")
+    async def run_evaluation(...):
+
+The Deadline lives in a context variable, so it follows the request into the
+gathered downloads and into worker threads. Each stage below runs within its
+share of what is left at the time it starts:
+
+    await deadline.within("llm", llm_router.ainvoke(...))       asyncio.wait_for + client timeout
+    await deadline.to_thread("parse", parse_pdf_text, data)     asyncio.to_thread + wait_for
+    budget = deadline.stage_budget("download")                  seconds, for a client timeout
+
+A stage that starts with less than its minimum left, or that runs out of its
+share, raises DeadlineExceeded(stage, document) at once instead of holding a
+worker for a result nobody will wait for. A thread cannot be cancelled, so
+code running in one calls deadline.check() at safe points (between PDF pages)
+and stops there; the blocking LLM client gets the time left as its HTTP
+timeout (llm_models.ainvoke). deadline.gather() cancels the sibling downloads when one of
+them fails.
+
+The document being worked on is named with
+
+    with deadline.document("canvas"):
+        ...
+
+so the 504 response (and the log line) tell which document and which stage
+blew the budget.
+
+    DEADLINE_BUDGETS="evaluate=120,compare=180,find_category=60,translate_evaluation=30"
+    DEADLINE_DEFAULT=60               seconds, for operations not listed (0 disables deadlines)
+    DEADLINE_SHARES="download=0.4,parse=0.5"     fraction of the remaining time a stage may use (default 1)
+    DEADLINE_MIN_SECONDS="llm=2"      stages are not started with less than this left
+"""
+from __future__ import annotations
+import asyncio
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import request_timing
+
+
+def parse_seconds(spec: str) -> Dict[str, float]:
+    values = {}
+    for part in (spec or "").split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip():
+            values[name.strip()] = max(0.0, float(value))
+    return values
+
+
+DEADLINE_BUDGETS = parse_seconds(
+    os.getenv("DEADLINE_BUDGETS", "evaluate=120,compare=180,find_category=60,translate_evaluation=30")
+)
+DEADLINE_DEFAULT = float(os.getenv("DEADLINE_DEFAULT", "60"))
+DEADLINE_SHARES = parse_seconds(os.getenv("DEADLINE_SHARES", "download=0.4,parse=0.5"))
+DEADLINE_MIN_SECONDS = parse_seconds(os.getenv("DEADLINE_MIN_SECONDS", "llm=2"))
+
+
+class DeadlineExceeded(Exception):
+    """`stage` (on `document`, when there is one) could not finish within the operation's budget."""
+
+    def __init__(self, operation: str, stage: str, document: Optional[str], budget: float, elapsed: float):
+        where = f"{stage} of {document}" if document else stage
+        super().__init__(f"{operation}: {where} exceeded the {budget:g}s deadline")
+        self.operation = operation
+        self.stage = stage
+        self.document = document
+        self.budget = budget
+        self.elapsed = elapsed
+
+
+class Deadline:
+    def __init__(self, operation: str, seconds: float):
+        self.operation = operation
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.expires_at = self.started + seconds
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def exceeded(self, stage: str) -> DeadlineExceeded:
+        return DeadlineExceeded(self.operation, stage, _document.get(), self.seconds,
+                                round(time.monotonic() - self.started, 3))
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+_document: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("deadline_document", default=None)
+# when the stage running in a worker thread has to stop (see to_thread)
+_stage_expires: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline_stage", default=None)
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+def remaining() -> Optional[float]:
+    deadline = _current.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+def budget_for(operation: str) -> float:
+    return DEADLINE_BUDGETS.get(operation, DEADLINE_DEFAULT)
+
+
+def bounded(operation: str):
+    """Decorator for async operations: the wrapped coroutine runs under the budget of `operation`."""
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            seconds = budget_for(operation)
+            if seconds <= 0:
+                return await fn(*args, **kwargs)
+            token = _current.set(Deadline(operation, seconds))
+            try:
+                return await fn(*args, **kwargs)
+            except DeadlineExceeded as e:
+                request_timing.count("deadline_exceeded", 1)
+                print("deadline exceeded:", str(e), f"after {e.elapsed:.1f}s")
+                raise
+            finally:
+                _current.reset(token)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def document(name: Optional[str]):
+    """Names the document the stages inside the block work on, for DeadlineExceeded."""
+    token = _document.set(name)
+    try:
+        yield
+    finally:
+        _document.reset(token)
+
+
+def stage_budget(stage: str) -> Optional[float]:
+    """
+    Seconds `stage` may take: its share of what is left. None when there is no
+    deadline; raises DeadlineExceeded when less than the stage minimum is left.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return None
+    left = deadline.remaining()
+    if left <= max(DEADLINE_MIN_SECONDS.get(stage, 0.0), 0.0):
+        raise deadline.exceeded(stage)
+    return left * min(1.0, DEADLINE_SHARES.get(stage, 1.0))
+
+
+async def within(stage: str, awaitable: Awaitable[Any], budget: Optional[float] = None) -> Any:
+    """Awaits `awaitable` for at most the stage budget; cancels it and raises DeadlineExceeded past that."""
+    try:
+        if budget is None:
+            budget = stage_budget(stage)
+    except DeadlineExceeded:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise
+    if budget is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, budget)
+    except asyncio.TimeoutError:
+        deadline = _current.get()
+        if deadline is None:
+            raise
+        raise deadline.exceeded(stage) from None
+
+
+async def to_thread(stage: str, fn: Callable[..., Any], *args: Any) -> Any:
+    """asyncio.to_thread within the stage budget; fn calls check() to stop once the budget is spent."""
+    budget = stage_budget(stage)
+    if budget is None:
+        return await asyncio.to_thread(fn, *args)
+    # set before the thread copies the context
+    token = _stage_expires.set(time.monotonic() + budget)
+    try:
+        return await within(stage, asyncio.to_thread(fn, *args), budget)
+    finally:
+        _stage_expires.reset(token)
+
+
+def check(stage: str) -> None:
+    """For work running in a thread: raises DeadlineExceeded once its stage (or the deadline) is out of time."""
+    deadline = _current.get()
+    if deadline is None:
+        return
+    expires_at = _stage_expires.get() or deadline.expires_at
+    if time.monotonic() >= expires_at:
+        raise deadline.exceeded(stage)
+
+
+async def gather(*awaitables: Awaitable[Any]) -> list:
+    """asyncio.gather that cancels the other awaitables as soon as one fails."""
+    tasks = [asyncio.ensure_future(a) for a in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
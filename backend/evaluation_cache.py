@@ -0,0 +1,183 @@
+# evaluation_cache.py
+"""
+Language-independent evaluations.
+
+The rubric assessment runs once, in EVALUATION_CANONICAL_LANG and from a prompt
+the server builds itself (prompt_builder.default_evaluate_prompt), so the UI
+language never reaches it. Its result - score, per-criterion scores and the
+texts - is stored in evaluation_results under
+
+    evaluation_hash = sha256(schema version, model, canonical query)
+
+and evaluating the same documents again, from any language, reuses it.
+
+What users read is a rendering: the canonical texts translated into their
+language by the cheap "translate_evaluation" chain (LLM_TRANSLATION_MODEL),
+stored in evaluation_renderings once per (evaluation_hash, lang). Scores are
+copied from the canonical result and never go through the translation, so
+they are the same in every language.
+
+    EVALUATION_CANONICAL_LANG=en
+    EVALUATION_CACHE=1      0 runs the assessment on every request (translations stay cached)
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import pymysql
+
+from database import db_config
+from prompt_builder import normalize_lang
+from request_timing import timed
+
+EVALUATION_CANONICAL_LANG = normalize_lang(os.getenv("EVALUATION_CANONICAL_LANG", "en"))
+EVALUATION_CACHE = os.getenv("EVALUATION_CACHE", "1") != "0"
+
+# Bump when the evaluation schema or the canonical prompt changes meaning
+EVALUATION_SCHEMA_VERSION = 2
+
+TEXT_LISTS = ("strengths", "weaknesses", "recommendations")
+
+
+def evaluation_hash(query: str, model: str) -> str:
+    """Identity of a canonical evaluation: everything the assessment depends on."""
+    digest = hashlib.sha256()
+    for part in (str(EVALUATION_SCHEMA_VERSION), model, query):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def clamp_score(value: Any) -> int:
+    try:
+        return max(0, min(100, int(value)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The LLM output with the score and every criterion score as ints in 0-100, lists as lists."""
+    result = dict(result or {})
+    result["score"] = clamp_score(result.get("score"))
+    result["evaluation"] = str(result.get("evaluation") or "")
+    for key in TEXT_LISTS:
+        result[key] = [str(item) for item in result.get(key) or [] if item]
+    criteria = []
+    for item in result.get("criteria") or []:
+        if isinstance(item, dict):
+            criteria.append({
+                "name": str(item.get("name") or ""),
+                "score": clamp_score(item.get("score")),
+                "comment": str(item.get("comment") or ""),
+            })
+    result["criteria"] = criteria
+    return result
+
+
+def translatable_texts(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a canonical result that are language dependent (no scores)."""
+    return {
+        "evaluation": result.get("evaluation", ""),
+        **{key: list(result.get(key) or []) for key in TEXT_LISTS},
+        "criteria": [{"name": c["name"], "comment": c["comment"]} for c in result.get("criteria") or []],
+    }
+
+
+def render(result: Dict[str, Any], texts: Optional[Dict[str, Any]], lang: str, input_hash: str) -> Dict[str, Any]:
+    """
+    The canonical result with its texts replaced by `texts` (a translation, or
+    None for the canonical language). Anything the translation mangled, e.g. a
+    list of the wrong length, falls back to the canonical text.
+    """
+    texts = texts or {}
+    rendered = {"score": result["score"]}
+    evaluation = texts.get("evaluation")
+    rendered["evaluation"] = evaluation if isinstance(evaluation, str) and evaluation else result["evaluation"]
+    for key in TEXT_LISTS:
+        items = texts.get(key)
+        rendered[key] = [str(i) for i in items] if _same_length(items, result[key]) else list(result[key])
+
+    translated = texts.get("criteria")
+    if not _same_length(translated, result["criteria"]):
+        translated = None
+    criteria: List[Dict[str, Any]] = []
+    for position, criterion in enumerate(result["criteria"]):
+        item = translated[position] if translated and isinstance(translated[position], dict) else {}
+        criteria.append({
+            "name": str(item.get("name") or criterion["name"]),
+            "score": criterion["score"],
+            "comment": str(item.get("comment") or criterion["comment"]),
+        })
+    rendered["criteria"] = criteria
+    rendered["lang"] = lang
+    rendered["evaluation_hash"] = input_hash
+    return rendered
+
+
+def _same_length(items: Any, reference: List[Any]) -> bool:
+    return isinstance(items, list) and len(items) == len(reference)
+
+
+@timed("db")
+def load_result(input_hash: str) -> Optional[Dict[str, Any]]:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT result FROM evaluation_results WHERE evaluation_hash = %s", (input_hash,))
+            row = cursor.fetchone()
+            return json.loads(row[0]) if row else None
+    finally:
+        connection.close()
+
+
+@timed("db")
+def save_result(input_hash: str, result: Dict[str, Any], model: str) -> None:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO evaluation_results (evaluation_hash, score, result, model)
+                VALUES (%s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE score = VALUES(score), result = VALUES(result), model = VALUES(model)
+                """,
+                (input_hash, result["score"], json.dumps(result, ensure_ascii=False), model[:100]),
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+@timed("db")
+def load_rendering(input_hash: str, lang: str) -> Optional[Dict[str, Any]]:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT rendering FROM evaluation_renderings WHERE evaluation_hash = %s AND lang = %s",
+                (input_hash, lang),
+            )
+            row = cursor.fetchone()
+            return json.loads(row[0]) if row else None
+    finally:
+        connection.close()
+
+
+@timed("db")
+def save_rendering(input_hash: str, lang: str, rendering: Dict[str, Any]) -> None:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO evaluation_renderings (evaluation_hash, lang, rendering)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE rendering = VALUES(rendering)
+                """,
+                (input_hash, lang, json.dumps(rendering, ensure_ascii=False)),
+            )
+        connection.commit()
+    finally:
+        connection.close()
@@ -0,0 +1,83 @@
+# json_codec.py
+from __future__ import annotations
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional dependency, stdlib json is the fallback
+    orjson = None
+
+
+def _json_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def _json_loads(data: Any) -> Any:
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def _orjson_dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_loads(data: Any) -> Any:
+    return orjson.loads(data)
+
+
+SERIALIZERS: Dict[str, Tuple[Callable[..., bytes], Callable[[Any], Any]]] = {
+    "json": (_json_dumps, _json_loads),
+}
+if orjson is not None:
+    SERIALIZERS["orjson"] = (_orjson_dumps, _orjson_loads)
+
+_active = "json"
+
+
+def set_serializer(name: str) -> str:
+    """Selects the serializer by name; unknown or unavailable names fall back to stdlib json."""
+    global _active
+    _active = name if name in SERIALIZERS else "json"
+    return _active
+
+
+def get_serializer() -> str:
+    return _active
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Compact UTF-8 JSON bytes."""
+    return SERIALIZERS[_active][0](obj, default)
+
+
+def dumps_text(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    return dumps(obj, default).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    return SERIALIZERS[_active][1](data)
+
+
+def parse_json_column(value: Any, default: Any = None) -> Any:
+    """
+    Decodes a JSON text column (str or bytes) in one pass.
+    bytes are handed to the parser as-is (it validates UTF-8 itself); only if
+    that fails is the blob re-decoded as latin-1, the charset of the tables.
+    """
+    if value is None or value == "" or value == b"":
+        return default
+    try:
+        return loads(value)
+    except (ValueError, UnicodeDecodeError):
+        if isinstance(value, bytes):
+            try:
+                return loads(value.decode("latin-1"))
+            except ValueError:
+                return default
+        return default
+
+
+set_serializer(os.getenv("JSON_SERIALIZER", "orjson"))
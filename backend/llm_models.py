@@ -0,0 +1,203 @@
+# llm_models.py
+"""
+Model registry and lazily built LangChain chains.
+
+The backend is chosen by configuration instead of commented-out lines:
+
+    LLM_BACKEND=openai      ChatOpenAI (default, LLM_MODEL=gpt-5-mini)
+    LLM_BACKEND=openrouter  ChatOpenAI against OpenRouter (OPENROUTER_API_KEY)
+    LLM_BACKEND=ollama      ChatOllama (LLM_BASE_URL, OLLAMA_NUM_CTX)
+
+langchain and the provider SDKs are only imported when the first chain is
+requested, so importing the web app stays fast. Set LLM_WARMUP=1 to build
+the chains in a background thread right after startup instead
+(ModelRouter.warm_up).
+
+Chains listed in CHAIN_MODELS run on another model of the same backend, e.g.
+LLM_TRANSLATION_MODEL=gpt-5-nano for the evaluation translations. Models
+and chains can also be asked for on another backend (get_model(model,
+backend, base_url)); model_router.py uses that to spread one chain over
+several providers.
+
+Under Flask the blocking client runs in a worker thread, which cannot be
+cancelled when a deadline (deadline.py) runs out, so ainvoke() gives the
+provider call the time that is left as its HTTP timeout: the thread, and
+with it the Flask worker, is freed when the budget is spent. The providers'
+own retries are off by default (LLM_MAX_RETRIES=0), because each retry
+would get the whole timeout again; model_router retries failed calls on
+the next route instead.
+"""
+from __future__ import annotations
+import asyncio
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-5-mini")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "1"))
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") or None
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "8192"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "0"))
+LLM_TRANSLATION_MODEL = os.getenv("LLM_TRANSLATION_MODEL") or LLM_MODEL
+
+# chain name -> model, for chains that do not need the main model
+CHAIN_MODELS: Dict[str, str] = {
+    "translate_evaluation": LLM_TRANSLATION_MODEL,
+}
+
+# Set by asgi_app: one long-lived event loop, so the provider's async client can
+# be shared. Flask runs every async view on a fresh loop, where a cached async
+# client would stay bound to an already closed loop; there the blocking client
+# runs in a worker thread instead.
+ASYNC_CLIENTS = False
+
+
+def _openai(model: str, temperature: float, base_url: Optional[str]):
+    from langchain_openai import ChatOpenAI
+    if base_url:
+        return ChatOpenAI(model=model, temperature=temperature, base_url=base_url, max_retries=LLM_MAX_RETRIES)
+    return ChatOpenAI(model=model, temperature=temperature, max_retries=LLM_MAX_RETRIES)
+
+
+def _openrouter(model: str, temperature: float, base_url: Optional[str]):
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        api_key=os.getenv("OPENROUTER_API_KEY"),
+        base_url=base_url or "https://openrouter.ai/api/v1",
+        model=model,
+        temperature=temperature,
+        max_retries=LLM_MAX_RETRIES,
+        default_headers={"HTTP-Referer": "https://www.workflowsimulator.com", "X-Title": "Ranking Projects"},
+    )
+
+
+def _ollama(model: str, temperature: float, base_url: Optional[str], timeout: Optional[float] = None):
+    from langchain_ollama import ChatOllama
+    return ChatOllama(model=model, base_url=base_url, temperature=temperature, num_ctx=OLLAMA_NUM_CTX,
+                      client_kwargs={"timeout": timeout} if timeout is not None else {})
+
+
+def _openai_timeout(instance, seconds: float):
+    # the openai SDK takes a timeout per request
+    return instance.bind(timeout=seconds)
+
+
+def _ollama_timeout(instance, seconds: float):
+    # the ollama client only has a client-wide timeout: a short-lived copy of the model
+    return _ollama(instance.model, instance.temperature, instance.base_url, seconds)
+
+
+# name -> factory(model, temperature, base_url) returning a LangChain chat model
+MODEL_REGISTRY: Dict[str, Callable[[str, float, Optional[str]], Any]] = {
+    "openai": _openai,
+    "openrouter": _openrouter,
+    "ollama": _ollama,
+}
+
+# name -> binder(model instance, seconds) returning the model with that request timeout
+TIMEOUT_BINDERS: Dict[str, Callable[[Any, float], Any]] = {
+    "openai": _openai_timeout,
+    "openrouter": _openai_timeout,
+    "ollama": _ollama_timeout,
+}
+
+_lock = threading.Lock()
+_models: Dict[Tuple[str, str, Optional[str]], Any] = {}
+_chains: Dict[Tuple[str, str, str, Optional[str]], Any] = {}
+# id(model instance) -> backend, to find the timeout binder of a chain's model
+_model_backends: Dict[int, str] = {}
+
+
+def register_backend(name: str, factory: Callable[[str, float, Optional[str]], Any],
+                     bind_timeout: Optional[Callable[[Any, float], Any]] = None) -> None:
+    """A backend without `bind_timeout` runs its calls without a deadline-derived timeout."""
+    MODEL_REGISTRY[name] = factory
+    if bind_timeout is not None:
+        TIMEOUT_BINDERS[name] = bind_timeout
+    else:
+        TIMEOUT_BINDERS.pop(name, None)
+
+
+def get_model(model: Optional[str] = None, backend: Optional[str] = None, base_url: Optional[str] = None):
+    """
+    The configured chat model, or `model` of the same backend, or of another
+    `backend` (at `base_url`); created on first use.
+    """
+    model = model or LLM_MODEL
+    if backend is None:
+        backend, base_url = LLM_BACKEND, base_url or LLM_BASE_URL
+    key = (backend, model, base_url)
+    instance = _models.get(key)
+    if instance is None:
+        with _lock:
+            instance = _models.get(key)
+            if instance is None:
+                if backend not in MODEL_REGISTRY:
+                    raise RuntimeError(f"Unknown LLM backend: {backend} (known: {', '.join(MODEL_REGISTRY)})")
+                instance = _models[key] = MODEL_REGISTRY[backend](model, LLM_TEMPERATURE, base_url)
+                _model_backends[id(instance)] = backend
+    return instance
+
+
+def chain_model(name: str) -> str:
+    """The model the chain `name` runs on."""
+    return CHAIN_MODELS.get(name, LLM_MODEL)
+
+
+def build_json_chain(schema: Type, model: Optional[str] = None, backend: Optional[str] = None,
+                     base_url: Optional[str] = None) -> Any:
+    """prompt | model | JSON parser, with the format instructions taken from the pydantic schema."""
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.prompts.prompt import PromptTemplate
+
+    parser = JsonOutputParser(pydantic_object=schema)
+    prompt = PromptTemplate(
+        template="\n{format_instructions}\n\n{query}\n",
+        input_variables=["query"],
+        partial_variables={"format_instructions": parser.get_format_instructions()},
+    )
+    return prompt | get_model(model, backend, base_url) | parser
+
+
+def get_chain(name: str, schema: Type, model: Optional[str] = None, backend: Optional[str] = None,
+              base_url: Optional[str] = None) -> Any:
+    """The chain registered under `name` (on the given model/backend), built once per process."""
+    model = model or chain_model(name)
+    if backend is None:
+        backend, base_url = LLM_BACKEND, base_url or LLM_BASE_URL
+    key = (name, backend, model, base_url)
+    chain = _chains.get(key)
+    if chain is None:
+        get_model(model, backend, base_url)  # create the model first: it takes the same (non-reentrant) lock
+        with _lock:
+            chain = _chains.get(key)
+            if chain is None:
+                chain = build_json_chain(schema, model, backend, base_url)
+                _chains[key] = chain
+    return chain
+
+
+def with_timeout(chain: Any, seconds: float) -> Any:
+    """`chain` with the HTTP timeout of its model call set to `seconds`."""
+    from langchain_core.runnables import RunnableSequence
+
+    steps = []
+    for step in chain.steps:
+        binder = TIMEOUT_BINDERS.get(_model_backends.get(id(step)))
+        steps.append(binder(step, seconds) if binder is not None else step)
+    return RunnableSequence(*steps)
+
+
+async def ainvoke(chain: Any, inputs: Dict[str, Any], timeout: Optional[float] = None) -> Any:
+    """
+    Runs a chain from async code, in whichever way is safe for the serving
+    mode. `timeout` (seconds) bounds the provider call in the worker thread,
+    which cancelling the awaiting task cannot stop; on the shared event loop
+    cancelling is enough.
+    """
+    if ASYNC_CLIENTS:
+        return await chain.ainvoke(inputs)
+    if timeout is not None:
+        chain = with_timeout(chain, max(0.001, timeout))
+    return await asyncio.to_thread(chain.invoke, inputs)
@@ -0,0 +1,312 @@
+# model_router.py
+"""
+Routes each LLM chain over one or more backend/model pairs ("routes"), using
+the latency and error rate each route shows live in this process.
+
+Without configuration a chain has a single route, the configured backend
+and chain_model() (llm_models), and behaves exactly as before. More routes
+for a chain are listed in order of preference:
+
+    LLM_ROUTES_FIND_CATEGORY="openai:gpt-5-nano, ollama:qwen2.5:7b@http://gpu-box:11434"
+    LLM_ROUTES_EVALUATION="openai:gpt-5-mini, openrouter:openai/gpt-5-mini"
+
+Every route listed for a chain is considered adequate for it. How a route is picked:
+
+    ordered   the first healthy route; the others serve failover and hedges (default)
+    fastest   the healthy route with the lowest expected latency, i.e. its EWMA
+              latency divided by its EWMA success rate (routes never tried go first)
+
+    LLM_ROUTE_POLICIES="find_category=fastest,translate_evaluation=fastest"
+
+A route that fails LLM_ROUTER_MAX_FAILURES times in a row is skipped for
+LLM_ROUTER_COOLDOWN seconds. A failed call (provider error or output that
+does not parse) is retried once on the next route (LLM_ROUTER_MAX_ATTEMPTS
+routes per call).
+
+Hedging: for the chains in LLM_HEDGE_CHAINS, when the first route has not
+answered after the p95 latency of the chain's quickest route
+(LLM_HEDGE_PERCENTILE over each route's last calls; LLM_HEDGE_INITIAL_DELAY
+seconds until a route has LLM_HEDGE_MIN_SAMPLES), the same call is also
+sent to the next route and the first valid answer wins; the other call is
+cancelled. Hedging needs the async clients of the ASGI mode: under Flask a
+call runs in a worker thread that cannot be cancelled, and the view would
+wait for the slower call too, so there LLM_HEDGE_CHAINS is ignored. While the routes are healthy about one call in twenty is hedged;
+when one provider slows down, its calls are the ones that get hedged.
+"fastest" with hedging is the combination that keeps p99 down
+(benchmarks/bench_router.py).
+
+    LLM_ROUTER_EWMA_ALPHA=0.2
+    LLM_ROUTER_MAX_FAILURES=3
+    LLM_ROUTER_COOLDOWN=30
+    LLM_ROUTER_MAX_ATTEMPTS=2
+    LLM_ROUTER_EXPLORE=0.05       share of "fastest" calls sent to a random route to refresh its latency
+    LLM_HEDGE_CHAINS=             e.g. "find_category,translate_evaluation"
+    LLM_HEDGE_PERCENTILE=95
+    LLM_HEDGE_MIN_SAMPLES=20
+    LLM_HEDGE_INITIAL_DELAY=10
+"""
+from __future__ import annotations
+import asyncio
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Type
+
+import deadline
+import llm_models
+from request_timing import count
+
+LLM_ROUTE_POLICIES = os.getenv("LLM_ROUTE_POLICIES", "find_category=fastest,translate_evaluation=fastest")
+LLM_ROUTER_EWMA_ALPHA = float(os.getenv("LLM_ROUTER_EWMA_ALPHA", "0.2"))
+LLM_ROUTER_MAX_FAILURES = int(os.getenv("LLM_ROUTER_MAX_FAILURES", "3"))
+LLM_ROUTER_COOLDOWN = float(os.getenv("LLM_ROUTER_COOLDOWN", "30"))
+LLM_ROUTER_MAX_ATTEMPTS = int(os.getenv("LLM_ROUTER_MAX_ATTEMPTS", "2"))
+LLM_ROUTER_EXPLORE = float(os.getenv("LLM_ROUTER_EXPLORE", "0.05"))
+LLM_HEDGE_CHAINS = {c.strip() for c in os.getenv("LLM_HEDGE_CHAINS", "").split(",") if c.strip()}
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_INITIAL_DELAY = float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "10"))
+
+POLICIES = ("ordered", "fastest")
+# Latencies kept per route for the hedge percentile
+LATENCY_WINDOW = 200
+
+
+@dataclass(frozen=True)
+class Route:
+    backend: str
+    model: str
+    base_url: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.backend}/{self.model}"
+
+
+def parse_routes(spec: str) -> List[Route]:
+    """'backend:model[@base_url], ...'; the model may contain ':' (ollama tags)."""
+    routes = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        backend, sep, rest = item.partition(":")
+        if not sep or not rest:
+            raise ValueError(f"Bad LLM route {item!r}, expected backend:model[@base_url]")
+        model, _, base_url = rest.partition("@")
+        routes.append(Route(backend.strip(), model.strip(), base_url.strip() or None))
+    return routes
+
+
+def parse_policies(spec: str) -> Dict[str, str]:
+    policies = {}
+    for item in spec.split(","):
+        name, sep, policy = item.partition("=")
+        if sep and name.strip():
+            if policy.strip() not in POLICIES:
+                raise ValueError(f"Unknown route policy {policy!r} (known: {', '.join(POLICIES)})")
+            policies[name.strip()] = policy.strip()
+    return policies
+
+
+def configured_routes(name: str) -> List[Route]:
+    spec = os.getenv(f"LLM_ROUTES_{name.upper()}")
+    if spec:
+        return parse_routes(spec)
+    return [Route(llm_models.LLM_BACKEND, llm_models.chain_model(name), llm_models.LLM_BASE_URL)]
+
+
+class RouteStats:
+    def __init__(self):
+        self.latency: Optional[float] = None   # EWMA seconds of successful calls
+        self.error_rate = 0.0                  # EWMA of failures (0..1)
+        self.samples: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.skip_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.hedges = 0
+        self.wins = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        alpha = LLM_ROUTER_EWMA_ALPHA
+        self.calls += 1
+        self.error_rate += alpha * ((0.0 if ok else 1.0) - self.error_rate)
+        if ok:
+            self.latency = seconds if self.latency is None else self.latency + alpha * (seconds - self.latency)
+            self.samples.append(seconds)
+            self.consecutive_failures = 0
+            return
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= LLM_ROUTER_MAX_FAILURES:
+            self.skip_until = time.monotonic() + LLM_ROUTER_COOLDOWN
+
+    def available(self, now: float) -> bool:
+        return now >= self.skip_until
+
+    def expected_latency(self) -> float:
+        if self.latency is None:
+            return 0.0
+        return self.latency / max(0.1, 1.0 - self.error_rate)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if len(self.samples) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        p95 = self.percentile(95)
+        return {
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "calls": self.calls,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "wins": self.wins,
+            "skipped": self.skip_until > time.monotonic(),
+        }
+
+
+class ModelRouter:
+    def __init__(self, schemas: Dict[str, Type], routes: Optional[Dict[str, List[Route]]] = None,
+                 policies: Optional[Dict[str, str]] = None, hedged: Optional[set] = None):
+        self.schemas = schemas
+        self.routes = {name: (routes or {}).get(name) or configured_routes(name) for name in schemas}
+        self.policies = parse_policies(LLM_ROUTE_POLICIES) if policies is None else dict(policies)
+        self.hedged = set(LLM_HEDGE_CHAINS if hedged is None else hedged)
+        self._lock = threading.Lock()
+        self._stats: Dict[tuple, RouteStats] = {
+            (name, route): RouteStats() for name, routes in self.routes.items() for route in routes
+        }
+
+    def route_label(self, name: str) -> str:
+        """Identity of what may answer chain `name`, e.g. for keys of cached results."""
+        return ",".join(route.label for route in self.routes[name])
+
+    def candidates(self, name: str) -> List[Route]:
+        """The routes of chain `name` in the order this call should try them."""
+        routes = self.routes[name]
+        now = time.monotonic()
+        with self._lock:
+            healthy = [r for r in routes if self._stats[(name, r)].available(now)]
+            skipped = [r for r in routes if r not in healthy]
+            if self.policies.get(name, "ordered") == "fastest" and len(healthy) > 1:
+                if random.random() < LLM_ROUTER_EXPLORE:
+                    random.shuffle(healthy)
+                else:
+                    healthy.sort(key=lambda r: self._stats[(name, r)].expected_latency())
+        # routes in their cooldown are still the last resort
+        return healthy + skipped
+
+    def hedge_delay(self, name: str) -> float:
+        """
+        The lowest p95 among the chain's routes: a route whose own p95 has
+        degraded gets hedged at what another route usually answers in.
+        """
+        with self._lock:
+            delays = [self._stats[(name, route)].percentile(LLM_HEDGE_PERCENTILE) for route in self.routes[name]]
+        delays = [delay for delay in delays if delay is not None]
+        return min(delays) if delays else LLM_HEDGE_INITIAL_DELAY
+
+    def _record(self, name: str, route: Route, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._stats[(name, route)].record(seconds, ok)
+
+    async def _call(self, name: str, route: Route, inputs: Dict[str, Any]) -> Any:
+        chain = llm_models.get_chain(name, self.schemas[name], route.model, route.backend, route.base_url)
+        started = time.perf_counter()
+        try:
+            # under Flask the call runs in a thread: the client timeout is what stops it at the deadline
+            result = await llm_models.ainvoke(chain, inputs, deadline.remaining())
+            if not isinstance(result, dict):
+                raise ValueError(f"{route.label} returned no JSON object")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._record(name, route, time.perf_counter() - started, False)
+            raise
+        self._record(name, route, time.perf_counter() - started, True)
+        return result
+
+    async def ainvoke(self, name: str, inputs: Dict[str, Any]) -> Any:
+        """Runs chain `name` on the best route, with failover and (if enabled) a hedge."""
+        candidates = self.candidates(name)
+        max_launches = min(len(candidates), max(1, LLM_ROUTER_MAX_ATTEMPTS))
+        # a losing call in a worker thread (Flask) cannot be cancelled and would hold the view
+        hedge = name in self.hedged and max_launches > 1 and llm_models.ASYNC_CLIENTS
+        pending: Dict[asyncio.Future, Route] = {}
+        launched = 0
+        error: Optional[BaseException] = None
+
+        def launch():
+            nonlocal launched
+            route = candidates[launched]
+            pending[asyncio.ensure_future(self._call(name, route, inputs))] = route
+            launched += 1
+
+        launch()
+        hedge_at = time.monotonic() + self.hedge_delay(name) if hedge else None
+        try:
+            while pending:
+                timeout = None
+                if hedge_at is not None and launched < max_launches:
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # the first route is slower than its p95: ask the next one too
+                    with self._lock:
+                        self._stats[(name, candidates[0])].hedges += 1
+                    count("llm_hedge", 1)
+                    hedge_at = None
+                    launch()
+                    continue
+                for task in done:
+                    route = pending.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        print(f"model_router {name} {route.label} error:", repr(error))
+                        continue
+                    if launched > 1:
+                        with self._lock:
+                            self._stats[(name, route)].wins += 1
+                    return task.result()
+                if not pending and launched < max_launches:
+                    count("llm_failover", 1)
+                    hedge_at = None
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "policy": self.policies.get(name, "ordered"),
+                    "hedged": name in self.hedged and llm_models.ASYNC_CLIENTS,
+                    "routes": {route.label: self._stats[(name, route)].to_dict() for route in routes},
+                }
+                for name, routes in self.routes.items()
+            }
+
+    def warm_up(self) -> threading.Thread:
+        """Builds every route's chain in a daemon thread so the first request does not pay for it."""
+        def job():
+            try:
+                for name, routes in self.routes.items():
+                    for route in routes:
+                        llm_models.get_chain(name, self.schemas[name], route.model, route.backend, route.base_url)
+            except Exception as e:
+                print("model_router warm_up error:", repr(e))
+
+        thread = threading.Thread(target=job, name="llm-warmup", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,109 @@
+# password_hashing.py
+"""
+bcrypt off the request thread.
+
+Hashes run on a small dedicated pool (bcrypt releases the GIL, so the pool
+really runs in parallel) and the number of waiting jobs is bounded: when a
+login burst exceeds BCRYPT_MAX_PENDING, callers get HashingBusy at once
+instead of queuing behind hundreds of 250 ms hashes. A job that is still
+queued after BCRYPT_WAIT_TIMEOUT seconds also ends in HashingBusy.
+"""
+from __future__ import annotations
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Optional
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+BCRYPT_WAIT_TIMEOUT = float(os.getenv("BCRYPT_WAIT_TIMEOUT", "10"))
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full; retry_after is a hint in seconds."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_pending = threading.BoundedSemaphore(BCRYPT_MAX_PENDING)
+
+
+def _submit(fn: Callable, *args):
+    if not _pending.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        future = _executor.submit(fn, *args)
+    except Exception:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return future
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def _check(password: str, pw_hash: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), pw_hash.encode("utf-8"))
+    except ValueError:
+        # malformed hash in the database
+        return False
+
+
+def _wait(future):
+    try:
+        return future.result(timeout=BCRYPT_WAIT_TIMEOUT)
+    except FutureTimeout:
+        # Free the slot now if the job has not started; a running hash finishes on its own
+        future.cancel()
+        raise HashingBusy(max(1, int(BCRYPT_WAIT_TIMEOUT))) from None
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    return _wait(_submit(_hash, password, rounds or BCRYPT_ROUNDS))
+
+
+def check_password(password: str, pw_hash: str) -> bool:
+    return _wait(_submit(_check, password, pw_hash))
+
+
+def hash_rounds(pw_hash: str) -> Optional[int]:
+    """Cost factor of a "$2b$12$..." hash, None if it cannot be read."""
+    parts = (pw_hash or "").split("$")
+    if len(parts) < 4:
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+def needs_rehash(pw_hash: str) -> bool:
+    return hash_rounds(pw_hash) != BCRYPT_ROUNDS
+
+
+def rehash_in_background(password: str, on_done: Callable[[str], None]) -> bool:
+    """
+    Hashes `password` with the current cost on the pool and hands the new hash
+    to `on_done`, without making the caller wait. Returns False when the pool
+    is busy (the rehash simply happens on a later login).
+    """
+    def job():
+        try:
+            on_done(_hash(password, BCRYPT_ROUNDS))
+        except Exception as e:
+            print("rehash_in_background error:", repr(e))
+
+    try:
+        _submit(job)
+        return True
+    except HashingBusy:
+        return False
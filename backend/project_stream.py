@@ -0,0 +1,112 @@
+# project_stream.py
+"""
+The /projects list of a cohort read row by row.
+
+    for chunk in iter_projects_json(cohort_id):     "[", {...},{...}, ..., "]" in ~64 KB chunks
+    for line in iter_projects_ndjson(cohort_id):    one project per line
+
+Rows come from an unbuffered server-side cursor (SSCursor) and are encoded as
+they arrive, so the Python process holds one fetch batch and one output chunk
+at a time instead of every row, every dict and the whole JSON text. The rows
+are read in id order along the (cohort_id, id) index.
+
+The JSON array is byte-for-byte what the cached /projects response contains;
+GET /rankingprojects/projects?stream=1 sends it without building it first and
+?format=ndjson (or Accept: application/x-ndjson) sends NDJSON. A server-side
+cursor keeps its connection busy until the last row is read, and MySQL drops
+it after net_write_timeout (60s) if the client stops reading; clients that
+read slowly should use the cached response.
+
+    PROJECTS_STREAMING=0        1 streams GET /projects by default (no response cache)
+    PROJECTS_STREAM_BATCH=500   rows per fetchmany()
+    PROJECTS_STREAM_CHUNK=65536 characters per chunk of the JSON array
+"""
+from __future__ import annotations
+import os
+from typing import Any, Dict, Iterator, Sequence
+
+import pymysql
+import pymysql.cursors
+
+import json_codec
+from database import db_config
+
+PROJECTS_STREAMING = os.getenv("PROJECTS_STREAMING", "0") == "1"
+PROJECTS_STREAM_BATCH = int(os.getenv("PROJECTS_STREAM_BATCH", "500"))
+PROJECTS_STREAM_CHUNK = int(os.getenv("PROJECTS_STREAM_CHUNK", "65536"))
+
+# Only what the list shows; created_at, like_count and the *_at columns are not sent
+PROJECT_LIST_COLUMNS = (
+    "id", "email", "category_id", "title", "description", "authors", "link", "pitch", "canvas",
+    "summary", "script", "detail", "score", "evaluation", "conversation", "likes",
+    "relationships_local", "relationships_global",
+)
+
+
+def project_list_item(row: Sequence[Any]) -> Dict[str, Any]:
+    """One /projects entry from a row selected with PROJECT_LIST_COLUMNS."""
+    return {
+        'id': row[0],
+        'email': row[1],
+        'category_id': row[2],
+        'title': row[3],
+        'description': row[4],
+        'authors': row[5],
+        'link': row[6],
+        'pitch': row[7],
+        'canvas': row[8],
+        'summary': row[9],
+        'script': row[10],
+        'detail': row[11],
+        'score': row[12],
+        'evaluation': row[13],
+        'conversation': _json_list(row[14]),
+        'likes': _json_list(row[15]),
+        'local': _json_list(row[16]),
+        'global': _json_list(row[17]),
+    }
+
+
+def _json_list(value: Any) -> Any:
+    if not isinstance(value, (bytes, str)):
+        return []
+    return json_codec.parse_json_column(value, [])
+
+
+def iter_projects(cohort_id: int, batch_size: int = PROJECTS_STREAM_BATCH) -> Iterator[Dict[str, Any]]:
+    """Yields the /projects entries of a cohort in id order, read with a server-side cursor."""
+    connection = pymysql.connect(**db_config, cursorclass=pymysql.cursors.SSCursor)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {', '.join(PROJECT_LIST_COLUMNS)} FROM projects WHERE cohort_id = %s ORDER BY id",
+                           (cohort_id,))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield project_list_item(row)
+    finally:
+        connection.close()
+
+
+def iter_projects_json(cohort_id: int, chunk_size: int = PROJECTS_STREAM_CHUNK) -> Iterator[str]:
+    """The /projects JSON array in chunks of about chunk_size characters."""
+    parts = ["["]
+    size = 1
+    for position, project in enumerate(iter_projects(cohort_id)):
+        item = json_codec.dumps_text(project)
+        if position:
+            parts.append(",")
+        parts.append(item)
+        size += len(item) + 1
+        if size >= chunk_size:
+            yield "".join(parts)
+            parts, size = [], 0
+    parts.append("]")
+    yield "".join(parts)
+
+
+def iter_projects_ndjson(cohort_id: int) -> Iterator[str]:
+    for project in iter_projects(cohort_id):
+        yield json_codec.dumps_text(project) + "\n"
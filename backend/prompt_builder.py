@@ -24,6 +24,18 @@ class PromptTexts:
     compare_instructions_intro: str
     find_category_instructions: str
 
+    # Default compare request (the UI's prompt.compare.with.other.projects.1/.2), wrapped around the title
+    compare_prompt_prefix: str
+    compare_prompt_suffix: str
+
+    # Default evaluation request (the UI's prompt.rubric.expert.prompt.1/.2/.3)
+    evaluate_prompt_intro: str
+    evaluate_prompt_name: str
+    evaluate_prompt_category: str
+
+    # The language's name in English, for the translation prompts
+    language_name: str
+
 
 TEXTS: Dict[str, PromptTexts] = {
     "en": PromptTexts(
@@ -54,6 +66,12 @@ TEXTS: Dict[str, PromptTexts] = {
             "3. category_name must match one provided name exactly.\n"
             "4. Write the explanation and summary in English."
         ),
+        compare_prompt_prefix="It acts as an expert project comparator.\n\nCompare the original project",
+        compare_prompt_suffix="with the other projects I provide. Use only the information available in the linked documents.",
+        evaluate_prompt_intro="Act as an expert evaluator.\n\nEvaluate the feasibility of the following project using the indicated rubric.\nUse only the information available in the linked documents and the pitch script (if included).\n\nPROJECT:",
+        evaluate_prompt_name="- Name:",
+        evaluate_prompt_category="- Category:",
+        language_name="English",
     ),
     "es": PromptTexts(
         rubric_heading="RÚBRICA (PDF)",
@@ -83,6 +101,12 @@ TEXTS: Dict[str, PromptTexts] = {
             "3. category_name debe coincidir exactamente con un nombre proporcionado.\n"
             "4. Escribe la explicación y el resumen en español."
         ),
+        compare_prompt_prefix="Actúa como un comparador experto de proyectos.\n\nCompara el proyecto original",
+        compare_prompt_suffix="con los otros proyectos que te proporciono. Utiliza únicamente la información disponible en los documentos enlazados.",
+        evaluate_prompt_intro="Actúa como un evaluador experto.\n\nEvalúa la viabilidad del siguiente proyecto utilizando la rúbrica indicada.\nUtiliza únicamente la información disponible en los documentos enlazados y el guion del pitch (si está incluido).\n\nPROYECTO:",
+        evaluate_prompt_name="- Nombre:",
+        evaluate_prompt_category="- Categoría:",
+        language_name="Spanish",
     ),
     "ca": PromptTexts(
         rubric_heading="RÚBRICA (PDF)",
@@ -112,6 +136,12 @@ TEXTS: Dict[str, PromptTexts] = {
             "3. category_name ha de coincidir exactament amb un nom proporcionat.\n"
             "4. Escriu l’explicació i el resum en català."
         ),
+        compare_prompt_prefix="Actua com un comparador expert de projectes.\n\nCompara el projecte original",
+        compare_prompt_suffix="amb els altres projectes que et proporciono. Utilitza únicament la informació disponible als documents enllaçats.",
+        evaluate_prompt_intro="Actua com un avaluador expert.\n\nAvalua la viabilitat del projecte següent utilitzant la rúbrica indicada.\nUtilitza únicament la informació disponible als documents enllaçats i el guió del pitch (si està inclòs).\n\nPROJECTE:",
+        evaluate_prompt_name="- Nom:",
+        evaluate_prompt_category="- Categoria:",
+        language_name="Catalan",
     ),
 }
 
@@ -177,6 +207,39 @@ def build_compare_query(
     ]).strip()
 
 
+def default_compare_prompt(lang: Optional[str], title: str) -> str:
+    """The prompt the UI sends with /compareprojects, for callers without a user prompt (scheduled recomputes)."""
+    L = TEXTS[normalize_lang(lang)]
+    return f"{L.compare_prompt_prefix} {title or ''} {L.compare_prompt_suffix}".strip()
+
+
+def default_evaluate_prompt(lang: Optional[str], title: str, category: str) -> str:
+    """The prompt the UI sends with /evaluate, built on the server so the canonical evaluation does not depend on it."""
+    L = TEXTS[normalize_lang(lang)]
+    return "\n".join([
+        L.evaluate_prompt_intro,
+        f"{L.evaluate_prompt_name} {title or ''}",
+        f"{L.evaluate_prompt_category} {category or ''}",
+    ]).strip()
+
+
+def build_translate_evaluation_query(source_lang: str, target_lang: str, texts: Dict[str, Any]) -> str:
+    """Asks for the texts of an evaluation (evaluation_cache.translatable_texts) in another language."""
+    source = TEXTS[normalize_lang(source_lang)].language_name
+    target = TEXTS[normalize_lang(target_lang)].language_name
+    return "\n".join([
+        f"Translate the project evaluation below from {source} into {target}.",
+        "",
+        "INSTRUCTIONS:",
+        "1. Return the same JSON structure with every text translated.",
+        "2. Keep the number and order of the items in every list, including criteria.",
+        "3. Do not add, drop or summarize content; keep names of products, figures and numbers as they are.",
+        "",
+        "EVALUATION JSON:",
+        json.dumps(texts, ensure_ascii=False, indent=2),
+    ])
+
+
 def build_find_category_query(
     lang: str,
     user_prompt: str,
@@ -1,31 +1,53 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, stream_with_context, g, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import pymysql
-from fastapi import FastAPI
-from pydantic import BaseModel
-import openai
 import os
 import json
-import bcrypt
+import asyncio
+import threading
+import time
 import jwt
 import datetime
 from functools import wraps
-import pdfplumber
-import aiohttp
 import io
 from pydantic import BaseModel, Field
-from langchain_ollama import ChatOllama
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts.prompt import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from typing import List, Optional
 from prompt_builder import (
     normalize_lang,
     build_evaluate_query,
     build_compare_query,
     build_find_category_query,
+    build_translate_evaluation_query,
+    default_evaluate_prompt,
     get_prompt_headings
 )
+from database import db_config, get_cache_version
+from cache_store import VersionedCache, LRUBackend, create_response_cache
+import json_codec
+from bulk_io import iter_table_ndjson
+import cohorts
+from cohorts import COHORT_DEFAULT, parse_cohort
+from project_stream import PROJECTS_STREAMING, iter_projects_json, iter_projects_ndjson
+from password_hashing import HashingBusy, hash_password, check_password, needs_rehash, rehash_in_background
+from http_compression import negotiate_encoding, CompressedBodyCache, COMPRESSIBLE_MIMETYPES
+from model_router import ModelRouter
+from admission import AdmissionController, AdmissionRejected
+import deadline
+from deadline import DeadlineExceeded
+import request_timing
+from request_timing import phase, timed
+from search_index import ProjectSearchIndex, query_terms, save_document_texts, snippet
+from text_normalizer import normalize_pages
+import evaluation_cache
+import category_stats
+import blob_store
+from blob_store import BlobTooLarge, NotAPdf
+from change_feed import (
+    ChangeFeed, format_sse, CHANGE_FEED_LONG_POLL_TIMEOUT, CHANGE_FEED_STREAM_SECONDS, CHANGE_FEED_HEARTBEAT,
+    SSE_RETRY_MS, SSE_HEADERS
+)
+from evaluation_cache import EVALUATION_CANONICAL_LANG
 
 JWT_SECRET = os.getenv("JWT_SECRET")  # set in env in production
 JWT_ALG = "HS256"
@@ -35,47 +57,128 @@ if not JWT_SECRET:
     
 JWT_SECRET_BYTES = JWT_SECRET.encode("utf-8")
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
-apikey_openrouter = os.getenv("OPENROUTER_API_KEY")
+# jsonify() and cached responses go through json_codec (orjson when installed, JSON_SERIALIZER=json to disable)
+class FastJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        return json_codec.dumps_text(obj, default=self.default)
+
+    def loads(self, s, **kwargs):
+        return json_codec.loads(s)
 
 app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": ["http://127.0.0.1:5500", "http://localhost:5500", "http://localhost:8080", "http://127.0.0.1:8080"]}})
-
-# Database configuration
-db_config = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': '',
-    'database': 'test'
-}
+request_timing.configure_logging()
+app.json = FastJSONProvider(app)
+CORS_ORIGINS = ["http://127.0.0.1:5500", "http://localhost:5500", "http://localhost:8080", "http://127.0.0.1:8080"]
+CORS(app, resources={r"/*": {"origins": CORS_ORIGINS}})
+
+# Phase timings of every request: Server-Timing header, structured log, slow-request sampler
+# (SLOW_REQUEST_MS, REQUEST_PROFILE_RATE, see request_timing.py). Registered first so that it
+# runs after the other after_request hooks and its total includes them.
+@app.before_request
+def start_request_timing():
+    g.timing_token = request_timing.start(request.method, request.path)
+    request_timing.current().enable_profile()
+
+@app.after_request
+def add_server_timing(response):
+    token = g.pop("timing_token", None)
+    if token is not None:
+        request_timing.current().disable_profile()
+        server_timing = request_timing.finish(token, response.status_code)
+        if server_timing:
+            response.headers["Server-Timing"] = server_timing
+    return response
+
+@app.teardown_request
+def end_request_timing(exc):
+    # after_request does not run when the view raised
+    token = g.pop("timing_token", None)
+    if token is not None:
+        request_timing.finish(token, 500)
+
+# Per-user cache for GET /me/session; writes through this worker refresh it,
+# writes through other workers are picked up after SESSION_CACHE_TTL seconds.
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "30"))
+SESSION_MAX_BYTES = 50_000
+session_cache = LRUBackend(max_entries=int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "4096")))
+
+# Seconds a worker trusts its cached categories before re-checking the version stamp
+CATEGORIES_CACHE_TTL = int(os.getenv("CATEGORIES_CACHE_TTL", "300"))
+
+# Response cache for the public read endpoints (/projects, /getlikes, /getconversation).
+# In-process LRU by default; set RESPONSE_CACHE_URL (redis://... or memcached://...)
+# to share entries and invalidations between workers.
+response_cache = create_response_cache(
+    url=os.getenv("RESPONSE_CACHE_URL") or None,
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "30")),
+    stale_ttl=float(os.getenv("RESPONSE_CACHE_STALE_TTL", "300")),
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+)
+
+# Responses at least this big are sent with gzip/brotli when the client accepts it
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+compressed_bodies = CompressedBodyCache()
+
+# Concurrency limits and bounded wait queues for the LLM operations (ADMISSION_* settings)
+admission = AdmissionController()
 
-name_model = "gpt-5-mini"
+# Full-text indexes for /search, one per cohort, each built on first use and synced from
+# projects.updated_at (SEARCH_* settings). SEARCH_WARMUP=1 builds the default cohort's at startup.
+project_searches = {}
+project_searches_lock = threading.Lock()
+
+def get_project_search(cohort_id):
+    with project_searches_lock:
+        index = project_searches.get(cohort_id)
+        if index is None:
+            index = project_searches[cohort_id] = ProjectSearchIndex(cohort_id)
+        return index
+
+if os.getenv("SEARCH_WARMUP") == "1":
+    threading.Thread(target=lambda: get_project_search(COHORT_DEFAULT).ensure_fresh(),
+                     name="search-warmup", daemon=True).start()
+
+# project id -> cohort id, for invalidating the right cohort's responses (a project never changes cohort)
+project_cohorts = LRUBackend(max_entries=int(os.getenv("PROJECT_COHORT_MEMO_ENTRIES", "10000")))
+PROJECT_COHORT_MEMO_TTL = 3600
+
+# Deltas for /changes, published by the write endpoints (CHANGE_FEED_* settings)
+change_feed = ChangeFeed()
 
 # ############################################
 # DATA STRUCTURES
 # ############################################
-# MODEL SELECTION
-model_llm = ChatOpenAI(model=name_model, temperature=1)
-# model_llm = ChatOllama(model="gpt-oss:latest", base_url="URL_OR_TUNNEL_TO_YOUR_LOCAL_SERVER", temperature=0.7, num_ctx=8192) # SLOW MODEL WITH JSON OUTPUT
-# model_llm = ChatOllama(model="qwen2.5:7b", base_url="URL_OR_TUNNEL_TO_YOUR_LOCAL_SERVER", temperature=0.7, num_ctx=8192)  # FAST MODEL WITH JSON OUTPUT
-# model_llm = ChatOpenAI( openai_api_key=apikey_openrouter, openai_api_base='https://openrouter.ai/api/v1', model_name=name_model, model_kwargs={}, default_headers={ "HTTP-Referer": "https://www.workflowsimulator.com", "X-Title": "Ranking Projects"});
+# MODEL SELECTION: LLM_BACKEND / LLM_MODEL, see llm_models.py
+# e.g. LLM_BACKEND=ollama LLM_MODEL=qwen2.5:7b LLM_BASE_URL=URL_OR_TUNNEL_TO_YOUR_LOCAL_SERVER LLM_TEMPERATURE=0.7
+# Several backends per chain: LLM_ROUTES_<CHAIN>, see model_router.py
 
 # Langchain class format for "/evaluate"
+class EvaluationCriterion(BaseModel):
+    name: str = Field(description="Name of the rubric criterion.")
+    score: int = Field(description="Score of the project on this criterion, 0 to 100.")
+    comment: str = Field(description="One or two sentences justifying the score.")
+
 class EvaluationResult(BaseModel):
     score: int = Field(description="Final score from 0 to 100.")
     evaluation: str = Field(description="Short structured evaluation text.")
     strengths: list[str] = Field(description="List of strengths.")
     weaknesses: list[str] = Field(description="List of weaknesses.")
     recommendations: list[str] = Field(description="List of actionable recommendations.")
+    criteria: List[EvaluationCriterion] = Field(description="One item per rubric criterion, in rubric order.")
 
-# Langchain format prompt for "/evaluate"
-evaluation_parser = JsonOutputParser(pydantic_object=EvaluationResult)
-evaluation_prompt = PromptTemplate(
-    template="\n{format_instructions}\n\n{query}\n",
-    input_variables=["query"],
-    partial_variables={"format_instructions": evaluation_parser.get_format_instructions()},
-)
-evaluation_chain = evaluation_prompt | model_llm | evaluation_parser
+# Langchain class format for the localized renderings of an evaluation (evaluation_cache.py)
+class TranslatedCriterion(BaseModel):
+    name: str = Field(description="Translated criterion name.")
+    comment: str = Field(description="Translated criterion comment.")
+
+class EvaluationTranslation(BaseModel):
+    evaluation: str = Field(description="Translated evaluation text.")
+    strengths: list[str] = Field(description="Translated strengths, same number and order.")
+    weaknesses: list[str] = Field(description="Translated weaknesses, same number and order.")
+    recommendations: list[str] = Field(description="Translated recommendations, same number and order.")
+    criteria: List[TranslatedCriterion] = Field(description="Translated criteria, same number and order.")
 
 # Langchain class format for "/compareprojects"
 class ProjectComparisonItem(BaseModel):
@@ -88,15 +191,6 @@ class ProjectComparisonItem(BaseModel):
 class CompareProjectsResult(BaseModel):
     results: List[ProjectComparisonItem] = Field(description="Comparison results for all other projects.")
 
-# Langchain format prompt for "/compareprojects"
-compare_parser = JsonOutputParser(pydantic_object=CompareProjectsResult)
-compare_prompt = PromptTemplate(
-    template="\n{format_instructions}\n\n{query}\n",
-    input_variables=["query"],
-    partial_variables={"format_instructions": compare_parser.get_format_instructions()},
-)
-compare_chain = compare_prompt | model_llm | compare_parser
-
 # Langchain class format for "/findoutcategory"
 class FindCategoryResult(BaseModel):
     category_id: str = Field(description="The selected category number id (must match one of the provided category numeric ids exactly).")
@@ -104,78 +198,140 @@ class FindCategoryResult(BaseModel):
     category_description: str = Field(description="A short explanation of why this category fits.")
     project_short_description: str = Field(description="A one-paragraph summary of the project.")
 
-# Langchain format prompt for "/compareprojects"
-find_category_parser = JsonOutputParser(pydantic_object=FindCategoryResult)
-find_category_prompt = PromptTemplate(
-    template="\n{format_instructions}\n\n{query}\n",
-    input_variables=["query"],
-    partial_variables={"format_instructions": find_category_parser.get_format_instructions()},
-)
-find_category_chain = find_category_prompt | model_llm | find_category_parser
+# Langchain chains (prompt | model | JSON parser), built on first use
+CHAIN_SCHEMAS = {
+    "evaluation": EvaluationResult,
+    "compare": CompareProjectsResult,
+    "find_category": FindCategoryResult,
+    "translate_evaluation": EvaluationTranslation,
+}
+
+# Each chain runs on one or more backend/model routes, picked by live latency and
+# error rate, with failover and optional hedging (LLM_ROUTES_*, LLM_HEDGE_* settings)
+llm_router = ModelRouter(CHAIN_SCHEMAS)
+
+if os.getenv("LLM_WARMUP") == "1":
+    llm_router.warm_up()
 
 
 # ############################################
 # HELPER FUNCTIONS
 # ############################################
 
-def get_user_session_by_email(email: str):
+@timed("db")
+def get_user_session_record(email: str):
+    """
+    Returns (session, session_version) for the user, or None if not found.
+    Served from the per-user session cache when possible.
+    """
+    key = (email or "").strip().lower()
+    cached = session_cache.get(key)
+    if cached is not None:
+        return cached
+
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            cursor.execute("SELECT session FROM users WHERE LOWER(email)=LOWER(%s) LIMIT 1", (email,))
+            cursor.execute("SELECT session, session_version FROM users WHERE LOWER(email)=LOWER(%s) LIMIT 1", (email,))
             row = cursor.fetchone()
             if not row:
                 return None
-            raw = row[0]
-            if raw is None or raw == "":
-                return {}
+            raw, version = row
+            session = {}
             # raw can be dict (JSON column), bytes, or str depending on driver/column type
             if isinstance(raw, (dict, list)):
-                return raw
-            if isinstance(raw, bytes):
-                raw = raw.decode("utf-8", errors="ignore")
-            if isinstance(raw, str):
-                try:
-                    return json.loads(raw)
-                except json.JSONDecodeError:
-                    return {}
-            return {}
+                session = raw
+            elif isinstance(raw, bytes):
+                session = json_codec.parse_json_column(raw.decode("utf-8", errors="ignore"), {})
+            elif isinstance(raw, str):
+                session = json_codec.parse_json_column(raw, {})
+            record = (session, version)
+            session_cache.set(key, record, expire=SESSION_CACHE_TTL)
+            return record
     finally:
         connection.close()
 
+def get_user_session_by_email(email: str):
+    record = get_user_session_record(email)
+    return record[0] if record else None
 
-def update_user_session_by_email(email: str, session_obj):
+@timed("db")
+def update_user_session_by_email(email: str, session_obj, session_json=None, expected_version=None):
     """
-    Stores session_obj as JSON in users.session.
+    Stores session_obj as JSON in users.session and bumps users.session_version.
     Works with JSON column or TEXT column.
+    Pass session_json when the caller already serialized it.
+    With expected_version the write only happens if nobody changed the session
+    meanwhile. Returns the new version, or None on a version conflict.
     """
+    if session_json is None:
+        session_json = json_codec.dumps_text(session_obj or {})
+
+    sql = "UPDATE users SET session=%s, session_version=LAST_INSERT_ID(session_version+1) WHERE LOWER(email)=LOWER(%s)"
+    params = [session_json, email]
+    if expected_version is not None:
+        sql += " AND session_version=%s"
+        params.append(expected_version)
+
+    key = (email or "").strip().lower()
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
             # Always store as JSON string; JSON column will accept it too
-            session_json = json.dumps(session_obj or {}, ensure_ascii=False)
-            cursor.execute(
-                "UPDATE users SET session=%s WHERE LOWER(email)=LOWER(%s)",
-                (session_json, email)
-            )
+            cursor.execute(sql, params)
+            if cursor.rowcount == 0:
+                session_cache.delete(key)
+                return None
+            new_version = cursor.lastrowid
         connection.commit()
-        return True
+        session_cache.set(key, (session_obj or {}, new_version), expire=SESSION_CACHE_TTL)
+        return new_version
     finally:
         connection.close()
 
-async def extract_pdf_text_from_url(url):
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as resp:
-            pdf_bytes = await resp.read()
+def apply_merge_patch(target, patch):
+    """RFC 7396 JSON Merge Patch: null deletes a member, objects merge recursively, anything else replaces."""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for name, value in patch.items():
+        if value is None:
+            result.pop(name, None)
+        else:
+            result[name] = apply_merge_patch(result.get(name), value)
+    return result
 
-    text = ""
+@timed("pdf_parse")
+def parse_pdf_pages(pdf_bytes):
+    pages = []
+    import pdfplumber  # heavy, only needed once a PDF is actually parsed
     with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
         for page in pdf.pages:
+            # runs in a worker thread, which cannot be cancelled: stop here once the request is out of time
+            deadline.check("parse")
             page_text = page.extract_text()
             if page_text:
-                text += page_text + "\n"
-
-    return text
+                pages.append(page_text)
+
+    return pages
+
+def parse_pdf_text(pdf_bytes):
+    """Page text without headers, footers, page numbers and template lines (see text_normalizer)."""
+    pages = parse_pdf_pages(pdf_bytes)
+    with phase("normalize"):
+        normalized = normalize_pages(pages)
+    request_timing.count("text_chars", normalized.original_chars)
+    request_timing.count("text_removed_chars", normalized.removed_chars)
+    return normalized.text
+
+async def extract_pdf_text_from_url(url, document=None):
+    # `document` names it in a DeadlineExceeded ("canvas", "project 2 summary"); the URL by default
+    with deadline.document(document or url):
+        # Uploaded and already mirrored documents come from the local blob store, others are downloaded (and mirrored)
+        pdf_bytes = await blob_store.read_document(url)
+
+        # pdfplumber is CPU bound: keep it off the event loop so other requests keep flowing
+        return await deadline.to_thread("parse", parse_pdf_text, pdf_bytes)
     
 def update_user_name_by_email(email: str, new_name: str):
     email = (email or "").strip().lower()
@@ -199,7 +355,8 @@ def get_project_by_owner_email(owner_email: str):
         with connection.cursor() as cursor:
             cursor.execute("""
                 SELECT id, email, category_id, title, description, authors, link,
-                       pitch, canvas, summary, script, detail, score, evaluation, conversation, likes, relationships_local, relationships_global
+                       pitch, canvas, summary, script, detail, score, evaluation, conversation, likes, relationships_local, relationships_global,
+                       cohort_id
                 FROM projects
                 WHERE LOWER(email) = LOWER(%s)
                 ORDER BY id DESC
@@ -210,8 +367,6 @@ def get_project_by_owner_email(owner_email: str):
     finally:
         connection.close()
 
-import pymysql
-
 def update_project_by_owner_email(owner_email: str, fields: dict):
     owner_email = (owner_email or "").strip().lower()
 
@@ -236,42 +391,53 @@ def update_project_by_owner_email(owner_email: str, fields: dict):
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            # 1) Find an existing project for this owner (latest)
+            # 1) Find an existing project for this owner (latest); a plain read, no row locks
             cursor.execute(
                 "SELECT id FROM projects WHERE LOWER(email)=LOWER(%s) ORDER BY id DESC LIMIT 1",
                 (owner_email,)
             )
             row = cursor.fetchone()
 
+            # projects.category_id/score/likes feed category_stats; only the project's own row is locked
             if row:
                 project_id = row[0]
-                cursor.execute(
-                    """
-                    UPDATE projects
-                    SET category_id=%s,
-                        title=%s,
-                        description=%s,
-                        authors=%s,
-                        pitch=%s,
-                        canvas=%s,
-                        summary=%s,
-                        detail=%s,
-                        link=%s,
-                        script=%s
-                    WHERE id=%s
-                    """,
-                    (category_id, title, description, authors, pitch, canvas, summary, detail, link, script, project_id)
-                )
-                created = False
+                with category_stats.tracked(cursor, "id = %s", (project_id,)):
+                    cursor.execute(
+                        """
+                        UPDATE projects
+                        SET content_updated_at=IF(
+                                category_id<=>%s AND title<=>%s AND description<=>%s AND canvas<=>%s
+                                AND summary<=>%s AND script<=>%s,
+                                content_updated_at, NOW()),
+                            category_id=%s,
+                            title=%s,
+                            description=%s,
+                            authors=%s,
+                            pitch=%s,
+                            canvas=%s,
+                            summary=%s,
+                            detail=%s,
+                            link=%s,
+                            script=%s
+                        WHERE id=%s
+                        """,
+                        (category_id, title, description, canvas, summary, script,
+                         category_id, title, description, authors, pitch, canvas, summary, detail, link, script, project_id)
+                    )
+                    created = False
             else:
+                # A new project belongs to its owner's cohort
                 cursor.execute(
                     """
-                    INSERT INTO projects (email, category_id, title, description, authors, link, pitch, canvas, summary, detail, script)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    INSERT INTO projects (email, category_id, title, description, authors, link, pitch, canvas, summary, detail, script, content_updated_at, cohort_id)
+                    SELECT %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(),
+                           COALESCE((SELECT cohort_id FROM users WHERE email=%s), %s)
                     """,
-                    (owner_email, category_id, title, description, authors, link, pitch, canvas, summary, detail, script)
+                    (owner_email, category_id, title, description, authors, link, pitch, canvas, summary, detail, script,
+                     owner_email, COHORT_DEFAULT)
                 )
                 project_id = cursor.lastrowid
+                category_stats.created(cursor, project_id)
                 created = True
 
         connection.commit()
@@ -279,11 +445,25 @@ def update_project_by_owner_email(owner_email: str, fields: dict):
     finally:
         connection.close()
 
+def delete_owner_projects(cursor, owner_email: str):
+    """
+    Deletes the owner's projects by primary key: the ids come from a plain read,
+    so the locking statements only lock those rows, not every row scanned.
+    """
+    cursor.execute("SELECT id FROM projects WHERE LOWER(email)=LOWER(%s)", (owner_email,))
+    project_ids = [row[0] for row in cursor.fetchall()]
+    if not project_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(project_ids))
+    cursor.execute(f"DELETE FROM project_documents WHERE project_id IN ({placeholders})", project_ids)
+    with category_stats.tracked(cursor, f"id IN ({placeholders})", tuple(project_ids)):
+        cursor.execute(f"DELETE FROM projects WHERE id IN ({placeholders})", project_ids)
+
 def delete_project_by_owner_email(owner_email: str):
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            cursor.execute("DELETE FROM projects WHERE LOWER(email)=LOWER(%s)", (owner_email,))
+            delete_owner_projects(cursor, owner_email)
         connection.commit()
         return True
     finally:
@@ -293,7 +473,7 @@ def delete_user_and_projects(owner_email: str):
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            cursor.execute("DELETE FROM projects WHERE LOWER(email)=LOWER(%s)", (owner_email,))
+            delete_owner_projects(cursor, owner_email)
             cursor.execute("DELETE FROM users WHERE LOWER(email)=LOWER(%s)", (owner_email,))
         connection.commit()
         return True
@@ -323,22 +503,27 @@ def project_row_to_dict(row):
         "likes": row[15],        
         "local": row[16], 
         "global": row[17], 
+        "cohort": row[18],
     }
 
+@timed("db")
 def get_user_by_email(email: str):
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            cursor.execute("SELECT id, name, email, password, validated FROM users WHERE email=%s", (email,))
+            cursor.execute("SELECT id, name, email, password, validated, cohort_id FROM users WHERE email=%s", (email,))
             row = cursor.fetchone()
-            return row  # (id, email, password) or None
+            return row  # (id, name, email, password, validated, cohort_id) or None
     finally:
         connection.close()
 
-def create_user(username: str, email: str, password: str):
+EMAIL_EXISTS_ERROR = "Email already exists."
+
+def create_user(username: str, email: str, password: str, cohort_id: int = COHORT_DEFAULT):
     """
     Creates a user in table `users` with columns:
-      id (auto), name (varchar(10)), email (varchar(255)), password (varchar(255)), created_at (default)
+      id (auto), name (varchar(10)), email (varchar(255)), password (varchar(255)), cohort_id, created_at (default)
+    Uniqueness is enforced by the UNIQUE index on users.email (no extra SELECT).
     Returns:
       (ok: bool, error: str | None)
     """
@@ -352,42 +537,122 @@ def create_user(username: str, email: str, password: str):
     if len(password) < 8:
         return False, "Password must be at least 8 characters long."
 
-    pw_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    pw_hash = hash_password(password)
 
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            # Optional: check uniqueness by email (recommended)
-            cursor.execute("SELECT id FROM users WHERE email=%s LIMIT 1", (email,))
-            if cursor.fetchone():
-                return False, "Email already exists."
-
             sql = """
-                INSERT INTO users (name, email, password)
-                VALUES (%s, %s, %s)
+                INSERT INTO users (name, email, password, cohort_id)
+                VALUES (%s, %s, %s, %s)
             """
-            cursor.execute(sql, (username, email, pw_hash))
+            try:
+                cursor.execute(sql, (username, email, pw_hash, cohort_id))
+            except pymysql.err.IntegrityError:
+                return False, EMAIL_EXISTS_ERROR
             connection.commit()
-            
+
             # Debug confirmation
             new_id = cursor.lastrowid
             # print(f"[REGISTER] Inserted user id={new_id}, email={email}, rowcount={cursor.rowcount}")
 
-            return {"ok": True, "id": new_id}
+            return True, None
+    finally:
+        connection.close()
+
+def update_user_password_hash(user_id: int, pw_hash: str):
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE users SET password=%s WHERE id=%s", (pw_hash, user_id))
+        connection.commit()
+        return True
     finally:
         connection.close()
 
 
-def issue_token(user_id: int, email: str):
+def issue_token(user_id: int, email: str, cohort_id: int = COHORT_DEFAULT):
     now = datetime.datetime.utcnow()
     payload = {
         "sub": str(user_id),
         "email": email,
+        "cohort": cohort_id,
         "iat": now,
         "exp": now + datetime.timedelta(hours=JWT_EXPIRE_HOURS),
     }
     return jwt.encode(payload, JWT_SECRET_BYTES, algorithm=JWT_ALG)
 
+def parse_project_id(value) -> int:
+    """Project id sent by a client. Raises ValueError (also for missing values)."""
+    return int(str(value).strip())
+
+def project_cache_key(kind: str, project_id) -> str:
+    # Canonical int, so "01" and "1" share one entry and one invalidation
+    return f"{kind}:{parse_project_id(project_id)}"
+
+def projects_cache_key(cohort_id) -> str:
+    return f"projects:{cohort_id}"
+
+def graph_cache_key(cohort_id) -> str:
+    return f"graph:{cohort_id}"
+
+def request_cohort():
+    """Cohort of a public read (?cohort=, COHORT_DEFAULT when absent). Raises ValueError."""
+    return parse_cohort(request.args.get("cohort"))
+
+def remember_project_cohort(project_id, cohort_id):
+    if cohort_id is not None:
+        project_cohorts.set(str(project_id).strip(), cohort_id, PROJECT_COHORT_MEMO_TTL)
+    return cohort_id
+
+@timed("db")
+def project_cohort(project_id):
+    cohort_id = project_cohorts.get(str(project_id).strip())
+    if cohort_id is None:
+        connection = pymysql.connect(**db_config)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT cohort_id FROM projects WHERE id=%s", (project_id,))
+                row = cursor.fetchone()
+        finally:
+            connection.close()
+        cohort_id = remember_project_cohort(project_id, row[0] if row else None)
+    return cohort_id
+
+def cached_json_response(key: str, loader):
+    """Serves loader()'s JSON from the response cache; loader only runs on a miss or revalidation."""
+    return cached_body_response(key, lambda: json_codec.dumps_text(loader()))
+
+def cached_body_response(key: str, build_body):
+    """Same, for a loader that returns the JSON text itself."""
+    body = response_cache.get_or_load(key, build_body)
+    return app.response_class(body, mimetype="application/json")
+
+def invalidate_project_responses(project_id=None, likes=False, conversation=False, graph=True, cohort_id=None):
+    """
+    Write paths call this so the next read of the touched lists hits the database once.
+    Only the lists of the project's cohort are dropped; pass cohort_id when it is
+    at hand or the project is already gone. Blocking (database and cache
+    round trips): async code runs it with asyncio.to_thread.
+    """
+    if cohort_id is None and project_id is not None:
+        cohort_id = project_cohort(project_id)
+    keys = []
+    if cohort_id is not None:
+        keys.append(projects_cache_key(cohort_id))
+        if graph:
+            keys.append(graph_cache_key(cohort_id))
+    if project_id is not None and likes:
+        keys.append(project_cache_key("likes", project_id))
+    if project_id is not None and conversation:
+        keys.append(project_cache_key("conversation", project_id))
+    if keys:
+        response_cache.invalidate(*keys)
+    with project_searches_lock:
+        index = project_searches.get(cohort_id)
+    if index is not None:
+        index.mark_stale()
+
 def require_auth(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
@@ -410,6 +675,38 @@ def require_auth(fn):
         return fn(*args, **kwargs)
     return wrapper
 
+EVALUATION_CONTEXT_SQL = """
+    SELECT p.title, c.labelLong
+    FROM projects p
+    LEFT JOIN categories c ON c.id = p.category_id AND c.cohort_id = p.cohort_id
+    WHERE p.id = %s
+"""
+
+def evaluation_context_row(row):
+    return (row[0] or "", row[1] or "") if row else ("", "")
+
+@timed("db")
+def get_evaluation_context(project_id):
+    """(title, category label) of a project, for the canonical evaluation prompt."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(EVALUATION_CONTEXT_SQL, (project_id,))
+            return evaluation_context_row(cursor.fetchone())
+    finally:
+        connection.close()
+
+@timed("db")
+def get_project_evaluation(project_id):
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT evaluation FROM projects WHERE id = %s", (project_id,))
+            row = cursor.fetchone()
+            return row[0] if row else None
+    finally:
+        connection.close()
+
 def get_project_owner_email(project_id: int):
     connection = pymysql.connect(**db_config)
     try:
@@ -420,6 +717,7 @@ def get_project_owner_email(project_id: int):
     finally:
         connection.close()
 
+@timed("db")
 def update_project_evaluation(project_id, score, evaluation):
     connection = pymysql.connect(**db_config)
     try:
@@ -429,19 +727,21 @@ def update_project_evaluation(project_id, score, evaluation):
                 SET score = %s, evaluation = %s
                 WHERE id = %s
             """
-            cursor.execute(sql, (score, evaluation, project_id))
+            with category_stats.tracked(cursor, "id = %s", (project_id,)):
+                cursor.execute(sql, (score, evaluation, project_id))
         connection.commit()
         return True
     finally:
         connection.close()
 
+@timed("db")
 def update_project_relationships_local(project_id, relationships):
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
             sql = """
                 UPDATE projects
-                SET relationships_local = %s
+                SET relationships_local = %s, relationships_local_at = NOW()
                 WHERE id = %s
             """
             cursor.execute(sql, (relationships, project_id))
@@ -450,13 +750,14 @@ def update_project_relationships_local(project_id, relationships):
     finally:
         connection.close()
 
+@timed("db")
 def update_project_relationships_global(project_id, relationships):
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
             sql = """
                 UPDATE projects
-                SET relationships_global = %s
+                SET relationships_global = %s, relationships_global_at = NOW()
                 WHERE id = %s
             """
             cursor.execute(sql, (relationships, project_id))
@@ -465,6 +766,7 @@ def update_project_relationships_global(project_id, relationships):
     finally:
         connection.close()
 
+@timed("db")
 def get_project_conversation(project_id):
     connection = pymysql.connect(**db_config)
     try:
@@ -492,6 +794,7 @@ def remove_user_by_id(users, user_id):
     """Remove user by ID and return new list"""
     return [user for user in users if user["user"] != user_id]
 
+@timed("db")
 def get_project_likes(project_id):
     connection = pymysql.connect(**db_config)
     try:
@@ -508,8 +811,10 @@ def update_project_likes(project_id, likes):
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            sql = "UPDATE projects SET likes=%s WHERE id=%s"
-            cursor.execute(sql, (json.dumps(likes), project_id))
+            # like_count is kept next to the JSON so rankings can use the index
+            sql = "UPDATE projects SET likes=%s, like_count=%s WHERE id=%s"
+            with category_stats.tracked(cursor, "id = %s", (project_id,)):
+                cursor.execute(sql, (json.dumps(likes), len(likes), project_id))
         connection.commit()
         return True
     finally:
@@ -525,57 +830,360 @@ def get_user_name(user_id):
     finally:
         connection.close()
         
-# Function to fetch all categories from the database
-def get_all_categories():
+# Function to fetch all categories (of every cohort) from the database
+@timed("db")
+def load_all_categories():
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            sql = "SELECT * FROM categories"
+            sql = "SELECT uid, id, color, labelShort, labelActiveShort, labelLong, rubric, traits, cohort_id FROM categories"
             cursor.execute(sql)
             result = cursor.fetchall()
             return result
     finally:
         connection.close()
 
-# Function to fetch all projects from the database
-def get_all_projects():
+categories_cache = VersionedCache(
+    loader=load_all_categories,
+    version_reader=lambda: get_cache_version("categories"),
+    ttl=CATEGORIES_CACHE_TTL,
+)
+
+# Cached categories; MariaDB is only asked for the version stamp once per TTL.
+# Writes to `categories` (bulk_io imports, manual SQL, see migration 002) bump that stamp.
+def get_all_categories():
+    return categories_cache.get()
+
+def get_cohort_categories(cohort_id):
+    return [c for c in get_all_categories() if c[8] == cohort_id]
+
+def get_categories_hint(cohort_id=COHORT_DEFAULT):
+    """Category list of a cohort for the /findoutcategory prompt, in the same format the frontend uses."""
+    return "\n".join(
+        f"{{ category_id:{c[0]}, category_name:{c[1]}, category_description:{c[5]} }}"
+        for c in get_cohort_categories(cohort_id)
+    )
+
+def resolve_category(category_id, category_name, cohort_id=COHORT_DEFAULT):
+    """Maps the model answer onto a known category row of the cohort (by numeric uid, then by name id)."""
+    categories = get_cohort_categories(cohort_id)
+    for c in categories:
+        if str(c[0]) == str(category_id).strip():
+            return c
+    for c in categories:
+        if str(c[1]).lower() == str(category_name or "").strip().lower():
+            return c
+    return None
+
+def parse_likes_data(likes_data):
+    """Parse likes data from database (bytes, string, or None) to Python list"""
+    if not isinstance(likes_data, (bytes, str)):
+        return []
+    # Single parse; latin-1 is only tried when the bytes are not valid UTF-8
+    return json_codec.parse_json_column(likes_data, [])
+
+# Columns a project card can ask for with /projectdetail?fields=...
+PROJECT_DETAIL_CORE_FIELDS = (
+    "id", "email", "category_id", "title", "description", "authors", "link",
+    "pitch", "canvas", "summary", "script", "detail", "score", "evaluation",
+)
+PROJECT_DETAIL_SECTIONS = {
+    "likes": ("likes",),
+    "comments": ("conversation",),
+    "relationships": ("relationships_local", "relationships_global"),
+}
+
+@timed("db")
+def get_project_columns(project_id, columns):
+    """Single-row read of only the requested (whitelisted) columns, as a dict."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT " + ", ".join(columns) + " FROM projects WHERE id=%s",
+                (project_id,)
+            )
+            row = cursor.fetchone()
+            return dict(zip(columns, row)) if row else None
+    finally:
+        connection.close()
+
+def top_relationships(relationships, limit):
+    if not isinstance(relationships, list):
+        return []
+    items = [r for r in relationships if isinstance(r, dict)]
+    items.sort(key=lambda r: r.get("match") if isinstance(r.get("match"), int) else -1, reverse=True)
+    return items[:limit]
+
+# Ranking orders for the leaderboard. Every column is sorted DESC (ties by newest id) so MariaDB
+# can walk the (cohort_id, category_id, score) / (cohort_id, category_id, like_count, score) indexes.
+LEADERBOARD_SORTS = {
+    "score": ["score"],
+    "likes": ["like_count", "score"],
+}
+LEADERBOARD_MAX_LIMIT = 100
+LEADERBOARD_COLUMNS = "id, category_id, title, authors, score, like_count"
+
+def leaderboard_row_to_dict(row, rank=None):
+    return {
+        "id": row[0],
+        "category_id": row[1],
+        "title": row[2],
+        "authors": row[3],
+        "score": row[4],
+        "likes": row[5],
+        "rank": rank,
+    }
+
+def build_rank_clause(columns, values, project_id, op=">"):
+    """
+    Returns (sql, params) matching the rows ranked strictly ahead (op=">") or
+    behind (op="<") a project whose sort columns hold `values`.
+    Ties on every column are broken by id DESC.
+    """
+    clauses = []
+    params = []
+    for i, column in enumerate(columns + ["id"]):
+        equal_parts = [f"{c}=%s" for c in columns[:i]]
+        clauses.append("(" + " AND ".join(equal_parts + [f"{column}{op}%s"]) + ")")
+        params += list(values[:i]) + [values[i] if i < len(columns) else project_id]
+    return "(" + " OR ".join(clauses) + ")", params
+
+@timed("db")
+def get_leaderboard(category_id, sort="score", limit=10, project_id=None, neighbours=2, cohort_id=COHORT_DEFAULT):
+    """
+    Top-N of a category (or of every project of the cohort when category_id is
+    None) plus, optionally, the rank of `project_id` and its neighbours above
+    and below; then the project's cohort is used. Every query is an index range
+    scan, no full table sort.
+    """
+    columns = LEADERBOARD_SORTS.get(sort, LEADERBOARD_SORTS["score"])
+    order_desc = ", ".join(f"{c} DESC" for c in columns + ["id"])
+    order_asc = ", ".join(f"{c} ASC" for c in columns + ["id"])
+
     connection = pymysql.connect(**db_config)
     try:
         with connection.cursor() as cursor:
-            sql = "SELECT * FROM projects"
-            cursor.execute(sql)
-            result = cursor.fetchall()
+            project = None
+            if project_id is not None:
+                cursor.execute(
+                    f"SELECT {LEADERBOARD_COLUMNS}, cohort_id FROM projects WHERE id=%s",
+                    (project_id,)
+                )
+                project = cursor.fetchone()
+                if project:
+                    cohort_id = project[6]
+                    if category_id is None:
+                        category_id = project[1]
+
+            scope_sql = "cohort_id=%s AND category_id=%s" if category_id is not None else "cohort_id=%s"
+            scope_params = [cohort_id, category_id] if category_id is not None else [cohort_id]
+
+            cursor.execute(f"SELECT COUNT(*) FROM projects WHERE {scope_sql}", scope_params)
+            total = cursor.fetchone()[0]
+
+            cursor.execute(
+                f"SELECT {LEADERBOARD_COLUMNS} FROM projects WHERE {scope_sql} ORDER BY {order_desc} LIMIT %s",
+                scope_params + [limit]
+            )
+            top = [leaderboard_row_to_dict(row, idx) for idx, row in enumerate(cursor.fetchall(), 1)]
+
+            result = {"cohort": cohort_id, "category": category_id, "sort": sort, "total": total, "top": top}
+            if project is None:
+                return result
+
+            values = [project[4] if c == "score" else project[5] for c in columns]
+            ahead_sql, ahead_params = build_rank_clause(columns, values, project[0], ">")
+            behind_sql, behind_params = build_rank_clause(columns, values, project[0], "<")
+
+            cursor.execute(
+                f"SELECT COUNT(*) FROM projects WHERE {scope_sql} AND {ahead_sql}",
+                scope_params + ahead_params
+            )
+            rank = cursor.fetchone()[0] + 1
+
+            cursor.execute(
+                f"SELECT {LEADERBOARD_COLUMNS} FROM projects WHERE {scope_sql} AND {ahead_sql} ORDER BY {order_asc} LIMIT %s",
+                scope_params + ahead_params + [neighbours]
+            )
+            above = [leaderboard_row_to_dict(row, rank - idx) for idx, row in enumerate(cursor.fetchall(), 1)]
+            above.reverse()
+
+            cursor.execute(
+                f"SELECT {LEADERBOARD_COLUMNS} FROM projects WHERE {scope_sql} AND {behind_sql} ORDER BY {order_desc} LIMIT %s",
+                scope_params + behind_params + [neighbours]
+            )
+            below = [leaderboard_row_to_dict(row, rank + idx) for idx, row in enumerate(cursor.fetchall(), 1)]
+
+            result["project"] = leaderboard_row_to_dict(project, rank)
+            result["neighbours"] = {"above": above, "below": below}
             return result
     finally:
         connection.close()
 
-def parse_likes_data(likes_data):
-    """Parse likes data from database (bytes, string, or None) to Python list"""
-    if likes_data is None:
-        return []
-    
-    if isinstance(likes_data, bytes):
-        try:
-            return json.loads(likes_data.decode('utf-8'))
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            # Try latin-1 if utf-8 fails
-            try:
-                return json.loads(likes_data.decode('latin-1'))
-            except:
-                return []
-    
-    if isinstance(likes_data, str):
-        try:
-            return json.loads(likes_data)
-        except json.JSONDecodeError:
-            return []
-    
-    return []
+# Relationship graph. The index of a cohort (its projects plus their resolved,
+# match-sorted edges for both scopes) is built once per change of its
+# evaluations/relationships and kept in the response cache under
+# graph_cache_key(cohort); requests only filter it.
+GRAPH_SCOPES = ("local", "global")
+GRAPH_MAX_TOP_K = 50
+graph_index_memo = {}  # cohort -> (cached text, parsed index)
+
+@timed("db")
+def build_graph_index(cohort_id=COHORT_DEFAULT):
+    """
+    {"nodes": [[id, title, category_id, score], ...],
+     "edges": {"local": [[source, [[target, match], ...]], ...], "global": [...]}}
+    Relationships name the other project by title; titles that no longer
+    resolve to a project and self references are dropped.
+    """
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT id, title, category_id, score, relationships_local, relationships_global "
+                "FROM projects WHERE cohort_id=%s",
+                (cohort_id,)
+            )
+            rows = cursor.fetchall()
+    finally:
+        connection.close()
+
+    ids_by_title = {}
+    for row in rows:
+        ids_by_title.setdefault(str(row[1] or "").strip().lower(), row[0])
+
+    nodes = [[row[0], row[1], row[2], row[3]] for row in rows]
+    edges = {scope: [] for scope in GRAPH_SCOPES}
+    for row in rows:
+        for scope, column in zip(GRAPH_SCOPES, (row[4], row[5])):
+            relationships = json_codec.parse_json_column(column, [])
+            targets = {}
+            for item in relationships if isinstance(relationships, list) else []:
+                if not isinstance(item, dict):
+                    continue
+                target = ids_by_title.get(str(item.get("title") or "").strip().lower())
+                try:
+                    match = int(item.get("match"))
+                except (TypeError, ValueError):
+                    continue
+                if target is None or target == row[0]:
+                    continue
+                targets[target] = max(match, targets.get(target, match))
+            if targets:
+                edges[scope].append([row[0], sorted(targets.items(), key=lambda t: (-t[1], t[0]))])
+    return {"nodes": nodes, "edges": edges}
+
+def get_graph_index(cohort_id=COHORT_DEFAULT):
+    text = response_cache.get_or_load(graph_cache_key(cohort_id),
+                                      lambda: json_codec.dumps_text(build_graph_index(cohort_id)))
+    # Parse once per cached version, not once per request
+    memo_text, index = graph_index_memo.get(cohort_id, (None, None))
+    if memo_text != text:
+        index = json_codec.loads(text)
+        graph_index_memo[cohort_id] = (text, index)
+    return index
+
+def build_graph(scope="local", category_id=None, project_id=None, min_match=0, top_k=10, cohort_id=COHORT_DEFAULT):
+    """
+    Compact node/edge lists for the category and relationship graphs: at most
+    top_k edges per source node, each with match >= min_match. With project_id
+    the result is that project plus its neighbours (ego graph).
+    """
+    index = get_graph_index(cohort_id)
+    nodes = {n[0]: n for n in index["nodes"]}
+
+    if project_id is not None:
+        if project_id not in nodes:
+            return None
+        sources = {project_id}
+    elif category_id:
+        sources = {n[0] for n in index["nodes"] if n[2] == category_id}
+    else:
+        sources = set(nodes)
+
+    edges = []
+    for source, targets in index["edges"][scope]:
+        if source not in sources:
+            continue
+        kept = 0
+        for target, match in targets:
+            if match < min_match or kept >= top_k:
+                break  # targets are sorted by match DESC
+            if project_id is None and target not in sources:
+                continue
+            edges.append({"source": source, "target": target, "match": match})
+            kept += 1
+
+    included = set(sources)
+    included.update(e["target"] for e in edges)
+    return {
+        "nodes": [
+            {"id": n[0], "title": n[1], "category": n[2], "score": n[3]}
+            for n in index["nodes"] if n[0] in included
+        ],
+        "edges": edges,
+    }
+
+SEARCH_MAX_LIMIT = 50
+
+def search_projects(query, category_id=None, min_score=None, max_score=None, limit=20, offset=0,
+                    cohort_id=COHORT_DEFAULT):
+    """Ranked page of the cohort's projects matching `query`, with highlighted title and snippet."""
+    project_search = get_project_search(cohort_id)
+    project_search.ensure_fresh()
+    with phase("search"):
+        total, hits = project_search.search(query, category=category_id, min_score=min_score,
+                                            max_score=max_score, limit=limit, offset=offset)
+    rows = project_search.fetch_hits([project_id for project_id, _ in hits])
+    terms = query_terms(query)
+    results = []
+    for project_id, relevance in hits:
+        if project_id not in rows:
+            continue  # deleted since the last sync
+        fields, category, score = rows[project_id]
+        results.append({
+            "id": project_id,
+            "title": fields["title"],
+            "category_id": category,
+            "score": score,
+            "relevance": round(relevance, 3),
+            "highlight": snippet(fields, terms),
+        })
+    return {"total": total, "results": results}
 
 # ############################################
 # ENDPOINTS
 # ############################################
 
+@app.after_request
+def compress_response(response):
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code >= 300
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+    if not encoding:
+        return response
+
+    with phase("compress"):
+        response.set_data(compressed_bodies.get_or_compress(
+            body, encoding, gzip_level=COMPRESSION_GZIP_LEVEL, brotli_quality=COMPRESSION_BROTLI_QUALITY
+        ))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
 # Endpoint LOGIN USER
 @app.route("/rankingprojects/auth/login", methods=["POST"])
 def login():
@@ -587,15 +1195,22 @@ def login():
     if not row:
         return jsonify({"ok": False, "error": "Invalid credentials"}), 401
 
-    user_id, user_name, user_email, pw_hash, validated = row
-    if not bcrypt.checkpw(password.encode("utf-8"), pw_hash.encode("utf-8")):
-        return jsonify({"ok": False, "error": "Invalid credentials"}), 401
+    user_id, user_name, user_email, pw_hash, validated, cohort_id = row
+    try:
+        if not check_password(password, pw_hash):
+            return jsonify({"ok": False, "error": "Invalid credentials"}), 401
+    except HashingBusy as e:
+        return jsonify({"ok": False, "error": "Server busy, please retry"}), 503, {"Retry-After": str(e.retry_after)}
 
     if validated == 0:
         return jsonify({"ok": False, "error": "Not Validated Yet"}), 401
 
-    token = issue_token(user_id, user_email)
-    return jsonify({"ok": True, "token": token, "email": user_email, "name": user_name})
+    # BCRYPT_ROUNDS changed since this hash was made: upgrade it without delaying the login
+    if needs_rehash(pw_hash):
+        rehash_in_background(password, lambda new_hash: update_user_password_hash(user_id, new_hash))
+
+    token = issue_token(user_id, user_email, cohort_id)
+    return jsonify({"ok": True, "token": token, "email": user_email, "name": user_name, "cohort": cohort_id})
 
 # Endpoint REGISTER USER
 @app.route("/rankingprojects/auth/register", methods=["POST"])
@@ -607,11 +1222,21 @@ def register():
     if not email or not password or len(password) < 8:
         return jsonify({"ok": False, "error": "Invalid email or password"}), 400
 
-    existing = get_user_by_email(email)
-    if existing:
-        return jsonify({"ok": False, "error": "Email already exists"}), 409
+    try:
+        cohort_id = parse_cohort(data.get("cohort"))
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    if cohort_id != COHORT_DEFAULT and not cohorts.cohort_exists(cohort_id):
+        return jsonify({"ok": False, "error": "Unknown cohort"}), 400
+
+    try:
+        ok, error = create_user(email, email, password, cohort_id)
+    except HashingBusy as e:
+        return jsonify({"ok": False, "error": "Server busy, please retry"}), 503, {"Retry-After": str(e.retry_after)}
 
-    create_user(email, email, password)
+    if not ok:
+        status = 409 if error == EMAIL_EXISTS_ERROR else 400
+        return jsonify({"ok": False, "error": error}), status
     return jsonify({"ok": True})
 
 # Endpoint GET SESSION
@@ -623,10 +1248,11 @@ def get_my_session():
         return jsonify({"ok": False, "error": "Invalid token payload (missing email)."}), 401
 
     try:
-        sess = get_user_session_by_email(owner_email)
-        if sess is None:
+        record = get_user_session_record(owner_email)
+        if record is None:
             return jsonify({"ok": False, "error": "User not found"}), 404
-        return jsonify({"ok": True, "session": sess})
+        sess, version = record
+        return jsonify({"ok": True, "session": sess, "version": version}), 200, {"ETag": f'"{version}"'}
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
@@ -644,17 +1270,71 @@ def put_my_session():
     if not isinstance(session_obj, (dict, list)) and session_obj is not None:
         return jsonify({"ok": False, "error": "session must be an object (or null)"}), 400
 
-    # Optional: size limit (avoid giant rows)
+    # Serialized once: used for the size limit and stored as-is
     try:
-        raw_size = len(json.dumps(session_obj or {}))
-        if raw_size > 50_000:
-            return jsonify({"ok": False, "error": "session too large"}), 413
+        session_json = json_codec.dumps_text(session_obj or {})
     except Exception:
-        pass
+        return jsonify({"ok": False, "error": "session is not serializable"}), 400
+    if len(session_json) > SESSION_MAX_BYTES:
+        return jsonify({"ok": False, "error": "session too large"}), 413
 
     try:
-        update_user_session_by_email(owner_email, session_obj or {})
-        return jsonify({"ok": True, "session": session_obj or {}})
+        version = update_user_session_by_email(owner_email, session_obj or {}, session_json=session_json)
+        return jsonify({"ok": True, "session": session_obj or {}, "version": version})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+def parse_if_match(value):
+    """The session version an If-Match header asks for; None when absent or "*" (any current version)."""
+    value = (value or "").strip()
+    if not value or value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    return int(value.strip('"'))
+
+# Endpoint PATCH SESSION (RFC 7396 merge patch, optimistic concurrency on session_version)
+@app.route("/rankingprojects/me/session", methods=["PATCH"])
+@require_auth
+def patch_my_session():
+    owner_email = request.user.get("email")
+    if not owner_email:
+        return jsonify({"ok": False, "error": "Invalid token payload (missing email)."}), 401
+
+    # Body is the merge patch itself (application/merge-patch+json); the version the
+    # client last saw goes in If-Match (the ETag of GET /me/session), "*" for any version
+    patch = request.get_json(force=True, silent=True)
+    if not isinstance(patch, dict):
+        return jsonify({"ok": False, "error": "patch must be an object"}), 400
+    try:
+        expected_version = parse_if_match(request.headers.get("If-Match"))
+    except ValueError:
+        return jsonify({"ok": False, "error": "If-Match must be a session version"}), 400
+
+    try:
+        # Without a client version, retry a couple of times on concurrent writers
+        for _ in range(3):
+            record = get_user_session_record(owner_email)
+            if record is None:
+                return jsonify({"ok": False, "error": "User not found"}), 404
+            current, current_version = record
+
+            if expected_version is not None and expected_version != current_version:
+                return jsonify({"ok": False, "error": "Session version conflict", "session": current, "version": current_version}), 409
+
+            merged = apply_merge_patch(current, patch)
+            session_json = json_codec.dumps_text(merged)
+            if len(session_json) > SESSION_MAX_BYTES:
+                return jsonify({"ok": False, "error": "session too large"}), 413
+
+            version = update_user_session_by_email(owner_email, merged, session_json=session_json, expected_version=current_version)
+            if version is not None:
+                return jsonify({"ok": True, "version": version}), 200, {"ETag": f'"{version}"'}
+            if expected_version is not None:
+                break
+
+        record = get_user_session_record(owner_email) or ({}, None)
+        return jsonify({"ok": False, "error": "Session version conflict", "session": record[0], "version": record[1]}), 409
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
@@ -682,39 +1362,31 @@ def update_my_name():
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
-# Endpoint to list all projects
+# Endpoint to list the projects of a cohort (?stream=1: streamed JSON array, ?format=ndjson: one project per line; both uncached)
 @app.route('/rankingprojects/projects', methods=['GET'])
 def list_projects():
-    projects = get_all_projects()
-    projects_list = []
-    for project in projects:
-        project_dict = {
-            'id': project[0],
-            'email': project[1],
-            'category_id': project[3],
-            'title': project[4],
-            'description': project[5],
-            'authors': project[6],
-            'link': project[7],
-            'pitch': project[8],
-            'canvas': project[9],
-            'summary': project[10],
-            'script': project[11],
-            'detail': project[12],
-            'score': project[13],
-            'evaluation': project[14],
-            'conversation': parse_likes_data(project[15]),
-            'likes': parse_likes_data(project[16]),
-            'local': parse_likes_data(project[17]),
-            'global': parse_likes_data(project[18])
-        }
-        projects_list.append(project_dict)
-    return jsonify(projects_list)
-
-# Endpoint to list all categories
+    try:
+        cohort_id = request_cohort()
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    if request.args.get("format") == "ndjson" or "application/x-ndjson" in (request.headers.get("Accept") or ""):
+        return app.response_class(stream_with_context(iter_projects_ndjson(cohort_id)), mimetype="application/x-ndjson")
+    if PROJECTS_STREAMING or request.args.get("stream") == "1":
+        return app.response_class(stream_with_context(iter_projects_json(cohort_id)), mimetype="application/json")
+    return cached_body_response(projects_cache_key(cohort_id), lambda: build_projects_body(cohort_id))
+
+@timed("db")
+def build_projects_body(cohort_id=COHORT_DEFAULT):
+    # Joined from the stream: no list of rows or of dicts next to the JSON text
+    return "".join(iter_projects_json(cohort_id))
+
+# Endpoint to list the categories of a cohort
 @app.route('/rankingprojects/categories', methods=['GET'])
 def list_categories():
-    categories = get_all_categories()
+    try:
+        categories = get_cohort_categories(request_cohort())
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
     categories_list = []
     for category in categories:
         category_dict = {
@@ -730,63 +1402,458 @@ def list_categories():
         categories_list.append(category_dict)
     return jsonify(categories_list)
 
-# Endpoint to EVALUATE
-@app.route("/rankingprojects/evaluate", methods=["POST"])
-async def evaluate_project():
-    # Parse the JSON data from the request body
-    data = request.get_json()
+# Endpoint to GET EVERYTHING A PROJECT CARD NEEDS (core fields, likes, comments, relationships)
+@app.route('/rankingprojects/projectdetail', methods=['GET'])
+def project_detail():
+    project_id = request.args.get("project")
+    if not project_id:
+        return jsonify({"ok": False, "error": "Missing project parameter"}), 400
+
+    try:
+        comments_limit = max(0, int(request.args.get("comments", 20)))
+        relationships_limit = max(0, int(request.args.get("relationships", 5)))
+    except ValueError:
+        return jsonify({"ok": False, "error": "comments and relationships must be integers"}), 400
+
+    # Optional field selection: core columns and/or the likes, comments, relationships sections
+    requested = [f.strip() for f in (request.args.get("fields") or "").split(",") if f.strip()]
+    if not requested:
+        requested = list(PROJECT_DETAIL_CORE_FIELDS) + list(PROJECT_DETAIL_SECTIONS)
+    unknown = [f for f in requested if f not in PROJECT_DETAIL_CORE_FIELDS and f not in PROJECT_DETAIL_SECTIONS]
+    if unknown:
+        return jsonify({"ok": False, "error": "Unknown fields: " + ", ".join(unknown)}), 400
+
+    core = [f for f in requested if f in PROJECT_DETAIL_CORE_FIELDS]
+    columns = ["id"] + [f for f in core if f != "id"]
+    for section in PROJECT_DETAIL_SECTIONS:
+        if section in requested:
+            columns += PROJECT_DETAIL_SECTIONS[section]
+
+    # The viewer is the `user` parameter (same id as /addlike) or the Bearer token owner
+    user = request.args.get("user")
+    if user is None:
+        auth = request.headers.get("Authorization", "")
+        if auth.startswith("Bearer "):
+            try:
+                user = jwt.decode(auth.split(" ", 1)[1].strip(), JWT_SECRET_BYTES, algorithms=[JWT_ALG]).get("sub")
+            except Exception:
+                user = None
+
+    try:
+        row = get_project_columns(project_id, columns)
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+    if not row:
+        return jsonify({"ok": False, "error": "Project not found"}), 404
+
+    result = {"ok": True, "project": {f: row[f] for f in core}}
+
+    if "likes" in requested:
+        likes = parse_likes_data(row["likes"])
+        result["likes"] = {
+            "count": len(likes),
+            "liked": user is not None and any(str(l.get("user")) == str(user) for l in likes if isinstance(l, dict)),
+        }
+
+    if "comments" in requested:
+        conversation = parse_likes_data(row["conversation"])
+        result["comments"] = {
+            "total": len(conversation),
+            "latest": conversation[-comments_limit:] if comments_limit else [],
+        }
+
+    if "relationships" in requested:
+        result["relationships"] = {
+            "local": top_relationships(parse_likes_data(row["relationships_local"]), relationships_limit),
+            "global": top_relationships(parse_likes_data(row["relationships_global"]), relationships_limit),
+        }
+
+    return jsonify(result)
+
+# Tables that may be streamed over HTTP; users (password hashes) only through bulk_io.py
+PUBLIC_EXPORT_TABLES = ("categories", "projects")
+# Columns left out of the public export (owner emails); full dumps go through bulk_io.py
+PUBLIC_EXPORT_EXCLUDED = {"projects": ("email",)}
+
+# Endpoint to EXPORT A COHORT'S CATEGORIES AND PROJECTS AS NDJSON (streamed with a server-side cursor)
+@app.route('/rankingprojects/export', methods=['GET'])
+def export_ndjson():
+    tables = [t.strip() for t in (request.args.get("tables") or ",".join(PUBLIC_EXPORT_TABLES)).split(",") if t.strip()]
+    invalid = [t for t in tables if t not in PUBLIC_EXPORT_TABLES]
+    if invalid:
+        return jsonify({"ok": False, "error": "tables must be among: " + ", ".join(PUBLIC_EXPORT_TABLES)}), 400
+    try:
+        cohort_id = request_cohort()
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+
+    def generate():
+        for table in tables:
+            yield from iter_table_ndjson(table, cohort_id=cohort_id, exclude=PUBLIC_EXPORT_EXCLUDED.get(table, ()))
+
+    return app.response_class(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+# Endpoint to GET THE LEADERBOARD (top-N and a project's rank with its neighbours)
+@app.route('/rankingprojects/leaderboard', methods=['GET'])
+def leaderboard():
+    category_id = (request.args.get("category") or "").strip()
+    if category_id == "" or category_id.upper() == "GLOBAL":
+        category_id = None
+
+    sort = request.args.get("sort", "score")
+    if sort not in LEADERBOARD_SORTS:
+        return jsonify({"ok": False, "error": "sort must be one of: " + ", ".join(LEADERBOARD_SORTS)}), 400
+
+    try:
+        limit = max(1, min(LEADERBOARD_MAX_LIMIT, int(request.args.get("limit", 10))))
+        neighbours = max(0, min(LEADERBOARD_MAX_LIMIT, int(request.args.get("neighbours", 2))))
+        project_id = request.args.get("project")
+        project_id = int(project_id) if project_id else None
+        cohort_id = request_cohort()
+    except ValueError:
+        return jsonify({"ok": False, "error": "limit, neighbours, project and cohort must be integers"}), 400
+
+    try:
+        result = get_leaderboard(category_id, sort=sort, limit=limit, project_id=project_id, neighbours=neighbours,
+                                 cohort_id=cohort_id)
+        if project_id is not None and "project" not in result:
+            return jsonify({"ok": False, "error": "Project not found"}), 404
+        return jsonify({"ok": True, **result})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+# Endpoint to GET CATEGORY STATISTICS (counts, mean/median score, histogram, likes, evaluation coverage)
+@app.route('/rankingprojects/stats', methods=['GET'])
+def get_category_stats():
+    category_id = (request.args.get("category") or "").strip()
+    if category_id.upper() == "GLOBAL":
+        category_id = ""
+    try:
+        cohort_id = request_cohort()
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    try:
+        # Read from the incrementally maintained aggregates: a few rows per category, whatever the number of projects
+        stats = category_stats.load_stats(cohort_id, category_id or None)
+        if category_id:
+            if not stats["categories"]:
+                return jsonify({"ok": False, "error": "Category not found or empty"}), 404
+            del stats["global"]
+        return jsonify({"ok": True, **stats})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+# Endpoint to GET GRAPH (nodes and thresholded relationship edges)
+@app.route('/rankingprojects/graph', methods=['GET'])
+def get_graph():
+    scope = request.args.get("scope", "local")
+    if scope not in GRAPH_SCOPES:
+        return jsonify({"ok": False, "error": "scope must be one of: " + ", ".join(GRAPH_SCOPES)}), 400
+    category_id = (request.args.get("category") or "").strip() or None
+
+    try:
+        min_match = max(0, min(100, int(request.args.get("min_match", 0))))
+        top_k = max(1, min(GRAPH_MAX_TOP_K, int(request.args.get("top_k", 10))))
+        project_id = request.args.get("project")
+        project_id = int(project_id) if project_id else None
+        cohort_id = request_cohort()
+    except ValueError:
+        return jsonify({"ok": False, "error": "min_match, top_k, project and cohort must be integers"}), 400
+
+    try:
+        if project_id is not None:
+            cohort_id = project_cohort(project_id) or cohort_id
+        graph = build_graph(scope, category_id=category_id, project_id=project_id, min_match=min_match, top_k=top_k,
+                            cohort_id=cohort_id)
+        if graph is None:
+            return jsonify({"ok": False, "error": "Project not found"}), 404
+        return jsonify({"ok": True, "scope": scope, **graph})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+# Endpoint to UPLOAD A DOCUMENT (PDF) into the local blob store; returns the URL to save in the project
+@app.route('/rankingprojects/blobs', methods=['POST'])
+@require_auth
+def upload_blob():
+    if request.content_length and request.content_length > blob_store.BLOB_MAX_BYTES + 64 * 1024:
+        return jsonify({"ok": False, "error": f"File larger than {blob_store.BLOB_MAX_BYTES} bytes"}), 413
+    upload = request.files.get("file")
+    if upload is None and request.mimetype != "application/pdf":
+        return jsonify({"ok": False, "error": "Send the PDF as multipart field 'file' or as application/pdf"}), 400
+
+    try:
+        with phase("blob_write"):
+            blob_id, size, created = blob_store.put_stream(
+                upload.stream if upload is not None else request.stream, require_pdf=True
+            )
+    except BlobTooLarge:
+        return jsonify({"ok": False, "error": f"File larger than {blob_store.BLOB_MAX_BYTES} bytes"}), 413
+    except NotAPdf as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+    url = blob_store.blob_url(blob_store.BLOB_BASE_URL or request.host_url, blob_id)
+    return jsonify({"ok": True, "sha256": blob_id, "size": size, "created": created, "url": url}), 201 if created else 200
+
+# Endpoint to GET A DOCUMENT from the local blob store (Range requests supported)
+@app.route('/rankingprojects/blobs/<blob_name>', methods=['GET'])
+def get_blob(blob_name):
+    blob_id = blob_name[:-4] if blob_name.endswith(".pdf") else blob_name
+    if not blob_store.blob_exists(blob_id):
+        return jsonify({"ok": False, "error": "Not found"}), 404
+    response = send_file(blob_store.blob_path(blob_id), mimetype="application/pdf", conditional=True,
+                         etag=blob_id, max_age=31536000, download_name=f"{blob_id}.pdf")
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+# Endpoint to SEARCH PROJECTS (BM25 over text and extracted PDFs, with category/score filters)
+@app.route('/rankingprojects/search', methods=['GET'])
+def get_search():
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"ok": False, "error": "Missing q"}), 400
+    category_id = (request.args.get("category") or "").strip() or None
+
+    try:
+        limit = max(1, min(SEARCH_MAX_LIMIT, int(request.args.get("limit", 20))))
+        offset = max(0, int(request.args.get("offset", 0)))
+        min_score = request.args.get("min_score")
+        min_score = int(min_score) if min_score else None
+        max_score = request.args.get("max_score")
+        max_score = int(max_score) if max_score else None
+        cohort_id = request_cohort()
+    except ValueError:
+        return jsonify({"ok": False, "error": "limit, offset, min_score, max_score and cohort must be integers"}), 400
+
+    try:
+        found = search_projects(query, category_id=category_id, min_score=min_score, max_score=max_score,
+                                limit=limit, offset=offset, cohort_id=cohort_id)
+        return jsonify({"ok": True, "query": query, "limit": limit, "offset": offset, **found})
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+def changes_request_params(last_event_id, after, timeout):
+    """
+    (after, timeout) of a /changes request: resume after the SSE Last-Event-ID
+    header or ?after=; without either, only events from now on are sent.
+    Raises ValueError on malformed values.
+    """
+    after = last_event_id or after
+    after = int(after) if after not in (None, "") else None
+    timeout = float(timeout) if timeout not in (None, "") else CHANGE_FEED_LONG_POLL_TIMEOUT
+    return after, max(0.0, min(CHANGE_FEED_LONG_POLL_TIMEOUT, timeout))
+
+def changes_payload(after, events):
+    return {"ok": True, "last_id": events[-1].id if events else after, "events": [e.to_dict() for e in events]}
+
+# Endpoint to FOLLOW CHANGES (Server-Sent Events, or long polling with ?after=&timeout=)
+@app.route('/rankingprojects/changes', methods=['GET'])
+def get_changes():
+    stream = "text/event-stream" in request.headers.get("Accept", "")
+    try:
+        after, timeout = changes_request_params(
+            request.headers.get("Last-Event-ID"), request.args.get("after"), request.args.get("timeout")
+        )
+    except ValueError:
+        return jsonify({"ok": False, "error": "after must be an integer and timeout a number"}), 400
+
+    try:
+        if after is None:
+            after = change_feed.last_id()
+            if not stream:
+                # tells a long-polling client where to start from
+                return jsonify(changes_payload(after, []))
+        if not stream:
+            return jsonify(changes_payload(after, change_feed.wait(after, timeout)))
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+    def generate(last):
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        until = time.monotonic() + CHANGE_FEED_STREAM_SECONDS
+        while (remaining := until - time.monotonic()) > 0:
+            events = change_feed.wait(last, min(CHANGE_FEED_HEARTBEAT, remaining))
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                yield format_sse(event)
+                last = event.id
+
+    return app.response_class(generate(after), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+# ############################################
+# LLM OPERATIONS (shared by the Flask views and the ASGI routes in asgi_app.py)
+# ############################################
+
+def admission_client_key(authorization=None, remote_addr=None) -> str:
+    """
+    Who a LLM request is queued for: the logged-in user when a valid token is
+    sent, otherwise the client address. Nothing from the request body: an
+    anonymous client could pick a new key per request and skip its limit.
+    """
+    if authorization and authorization.startswith("Bearer "):
+        try:
+            payload = jwt.decode(authorization.split(" ", 1)[1].strip(), JWT_SECRET_BYTES, algorithms=[JWT_ALG])
+            if payload.get("email"):
+                return "user:" + str(payload["email"]).lower()
+        except Exception:
+            pass
+    return f"addr:{remote_addr or 'unknown'}"
+
+def admission_rejected_payload(e: AdmissionRejected):
+    return {"ok": False, "error": f"Too many requests ({e.reason}), retry later", "retry_after": e.retry_after}
+
+def deadline_exceeded_payload(e: DeadlineExceeded):
+    return {"ok": False, "error": str(e), "stage": e.stage, "document": e.document,
+            "budget": e.budget, "elapsed": e.elapsed}
+
+@request_timing.profiled
+@admission.admitted("evaluate")
+@deadline.bounded("evaluate")
+async def run_evaluation(data, store):
+    """
+    Evaluates a project against its category rubric.
+    The assessment runs once per set of inputs in the canonical language
+    (evaluation_cache.py); `lang` only picks the rendering that is returned and stored.
+    The UI's `prompt` is not used: the server builds the same prompt in the canonical language.
+    Project reads and the result go through `store` (ThreadedProjectStore, or
+    the aiomysql one of asgi_app).
+    Returns (payload, status).
+    """
+    data = data or {}
     project_id = data.get("project")
-    prompt = data.get("prompt")
     rubric = data.get("rubric")
     canvas = data.get("canvas")
     summary = data.get("summary")
     script = data.get("script")
 
-    rubric_text = await extract_pdf_text_from_url(rubric)
-    canvas_text = await extract_pdf_text_from_url(canvas)
-    summary_text = await extract_pdf_text_from_url(summary)
-
-    lang = normalize_lang(data.get("lang"))
+    if not project_id:
+        return {"ok": False, "error": "Missing project or prompt"}, 400
 
-    query = build_evaluate_query(
-        lang=lang,
-        user_prompt=prompt,
-        rubric_text=rubric_text,
-        canvas_text=canvas_text,
-        summary_text=summary_text,
-        script_text=script,
+    rubric_text, canvas_text, summary_text = await deadline.gather(
+        extract_pdf_text_from_url(rubric, "rubric"),
+        extract_pdf_text_from_url(canvas, "canvas"),
+        extract_pdf_text_from_url(summary, "summary"),
     )
+    # Keep the extracted text for /search instead of downloading the PDFs again
+    await asyncio.to_thread(save_document_texts, project_id,
+                            {"canvas": (canvas, canvas_text), "summary": (summary, summary_text)})
 
-    if not project_id or not query:
-        return jsonify({"ok": False, "error": "Missing project or prompt"}), 400
+    lang = normalize_lang(data.get("lang"))
+    title, category_label = await store.evaluation_context(project_id)
+
+    # The assessment is language independent: canonical prompt and language, whatever the UI sent
+    with phase("prompt"):
+        query = build_evaluate_query(
+            lang=EVALUATION_CANONICAL_LANG,
+            user_prompt=default_evaluate_prompt(EVALUATION_CANONICAL_LANG, title, category_label),
+            rubric_text=rubric_text,
+            canvas_text=canvas_text,
+            summary_text=summary_text,
+            script_text=script,
+        )
+
+    if not query:
+        return {"ok": False, "error": "Missing project or prompt"}, 400
+
+    model = llm_router.route_label("evaluation")
+    input_hash = evaluation_cache.evaluation_hash(query, model)
+    canonical = None
+    if evaluation_cache.EVALUATION_CACHE:
+        canonical = await asyncio.to_thread(evaluation_cache.load_result, input_hash)
+    request_timing.count("evaluation_cache_hit", int(canonical is not None))
+
+    if canonical is None:
+        try:
+            # LangChain returns a parsed python dict validated by Pydantic
+            with phase("llm"):
+                result = await deadline.within("llm", llm_router.ainvoke("evaluation", {"query": query}))
+            # result is a dict like: {"score":..., "evaluation":..., "criteria": [...], ...}
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            return {"ok": False, "error": f"LLM parsing failed: {str(e)}"}, 502
+        # Scores as ints in range, then kept as the canonical result for every language
+        canonical = evaluation_cache.normalize_result(result)
+        await asyncio.to_thread(evaluation_cache.save_result, input_hash, canonical, model)
 
-    try:
-        # LangChain returns a parsed python dict validated by Pydantic
-        result = evaluation_chain.invoke({"query": query})
-        # result is a dict like: {"score":..., "evaluation":..., ...}
-    except Exception as e:
-        return jsonify({"ok": False, "error": f"LLM parsing failed: {str(e)}"}), 502
-
-    # Ensure score is int and in range
-    try:
-        score = int(result.get("score"))
-        if score < 0: score = 0
-        if score > 100: score = 100
-        result["score"] = score
-    except Exception:
-        result["score"] = 0
+    result = await localize_evaluation(input_hash, canonical, lang)
 
     # Store evaluation as JSON string in DB (same as you do today)
     evaluation_json = json.dumps(result, ensure_ascii=False)
-    update_project_evaluation(project_id, result["score"], evaluation_json)
-    
-    return evaluation_json
+    await store.save_evaluation(project_id, result["score"], evaluation_json)
+    cohort_id = await store.project_cohort(project_id)
+    await asyncio.to_thread(invalidate_project_responses, project_id, cohort_id=cohort_id)
+    await asyncio.to_thread(change_feed.publish, "evaluation", project_id, {"score": result["score"]})
 
-# Endpoint to COMPARE PROJECTS
-@app.route("/rankingprojects/compareprojects", methods=["POST"])
-async def compare_projects():
-    # Parse the JSON data from the request body
-    data = request.get_json()
+    return result, 200
+
+async def localize_evaluation(input_hash, canonical, lang):
+    """
+    The canonical evaluation rendered in `lang`: its translation is made once per
+    (evaluation hash, lang) and reused. If the translation fails the canonical
+    rendering is returned, scores are the same either way.
+    """
+    if lang == EVALUATION_CANONICAL_LANG:
+        return evaluation_cache.render(canonical, None, lang, input_hash)
+
+    texts = await asyncio.to_thread(evaluation_cache.load_rendering, input_hash, lang)
+    if texts is None:
+        query = build_translate_evaluation_query(
+            EVALUATION_CANONICAL_LANG, lang, evaluation_cache.translatable_texts(canonical)
+        )
+        try:
+            with phase("llm_translate"):
+                texts = await deadline.within("llm", llm_router.ainvoke("translate_evaluation", {"query": query}))
+        except Exception as e:
+            # out of time included: the scores are already known, send them untranslated
+            print("Evaluation translation error:", repr(e))
+            return evaluation_cache.render(canonical, None, EVALUATION_CANONICAL_LANG, input_hash)
+        await asyncio.to_thread(evaluation_cache.save_rendering, input_hash, lang, texts)
+    return evaluation_cache.render(canonical, texts, lang, input_hash)
+
+@request_timing.profiled
+@admission.admitted("translate_evaluation")
+@deadline.bounded("translate_evaluation")
+async def run_localized_evaluation(data, store):
+    """
+    A project's stored evaluation in another language, without assessing it again.
+    Returns (payload, status).
+    """
+    data = data or {}
+    project_id = data.get("project")
+    if not project_id:
+        return {"ok": False, "error": "Missing project"}, 400
+    lang = normalize_lang(data.get("lang"))
+
+    stored = await store.project_evaluation(project_id)
+    if stored is None:
+        return {"ok": False, "error": "Project not found"}, 404
+    try:
+        stored = json.loads(stored) if stored else {}
+    except ValueError:
+        stored = {}
+
+    # Evaluations made before the canonical form existed are returned as they are
+    input_hash = stored.get("evaluation_hash") if isinstance(stored, dict) else None
+    if not input_hash or stored.get("lang") == lang:
+        return stored, 200
+    canonical = await asyncio.to_thread(evaluation_cache.load_result, input_hash)
+    if canonical is None:
+        return stored, 200
+    return await localize_evaluation(input_hash, canonical, lang), 200
+
+@request_timing.profiled
+@admission.admitted("compare")
+@deadline.bounded("compare")
+async def run_compare(data, store):
+    """
+    Compares a project with a list of other projects; the result is saved through `store`.
+    Returns (payload, status).
+    """
+    data = data or {}
     project_id = data.get("project")
     project_title = data.get("title")
     is_global = data.get("is_global")
@@ -798,29 +1865,35 @@ async def compare_projects():
 
     # Validate required fields
     if not project_id or not prompt or not other_projects:
-        return jsonify({"ok": False, "error": "Missing required fields: project, prompt, or other_projects"}), 400
+        return {"ok": False, "error": "Missing required fields: project, prompt, or other_projects"}, 400
 
-    original_canvas_text = await extract_pdf_text_from_url(canvas)
-    original_summary_text = await extract_pdf_text_from_url(summary)
+    async def optional_pdf_text(url, document):
+        return await extract_pdf_text_from_url(url, document) if url else "No disponible"
+
+    # All documents are downloaded concurrently: original first, then canvas/summary of each other project
+    texts = await deadline.gather(
+        extract_pdf_text_from_url(canvas, "canvas"),
+        extract_pdf_text_from_url(summary, "summary"),
+        *[optional_pdf_text(p.get(key), f"project {idx} {key}")
+          for idx, p in enumerate(other_projects, 1) for key in ("canvas", "summary")],
+    )
+    original_canvas_text, original_summary_text = texts[0], texts[1]
 
     # Build the section for other projects
     other_projects_blocks = []
     other_titles = []
+    headings = get_prompt_headings(lang)
+
+    canvas_h = headings["canvas"]
+    summary_h = headings["summary"]
 
     for idx, project in enumerate(other_projects, 1):
         project_title_other = project.get("title", f"Project {idx}")
-        project_canvas = project.get("canvas")
-        project_summary = project.get("summary")        
         other_titles.append(project_title_other)
 
         # Extract text from other projects' documents
-        canvas_text = await extract_pdf_text_from_url(project_canvas) if project_canvas else "No disponible"
-        summary_text = await extract_pdf_text_from_url(project_summary) if project_summary else "No disponible"
-
-        headings = get_prompt_headings(lang)
-
-        canvas_h = headings["canvas"]
-        summary_h = headings["summary"]
+        canvas_text = texts[2 * idx]
+        summary_text = texts[2 * idx + 1]
 
         block = "\n".join([
             f"--- PROJECT {idx}: {project_title_other} - {canvas_h} ---",
@@ -833,29 +1906,33 @@ async def compare_projects():
         other_projects_blocks.append(block)
 
     # Build final prompt
-    final_query = build_compare_query(
-        lang=lang,
-        user_prompt=prompt,
-        original_title=project_title,
-        original_canvas_text=original_canvas_text,
-        original_summary_text=original_summary_text,
-        other_projects_blocks=other_projects_blocks,
-        other_titles=other_titles,
-    )
+    with phase("prompt"):
+        final_query = build_compare_query(
+            lang=lang,
+            user_prompt=prompt,
+            original_title=project_title,
+            original_canvas_text=original_canvas_text,
+            original_summary_text=original_summary_text,
+            other_projects_blocks=other_projects_blocks,
+            other_titles=other_titles,
+        )
 
     if not project_id or not final_query:
-        return jsonify({"ok": False, "error": "Missing project or prompt"}), 400
+        return {"ok": False, "error": "Missing project or prompt"}, 400
 
     try:
-        parsed = compare_chain.invoke({"query": final_query})
+        with phase("llm"):
+            parsed = await deadline.within("llm", llm_router.ainvoke("compare", {"query": final_query}))
         # parsed is a dict: {"results":[{...}, ...]}
+    except DeadlineExceeded:
+        raise
     except Exception as e:
-        return jsonify({"ok": False, "error": f"LLM parsing failed: {str(e)}"}), 502
+        return {"ok": False, "error": f"LLM parsing failed: {str(e)}"}, 502
 
     # Normalize match to int 0..100
     results = parsed.get("results") if isinstance(parsed, dict) else None
     if not isinstance(results, list):
-        return jsonify({"ok": False, "error": "Unexpected model output format"}), 502
+        return {"ok": False, "error": "Unexpected model output format"}, 502
 
     for item in results:
         try:
@@ -874,50 +1951,132 @@ async def compare_projects():
             item["similarities"] = str(item.get("similarities") or "")            
 
     relationships_json = json.dumps(results, ensure_ascii=False)
-    
-    if is_global:
-        update_project_relationships_global(project_id, relationships_json)
-    else:
-        update_project_relationships_local(project_id, relationships_json)
-
-    return results
-
-# Endpoint to FIND OUT CATEGORY OF THE PROJECT
-@app.route("/rankingprojects/findoutcategory", methods=["POST"])
-async def findoutcategory_project():
-    # Parse the JSON data from the request body
-    data = request.get_json()
+    await store.save_relationships(project_id, relationships_json, bool(is_global))
+    cohort_id = await store.project_cohort(project_id)
+    await asyncio.to_thread(invalidate_project_responses, project_id, cohort_id=cohort_id)
+    await asyncio.to_thread(change_feed.publish, "relationships", project_id,
+                            {"scope": "global" if is_global else "local"})
+
+    return results, 200
+
+@request_timing.profiled
+@admission.admitted("find_category")
+@deadline.bounded("find_category")
+async def run_find_category(data):
+    """Suggests the category of a project. Returns (payload, status)."""
+    data = data or {}
     prompt = data.get("prompt")
     canvas = data.get("canvas")
     summary = data.get("summary")
     script = data.get("script")
     lang = normalize_lang(data.get("lang"))
+    try:
+        cohort_id = parse_cohort(data.get("cohort"))
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}, 400
 
-    canvas_text = await extract_pdf_text_from_url(canvas)
-    summary_text = await extract_pdf_text_from_url(summary)
-
-    final_query = build_find_category_query(
-        lang=lang,
-        user_prompt=prompt,
-        canvas_text=canvas_text,
-        summary_text=summary_text,
-        script_text=script
+    canvas_text, summary_text = await deadline.gather(
+        extract_pdf_text_from_url(canvas, "canvas"),
+        extract_pdf_text_from_url(summary, "summary"),
     )
 
+    # Cached; the periodic version check is a blocking query, keep it off the event loop
+    categories_hint = await asyncio.to_thread(get_categories_hint, cohort_id)
+
+    with phase("prompt"):
+        final_query = build_find_category_query(
+            lang=lang,
+            user_prompt=prompt,
+            canvas_text=canvas_text,
+            summary_text=summary_text,
+            script_text=script,
+            categories_hint=categories_hint
+        )
+
     if not final_query:
-        return jsonify({"ok": False, "error": "Missing prompt"}), 400
+        return {"ok": False, "error": "Missing prompt"}, 400
 
     try:
-        result = find_category_chain.invoke({"query": final_query})
+        with phase("llm"):
+            result = await deadline.within("llm", llm_router.ainvoke("find_category", {"query": final_query}))
+    except DeadlineExceeded:
+        raise
     except Exception as e:
-        return jsonify({"ok": False, "error": f"LLM parsing failed: {str(e)}"}), 502
+        return {"ok": False, "error": f"LLM parsing failed: {str(e)}"}, 502
 
-    category_id = result.get("category_id", None)
-    category_name = result.get("category_name", None)
-    category_description = result.get("category_description", None)
-    project_short_description = result.get("project_short_description", None)
+    # Normalize the answer against the cached categories (no DB round trip)
+    category = resolve_category(result.get("category_id", None), result.get("category_name", None), cohort_id)
+    if category:
+        result["category_id"] = str(category[0])
+        result["category_name"] = category[1]
 
-    return result
+    return result, 200
+
+class ThreadedProjectStore:
+    """
+    The project reads and writes of the LLM operations, for the Flask app: the
+    pymysql helpers run in worker threads. asgi_app has the same methods on its
+    aiomysql pool.
+    """
+
+    async def evaluation_context(self, project_id):
+        return await asyncio.to_thread(get_evaluation_context, project_id)
+
+    async def project_evaluation(self, project_id):
+        return await asyncio.to_thread(get_project_evaluation, project_id)
+
+    async def project_cohort(self, project_id):
+        return await asyncio.to_thread(project_cohort, project_id)
+
+    async def save_evaluation(self, project_id, score, evaluation_json):
+        await asyncio.to_thread(update_project_evaluation, project_id, score, evaluation_json)
+
+    async def save_relationships(self, project_id, relationships_json, is_global):
+        if is_global:
+            await asyncio.to_thread(update_project_relationships_global, project_id, relationships_json)
+        else:
+            await asyncio.to_thread(update_project_relationships_local, project_id, relationships_json)
+
+threaded_store = ThreadedProjectStore()
+
+def request_client_key():
+    return admission_client_key(request.headers.get("Authorization", ""), request.remote_addr)
+
+@app.errorhandler(AdmissionRejected)
+def handle_admission_rejected(e):
+    return jsonify(admission_rejected_payload(e)), 429, {"Retry-After": str(e.retry_after)}
+
+@app.errorhandler(DeadlineExceeded)
+def handle_deadline_exceeded(e):
+    return jsonify(deadline_exceeded_payload(e)), 504
+
+# Endpoint to EVALUATE
+@app.route("/rankingprojects/evaluate", methods=["POST"])
+async def evaluate_project():
+    data = request.get_json()
+    payload, status = await run_evaluation(data, threaded_store, client_key=request_client_key())
+    return jsonify(payload), status
+
+# Endpoint to GET THE EVALUATION OF A PROJECT IN ANOTHER LANGUAGE
+@app.route("/rankingprojects/evaluation", methods=["GET"])
+async def localized_evaluation():
+    data = {"project": request.args.get("project"), "lang": request.args.get("lang")}
+    payload, status = await run_localized_evaluation(data, threaded_store, client_key=request_client_key())
+    return jsonify(payload), status
+
+# Endpoint to COMPARE PROJECTS
+@app.route("/rankingprojects/compareprojects", methods=["POST"])
+async def compare_projects():
+    data = request.get_json()
+    payload, status = await run_compare(data, threaded_store, client_key=request_client_key())
+    return jsonify(payload), status
+
+# Endpoint to FIND OUT CATEGORY OF THE PROJECT
+@app.route("/rankingprojects/findoutcategory", methods=["POST"])
+async def findoutcategory_project():
+    data = request.get_json()
+    payload, status = await run_find_category(data, client_key=request_client_key())
+    return jsonify(payload), status
 
 # Endpoint to GET MY PROJECT
 @app.route("/rankingprojects/my/project", methods=["GET"])
@@ -960,6 +2119,9 @@ def my_project_update():
 
     # Return updated project
     updated = get_project_by_owner_email(owner_email)
+    if updated:
+        invalidate_project_responses(cohort_id=updated[18])
+        change_feed.publish("project_updated", updated[0], fields)
     return jsonify({"ok": True, "project": project_row_to_dict(updated)})
 
 # Endpoint to DELETE MY PROJECT
@@ -972,6 +2134,8 @@ def my_project_delete():
         return jsonify({"ok": False, "error": "No project found to delete."}), 404
 
     delete_project_by_owner_email(owner_email)
+    invalidate_project_responses(existing[0], likes=True, conversation=True, cohort_id=existing[18])
+    change_feed.publish("project_deleted", existing[0])
     return jsonify({"ok": True})
 
 # Endpoint to DELETE ACCOUNT
@@ -979,7 +2143,11 @@ def my_project_delete():
 @require_auth
 def delete_me():
     owner_email = request.user.get("email")
+    existing = get_project_by_owner_email(owner_email)
     delete_user_and_projects(owner_email)
+    if existing:
+        invalidate_project_responses(existing[0], likes=True, conversation=True, cohort_id=existing[18])
+        change_feed.publish("project_deleted", existing[0])
     return jsonify({"ok": True})
 
 # Endpoint to ADD CONVERSATION ENTRY
@@ -992,6 +2160,10 @@ def add_conversation_entry():
 
     if not all([user is not None, project, text]):
         return jsonify({"ok": False, "error": "Missing parameters"}), 400
+    try:
+        project = parse_project_id(project)
+    except ValueError:
+        return jsonify({"ok": False, "error": "project must be an integer"}), 400
 
     try:
         name = get_user_name(user) or "Unknown"
@@ -999,6 +2171,8 @@ def add_conversation_entry():
         new_entry = {"user": user, "name": name, "text": text}
         conversation.append(new_entry)
         success = update_project_conversation(project, conversation)
+        invalidate_project_responses(project, conversation=True, graph=False)
+        change_feed.publish("comment_added", project, {"entry": new_entry, "count": len(conversation)})
         return jsonify(success)
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
@@ -1006,13 +2180,16 @@ def add_conversation_entry():
 # Endpoint to GET CONVERSATION
 @app.route("/rankingprojects/getconversation", methods=["GET"])
 def get_conversation():
-    project = request.args.get("project")
-    if not project:
-        return jsonify({"ok": False, "error": "Missing project parameter"}), 400
+    try:
+        project = parse_project_id(request.args.get("project"))
+    except ValueError:
+        return jsonify({"ok": False, "error": "Missing or invalid project parameter"}), 400
 
     try:
-        conversation = get_project_conversation(project)
-        return jsonify(conversation)
+        return cached_json_response(
+            project_cache_key("conversation", project),
+            lambda: get_project_conversation(project)
+        )
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
@@ -1025,6 +2202,10 @@ def add_like():
 
     if not all([user is not None, project]):
         return jsonify({"ok": False, "error": "Missing parameters"}), 400
+    try:
+        project = parse_project_id(project)
+    except ValueError:
+        return jsonify({"ok": False, "error": "project must be an integer"}), 400
 
     try:
         name = get_user_name(user) or "Unknown"
@@ -1032,6 +2213,8 @@ def add_like():
         new_entry = {"user": user, "name": name}
         likes.append(new_entry)
         success = update_project_likes(project, likes)
+        invalidate_project_responses(project, likes=True, graph=False)
+        change_feed.publish("like_added", project, {"user": user, "name": name, "like_count": len(likes)})
         return jsonify(success)
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
@@ -1045,11 +2228,17 @@ def remove_like():
 
     if not all([user is not None, project]):
         return jsonify({"ok": False, "error": "Missing parameters"}), 400
+    try:
+        project = parse_project_id(project)
+    except ValueError:
+        return jsonify({"ok": False, "error": "project must be an integer"}), 400
 
     try:
         likes = get_project_likes(project)
         updated_likes = remove_user_by_id(likes, user)
         success = update_project_likes(project, updated_likes)
+        invalidate_project_responses(project, likes=True, graph=False)
+        change_feed.publish("like_removed", project, {"user": user, "like_count": len(updated_likes)})
         return jsonify(success)
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
@@ -1057,13 +2246,16 @@ def remove_like():
 # Endpoint to GET LIKES
 @app.route("/rankingprojects/getlikes", methods=["GET"])
 def get_likes():
-    project = request.args.get("project")
-    if not project:
-        return jsonify({"ok": False, "error": "Missing project parameter"}), 400
+    try:
+        project = parse_project_id(request.args.get("project"))
+    except ValueError:
+        return jsonify({"ok": False, "error": "Missing or invalid project parameter"}), 400
 
     try:
-        likes = get_project_likes(project)
-        return jsonify(likes)
+        return cached_json_response(
+            project_cache_key("likes", project),
+            lambda: get_project_likes(project)
+        )
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
@@ -0,0 +1,440 @@
+# relationship_scheduler.py
+"""
+Scheduled recompute of project relationships (the work /compareprojects does
+when someone clicks compare in the UI), so the whole network stays fresh.
+
+    python relationship_scheduler.py plan [--scope both|local|global] [--block-size 8] [--cohort 2]
+    python relationship_scheduler.py run [--concurrency 2] [--max-calls 200] [--max-tokens 5000000]
+    python relationship_scheduler.py status
+    python relationship_scheduler.py loop --interval 3600 [plan and run options]
+
+plan finds projects whose relationships are missing or stale and writes one
+row per (project, scope) to relationship_schedule with the candidates to
+compare against. Candidates come from blocking instead of all pairs:
+
+    local   the most similar projects of the same category (what the UI compares)
+    global  the most similar projects across all categories of the same cohort
+
+Similarity is IDF-weighted word overlap of title and description, found
+through an inverted index, so only projects sharing a word are ever scored.
+Each cohort (cohorts.py) gets its own index, so candidates never come from
+another program and planning one cohort (--cohort) only reads its projects.
+
+A scope is stale when it was never computed, when the project's content
+changed after it (content_updated_at), when a candidate is not in the stored
+relationships yet, or when a candidate's content changed after it.
+
+run works through the pending rows with rankingprojects.run_compare under a
+concurrency limit and a budget (--max-calls LLM calls and --max-tokens,
+estimated as --tokens-per-doc per downloaded document). Every row moves
+pending -> running -> done/failed in the database, so a run stopped by the
+budget, a crash or a restart resumes where it left off; rows left 'running'
+by a dead process are picked up again. New results are merged into the
+stored relationships: entries for the compared titles are replaced, the
+others are kept. Only one run at a time is allowed (GET_LOCK).
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import math
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pymysql
+import pymysql.cursors
+
+import json_codec
+from database import db_config
+
+SCOPES = ("local", "global")
+LOCK_NAME = "relationship_scheduler"
+
+# Words that appear in more than this share of the projects do not create candidates
+MAX_DOCUMENT_FREQUENCY = 0.2
+MIN_WORD_LENGTH = 3
+WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# Prompt overhead on top of the documents, for the token estimate
+PROMPT_OVERHEAD_TOKENS = 800
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    return {w for w in WORD_RE.findall((text or "").lower()) if len(w) >= MIN_WORD_LENGTH}
+
+
+def title_key(title: Any) -> str:
+    return str(title or "").strip().lower()
+
+
+def load_projects(cohort_id: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+    where, params = ("WHERE cohort_id = %s", (cohort_id,)) if cohort_id is not None else ("", ())
+    connection = pymysql.connect(**db_config, cursorclass=pymysql.cursors.DictCursor)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT id, cohort_id, title, description, category_id, canvas, summary, content_updated_at,
+                       relationships_local, relationships_global, relationships_local_at, relationships_global_at
+                FROM projects {where}
+                """,
+                params
+            )
+            return {row["id"]: row for row in cursor.fetchall()}
+    finally:
+        connection.close()
+
+
+def group_by_cohort(projects: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[int, Dict[str, Any]]]:
+    cohorts: Dict[int, Dict[int, Dict[str, Any]]] = defaultdict(dict)
+    for project_id, project in projects.items():
+        cohorts[project["cohort_id"]][project_id] = project
+    return dict(cohorts)
+
+
+def build_similarity_index(projects: Dict[int, Dict[str, Any]]):
+    """Returns (words per project, project ids per word, idf per word) over title + description."""
+    words = {pid: tokenize(f"{p['title'] or ''} {p['description'] or ''}") for pid, p in projects.items()}
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for pid, project_words in words.items():
+        for word in project_words:
+            postings[word].append(pid)
+    total = max(1, len(projects))
+    max_df = max(2, int(total * MAX_DOCUMENT_FREQUENCY))
+    idf = {word: math.log(total / len(ids)) for word, ids in postings.items() if len(ids) <= max_df}
+    return words, postings, idf
+
+
+def block_candidates(project_id: int, projects, index, scope: str, block_size: int) -> List[int]:
+    """The block_size most similar projects for `scope`; local blocks are filled up from the category."""
+    words, postings, idf = index
+    category = projects[project_id]["category_id"]
+    scores: Dict[int, float] = defaultdict(float)
+    for word in words[project_id]:
+        weight = idf.get(word)
+        if weight is None:
+            continue
+        for other in postings[word]:
+            if other == project_id:
+                continue
+            if scope == "local" and projects[other]["category_id"] != category:
+                continue
+            scores[other] += weight
+
+    ranked = sorted(scores, key=lambda other: (-scores[other], other))[:block_size]
+    if scope == "local" and len(ranked) < block_size:
+        chosen = set(ranked)
+        ranked += [other for other in sorted(projects)
+                   if other != project_id and other not in chosen
+                   and projects[other]["category_id"] == category][:block_size - len(ranked)]
+    return ranked
+
+
+def stale_reason(project_id: int, projects, scope: str, candidates: List[int]) -> Optional[str]:
+    """Why the stored relationships of `scope` need a recompute, or None when they are fresh."""
+    project = projects[project_id]
+    computed_at = project[f"relationships_{scope}_at"]
+    relationships = json_codec.parse_json_column(project[f"relationships_{scope}"], [])
+    if computed_at is None or not relationships:
+        return "missing"
+    if project["content_updated_at"] and project["content_updated_at"] > computed_at:
+        return "content"
+    known = {title_key(item.get("title")) for item in relationships if isinstance(item, dict)}
+    if any(title_key(projects[c]["title"]) not in known for c in candidates):
+        return "new_candidates"
+    if any(projects[c]["content_updated_at"] and projects[c]["content_updated_at"] > computed_at
+           for c in candidates):
+        return "candidate_content"
+    return None
+
+
+def estimate_tokens(candidates: int, tokens_per_doc: int) -> int:
+    # canvas + summary of the project and of every candidate
+    return PROMPT_OVERHEAD_TOKENS + tokens_per_doc * 2 * (1 + candidates)
+
+
+REASON_PRIORITY = {"missing": 0, "content": 1, "candidate_content": 2, "new_candidates": 3}
+
+
+def plan(scopes: Iterable[str], block_size: int, tokens_per_doc: int, limit: Optional[int] = None,
+         cohort_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Writes the stale (project, scope) pairs to relationship_schedule as pending,
+    for every cohort or only `cohort_id`. Pending rows (of the planned cohorts)
+    that are no longer stale are dropped; running rows are left alone.
+    """
+    items = []
+    for members in group_by_cohort(load_projects(cohort_id)).values():
+        index = build_similarity_index(members)
+        for scope in scopes:
+            for project_id in sorted(members):
+                candidates = block_candidates(project_id, members, index, scope, block_size)
+                if not candidates:
+                    continue
+                reason = stale_reason(project_id, members, scope, candidates)
+                if reason is not None:
+                    items.append((project_id, scope, reason, candidates))
+    items.sort(key=lambda item: (REASON_PRIORITY[item[2]], item[0]))
+    if limit:
+        items = items[:limit]
+
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT NOW()")
+            planned_at = cursor.fetchone()[0]
+            cursor.executemany(
+                """
+                INSERT INTO relationship_schedule
+                    (project_id, scope, status, reason, candidates, attempts, estimated_tokens, planned_at)
+                VALUES (%s, %s, 'pending', %s, %s, 0, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    attempts = IF(status = 'done', 0, attempts),
+                    status = IF(status = 'running', status, 'pending'),
+                    reason = VALUES(reason),
+                    candidates = VALUES(candidates),
+                    estimated_tokens = VALUES(estimated_tokens),
+                    planned_at = VALUES(planned_at)
+                """,
+                [(project_id, scope, reason, json_codec.dumps_text(candidates),
+                  estimate_tokens(len(candidates), tokens_per_doc), planned_at)
+                 for project_id, scope, reason, candidates in items]
+            )
+            if cohort_id is None:
+                cursor.execute(
+                    "DELETE FROM relationship_schedule WHERE status = 'pending' AND planned_at < %s",
+                    (planned_at,)
+                )
+            else:
+                cursor.execute(
+                    "DELETE s FROM relationship_schedule s JOIN projects p ON p.id = s.project_id "
+                    "WHERE p.cohort_id = %s AND s.status = 'pending' AND s.planned_at < %s",
+                    (cohort_id, planned_at)
+                )
+        connection.commit()
+    finally:
+        connection.close()
+
+    counts: Dict[str, int] = defaultdict(int)
+    for _, scope, reason, _ in items:
+        counts[f"{scope}:{reason}"] += 1
+    return dict(counts)
+
+
+def set_item_status(project_id: int, scope: str, status: str, error: Optional[str] = None) -> None:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            if status == "running":
+                cursor.execute(
+                    "UPDATE relationship_schedule SET status = 'running', attempts = attempts + 1 "
+                    "WHERE project_id = %s AND scope = %s",
+                    (project_id, scope)
+                )
+            else:
+                cursor.execute(
+                    "UPDATE relationship_schedule SET status = %s, last_error = %s, finished_at = NOW() "
+                    "WHERE project_id = %s AND scope = %s",
+                    (status, (error or "")[:500], project_id, scope)
+                )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def load_pending(max_attempts: int) -> List[Tuple[int, str, List[int], int]]:
+    """Pending rows (and rows a dead run left 'running'), most urgent first."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT project_id, scope, candidates, estimated_tokens
+                FROM relationship_schedule
+                WHERE status IN ('pending', 'running', 'failed') AND attempts < %s
+                ORDER BY FIELD(reason, 'missing', 'content', 'candidate_content', 'new_candidates'), planned_at, project_id
+                """,
+                (max_attempts,)
+            )
+            rows = cursor.fetchall()
+    finally:
+        connection.close()
+    return [(row[0], row[1], json_codec.parse_json_column(row[2], []), row[3] or 0) for row in rows]
+
+
+def save_merged_relationships(project_id: int, relationships_json: str, is_global: bool) -> None:
+    """Replaces the entries for the compared titles and keeps the rest of the stored relationships."""
+    column = "relationships_global" if is_global else "relationships_local"
+    new_items = json_codec.parse_json_column(relationships_json, [])
+    new_titles = {title_key(item.get("title")) for item in new_items if isinstance(item, dict)}
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {column} FROM projects WHERE id = %s FOR UPDATE", (project_id,))
+            row = cursor.fetchone()
+            current = json_codec.parse_json_column(row[0], []) if row else []
+            kept = [item for item in current if isinstance(item, dict) and title_key(item.get("title")) not in new_titles]
+            cursor.execute(
+                f"UPDATE projects SET {column} = %s, {column}_at = NOW(), created_at = created_at WHERE id = %s",
+                (json_codec.dumps_text(kept + new_items), project_id)
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def merging_store(rankingprojects):
+    """The app's project store, except that relationships are merged (save_merged_relationships)."""
+    class MergingStore(rankingprojects.ThreadedProjectStore):
+        async def save_relationships(self, project_id, relationships_json, is_global):
+            await asyncio.to_thread(save_merged_relationships, project_id, relationships_json, is_global)
+    return MergingStore()
+
+
+async def compare_item(rankingprojects, store, projects, project_id: int, scope: str, candidates: List[int], lang: str):
+    from prompt_builder import default_compare_prompt
+
+    project = projects[project_id]
+    others = [projects[c] for c in candidates if c in projects]
+    data = {
+        "project": project_id,
+        "title": project["title"],
+        "is_global": scope == "global",
+        "prompt": default_compare_prompt(lang, project["title"]),
+        "lang": lang,
+        "canvas": project["canvas"],
+        "summary": project["summary"],
+        "other_projects": [{"title": o["title"], "canvas": o["canvas"], "summary": o["summary"]} for o in others],
+    }
+    return await rankingprojects.run_compare(data, store, client_key="scheduler")
+
+
+async def run_pending(concurrency: int, max_calls: Optional[int], max_tokens: Optional[int],
+                      max_attempts: int, lang: str, log=print) -> Dict[str, int]:
+    import llm_models
+    import rankingprojects
+
+    # One event loop for the whole run, and the scheduler is the only client of its own admission controller
+    llm_models.ASYNC_CLIENTS = True
+    rankingprojects.admission.max_per_client = 0
+
+    store = merging_store(rankingprojects)
+    projects = load_projects()
+    items = load_pending(max_attempts)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    counts = {"done": 0, "failed": 0, "skipped": 0, "deferred": 0, "calls": 0, "estimated_tokens": 0}
+
+    async def process(project_id, scope, candidates):
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                _, status = await compare_item(rankingprojects, store, projects, project_id, scope, candidates, lang)
+                error = None if status == 200 else f"HTTP {status}"
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+            await asyncio.to_thread(set_item_status, project_id, scope, "failed" if error else "done", error)
+            counts["failed" if error else "done"] += 1
+            log(f"{scope} {project_id}: {error or 'done'} in {time.monotonic() - started:.1f}s")
+
+    tasks = []
+    for project_id, scope, candidates, estimated in items:
+        if project_id not in projects or not any(c in projects for c in candidates):
+            await asyncio.to_thread(set_item_status, project_id, scope, "done", "project or candidates deleted")
+            counts["skipped"] += 1
+            continue
+        if (max_calls is not None and counts["calls"] >= max_calls) or \
+           (max_tokens is not None and counts["estimated_tokens"] + estimated > max_tokens):
+            counts["deferred"] += 1  # stays pending for the next run
+            continue
+        counts["calls"] += 1
+        counts["estimated_tokens"] += estimated
+        await asyncio.to_thread(set_item_status, project_id, scope, "running")
+        tasks.append(asyncio.create_task(process(project_id, scope, candidates)))
+    await asyncio.gather(*tasks)
+    return counts
+
+
+def run(concurrency: int, max_calls: Optional[int], max_tokens: Optional[int],
+        max_attempts: int, lang: str) -> Optional[Dict[str, int]]:
+    """Runs the pending schedule while holding the scheduler lock; None when another run holds it."""
+    lock_connection = pymysql.connect(**db_config)
+    try:
+        with lock_connection.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+            if cursor.fetchone()[0] != 1:
+                return None
+        try:
+            return asyncio.run(run_pending(concurrency, max_calls, max_tokens, max_attempts, lang))
+        finally:
+            with lock_connection.cursor() as cursor:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+    finally:
+        lock_connection.close()
+
+
+def status_summary() -> List[Tuple[str, str, int, int]]:
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT scope, status, COUNT(*), COALESCE(SUM(estimated_tokens), 0)
+                FROM relationship_schedule
+                GROUP BY scope, status
+                ORDER BY scope, status
+                """
+            )
+            return [(row[0], row[1], int(row[2]), int(row[3])) for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scheduled recompute of local/global project relationships.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_plan_args(p):
+        p.add_argument("--scope", choices=("both",) + SCOPES, default="both")
+        p.add_argument("--block-size", type=int, default=8, help="Candidates compared per project")
+        p.add_argument("--limit", type=int, default=None, help="Plan at most this many items")
+        p.add_argument("--tokens-per-doc", type=int, default=3000, help="Token estimate per downloaded PDF")
+        p.add_argument("--cohort", type=int, default=None, help="Only plan the projects of this cohort")
+
+    def add_run_args(p):
+        p.add_argument("--concurrency", type=int, default=2)
+        p.add_argument("--max-calls", type=int, default=None, help="LLM calls per run")
+        p.add_argument("--max-tokens", type=int, default=None, help="Estimated prompt tokens per run")
+        p.add_argument("--max-attempts", type=int, default=3)
+        p.add_argument("--lang", default="en", help="Language of the generated relationships")
+
+    add_plan_args(sub.add_parser("plan", help="Write stale (project, scope) pairs to the schedule"))
+    add_run_args(sub.add_parser("run", help="Work through the pending schedule"))
+    sub.add_parser("status", help="Counts per scope and status")
+    loop = sub.add_parser("loop", help="plan + run every --interval seconds")
+    loop.add_argument("--interval", type=float, default=3600)
+    add_plan_args(loop)
+    add_run_args(loop)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        for scope, status, count, tokens in status_summary():
+            print(f"{scope:<8}{status:<10}{count:>8}{tokens:>14}")
+        return 0
+
+    while True:
+        if args.command in ("plan", "loop"):
+            scopes = SCOPES if args.scope == "both" else (args.scope,)
+            print("planned", plan(scopes, args.block_size, args.tokens_per_doc, args.limit, args.cohort))
+        if args.command in ("run", "loop"):
+            counts = run(args.concurrency, args.max_calls, args.max_tokens, args.max_attempts, args.lang)
+            print("another run holds the scheduler lock" if counts is None else counts)
+        if args.command != "loop":
+            return 0
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# request_timing.py
+"""
+Request-scoped phase timing.
+
+A RequestTimer lives in a context variable for the duration of a request;
+code anywhere below the view marks phases with
+
+    with phase("llm"):
+        ...
+
+or decorates helpers with @timed("db"), and adds per-request totals with
+count("text_removed_chars", n). The context variable follows the
+request into asyncio tasks (gather) and worker threads (asyncio.to_thread),
+so concurrent downloads of one request all add up on the same timer.
+
+At the end of the request the serving layer (Flask hooks in rankingprojects,
+middleware in asgi_app) calls finish(): the phases go out as a Server-Timing
+header and one structured log line, and requests slower than
+SLOW_REQUEST_MS are sampled into a WARNING with the per-phase breakdown and,
+when the request was picked for profiling, the top of a cProfile capture.
+
+    SLOW_REQUEST_MS=5000             threshold for the slow-request log
+    SLOW_REQUEST_SAMPLE_RATE=1.0     fraction of slow requests that are logged
+    REQUEST_PROFILE_RATE=0           fraction of requests run under cProfile
+    REQUEST_PROFILE_DIR=             also write .prof files for slow profiled requests here
+    REQUEST_LOG_LEVEL=INFO           INFO: one line per request; WARNING: slow requests only
+
+configure_logging() (called when rankingprojects is imported) sends the
+"rankingprojects.timing" lines to stderr, unless the server's logging
+configuration already gave that logger a handler.
+"""
+from __future__ import annotations
+import asyncio
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "5000"))
+SLOW_REQUEST_SAMPLE_RATE = float(os.getenv("SLOW_REQUEST_SAMPLE_RATE", "1.0"))
+REQUEST_PROFILE_RATE = float(os.getenv("REQUEST_PROFILE_RATE", "0"))
+REQUEST_PROFILE_DIR = os.getenv("REQUEST_PROFILE_DIR") or None
+REQUEST_LOG_LEVEL = os.getenv("REQUEST_LOG_LEVEL", "INFO").upper()
+
+logger = logging.getLogger("rankingprojects.timing")
+
+
+def configure_logging(level: str = REQUEST_LOG_LEVEL) -> None:
+    """Without any logging set up, Python drops INFO records: give the request log a handler."""
+    logger.setLevel(level)
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logger.addHandler(handler)
+    logger.propagate = False
+
+
+class RequestTimer:
+    def __init__(self, method: str, path: str, profile: bool = False):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.profile = profile
+        self._lock = threading.Lock()
+        self.phases: Dict[str, List[float]] = {}  # name -> [total seconds, count]
+        self.counters: Dict[str, int] = {}
+        self._profilers: Dict[int, cProfile.Profile] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.phases.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def count(self, name: str, value: int) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total: float) -> str:
+        parts = []
+        for name, (seconds, count) in self.phases.items():
+            item = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                item += f';desc="x{count}"'
+            parts.append(item)
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+    def breakdown(self, total: float) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"ms": round(seconds * 1000, 1), "count": count,
+                   "share": round(seconds / total, 3) if total > 0 else 0.0}
+            for name, (seconds, count) in sorted(self.phases.items(), key=lambda kv: -kv[1][0])
+        }
+
+    def enable_profile(self) -> bool:
+        """Starts a profiler for the calling thread if this request was picked for profiling."""
+        ident = threading.get_ident()
+        with self._lock:
+            if not self.profile or ident in self._profilers:
+                return False
+            profiler = self._profilers[ident] = cProfile.Profile()
+        profiler.enable()
+        return True
+
+    def disable_profile(self) -> None:
+        profiler = self._profilers.get(threading.get_ident())
+        if profiler is not None:
+            profiler.disable()
+
+    @contextmanager
+    def profiling(self):
+        """Runs the block under cProfile when this request was picked for profiling (one profiler per thread)."""
+        if not self.enable_profile():
+            yield
+            return
+        try:
+            yield
+        finally:
+            self.disable_profile()
+
+    def profile_stats(self) -> Optional[pstats.Stats]:
+        profilers = list(self._profilers.values())
+        if not profilers:
+            return None
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+
+_current: contextvars.ContextVar[Optional[RequestTimer]] = contextvars.ContextVar("request_timer", default=None)
+
+
+def current() -> Optional[RequestTimer]:
+    return _current.get()
+
+
+def start(method: str, path: str):
+    """Starts timing a request; returns the token to pass to finish()."""
+    timer = RequestTimer(method, path, profile=REQUEST_PROFILE_RATE > 0 and random.random() < REQUEST_PROFILE_RATE)
+    return _current.set(timer)
+
+
+@contextmanager
+def phase(name: str):
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - started)
+
+
+def count(name: str, value: int) -> None:
+    """Adds `value` to a per-request counter reported in the request log line."""
+    timer = _current.get()
+    if timer is not None:
+        timer.count(name, value)
+
+
+def timed(name: str):
+    """Decorator: every call of the function counts as phase `name` (sync or async functions)."""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with phase(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profiled(fn):
+    """Decorator for coroutines: profiles the event-loop thread running them when the request is sampled."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        timer = _current.get()
+        if timer is None:
+            return await fn(*args, **kwargs)
+        with timer.profiling():
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
+def finish(token, status: int) -> Optional[str]:
+    """Ends the request started with start(): logs it and returns the Server-Timing header value."""
+    timer = _current.get()
+    try:
+        _current.reset(token)
+    except ValueError:  # finished from another context (e.g. a different worker thread)
+        _current.set(None)
+    if timer is None:
+        return None
+    total = timer.elapsed()
+    record = {
+        "method": timer.method,
+        "path": timer.path,
+        "status": status,
+        "total_ms": round(total * 1000, 1),
+        "phases": {name: round(seconds * 1000, 1) for name, (seconds, _) in timer.phases.items()},
+    }
+    if timer.counters:
+        record["counters"] = dict(timer.counters)
+    logger.info(json.dumps(record, ensure_ascii=False))
+
+    if total * 1000 >= SLOW_REQUEST_MS and random.random() < SLOW_REQUEST_SAMPLE_RATE:
+        log_slow_request(timer, total, record)
+    return timer.server_timing(total)
+
+
+def log_slow_request(timer: RequestTimer, total: float, record: Dict) -> None:
+    slow = dict(record, slow=True, breakdown=timer.breakdown(total))
+    unaccounted = total - sum(seconds for seconds, _ in timer.phases.values())
+    slow["unaccounted_ms"] = round(max(0.0, unaccounted) * 1000, 1)
+
+    stats = timer.profile_stats()
+    if stats is not None:
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(25)
+        slow["profile"] = out.getvalue()
+        if REQUEST_PROFILE_DIR:
+            os.makedirs(REQUEST_PROFILE_DIR, exist_ok=True)
+            name = f"{int(time.time() * 1000)}_{timer.method}_{timer.path.strip('/').replace('/', '_')}.prof"
+            stats.dump_stats(os.path.join(REQUEST_PROFILE_DIR, name))
+            slow["profile_file"] = name
+    logger.warning(json.dumps(slow, ensure_ascii=False))
@@ -0,0 +1,651 @@
+# search_index.py
+"""
+In-process full-text search over projects: title, description, authors,
+pitch script and the extracted text of the canvas/summary PDFs
+(project_documents, filled by evaluations and by `python search_index.py documents`).
+
+    index = ProjectSearchIndex()
+    total, hits = index.search("energia escoles", category="3", min_score=50)
+
+Ranking is BM25 over field-weighted term frequencies (FIELD_WEIGHTS). Text is
+lower-cased and accent-folded, stopwords are dropped and every project is
+stemmed with the light stemmer of its detected language (en/es/ca, the
+SUPPORTED_LANGS of the prompts). Query words are expanded to the stems of all
+three languages, so a Catalan query finds Spanish or English projects that
+share the root.
+
+Postings are compact arrays (doc number + weighted tf). Updates are
+incremental: a changed project gets a new doc number and the old one is
+tombstoned; the arrays are compacted once a quarter of the docs are dead.
+Every SEARCH_SYNC_INTERVAL seconds (or right after mark_stale() on this
+worker) the index reloads only the rows whose updated_at / extracted_at
+moved past its watermark, plus a row count check for deletions.
+
+rankingprojects keeps one ProjectSearchIndex per cohort (cohorts.py), built
+on the cohort's first search and synced through the (cohort_id, updated_at)
+index, so the size of one program does not slow the searches of another.
+
+    SEARCH_SYNC_INTERVAL=5           seconds between change checks
+    SEARCH_MAX_DOCUMENT_CHARS=8000   extracted PDF text indexed per document
+    SEARCH_WARMUP=1                  rankingprojects builds the index at startup (background thread)
+
+The first build reads every project (about 2-3 minutes for 100k projects
+with document text on one core); later syncs only read what changed.
+Query latency over 100k projects: benchmarks/bench_search.py.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import datetime
+import functools
+import hashlib
+import heapq
+import html
+import math
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import pymysql
+import pymysql.cursors
+
+from database import db_config
+from prompt_builder import SUPPORTED_LANGS
+from request_timing import timed
+
+SEARCH_SYNC_INTERVAL = float(os.getenv("SEARCH_SYNC_INTERVAL", "5"))
+SEARCH_MAX_DOCUMENT_CHARS = int(os.getenv("SEARCH_MAX_DOCUMENT_CHARS", "8000"))
+
+FIELD_WEIGHTS = {"title": 3.0, "authors": 2.0, "description": 1.5, "script": 1.0, "documents": 1.0}
+DOCUMENT_KINDS = ("canvas", "summary")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Rows re-read on every sync on top of the watermark (transactions commit after NOW())
+SYNC_OVERLAP_SECONDS = 2
+COMPACT_DEAD_RATIO = 0.25
+SNIPPET_CHARS = 180
+
+STOPWORDS: Dict[str, Set[str]] = {
+    "en": set("""a an and are as at be by for from has have in is it its of on or that the this to
+                 was were will with we our you your they their not but can into""".split()),
+    "es": set("""a al como con de del el ella en es esta este lo los la las le les mas muy no nos
+                 o para pero por que se sin sobre su sus un una unos unas y ya son ser hay""".split()),
+    "ca": set("""a al amb com de del dels el els en es i la les li lo ha han hi mes molt no els
+                 o per pero que se sense sobre seu seus seva un una uns unes ja son ser""".split()),
+}
+
+# Longest first; only stripped when at least MIN_STEM characters remain
+SUFFIXES: Dict[str, Tuple[str, ...]] = {
+    "en": ("ational", "ations", "ation", "ness", "ments", "ment", "ities", "ity", "ings", "ing",
+           "ies", "ied", "ers", "er", "ed", "es", "ly", "s"),
+    "es": ("amientos", "imientos", "amiento", "imiento", "aciones", "uciones", "acion", "ucion",
+           "idades", "idad", "mente", "ables", "ibles", "able", "ible", "istas", "ista", "adores",
+           "adoras", "ador", "adora", "ores", "oras", "osos", "osas", "oso", "osa", "ar", "er", "ir",
+           "es", "os", "as", "a", "o", "e", "s"),
+    "ca": ("aments", "ament", "acions", "acio", "itats", "itat", "ables", "ibles", "able", "ible",
+           "istes", "ista", "adors", "adores", "ador", "adora", "ores", "osos", "oses", "os", "osa",
+           "ar", "er", "ir", "es", "a", "o", "e", "s"),
+}
+MIN_STEM = 3
+
+LANGS = tuple(sorted(SUPPORTED_LANGS))
+assert set(LANGS) == set(SUFFIXES) == set(STOPWORDS)
+
+WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def _build_fold_table() -> Dict[int, str]:
+    """Lower-case + accent folding that keeps one character per character (snippet offsets stay valid)."""
+    table = {}
+    for code in range(0x250):
+        ch = chr(code)
+        folded = unicodedata.normalize("NFKD", ch.lower())
+        base = "".join(c for c in folded if not unicodedata.combining(c))
+        if len(base) == 1 and base != ch:
+            table[code] = base
+    table[ord("·")] = " "  # Catalan l·l splits into two words in both query and text
+    return table
+
+
+FOLD_TABLE = _build_fold_table()
+
+
+def fold(text: str) -> str:
+    return text.translate(FOLD_TABLE)
+
+
+@functools.lru_cache(maxsize=200_000)
+def stem(word: str, lang: str) -> str:
+    for suffix in SUFFIXES[lang]:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def detect_language(words: Sequence[str]) -> str:
+    """The language whose stopwords are most frequent in `words` (English when there is no signal)."""
+    frequency = Counter(words[:2000])
+    counts = {lang: sum(frequency[w] for w in STOPWORDS[lang]) for lang in LANGS}
+    best = max(LANGS, key=lambda lang: counts[lang])
+    return best if counts[best] > 0 else "en"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return WORD_RE.findall(fold(text or ""))
+
+
+def analyze(words: Iterable[str], lang: str) -> List[str]:
+    stopwords = STOPWORDS[lang]
+    return [stem(w, lang) for w in words if w not in stopwords and not (len(w) == 1 and w.isalpha())]
+
+
+def query_terms(query: str) -> List[Set[str]]:
+    """One set of stem variants (one per language) per distinct query word."""
+    terms, seen = [], set()
+    for word in tokenize(query):
+        if word in seen or all(word in STOPWORDS[lang] for lang in LANGS):
+            continue
+        seen.add(word)
+        terms.append({stem(word, lang) for lang in LANGS})
+    return terms
+
+
+class SearchIndex:
+    """Inverted index with BM25 ranking; thread-safe, incremental add/remove by project id."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.postings: Dict[str, Tuple[array, array]] = {}  # stem -> (doc numbers, weighted tf)
+        self.doc_project = array("i")  # doc number -> project id (-1 once removed)
+        self.doc_length = array("f")
+        self.doc_score = array("i")
+        self.doc_category: List[Optional[str]] = []
+        self.doc_hash: List[bytes] = []
+        self.doc_number: Dict[int, int] = {}  # project id -> live doc number
+        self.total_length = 0.0
+        self.dead = 0
+        # BM25 length normalisation per doc for the average length it was computed with (inf = removed)
+        self._norms = array("f")
+        self._norms_average: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_number)
+
+    @staticmethod
+    def content_hash(fields: Dict[str, str]) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for name in FIELD_WEIGHTS:
+            digest.update((fields.get(name) or "").encode("utf-8", "replace") + b"\0")
+        return digest.digest()
+
+    def add(self, project_id: int, fields: Dict[str, str], category_id=None, score=0) -> None:
+        """Indexes (or re-indexes) a project. Unchanged text only updates category and score."""
+        content_hash = self.content_hash(fields)
+        score = int(score or 0)
+        with self._lock:
+            current = self.doc_number.get(project_id)
+            if current is not None and self.doc_hash[current] == content_hash:
+                self.doc_category[current] = category_id
+                self.doc_score[current] = score
+                return
+
+        # Tokenizing is the slow part: do it outside the lock
+        field_words = {name: tokenize(fields.get(name)) for name in FIELD_WEIGHTS}
+        lang = detect_language([w for words in field_words.values() for w in words])
+        weighted_tf: Dict[str, float] = {}
+        length = 0.0
+        for name, words in field_words.items():
+            weight = FIELD_WEIGHTS[name]
+            for term, count in Counter(analyze(words, lang)).items():
+                weighted_tf[term] = weighted_tf.get(term, 0.0) + weight * count
+                length += weight * count
+
+        with self._lock:
+            self._remove(project_id)
+            number = len(self.doc_project)
+            self.doc_project.append(project_id)
+            self.doc_length.append(length)
+            self.doc_score.append(score)
+            self.doc_category.append(category_id)
+            self.doc_hash.append(content_hash)
+            self.doc_number[project_id] = number
+            self.total_length += length
+            for term, tf in weighted_tf.items():
+                entry = self.postings.get(term)
+                if entry is None:
+                    entry = self.postings[term] = (array("i"), array("f"))
+                entry[0].append(number)
+                entry[1].append(tf)
+
+    def remove(self, project_id: int) -> None:
+        with self._lock:
+            self._remove(project_id)
+            if self.dead > 1000 and self.dead > COMPACT_DEAD_RATIO * len(self.doc_project):
+                self.compact()
+
+    def _remove(self, project_id: int) -> None:
+        number = self.doc_number.pop(project_id, None)
+        if number is None:
+            return
+        self.doc_project[number] = -1
+        if number < len(self._norms):
+            self._norms[number] = math.inf
+        self.total_length -= self.doc_length[number]
+        self.doc_hash[number] = b""
+        self.dead += 1
+
+    def compact(self) -> None:
+        """Renumbers the live docs and drops tombstoned postings."""
+        with self._lock:
+            renumber = {}
+            doc_project, doc_length, doc_score = array("i"), array("f"), array("i")
+            doc_category, doc_hash = [], []
+            for old, project_id in enumerate(self.doc_project):
+                if project_id < 0:
+                    continue
+                renumber[old] = len(doc_project)
+                doc_project.append(project_id)
+                doc_length.append(self.doc_length[old])
+                doc_score.append(self.doc_score[old])
+                doc_category.append(self.doc_category[old])
+                doc_hash.append(self.doc_hash[old])
+            postings = {}
+            for term, (docs, tfs) in self.postings.items():
+                new_docs, new_tfs = array("i"), array("f")
+                for doc, tf in zip(docs, tfs):
+                    number = renumber.get(doc)
+                    if number is not None:
+                        new_docs.append(number)
+                        new_tfs.append(tf)
+                if new_docs:
+                    postings[term] = (new_docs, new_tfs)
+            self.postings = postings
+            self.doc_project, self.doc_length, self.doc_score = doc_project, doc_length, doc_score
+            self.doc_category, self.doc_hash = doc_category, doc_hash
+            self.doc_number = {project_id: number for number, project_id in enumerate(doc_project)}
+            self.dead = 0
+            self._norms, self._norms_average = array("f"), None
+
+    def _length_norms(self, average: float) -> array:
+        """k1 * (1 - b + b * length / average) per doc; only recomputed when the average drifts by 2%."""
+        if self._norms_average is None or abs(average - self._norms_average) > 0.02 * self._norms_average:
+            self._norms, self._norms_average = array("f"), average
+        k1, b, average = BM25_K1, BM25_B, self._norms_average
+        for number in range(len(self._norms), len(self.doc_project)):
+            self._norms.append(k1 * (1 - b + b * self.doc_length[number] / average)
+                               if self.doc_project[number] >= 0 else math.inf)
+        return self._norms
+
+    def search(self, query: str, category=None, min_score=None, max_score=None,
+               limit: int = 20, offset: int = 0) -> Tuple[int, List[Tuple[int, float]]]:
+        """Returns (number of matches, [(project_id, bm25), ...]) for the requested page."""
+        terms = query_terms(query)
+        if not terms:
+            return 0, []
+        with self._lock:
+            live = len(self.doc_number)
+            if live == 0:
+                return 0, []
+            norms = self._length_norms(self.total_length / live or 1.0)
+            doc_project = self.doc_project
+
+            scores: Dict[int, float] = {}
+            for variants in terms:
+                entries = [self.postings[term] for term in variants if term in self.postings]
+                # A word counts once per doc: the best of its language variants
+                best = scores if len(entries) == 1 else {}
+                for docs, tfs in entries:
+                    df = min(len(docs), live)  # postings of removed docs linger until compact()
+                    weight = math.log(1 + (live - df + 0.5) / (df + 0.5)) * (BM25_K1 + 1)
+                    get = best.get
+                    if best is scores:
+                        for doc, tf in zip(docs, tfs):
+                            value = weight * tf / (tf + norms[doc])
+                            if value:  # 0.0 for removed docs
+                                best[doc] = get(doc, 0.0) + value
+                    else:
+                        for doc, tf in zip(docs, tfs):
+                            value = weight * tf / (tf + norms[doc])
+                            if value > get(doc, 0.0):
+                                best[doc] = value
+                if best is not scores:
+                    for doc, value in best.items():
+                        scores[doc] = scores.get(doc, 0.0) + value
+
+            if category is not None or min_score is not None or max_score is not None:
+                doc_category, doc_score = self.doc_category, self.doc_score
+                scores = {
+                    doc: value for doc, value in scores.items()
+                    if (category is None or doc_category[doc] == category)
+                    and (min_score is None or doc_score[doc] >= min_score)
+                    and (max_score is None or doc_score[doc] <= max_score)
+                }
+            top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], -item[0]))
+            return len(scores), [(doc_project[doc], value) for doc, value in top[offset:]]
+
+
+# ############################################
+# Database sync
+# ############################################
+
+PROJECT_SEARCH_COLUMNS = "id, title, description, authors, script, category_id, score"
+
+
+def load_document_texts(cursor, project_ids: Sequence[int]) -> Dict[int, str]:
+    if not project_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(project_ids))
+    cursor.execute(
+        f"SELECT project_id, SUBSTRING(text, 1, %s) FROM project_documents "
+        f"WHERE project_id IN ({placeholders}) ORDER BY project_id, kind",
+        (SEARCH_MAX_DOCUMENT_CHARS, *project_ids)
+    )
+    texts: Dict[int, List[str]] = {}
+    for project_id, text in cursor.fetchall():
+        texts.setdefault(project_id, []).append(text or "")
+    return {project_id: "\n".join(parts) for project_id, parts in texts.items()}
+
+
+def row_fields(row, documents: str) -> Dict[str, str]:
+    return {"title": row[1] or "", "description": row[2] or "", "authors": row[3] or "",
+            "script": row[4] or "", "documents": documents}
+
+
+class ProjectSearchIndex(SearchIndex):
+    """SearchIndex kept in sync with the projects / project_documents tables (of one cohort, or all)."""
+
+    def __init__(self, cohort_id: Optional[int] = None, sync_interval: float = SEARCH_SYNC_INTERVAL):
+        super().__init__()
+        self.cohort_id = cohort_id
+        self.sync_interval = sync_interval
+        self._sync_lock = threading.Lock()
+        self._watermark = None  # database time of the last sync
+        self._checked_at = 0.0
+        self._stale = False
+
+    def mark_stale(self) -> None:
+        """Write paths call this so the next search on this worker picks up the change right away."""
+        self._stale = True
+
+    def ensure_fresh(self) -> None:
+        if self._watermark is not None and not self._stale and time.monotonic() - self._checked_at < self.sync_interval:
+            return
+        with self._sync_lock:
+            if self._watermark is not None and not self._stale and time.monotonic() - self._checked_at < self.sync_interval:
+                return
+            self._stale = False
+            self.sync()
+            self._checked_at = time.monotonic()
+
+    def _scope(self, alias: str = "") -> Tuple[str, tuple]:
+        """SQL condition (and its params) selecting the indexed projects."""
+        if self.cohort_id is None:
+            return "1=1", ()
+        return f"{alias}cohort_id = %s", (self.cohort_id,)
+
+    @timed("db")
+    def sync(self, batch_size: int = 1000) -> int:
+        """Full build on first call, afterwards only the rows changed since the watermark. Returns rows read."""
+        scope, params = self._scope()
+        connection = pymysql.connect(**db_config)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT NOW(), COUNT(*) FROM projects WHERE {scope}", params)
+                now, count = cursor.fetchone()
+                if self._watermark is None:
+                    changed = None
+                else:
+                    since = self._watermark - datetime.timedelta(seconds=SYNC_OVERLAP_SECONDS)
+                    documents_scope, documents_params = self._scope("p.")
+                    cursor.execute(
+                        f"SELECT id FROM projects WHERE {scope} AND updated_at >= %s "
+                        "UNION SELECT d.project_id FROM project_documents d JOIN projects p ON p.id = d.project_id "
+                        f"WHERE {documents_scope} AND d.extracted_at >= %s",
+                        (*params, since, *documents_params, since)
+                    )
+                    changed = [row[0] for row in cursor.fetchall()]
+        finally:
+            connection.close()
+
+        read = self._load(changed, batch_size)
+        if changed is not None and len(self) != count:
+            self._drop_deleted()
+        self._watermark = now
+        return read
+
+    def _drop_deleted(self) -> None:
+        """Removes the projects deleted (or moved to another cohort) since they were indexed."""
+        scope, params = self._scope()
+        connection = pymysql.connect(**db_config)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT id FROM projects WHERE {scope}", params)
+                existing = {row[0] for row in cursor.fetchall()}
+        finally:
+            connection.close()
+        for project_id in [p for p in self.doc_number if p not in existing]:
+            self.remove(project_id)
+
+    def _load(self, project_ids: Optional[List[int]], batch_size: int) -> int:
+        """Indexes the given projects (all of them when None), batch by batch."""
+        if project_ids is not None and not project_ids:
+            return 0
+        scope, params = self._scope()
+        connection = pymysql.connect(**db_config, cursorclass=pymysql.cursors.SSCursor)
+        documents_connection = pymysql.connect(**db_config)
+        read = 0
+        try:
+            with connection.cursor() as cursor, documents_connection.cursor() as documents_cursor:
+                if project_ids is None:
+                    cursor.execute(f"SELECT {PROJECT_SEARCH_COLUMNS} FROM projects WHERE {scope}", params)
+                else:
+                    placeholders = ", ".join(["%s"] * len(project_ids))
+                    cursor.execute(f"SELECT {PROJECT_SEARCH_COLUMNS} FROM projects "
+                                   f"WHERE {scope} AND id IN ({placeholders})", (*params, *project_ids))
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    documents = load_document_texts(documents_cursor, [row[0] for row in rows])
+                    for row in rows:
+                        self.add(row[0], row_fields(row, documents.get(row[0], "")), row[5], row[6])
+                    read += len(rows)
+        finally:
+            connection.close()
+            documents_connection.close()
+        return read
+
+    @timed("db")
+    def fetch_hits(self, project_ids: Sequence[int]) -> Dict[int, Tuple[Dict[str, str], Optional[str], int]]:
+        """Current (fields, category_id, score) of the hits, for the response and its snippets."""
+        if not project_ids:
+            return {}
+        connection = pymysql.connect(**db_config)
+        try:
+            with connection.cursor() as cursor:
+                placeholders = ", ".join(["%s"] * len(project_ids))
+                cursor.execute(f"SELECT {PROJECT_SEARCH_COLUMNS} FROM projects WHERE id IN ({placeholders})",
+                               tuple(project_ids))
+                rows = cursor.fetchall()
+                documents = load_document_texts(cursor, [row[0] for row in rows])
+        finally:
+            connection.close()
+        return {row[0]: (row_fields(row, documents.get(row[0], "")), row[5], row[6]) for row in rows}
+
+
+# ############################################
+# Highlighting
+# ############################################
+
+def match_spans(text: str, terms: List[Set[str]]) -> List[Tuple[int, int]]:
+    """Character spans of the words of `text` that match a query term in any language."""
+    wanted = set().union(*terms) if terms else set()
+    spans = []
+    for m in WORD_RE.finditer(fold(text)):
+        word = m.group(0)
+        if any(stem(word, lang) in wanted for lang in LANGS):
+            spans.append(m.span())
+    return spans
+
+
+def highlight(text: str, spans: List[Tuple[int, int]], start: int = 0, end: Optional[int] = None) -> str:
+    end = len(text) if end is None else end
+    out, position = [], start
+    for a, b in spans:
+        if a < start or b > end:
+            continue
+        out.append(html.escape(text[position:a]))
+        out.append("<mark>" + html.escape(text[a:b]) + "</mark>")
+        position = b
+    out.append(html.escape(text[position:end]))
+    return "".join(out)
+
+
+def snippet(fields: Dict[str, str], terms: List[Set[str]], size: int = SNIPPET_CHARS) -> Dict[str, str]:
+    """
+    {"title": highlighted title, "field": where the snippet comes from, "snippet": ...}
+    The snippet is the window of `size` characters with the most matches.
+    """
+    title = fields.get("title") or ""
+    result = {"title": highlight(title, match_spans(title, terms)), "field": "", "snippet": ""}
+    best = None  # (matches, field, start, end, spans)
+    for name in ("description", "script", "documents", "authors"):
+        text = " ".join((fields.get(name) or "").split())  # whitespace of PDF text collapsed
+        spans = match_spans(text, terms)
+        for i, (a, _) in enumerate(spans):
+            inside = sum(1 for s in spans[i:] if s[1] <= a + size)
+            if best is None or inside > best[0]:
+                start = max(0, a - size // 4)
+                best = (inside, name, text, start, min(len(text), start + size), spans)
+    if best is None:
+        description = " ".join((fields.get("description") or "").split())
+        if description:
+            result.update(field="description", snippet=html.escape(description[:size]))
+        return result
+    _, name, text, start, end, spans = best
+    # Cut at word boundaries
+    if start > 0:
+        start = text.find(" ", start) + 1 or start
+    if end < len(text):
+        end = text.rfind(" ", start, end) if text.rfind(" ", start, end) > start else end
+    body = highlight(text, spans, start, end)
+    result.update(field=name, snippet=("…" if start > 0 else "") + body + ("…" if end < len(text) else ""))
+    return result
+
+
+# ############################################
+# project_documents
+# ############################################
+
+@timed("db")
+def save_document_texts(project_id: int, documents: Dict[str, Tuple[Optional[str], Optional[str]]]) -> None:
+    """
+    Stores extracted PDF text per kind ({"canvas": (url, text), ...}); extracted_at
+    only moves when the url or the text changed, so the index does not re-read it.
+    """
+    rows = [(project_id, kind, url or "", text or "") for kind, (url, text) in documents.items() if url]
+    if not rows:
+        return
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                """
+                INSERT INTO project_documents (project_id, kind, url, text, extracted_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE
+                    extracted_at = IF(url <=> VALUES(url) AND text <=> VALUES(text), extracted_at, NOW()),
+                    url = VALUES(url),
+                    text = VALUES(text)
+                """,
+                rows
+            )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def load_missing_documents(limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+    """(project_id, kind, url) of canvas/summary links with no extracted text for the current url."""
+    connection = pymysql.connect(**db_config)
+    try:
+        with connection.cursor() as cursor:
+            selects = []
+            for kind in DOCUMENT_KINDS:
+                selects.append(
+                    f"SELECT p.id, '{kind}', p.{kind} FROM projects p "
+                    f"LEFT JOIN project_documents d ON d.project_id = p.id AND d.kind = '{kind}' "
+                    f"WHERE p.{kind} LIKE 'http%%' AND (d.url IS NULL OR d.url <> p.{kind})"
+                )
+            sql = " UNION ALL ".join(selects) + " ORDER BY 1"
+            if limit:
+                sql += f" LIMIT {int(limit)}"
+            cursor.execute(sql)
+            return [(row[0], row[1], row[2]) for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+async def extract_missing_documents(concurrency: int = 4, limit: Optional[int] = None, log=print) -> Dict[str, int]:
+    """Downloads and stores the text of every canvas/summary not extracted yet (backfill)."""
+    from rankingprojects import extract_pdf_text_from_url
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    counts = {"done": 0, "failed": 0}
+
+    async def extract(project_id, kind, url):
+        async with semaphore:
+            try:
+                text = await extract_pdf_text_from_url(url)
+            except Exception as e:
+                counts["failed"] += 1
+                log(f"{project_id} {kind}: {e}")
+                return
+            await asyncio.to_thread(save_document_texts, project_id, {kind: (url, text)})
+            counts["done"] += 1
+
+    missing = await asyncio.to_thread(load_missing_documents, limit)
+    await asyncio.gather(*[extract(*item) for item in missing])
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Project search index tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    docs = sub.add_parser("documents", help="Extract the text of canvas/summary PDFs not indexed yet")
+    docs.add_argument("--concurrency", type=int, default=4)
+    docs.add_argument("--limit", type=int, default=None)
+    query = sub.add_parser("query", help="Build the index and run one query")
+    query.add_argument("q")
+    query.add_argument("--limit", type=int, default=10)
+    query.add_argument("--cohort", type=int, default=None, help="Only index this cohort")
+    args = parser.parse_args(argv)
+
+    if args.command == "documents":
+        print(asyncio.run(extract_missing_documents(args.concurrency, args.limit)))
+        return 0
+
+    index = ProjectSearchIndex(args.cohort)
+    started = time.perf_counter()
+    index.sync()
+    print(f"indexed {len(index)} projects in {time.perf_counter() - started:.1f}s, {len(index.postings)} terms")
+    started = time.perf_counter()
+    total, hits = index.search(args.q, limit=args.limit)
+    print(f"{total} matches in {(time.perf_counter() - started) * 1000:.1f} ms")
+    terms = query_terms(args.q)
+    rows = index.fetch_hits([project_id for project_id, _ in hits])
+    for project_id, value in hits:
+        found = snippet(rows[project_id][0] if project_id in rows else {}, terms)
+        print(f"{value:7.2f}  {project_id}  {found['title']}\n         {found['snippet']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""Unit tests for the backend's pure helpers; run from backend/ with `python -m pytest tests`."""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# rankingprojects refuses to import without a JWT secret; nothing here talks to a database or model
+os.environ.setdefault("JWT_SECRET", "test-secret-of-at-least-32-bytes!")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
@@ -0,0 +1,18 @@
+import jwt
+
+from rankingprojects import JWT_ALG, JWT_SECRET_BYTES, admission_client_key
+
+
+def test_logged_in_user_is_keyed_by_email():
+    token = jwt.encode({"email": "Ana@Example.org"}, JWT_SECRET_BYTES, algorithm=JWT_ALG)
+    assert admission_client_key(f"Bearer {token}", "10.0.0.1") == "user:ana@example.org"
+
+
+def test_anonymous_client_is_keyed_by_address():
+    assert admission_client_key("", "10.0.0.1") == "addr:10.0.0.1"
+    assert admission_client_key(None, None) == "addr:unknown"
+
+
+def test_invalid_token_falls_back_to_address():
+    token = jwt.encode({"email": "ana@example.org"}, b"another-secret-of-at-least-32-bytes", algorithm=JWT_ALG)
+    assert admission_client_key(f"Bearer {token}", "10.0.0.1") == "addr:10.0.0.1"
@@ -0,0 +1,114 @@
+from category_stats import (UPSERT_SCORE_SQL, UPSERT_STATS_SQL, Contribution, _contributions,
+                            delta_statements, histogram, median_from_counts, summarize)
+
+
+def stats(statements):
+    return [params for sql, params in statements if sql == UPSERT_STATS_SQL]
+
+
+def scores(statements):
+    return [params for sql, params in statements if sql == UPSERT_SCORE_SQL]
+
+
+def test_contributions_from_snapshot_rows():
+    rows = [(7, 2, "health", 81, 1, 3), (8, "1", None, None, 0, None)]
+    assert _contributions(rows) == {
+        7: Contribution(2, "health", 81, True, 3),
+        8: Contribution(1, "", 0, False, 0),
+    }
+
+
+def test_new_project_counts_once():
+    after = {5: Contribution(1, "agro", 0, False, 0)}
+    assert delta_statements({}, after) == [(UPSERT_STATS_SQL, (1, "agro", 1, 0, 0, 0))]
+
+
+def test_evaluation_adds_score_and_coverage():
+    before = {5: Contribution(1, "agro", 0, False, 2)}
+    after = {5: Contribution(1, "agro", 72, True, 2)}
+    statements = delta_statements(before, after)
+    assert stats(statements) == [(1, "agro", 0, 1, 72, 0)]
+    assert scores(statements) == [(1, "agro", 72, 1)]
+
+
+def test_reevaluation_moves_the_score_bucket():
+    before = {5: Contribution(1, "agro", 60, True, 0)}
+    after = {5: Contribution(1, "agro", 75, True, 0)}
+    statements = delta_statements(before, after)
+    assert stats(statements) == [(1, "agro", 0, 0, 15, 0)]
+    assert scores(statements) == [(1, "agro", 60, -1), (1, "agro", 75, 1)]
+
+
+def test_category_change_moves_every_total():
+    before = {5: Contribution(1, "agro", 60, True, 4)}
+    after = {5: Contribution(1, "health", 60, True, 4)}
+    statements = delta_statements(before, after)
+    assert stats(statements) == [(1, "agro", -1, -1, -60, -4), (1, "health", 1, 1, 60, 4)]
+    assert scores(statements) == [(1, "agro", 60, -1), (1, "health", 60, 1)]
+
+
+def test_cohorts_are_kept_apart():
+    before = {5: Contribution(2, "agro", 0, False, 1)}
+    after = {5: Contribution(1, "agro", 0, False, 1)}
+    assert stats(delta_statements(before, after)) == [(1, "agro", 1, 0, 0, 1), (2, "agro", -1, 0, 0, -1)]
+
+
+def test_like_only_change_and_no_change():
+    before = {5: Contribution(1, "agro", 60, True, 4)}
+    after = {5: Contribution(1, "agro", 60, True, 5)}
+    assert delta_statements(before, after) == [(UPSERT_STATS_SQL, (1, "agro", 0, 0, 0, 1))]
+    assert delta_statements(before, dict(before)) == []
+
+
+def test_delete_of_several_projects_is_sorted():
+    before = {
+        9: Contribution(1, "tech", 50, True, 0),
+        3: Contribution(1, "agro", 50, True, 1),
+        4: Contribution(1, "agro", 0, False, 0),
+    }
+    statements = delta_statements(before, {})
+    assert stats(statements) == [(1, "agro", -2, -1, -50, -1), (1, "tech", -1, -1, -50, 0)]
+    assert scores(statements) == [(1, "agro", 50, -1), (1, "tech", 50, -1)]
+    # all category rows first, then the score rows: the same lock order for every writer
+    assert [sql for sql, _ in statements] == [UPSERT_STATS_SQL] * 2 + [UPSERT_SCORE_SQL] * 2
+
+
+def test_median_from_counts():
+    assert median_from_counts([]) is None
+    assert median_from_counts([(40, 0)]) is None
+    assert median_from_counts([(40, 1), (70, 1), (90, 1)]) == 70
+    assert median_from_counts([(40, 1), (70, 1)]) == 55
+    assert median_from_counts([(10, 3), (90, 1)]) == 10
+    assert median_from_counts([(10, 2), (90, 2)]) == 50
+
+
+def test_histogram_bins():
+    bins = histogram([(0, 1), (9, 2), (10, 1), (99, 1), (100, 4)])
+    assert len(bins) == 10
+    assert bins[0] == {"from": 0, "to": 9, "projects": 3}
+    assert bins[1] == {"from": 10, "to": 19, "projects": 1}
+    # the last bin includes 100
+    assert bins[-1] == {"from": 90, "to": 100, "projects": 5}
+
+
+def test_histogram_uneven_bucket():
+    bins = histogram([(95, 1), (100, 1)], bucket=30)
+    assert [(b["from"], b["to"]) for b in bins] == [(0, 29), (30, 59), (60, 89), (90, 100)]
+    assert bins[-1]["projects"] == 2
+
+
+def test_summarize():
+    summary = summarize("agro", (4, 3, 210, 9), [(60, 1), (70, 1), (80, 1)])
+    assert summary["category"] == "agro"
+    assert summary["coverage"] == 0.75
+    assert summary["mean_score"] == 70
+    assert summary["median_score"] == 70
+    assert summary["likes"] == 9
+    assert sum(b["projects"] for b in summary["histogram"]) == 3
+
+
+def test_summarize_empty_category():
+    summary = summarize("agro", (0, 0, 0, 0), [])
+    assert summary["coverage"] == 0.0
+    assert summary["mean_score"] is None
+    assert summary["median_score"] is None
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+import deadline
+from deadline import DeadlineExceeded
+
+
+@pytest.fixture(autouse=True)
+def budgets(monkeypatch):
+    monkeypatch.setattr(deadline, "DEADLINE_BUDGETS", {"evaluate": 1.0, "compare": 0.0})
+    monkeypatch.setattr(deadline, "DEADLINE_DEFAULT", 0.0)
+    monkeypatch.setattr(deadline, "DEADLINE_SHARES", {"download": 0.4, "parse": 0.5})
+    monkeypatch.setattr(deadline, "DEADLINE_MIN_SECONDS", {"llm": 0.5})
+
+
+def test_parse_seconds():
+    assert deadline.parse_seconds(" evaluate=120, compare = 180,bad,=3,neg=-2") == {
+        "evaluate": 120.0, "compare": 180.0, "neg": 0.0,
+    }
+    assert deadline.parse_seconds("") == {}
+
+
+def test_no_budget_outside_an_operation():
+    assert deadline.stage_budget("download") is None
+    assert deadline.remaining() is None
+    deadline.check("parse")
+
+
+def test_stage_gets_its_share_of_what_is_left():
+    @deadline.bounded("evaluate")
+    async def run():
+        return deadline.stage_budget("download"), deadline.stage_budget("llm")
+
+    download, llm = asyncio.run(run())
+    assert 0.35 < download <= 0.4
+    # stages without a share get all that is left
+    assert 0.9 < llm <= 1.0
+
+
+def test_disabled_budget_runs_without_deadline():
+    @deadline.bounded("compare")
+    async def run():
+        return deadline.current()
+
+    assert asyncio.run(run()) is None
+
+
+def test_stage_minimum_raises_before_starting(monkeypatch):
+    monkeypatch.setattr(deadline, "DEADLINE_MIN_SECONDS", {"llm": 5.0})
+
+    @deadline.bounded("evaluate")
+    async def run():
+        await deadline.within("llm", asyncio.sleep(0))
+
+    with pytest.raises(DeadlineExceeded) as info:
+        asyncio.run(run())
+    assert info.value.stage == "llm"
+
+
+def test_within_cancels_slow_stage_and_names_the_document():
+    cancelled = []
+
+    async def download():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    @deadline.bounded("evaluate")
+    async def run():
+        with deadline.document("project 2 canvas"):
+            await deadline.within("download", download())
+
+    with pytest.raises(DeadlineExceeded) as info:
+        asyncio.run(run())
+    error = info.value
+    assert cancelled == [True]
+    assert (error.operation, error.stage, error.document, error.budget) == ("evaluate", "download", "project 2 canvas", 1.0)
+    assert 0.3 < error.elapsed < 1.0
+    assert str(error) == "evaluate: download of project 2 canvas exceeded the 1s deadline"
+
+
+def test_within_returns_result_in_time():
+    @deadline.bounded("evaluate")
+    async def run():
+        return await deadline.within("parse", asyncio.sleep(0, result="text"))
+
+    assert asyncio.run(run()) == "text"
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+import evaluation_cache
+import rankingprojects
+from evaluation_cache import evaluation_hash, normalize_result, render, translatable_texts
+
+CANONICAL = normalize_result({
+    "score": 72,
+    "evaluation": "Solid plan.",
+    "strengths": ["Clear market"],
+    "weaknesses": ["Thin margins", "No team"],
+    "recommendations": [],
+    "criteria": [{"name": "Market", "score": 80, "comment": "Large"},
+                 {"name": "Team", "score": 40, "comment": "Small"}],
+})
+
+
+def test_normalize_result_clamps_scores_and_cleans_lists():
+    result = normalize_result({
+        "score": "140",
+        "evaluation": None,
+        "strengths": ["Good", "", None, 3],
+        "criteria": [{"name": "Market", "score": -5}, "not a criterion", {"score": "n/a", "comment": "?"}],
+        "extra": "kept",
+    })
+    assert result["score"] == 100
+    assert result["evaluation"] == ""
+    assert result["strengths"] == ["Good", "3"]
+    assert result["weaknesses"] == [] and result["recommendations"] == []
+    assert result["criteria"] == [{"name": "Market", "score": 0, "comment": ""},
+                                  {"name": "", "score": 0, "comment": "?"}]
+    assert result["extra"] == "kept"
+    assert normalize_result(None)["score"] == 0
+
+
+def test_evaluation_hash_depends_on_model_and_query():
+    assert evaluation_hash("query", "gpt-5-mini") == evaluation_hash("query", "gpt-5-mini")
+    assert evaluation_hash("query", "gpt-5-mini") != evaluation_hash("query", "gpt-5-nano")
+    assert evaluation_hash("query", "gpt-5-mini") != evaluation_hash("query ", "gpt-5-mini")
+
+
+def test_translatable_texts_leave_scores_out():
+    assert translatable_texts(CANONICAL) == {
+        "evaluation": "Solid plan.",
+        "strengths": ["Clear market"],
+        "weaknesses": ["Thin margins", "No team"],
+        "recommendations": [],
+        "criteria": [{"name": "Market", "comment": "Large"}, {"name": "Team", "comment": "Small"}],
+    }
+
+
+def test_render_canonical():
+    rendered = render(CANONICAL, None, "en", "h1")
+    assert rendered["lang"] == "en" and rendered["evaluation_hash"] == "h1"
+    assert rendered["criteria"] == CANONICAL["criteria"]
+    assert {k: rendered[k] for k in ("score", "evaluation", "strengths", "weaknesses")} == {
+        "score": 72, "evaluation": "Solid plan.", "strengths": ["Clear market"], "weaknesses": ["Thin margins", "No team"],
+    }
+
+
+def test_render_translation_keeps_canonical_scores():
+    texts = {
+        "evaluation": "Pla sòlid.",
+        "strengths": ["Mercat clar"],
+        "weaknesses": ["Marges petits", "Sense equip"],
+        "recommendations": [],
+        "criteria": [{"name": "Mercat", "comment": "Gran", "score": 5}, {"name": "Equip", "comment": "Petit"}],
+        "score": 10,
+    }
+    rendered = render(CANONICAL, texts, "ca", "h1")
+    assert rendered["score"] == 72
+    assert rendered["evaluation"] == "Pla sòlid."
+    assert rendered["weaknesses"] == ["Marges petits", "Sense equip"]
+    assert rendered["criteria"] == [{"name": "Mercat", "score": 80, "comment": "Gran"},
+                                    {"name": "Equip", "score": 40, "comment": "Petit"}]
+
+
+def test_render_falls_back_to_canonical_for_mangled_parts():
+    texts = {
+        "evaluation": "",
+        "strengths": "Mercat clar",
+        "weaknesses": ["Marges petits"],
+        "criteria": [{"name": "Mercat"}, "Equip"],
+    }
+    rendered = render(CANONICAL, texts, "ca", "h1")
+    assert rendered["evaluation"] == "Solid plan."
+    assert rendered["strengths"] == ["Clear market"]
+    assert rendered["weaknesses"] == ["Thin margins", "No team"]
+    assert rendered["criteria"] == [{"name": "Mercat", "score": 80, "comment": "Large"},
+                                    {"name": "Team", "score": 40, "comment": "Small"}]
+
+    texts["criteria"] = [{"name": "Mercat", "comment": "Gran"}]
+    assert render(CANONICAL, texts, "ca", "h1")["criteria"] == CANONICAL["criteria"]
+
+
+@pytest.fixture
+def renderings(monkeypatch):
+    stored = {}
+    monkeypatch.setattr(evaluation_cache, "load_rendering", lambda input_hash, lang: stored.get((input_hash, lang)))
+    monkeypatch.setattr(evaluation_cache, "save_rendering",
+                        lambda input_hash, lang, texts: stored.__setitem__((input_hash, lang), texts))
+    return stored
+
+
+def translator(monkeypatch, answer):
+    calls = []
+
+    async def ainvoke(name, inputs):
+        calls.append(name)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(rankingprojects.llm_router, "ainvoke", ainvoke)
+    return calls
+
+
+def test_localize_translates_once_and_stores_the_rendering(monkeypatch, renderings):
+    texts = dict(translatable_texts(CANONICAL), evaluation="Pla sòlid.")
+    calls = translator(monkeypatch, texts)
+    first = asyncio.run(rankingprojects.localize_evaluation("h1", CANONICAL, "ca"))
+    second = asyncio.run(rankingprojects.localize_evaluation("h1", CANONICAL, "ca"))
+    assert calls == ["translate_evaluation"]
+    assert renderings == {("h1", "ca"): texts}
+    assert first == second
+    assert (first["lang"], first["evaluation"], first["score"]) == ("ca", "Pla sòlid.", 72)
+
+
+def test_localize_canonical_language_needs_no_translation(monkeypatch, renderings):
+    calls = translator(monkeypatch, {})
+    rendered = asyncio.run(rankingprojects.localize_evaluation("h1", CANONICAL, "en"))
+    assert calls == [] and renderings == {}
+    assert rendered == render(CANONICAL, None, "en", "h1")
+
+
+def test_failed_translation_falls_back_to_canonical_rendering(monkeypatch, renderings):
+    translator(monkeypatch, RuntimeError("provider down"))
+    rendered = asyncio.run(rankingprojects.localize_evaluation("h1", CANONICAL, "es"))
+    # labelled with the language it is really in, and not cached as the Spanish rendering
+    assert rendered == render(CANONICAL, None, "en", "h1")
+    assert renderings == {}
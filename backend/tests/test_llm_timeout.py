@@ -0,0 +1,89 @@
+import socket
+import threading
+import time
+
+import pytest
+from flask import Flask
+from pydantic import BaseModel
+
+import deadline
+import llm_models
+from deadline import DeadlineExceeded
+from model_router import ModelRouter, Route
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+@pytest.fixture
+def hanging_provider():
+    """An OpenAI-compatible endpoint that accepts requests and never answers (gives up after 10s)."""
+    server = socket.create_server(("127.0.0.1", 0))
+    connections = []
+    stop = threading.Event()
+
+    def serve():
+        server.settimeout(0.1)
+        while not stop.is_set():
+            try:
+                connection, _ = server.accept()
+            except socket.timeout:
+                continue
+            connections.append(connection)
+
+    def shut_down():
+        stop.set()
+        for connection in connections:
+            connection.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    # a call nobody cut short ends here, with a connection error, instead of hanging the test run
+    timer = threading.Timer(10, shut_down)
+    timer.start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/v1"
+    timer.cancel()
+    shut_down()
+    thread.join()
+    server.close()
+
+
+@pytest.fixture
+def flask_mode(monkeypatch):
+    monkeypatch.setattr(llm_models, "ASYNC_CLIENTS", False)
+    monkeypatch.setattr(deadline, "DEADLINE_BUDGETS", {"evaluate": 1.0})
+    monkeypatch.setattr(deadline, "DEADLINE_MIN_SECONDS", {})
+
+
+def test_llm_deadline_frees_the_flask_worker(hanging_provider, flask_mode):
+    router = ModelRouter({"evaluation": Answer}, {"evaluation": [Route("openai", "gpt-test", hanging_provider)]}, {}, set())
+
+    @deadline.bounded("evaluate")
+    async def evaluate():
+        return await deadline.within("llm", router.ainvoke("evaluation", {"query": "hello"}))
+
+    app = Flask(__name__)
+
+    @app.post("/evaluate")
+    async def view():
+        try:
+            return await evaluate()
+        except DeadlineExceeded as e:
+            return {"ok": False, "stage": e.stage}, 504
+
+    started = time.monotonic()
+    response = app.test_client().post("/evaluate")
+    elapsed = time.monotonic() - started
+    assert response.status_code == 504
+    assert response.get_json()["stage"] == "llm"
+    # the view only returns once the worker thread has ended: the client timeout stopped the call
+    assert elapsed < 2.5
+
+
+def test_with_timeout_binds_only_the_model(hanging_provider):
+    chain = llm_models.get_chain("timeout_probe", Answer, "gpt-test", "openai", hanging_provider)
+    bound = llm_models.with_timeout(chain, 0.5)
+    assert bound.first is chain.first and bound.last is chain.last
+    assert bound.steps[1].kwargs == {"timeout": 0.5}
+    assert chain.steps[1] is llm_models.get_model("gpt-test", "openai", hanging_provider)
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+import rankingprojects
+from rankingprojects import apply_merge_patch, parse_if_match
+
+
+def test_adds_and_replaces_members():
+    assert apply_merge_patch({"a": 1, "b": 2}, {"b": 3, "c": 4}) == {"a": 1, "b": 3, "c": 4}
+
+
+def test_null_deletes_member():
+    assert apply_merge_patch({"a": 1, "b": 2}, {"a": None}) == {"b": 2}
+    # deleting a missing member is a no-op
+    assert apply_merge_patch({"a": 1}, {"x": None}) == {"a": 1}
+
+
+def test_objects_merge_recursively():
+    target = {"filters": {"category": "health", "min_score": 50}, "lang": "en"}
+    patch = {"filters": {"min_score": None, "max_score": 90}}
+    assert apply_merge_patch(target, patch) == {"filters": {"category": "health", "max_score": 90}, "lang": "en"}
+
+
+def test_non_object_patch_replaces_target():
+    assert apply_merge_patch({"a": 1}, ["x"]) == ["x"]
+    assert apply_merge_patch({"a": {"b": 1}}, {"a": [1, 2]}) == {"a": [1, 2]}
+    assert apply_merge_patch({"a": [1, 2]}, {"a": {"b": 1}}) == {"a": {"b": 1}}
+
+
+def test_object_patch_on_non_object_target():
+    assert apply_merge_patch("text", {"a": 1, "b": None}) == {"a": 1}
+
+
+def test_target_is_not_mutated():
+    target = {"a": {"b": 1}}
+    apply_merge_patch(target, {"a": {"b": None, "c": 2}})
+    assert target == {"a": {"b": 1}}
+
+
+def test_rfc7396_examples():
+    assert apply_merge_patch(
+        {"title": "Goodbye!", "author": {"givenName": "John", "familyName": "Doe"},
+         "tags": ["example", "sample"], "content": "This will be unchanged"},
+        {"title": "Hello!", "phoneNumber": "+01-555-1234", "author": {"familyName": None}, "tags": ["example"]},
+    ) == {"title": "Hello!", "author": {"givenName": "John"}, "tags": ["example"],
+          "content": "This will be unchanged", "phoneNumber": "+01-555-1234"}
+    assert apply_merge_patch({"a": [{"b": "c"}]}, {"a": [1]}) == {"a": [1]}
+    assert apply_merge_patch({}, {"a": {"bb": {"ccc": None}}}) == {"a": {"bb": {}}}
+
+
+@pytest.fixture
+def session_store(monkeypatch):
+    """One user's session in memory, in place of users.session / session_version."""
+    store = {"session": {"theme": "dark"}, "version": 3}
+
+    def record(email):
+        return store["session"], store["version"]
+
+    def update(email, session_obj, session_json=None, expected_version=None):
+        if expected_version is not None and expected_version != store["version"]:
+            return None
+        store["session"], store["version"] = session_obj, store["version"] + 1
+        return store["version"]
+
+    monkeypatch.setattr(rankingprojects, "get_user_session_record", record)
+    monkeypatch.setattr(rankingprojects, "update_user_session_by_email", update)
+    return store
+
+
+def patch_session(body, if_match=None):
+    token = rankingprojects.issue_token(1, "ana@example.org")
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/merge-patch+json"}
+    if if_match is not None:
+        headers["If-Match"] = if_match
+    return rankingprojects.app.test_client().patch("/rankingprojects/me/session", data=json.dumps(body), headers=headers)
+
+
+def test_patch_body_is_the_merge_patch(session_store):
+    # a top-level "patch" member is session data like any other
+    response = patch_session({"patch": {"a": 1}, "version": 7, "theme": None})
+    assert response.status_code == 200
+    assert session_store["session"] == {"patch": {"a": 1}, "version": 7}
+    assert response.get_json()["version"] == 4
+    assert response.headers["ETag"] == '"4"'
+
+
+def test_patch_with_matching_version(session_store):
+    assert patch_session({"lang": "ca"}, '"3"').status_code == 200
+    assert session_store["session"] == {"theme": "dark", "lang": "ca"}
+
+
+def test_patch_with_stale_version_conflicts(session_store):
+    response = patch_session({"lang": "ca"}, '"2"')
+    assert response.status_code == 409
+    assert response.get_json()["version"] == 3
+    assert session_store["session"] == {"theme": "dark"}
+
+
+def test_if_match_star_matches_any_version(session_store):
+    assert patch_session({"lang": "ca"}, "*").status_code == 200
+    assert session_store["version"] == 4
+
+
+def test_bad_if_match_and_bad_body(session_store):
+    assert patch_session({"lang": "ca"}, "abc").status_code == 400
+    assert patch_session(["lang"]).status_code == 400
+    assert session_store["version"] == 3
+
+
+def test_parse_if_match():
+    assert parse_if_match(None) is None
+    assert parse_if_match(" * ") is None
+    assert parse_if_match('"12"') == 12
+    assert parse_if_match('W/"12"') == 12
+    with pytest.raises(ValueError):
+        parse_if_match('"1", "2"')
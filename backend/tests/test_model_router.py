@@ -0,0 +1,203 @@
+import asyncio
+import time
+
+import pytest
+from flask import Flask
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+import llm_models
+import model_router
+from model_router import ModelRouter, Route, RouteStats, parse_policies, parse_routes
+
+FAST = Route("openai", "gpt-5-nano")
+SLOW = Route("ollama", "qwen2.5:7b", "http://gpu-box:11434")
+
+
+@pytest.fixture(autouse=True)
+def router_settings(monkeypatch):
+    monkeypatch.setattr(model_router, "LLM_ROUTER_EXPLORE", 0.0)
+    monkeypatch.setattr(model_router, "LLM_ROUTER_EWMA_ALPHA", 0.5)
+    monkeypatch.setattr(model_router, "LLM_ROUTER_MAX_FAILURES", 2)
+    monkeypatch.setattr(model_router, "LLM_ROUTER_COOLDOWN", 30.0)
+    monkeypatch.setattr(model_router, "LLM_ROUTER_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(model_router, "LLM_HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(model_router, "LLM_HEDGE_PERCENTILE", 95.0)
+    monkeypatch.setattr(model_router, "LLM_HEDGE_INITIAL_DELAY", 10.0)
+
+
+def make_router(policy="ordered", hedged=()):
+    return ModelRouter({"find_category": dict}, {"find_category": [SLOW, FAST]},
+                       {"find_category": policy}, set(hedged))
+
+
+def test_parse_routes():
+    assert parse_routes(" openai:gpt-5-nano , ollama:qwen2.5:7b@http://gpu-box:11434,") == [
+        Route("openai", "gpt-5-nano"), Route("ollama", "qwen2.5:7b", "http://gpu-box:11434"),
+    ]
+    assert SLOW.label == "ollama/qwen2.5:7b"
+    with pytest.raises(ValueError):
+        parse_routes("openai")
+    with pytest.raises(ValueError):
+        parse_routes("openai:")
+
+
+def test_parse_policies():
+    assert parse_policies("find_category=fastest, translate_evaluation = ordered,") == {
+        "find_category": "fastest", "translate_evaluation": "ordered",
+    }
+    with pytest.raises(ValueError):
+        parse_policies("find_category=cheapest")
+
+
+def test_route_stats_latency_and_errors():
+    stats = RouteStats()
+    assert stats.expected_latency() == 0.0
+    stats.record(2.0, True)
+    stats.record(4.0, True)
+    assert stats.latency == 3.0
+    stats.record(1.0, False)
+    assert stats.error_rate == 0.5
+    # failures make a route look slower without touching its latency
+    assert stats.latency == 3.0
+    assert stats.expected_latency() == 6.0
+
+
+def test_route_stats_cooldown_after_consecutive_failures():
+    stats = RouteStats()
+    stats.record(1.0, False)
+    assert stats.available(time.monotonic())
+    stats.record(1.0, False)
+    now = time.monotonic()
+    assert not stats.available(now)
+    assert stats.available(now + 31)
+    stats.record(1.0, True)
+    assert stats.consecutive_failures == 0
+
+
+def test_route_stats_percentile_needs_min_samples():
+    stats = RouteStats()
+    for seconds in (0.3, 0.1):
+        stats.record(seconds, True)
+    assert stats.percentile(95) is None
+    for seconds in (0.2, 0.5, 0.4):
+        stats.record(seconds, True)
+    assert stats.percentile(50) == 0.3
+    assert stats.percentile(95) == 0.5
+    # failures are not latency samples
+    stats.record(9.0, False)
+    assert stats.percentile(100) == 0.5
+
+
+def test_ordered_policy_keeps_configured_order():
+    router = make_router("ordered")
+    router._record("find_category", SLOW, 5.0, True)
+    router._record("find_category", FAST, 0.5, True)
+    assert router.candidates("find_category") == [SLOW, FAST]
+
+
+def test_fastest_policy_sorts_by_expected_latency():
+    router = make_router("fastest")
+    router._record("find_category", SLOW, 5.0, True)
+    router._record("find_category", FAST, 0.5, True)
+    assert router.candidates("find_category") == [FAST, SLOW]
+
+
+def test_routes_in_cooldown_go_last():
+    router = make_router("ordered")
+    router._record("find_category", SLOW, 1.0, False)
+    router._record("find_category", SLOW, 1.0, False)
+    assert router.candidates("find_category") == [FAST, SLOW]
+
+
+def test_hedge_delay_uses_quickest_route_percentile():
+    router = make_router(hedged={"find_category"})
+    assert router.hedge_delay("find_category") == 10.0
+    for seconds in (0.2, 0.3, 0.4):
+        router._record("find_category", FAST, seconds, True)
+    for seconds in (2.0, 3.0, 4.0):
+        router._record("find_category", SLOW, seconds, True)
+    assert router.hedge_delay("find_category") == 0.4
+
+
+def fake_calls(router, delays, failing=()):
+    calls = []
+
+    async def call(name, route, inputs):
+        calls.append(route)
+        await asyncio.sleep(delays[route])
+        if route in failing:
+            raise RuntimeError(f"{route.label} down")
+        return {"route": route.label}
+
+    router._call = call
+    return calls
+
+
+def test_failover_to_next_route():
+    router = make_router()
+    calls = fake_calls(router, {SLOW: 0, FAST: 0}, failing={SLOW})
+    assert asyncio.run(router.ainvoke("find_category", {})) == {"route": FAST.label}
+    assert calls == [SLOW, FAST]
+
+
+def test_error_of_last_route_is_raised():
+    router = make_router()
+    fake_calls(router, {SLOW: 0, FAST: 0}, failing={SLOW, FAST})
+    with pytest.raises(RuntimeError, match="openai/gpt-5-nano down"):
+        asyncio.run(router.ainvoke("find_category", {}))
+
+
+def test_hedge_answers_from_second_route(monkeypatch):
+    monkeypatch.setattr(llm_models, "ASYNC_CLIENTS", True)
+    monkeypatch.setattr(model_router, "LLM_HEDGE_INITIAL_DELAY", 0.05)
+    router = make_router(hedged={"find_category"})
+    calls = fake_calls(router, {SLOW: 5.0, FAST: 0})
+    started = time.monotonic()
+    assert asyncio.run(router.ainvoke("find_category", {})) == {"route": FAST.label}
+    assert time.monotonic() - started < 2
+    assert calls == [SLOW, FAST]
+    snapshot = router.snapshot()["find_category"]["routes"]
+    assert snapshot[SLOW.label]["hedges"] == 1
+    assert snapshot[FAST.label]["wins"] == 1
+
+
+def test_no_hedge_when_first_route_answers_in_time():
+    router = make_router(hedged={"find_category"})
+    calls = fake_calls(router, {SLOW: 0, FAST: 0})
+    assert asyncio.run(router.ainvoke("find_category", {})) == {"route": SLOW.label}
+    assert calls == [SLOW]
+
+
+class Category(BaseModel):
+    category: str
+
+
+def sleeping_backend(model, temperature, base_url):
+    """A blocking chat model: model "0.3" answers after 0.3s."""
+    def answer(prompt):
+        time.sleep(float(model))
+        return '{"category": "%s"}' % model
+    return RunnableLambda(answer)
+
+
+def test_flask_view_is_not_held_by_a_hedge(monkeypatch):
+    monkeypatch.setattr(llm_models, "ASYNC_CLIENTS", False)
+    monkeypatch.setattr(model_router, "LLM_HEDGE_INITIAL_DELAY", 0.05)
+    llm_models.register_backend("sleeping", sleeping_backend)
+    first, slow = Route("sleeping", "0.3"), Route("sleeping", "3")
+    router = ModelRouter({"find_category": Category}, {"find_category": [first, slow]},
+                         {"find_category": "ordered"}, {"find_category"})
+    app = Flask(__name__)
+
+    @app.post("/findoutcategory")
+    async def view():
+        return await router.ainvoke("find_category", {"query": "solar farms"})
+
+    started = time.monotonic()
+    response = app.test_client().post("/findoutcategory")
+    elapsed = time.monotonic() - started
+    assert response.get_json() == {"category": "0.3"}
+    # a hedge to the 3s route would only be discarded after the view had waited for its thread
+    assert elapsed < 1.5
+    assert router.snapshot()["find_category"]["routes"][first.label]["hedges"] == 0
@@ -0,0 +1,52 @@
+import json
+import logging
+
+import pytest
+
+import request_timing
+
+
+@pytest.fixture
+def timing_logger():
+    logger = request_timing.logger
+    saved = (logger.level, list(logger.handlers), logger.propagate)
+    logger.handlers.clear()
+    # as before configure_logging(); pytest also hooks its capture into non-propagating loggers
+    logger.propagate = True
+    yield logger
+    logger.level, logger.handlers[:], logger.propagate = saved
+
+
+def test_request_log_line_is_emitted(timing_logger, capsys):
+    request_timing.configure_logging("INFO")
+    token = request_timing.start("GET", "/rankingprojects/projects")
+    with request_timing.phase("db"):
+        pass
+    request_timing.count("rows", 3)
+    header = request_timing.finish(token, 200)
+    assert header.startswith("db;dur=")
+
+    line = capsys.readouterr().err.strip().splitlines()[-1]
+    assert " INFO rankingprojects.timing " in line
+    record = json.loads(line.split(" rankingprojects.timing ", 1)[1])
+    assert (record["method"], record["path"], record["status"]) == ("GET", "/rankingprojects/projects", 200)
+    assert set(record["phases"]) == {"db"} and record["counters"] == {"rows": 3}
+
+
+def test_warning_level_keeps_only_slow_requests(timing_logger, capsys):
+    request_timing.configure_logging("WARNING")
+    request_timing.finish(request_timing.start("GET", "/health"), 200)
+    assert capsys.readouterr().err == ""
+
+
+def test_existing_handler_is_kept(timing_logger):
+    handler = logging.NullHandler()
+    timing_logger.addHandler(handler)
+    request_timing.configure_logging("INFO")
+    assert timing_logger.handlers == [handler]
+    assert timing_logger.level == logging.INFO
+
+
+def test_finish_without_timer():
+    token = request_timing._current.set(None)
+    assert request_timing.finish(token, 200) is None
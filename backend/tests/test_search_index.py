@@ -0,0 +1,105 @@
+from search_index import SearchIndex, fold, query_terms, stem, tokenize
+
+
+def fields(title="", description="", authors="", script="", documents=""):
+    return {"title": title, "description": description, "authors": authors,
+            "script": script, "documents": documents}
+
+
+def build():
+    index = SearchIndex()
+    index.add(1, fields("Solar irrigation", "Pumps water for small farms"), "agro", 80)
+    index.add(2, fields("Farm marketplace", "Sells solar panels and seeds"), "agro", 40)
+    index.add(3, fields("Telemedicine", "Remote consultations for rural clinics"), "health", 65)
+    return index
+
+
+def ids(hits):
+    return [project_id for project_id, _ in hits]
+
+
+def test_fold_and_tokenize_strip_accents_and_case():
+    assert fold("Educació Pública") == "educacio publica"
+    assert tokenize("L'educació, la SALUT!") == ["l", "educacio", "la", "salut"]
+    # the Catalan middle dot splits l·l words in text and query alike
+    assert tokenize("col·laboració") == ["col", "laboracio"]
+
+
+def test_stem_keeps_a_minimum_stem():
+    assert stem("farms", "en") == "farm"
+    assert stem("innovacion", "es") == "innov"
+    assert stem("as", "en") == "as"
+
+
+def test_query_terms_expand_per_language_and_drop_stopwords():
+    # only words that are stopwords in every language are dropped
+    assert query_terms("a") == []
+    assert query_terms("the") == [{"the"}]
+    terms = query_terms("Innovación innovacion")
+    assert len(terms) == 1
+    assert {"innovacion", "innov"} <= terms[0]
+
+
+def test_title_match_outranks_description_match():
+    total, hits = build().search("solar")
+    assert total == 2
+    assert ids(hits) == [1, 2]
+    assert hits[0][1] > hits[1][1] > 0
+
+
+def test_no_match_and_empty_index():
+    assert build().search("blockchain") == (0, [])
+    assert SearchIndex().search("solar") == (0, [])
+
+
+def test_filters():
+    index = build()
+    assert ids(index.search("farms", category="agro")[1]) == [2, 1]
+    assert ids(index.search("solar", min_score=50)[1]) == [1]
+    assert ids(index.search("solar", max_score=50)[1]) == [2]
+    assert index.search("rural", category="agro") == (0, [])
+
+
+def test_limit_and_offset_page_the_ranking():
+    index = build()
+    total, first = index.search("solar", limit=1)
+    assert total == 2 and ids(first) == [1]
+    assert ids(index.search("solar", limit=1, offset=1)[1]) == [2]
+
+
+def test_remove_and_reindex():
+    index = build()
+    index.remove(1)
+    assert len(index) == 2
+    assert ids(index.search("solar")[1]) == [2]
+    index.add(2, fields("Seed exchange", "Local seeds"), "agro", 40)
+    assert index.search("solar") == (0, [])
+    assert ids(index.search("seeds")[1]) == [2]
+
+
+def test_compact_keeps_results():
+    index = build()
+    index.remove(3)
+    before = index.search("farms")
+    index.compact()
+    assert index.dead == 0
+    assert len(index.doc_project) == 2
+    assert index.search("farms") == before
+    assert index.search("telemedicine") == (0, [])
+
+
+def test_unchanged_text_only_updates_category_and_score():
+    index = build()
+    postings = len(index.doc_project)
+    index.add(1, fields("Solar irrigation", "Pumps water for small farms"), "energy", 95)
+    assert len(index.doc_project) == postings
+    assert ids(index.search("solar", category="energy", min_score=90)[1]) == [1]
+
+
+def test_spanish_and_catalan_variants_match():
+    index = SearchIndex()
+    index.add(1, fields("Plataforma de educación", "Una red para las escuelas rurales"), None, 0)
+    index.add(2, fields("Xarxa de salut", "Una aplicació per als centres de salut"), None, 0)
+    assert ids(index.search("educacion")[1]) == [1]
+    assert ids(index.search("escuela")[1]) == [1]
+    assert ids(index.search("salut")[1]) == [2]
@@ -0,0 +1,79 @@
+from text_normalizer import PAGE_NUMBER_RE, learn_template_lines, line_key, normalize_pages
+
+
+def test_line_key_masks_digits_and_spacing():
+    assert line_key("  Page   12 of 30 ") == "page # of #"
+    assert line_key("Version:\t2") == line_key("version: 7")
+
+
+def test_page_number_pattern():
+    for line in ("3", "- 3 -", "Page 3", "pàg. 4", "Página 2 de 10", "3/12", "[7]"):
+        assert PAGE_NUMBER_RE.match(line), line
+    for line in ("3 customers", "Revenue 2024", "Page turner"):
+        assert not PAGE_NUMBER_RE.match(line), line
+
+
+def test_collapses_whitespace():
+    result = normalize_pages(["Value   proposition\t here\n\n\n  Channels  "])
+    assert result.text == "Value proposition here\nChannels"
+    assert result.removed["whitespace"] > 0
+
+
+def test_page_numbers_only_at_page_edges():
+    page = "Page 1\nIntro\nCustomers\n42\nMarket\nSize\n- 1 -"
+    result = normalize_pages([page])
+    # the bare 42 in the middle of the page is content
+    assert result.text == "Intro\nCustomers\n42\nMarket\nSize"
+    assert result.removed["page_numbers"] == len("Page 1\n") + len("- 1 -\n")
+
+
+def test_template_lines_removed():
+    result = normalize_pages(["The Business Model Canvas\nDesigned for: Acme\nKey partners\nVersion:"])
+    assert result.text == "Designed for: Acme\nKey partners"
+    assert result.removed["template"] == len("The Business Model Canvas\n") + len("Version:\n")
+
+
+def test_custom_template_keys():
+    keys = frozenset({line_key("Confidential")})
+    assert normalize_pages(["CONFIDENTIAL\nPlan"], template_keys=keys).text == "Plan"
+
+
+def test_repeated_header_kept_once():
+    pages = [f"Acme Solar Ltd\nSection {n} text" for n in range(4)]
+    result = normalize_pages(pages, template_keys=frozenset())
+    assert result.text.count("Acme Solar Ltd") == 1
+    # masked digits: "Section # text" repeats too
+    assert result.removed["repeated"] == 3 * len("Acme Solar Ltd\n") + 3 * len("Section 1 text\n")
+    assert "Section 0 text" in result.text and "Section 3 text" not in result.text
+
+
+def test_repeats_need_min_pages():
+    pages = ["Acme Solar Ltd\nOne", "Acme Solar Ltd\nTwo"]
+    result = normalize_pages(pages, template_keys=frozenset(), repeat_min_pages=3)
+    assert result.text.count("Acme Solar Ltd") == 2
+    assert "repeated" not in result.removed
+
+
+def test_long_lines_are_never_repeats():
+    long_line = "x" * 250
+    pages = [f"{long_line}\nPage body {chr(97 + n)}" for n in range(3)]
+    assert normalize_pages(pages, template_keys=frozenset()).text.count(long_line) == 3
+
+
+def test_empty_pages_and_counts():
+    result = normalize_pages([None, "", "Text"])
+    assert result.text == "Text"
+    assert result.original_chars == len("\n\nText")
+    assert result.removed_chars == result.original_chars - len("Text")
+
+
+def test_learn_template_lines():
+    documents = [
+        ["Our canvas\nKey partners: farms\n3", "Key activities"],
+        ["Our canvas\nKey partners: clinics\n4", "Key activities"],
+        ["Other heading\nKey activities"],
+    ]
+    learned = learn_template_lines(documents)
+    assert learned[0] == "Key activities"
+    assert set(learned) == {"Key activities", "Our canvas"}
+    assert learn_template_lines(documents, min_documents=3) == ["Key activities"]
@@ -0,0 +1,210 @@
+# text_normalizer.py
+"""
+Cleans the text pdfplumber extracts before it is put into the prompts.
+
+    result = normalize_pages(["page 1 text", "page 2 text", ...])
+    result.text             cleaned text, pages separated by a blank line
+    result.removed_chars    characters dropped (result.removed has them per rule)
+
+Rules, in order:
+  - whitespace     runs of spaces/tabs collapse to one, blank lines are dropped
+  - page_numbers   first/last lines that are only a page number ("3", "- 3 -", "Page 3 of 10", "Pàg. 3")
+  - template       known template lines: the Business Model Canvas licence footer
+                   and whatever TEXT_TEMPLATE_FILE lists (one line per line; seed it
+                   with `python text_normalizer.py learn <rubric urls>`)
+  - repeated       headers/footers: a short line found on at least TEXT_REPEAT_MIN_PAGES
+                   pages and on half of them is kept the first time only (digits are
+                   ignored when comparing, so "Acme - 3" and "Acme - 4" are the same line)
+
+    TEXT_NORMALIZATION=1        0 only joins the pages, as before
+    TEXT_REPEAT_MIN_PAGES=3
+    TEXT_TEMPLATE_FILE=
+"""
+from __future__ import annotations
+import argparse
+import logging
+import os
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+TEXT_NORMALIZATION = os.getenv("TEXT_NORMALIZATION", "1") != "0"
+TEXT_REPEAT_MIN_PAGES = int(os.getenv("TEXT_REPEAT_MIN_PAGES", "3"))
+TEXT_TEMPLATE_FILE = os.getenv("TEXT_TEMPLATE_FILE") or None
+
+# Longer lines are content even when they repeat
+MAX_REPEATED_LINE_CHARS = 200
+# Page numbers are only looked for in the first/last lines of a page
+PAGE_NUMBER_EDGE_LINES = 2
+
+DEFAULT_TEMPLATE_LINES = (
+    "The Business Model Canvas",
+    "Designed for:",
+    "Designed by:",
+    "Date:",
+    "Version:",
+    "Iteration:",
+    "www.businessmodelgeneration.com",
+    "strategyzer.com",
+    "Strategyzer AG",
+    "This work is licensed under the Creative Commons Attribution-Share Alike 3.0 Unported License.",
+    "To view a copy of this license, visit http://creativecommons.org/licenses/by-sa/3.0/",
+    "or send a letter to Creative Commons, 171 Second Street, Suite 300, San Francisco, California, 94105, USA.",
+)
+
+PAGE_NUMBER_RE = re.compile(
+    r"^[-–—(\[\s]*(?:(?:page|pag|pág|pàg|pagina|página|pàgina|p)\.?\s*)?"
+    r"\d{1,4}(?:\s*(?:/|of|de|of the)\s*\d{1,4})?[-–—)\]\s]*$",
+    re.IGNORECASE,
+)
+SPACES_RE = re.compile(r"[ \t \f\v]+")
+DIGITS_RE = re.compile(r"\d+")
+
+logger = logging.getLogger("rankingprojects.text")
+
+
+@dataclass
+class NormalizedText:
+    text: str
+    original_chars: int
+    removed: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def removed_chars(self) -> int:
+        return self.original_chars - len(self.text)
+
+
+def line_key(line: str) -> str:
+    """Comparison form of a line: lower-case, single spaces, digits masked."""
+    return DIGITS_RE.sub("#", SPACES_RE.sub(" ", line).strip().lower())
+
+
+def load_template_lines(path: Optional[str] = TEXT_TEMPLATE_FILE) -> FrozenSet[str]:
+    lines = list(DEFAULT_TEMPLATE_LINES)
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            lines += [line for line in f.read().splitlines() if line.strip() and not line.startswith("#")]
+    return frozenset(line_key(line) for line in lines)
+
+
+TEMPLATE_KEYS = load_template_lines()
+
+
+def normalize_pages(pages: Iterable[Optional[str]], template_keys: FrozenSet[str] = TEMPLATE_KEYS,
+                    repeat_min_pages: int = TEXT_REPEAT_MIN_PAGES) -> NormalizedText:
+    pages = [page or "" for page in pages]
+    original_chars = len("\n".join(pages))
+    if not TEXT_NORMALIZATION:
+        return NormalizedText("\n".join(pages), original_chars)
+
+    removed = Counter()
+    page_lines: List[List[str]] = []
+    for page in pages:
+        collapsed = []
+        for raw in page.splitlines():
+            line = SPACES_RE.sub(" ", raw).strip()
+            removed["whitespace"] += len(raw) + 1 - (len(line) + 1 if line else 0)
+            if line:
+                collapsed.append(line)
+        lines = []
+        for position, line in enumerate(collapsed):
+            # Page numbers sit in the header or footer; a bare number elsewhere is content
+            edge = position < PAGE_NUMBER_EDGE_LINES or position >= len(collapsed) - PAGE_NUMBER_EDGE_LINES
+            if edge and PAGE_NUMBER_RE.match(line):
+                removed["page_numbers"] += len(line) + 1
+                continue
+            if line_key(line) in template_keys:
+                removed["template"] += len(line) + 1
+                continue
+            lines.append(line)
+        page_lines.append(lines)
+
+    repeated = set()
+    if len(page_lines) >= repeat_min_pages:
+        pages_with = Counter()
+        for lines in page_lines:
+            pages_with.update({line_key(line) for line in lines if len(line) <= MAX_REPEATED_LINE_CHARS})
+        threshold = max(repeat_min_pages, (len(page_lines) + 1) // 2)
+        repeated = {key for key, count in pages_with.items() if count >= threshold}
+
+    seen = set()
+    kept_pages = []
+    for lines in page_lines:
+        kept = []
+        for line in lines:
+            key = line_key(line)
+            if key in repeated:
+                if key in seen:
+                    removed["repeated"] += len(line) + 1
+                    continue
+                seen.add(key)
+            kept.append(line)
+        if kept:
+            kept_pages.append("\n".join(kept))
+
+    result = NormalizedText("\n\n".join(kept_pages), original_chars, dict(removed))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("normalized %d pages: %d -> %d chars %s",
+                     len(pages), original_chars, len(result.text), result.removed)
+    return result
+
+
+def learn_template_lines(documents: List[List[str]], min_documents: int = 2) -> List[str]:
+    """Short lines present in at least `min_documents` of the given documents (lists of pages)."""
+    documents_with = Counter()
+    first_seen: Dict[str, str] = {}
+    for pages in documents:
+        keys = set()
+        for page in pages:
+            for raw in (page or "").splitlines():
+                line = SPACES_RE.sub(" ", raw).strip()
+                if line and len(line) <= MAX_REPEATED_LINE_CHARS and not PAGE_NUMBER_RE.match(line):
+                    key = line_key(line)
+                    keys.add(key)
+                    first_seen.setdefault(key, line)
+        documents_with.update(keys)
+    return [first_seen[key] for key, count in documents_with.most_common() if count >= min_documents]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PDF text normalization tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    learn = sub.add_parser("learn", help="Print lines shared by several PDFs (template candidates)")
+    learn.add_argument("sources", nargs="+", help="PDF files or URLs, e.g. every category rubric")
+    learn.add_argument("--min-documents", type=int, default=2)
+    check = sub.add_parser("check", help="Show what normalization removes from PDFs")
+    check.add_argument("sources", nargs="+")
+    check.add_argument("--print", action="store_true", help="Print the normalized text")
+    args = parser.parse_args(argv)
+
+    import urllib.request
+    from rankingprojects import parse_pdf_pages
+
+    def read_pages(source):
+        if re.match(r"https?://", source):
+            with urllib.request.urlopen(source) as response:
+                return parse_pdf_pages(response.read())
+        with open(source, "rb") as f:
+            return parse_pdf_pages(f.read())
+
+    if args.command == "learn":
+        print("# Lines shared by at least %d of %d documents; review before using as TEXT_TEMPLATE_FILE"
+              % (args.min_documents, len(args.sources)))
+        for line in learn_template_lines([read_pages(s) for s in args.sources], args.min_documents):
+            print(line)
+        return 0
+
+    for source in args.sources:
+        result = normalize_pages(read_pages(source))
+        share = result.removed_chars / result.original_chars if result.original_chars else 0.0
+        print(f"{source}: {result.original_chars} -> {len(result.text)} chars "
+              f"({share:.0%} removed) {result.removed}")
+        if args.print:
+            print(result.text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
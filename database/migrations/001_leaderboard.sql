@@ -0,0 +1,14 @@
+-- Leaderboard support for existing installs.
+-- Adds the derived like counter and the indexes used by /rankingprojects/leaderboard.
+
+ALTER TABLE `projects`
+  ADD COLUMN `like_count` int(11) NOT NULL DEFAULT 0;
+
+-- created_at is re-stamped by every UPDATE (ON UPDATE current_timestamp()), keep it
+UPDATE `projects` SET `like_count` = JSON_LENGTH(`likes`), `created_at` = `created_at` WHERE JSON_VALID(`likes`);
+
+ALTER TABLE `projects`
+  ADD KEY `category_score` (`category_id`,`score`),
+  ADD KEY `category_likes` (`category_id`,`like_count`,`score`),
+  ADD KEY `score` (`score`),
+  ADD KEY `likes_score` (`like_count`,`score`);
@@ -0,0 +1,11 @@
+-- Version stamps shared by every backend worker.
+-- Bump a row after writing the matching table by hand so cached copies are reloaded, e.g.:
+--   UPDATE `cache_versions` SET `version` = `version` + 1 WHERE `name` = 'categories';
+
+CREATE TABLE `cache_versions` (
+  `name` varchar(50) NOT NULL,
+  `version` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+INSERT INTO `cache_versions` (`name`, `version`) VALUES ('categories', 1);
@@ -0,0 +1,5 @@
+-- Registration relies on this index to reject duplicate emails (no SELECT before INSERT).
+-- Remove any duplicated users before applying it.
+
+ALTER TABLE `users`
+  ADD UNIQUE KEY `email` (`email`);
@@ -0,0 +1,4 @@
+-- Optimistic concurrency for PATCH /rankingprojects/me/session.
+
+ALTER TABLE `users`
+  ADD COLUMN `session_version` int(11) NOT NULL DEFAULT 0;
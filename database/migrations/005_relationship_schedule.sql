@@ -0,0 +1,29 @@
+-- Freshness stamps and checkpoint table for backend/relationship_scheduler.py.
+-- created_at is re-stamped by every UPDATE (ON UPDATE current_timestamp()), so
+-- content and relationship changes get columns of their own.
+
+ALTER TABLE `projects`
+  ADD COLUMN `content_updated_at` timestamp NULL DEFAULT NULL,
+  ADD COLUMN `relationships_local_at` timestamp NULL DEFAULT NULL,
+  ADD COLUMN `relationships_global_at` timestamp NULL DEFAULT NULL;
+
+UPDATE `projects`
+SET `created_at` = `created_at`,
+    `content_updated_at` = `created_at`,
+    `relationships_local_at` = IF(`relationships_local` <> '', `created_at`, NULL),
+    `relationships_global_at` = IF(`relationships_global` <> '', `created_at`, NULL);
+
+CREATE TABLE `relationship_schedule` (
+  `project_id` int(11) NOT NULL,
+  `scope` varchar(10) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'pending',
+  `reason` varchar(20) NOT NULL DEFAULT '',
+  `candidates` text NOT NULL,
+  `attempts` int(11) NOT NULL DEFAULT 0,
+  `estimated_tokens` int(11) NOT NULL DEFAULT 0,
+  `last_error` varchar(500) NOT NULL DEFAULT '',
+  `planned_at` timestamp NULL DEFAULT NULL,
+  `finished_at` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`project_id`, `scope`),
+  KEY `status` (`status`, `planned_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
@@ -0,0 +1,17 @@
+-- Full-text search (backend/search_index.py).
+-- updated_at is the watermark the in-process index syncs from; project_documents
+-- keeps the text extracted from the canvas/summary PDFs.
+
+ALTER TABLE `projects`
+  ADD COLUMN `updated_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+  ADD KEY `updated_at` (`updated_at`);
+
+CREATE TABLE `project_documents` (
+  `project_id` int(11) NOT NULL,
+  `kind` varchar(20) NOT NULL,
+  `url` varchar(200) NOT NULL,
+  `text` mediumtext NOT NULL,
+  `extracted_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`project_id`, `kind`),
+  KEY `extracted_at` (`extracted_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
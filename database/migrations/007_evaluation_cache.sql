@@ -0,0 +1,20 @@
+-- Language-independent evaluations (backend/evaluation_cache.py).
+-- evaluation_results keeps the canonical rubric assessment under a hash of its
+-- inputs; evaluation_renderings keeps its translations, one row per language.
+
+CREATE TABLE `evaluation_results` (
+  `evaluation_hash` char(64) NOT NULL,
+  `score` int(11) NOT NULL,
+  `result` mediumtext NOT NULL,
+  `model` varchar(100) NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`evaluation_hash`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE `evaluation_renderings` (
+  `evaluation_hash` char(64) NOT NULL,
+  `lang` varchar(5) NOT NULL,
+  `rendering` mediumtext NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`evaluation_hash`, `lang`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
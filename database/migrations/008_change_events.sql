@@ -0,0 +1,12 @@
+-- Change feed (backend/change_feed.py): one row per delta published by the
+-- write endpoints. The AUTO_INCREMENT id is the event id clients resume from.
+
+CREATE TABLE `change_events` (
+  `id` bigint(20) NOT NULL AUTO_INCREMENT,
+  `kind` varchar(30) NOT NULL,
+  `project_id` int(11) DEFAULT NULL,
+  `data` text NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`id`),
+  KEY `created_at` (`created_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
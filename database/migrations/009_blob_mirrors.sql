@@ -0,0 +1,12 @@
+-- Local document store (backend/blob_store.py): remote document URLs that have
+-- been downloaded once and are now read from the blob with this sha256.
+
+CREATE TABLE `blob_mirrors` (
+  `url_hash` char(64) NOT NULL,
+  `url` text NOT NULL,
+  `sha256` char(64) NOT NULL,
+  `size` int(11) NOT NULL,
+  `mirrored_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`url_hash`),
+  KEY `sha256` (`sha256`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
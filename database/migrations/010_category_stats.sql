@@ -0,0 +1,29 @@
+-- Category statistics (backend/category_stats.py): per-category aggregates
+-- updated in the same transaction as evaluation, like and project writes,
+-- and the number of evaluated projects per (category, score) for medians
+-- and histograms. Filled from the current projects below;
+-- `python category_stats.py recompute` does the same later.
+
+CREATE TABLE `category_stats` (
+  `category_id` varchar(50) NOT NULL,
+  `projects` int(11) NOT NULL DEFAULT 0,
+  `evaluated` int(11) NOT NULL DEFAULT 0,
+  `score_sum` bigint(20) NOT NULL DEFAULT 0,
+  `likes` bigint(20) NOT NULL DEFAULT 0,
+  `updated_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+  PRIMARY KEY (`category_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+CREATE TABLE `category_score_counts` (
+  `category_id` varchar(50) NOT NULL,
+  `score` int(11) NOT NULL,
+  `projects` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`category_id`,`score`)
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+INSERT INTO `category_stats` (`category_id`, `projects`, `evaluated`, `score_sum`, `likes`)
+SELECT `category_id`, COUNT(*), SUM(`evaluation` <> ''), SUM(IF(`evaluation` <> '', `score`, 0)), SUM(`like_count`)
+FROM `projects` GROUP BY `category_id`;
+
+INSERT INTO `category_score_counts` (`category_id`, `score`, `projects`)
+SELECT `category_id`, `score`, COUNT(*) FROM `projects` WHERE `evaluation` <> '' GROUP BY `category_id`, `score`;
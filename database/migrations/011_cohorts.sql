@@ -0,0 +1,45 @@
+-- Cohorts (backend/cohorts.py): several programs on one install. Users,
+-- projects and categories get a cohort_id and every existing row goes to
+-- cohort 1. The project indexes now lead with the cohort, so lists,
+-- leaderboards and stats only read the rows of the cohort they are asked for.
+
+CREATE TABLE `cohorts` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `name` varchar(200) NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT INTO `cohorts` (`id`, `name`) VALUES (1, 'Default');
+
+ALTER TABLE `users`
+  ADD COLUMN `cohort_id` int(11) NOT NULL DEFAULT 1,
+  ADD KEY `cohort_id` (`cohort_id`,`id`);
+
+ALTER TABLE `categories`
+  ADD COLUMN `cohort_id` int(11) NOT NULL DEFAULT 1,
+  ADD KEY `cohort_id` (`cohort_id`,`uid`);
+
+ALTER TABLE `projects`
+  ADD COLUMN `cohort_id` int(11) NOT NULL DEFAULT 1,
+  DROP KEY `category_score`,
+  DROP KEY `category_likes`,
+  DROP KEY `score`,
+  DROP KEY `likes_score`,
+  ADD KEY `cohort_id` (`cohort_id`,`id`),
+  ADD KEY `cohort_category_score` (`cohort_id`,`category_id`,`score`),
+  ADD KEY `cohort_category_likes` (`cohort_id`,`category_id`,`like_count`,`score`),
+  ADD KEY `cohort_score` (`cohort_id`,`score`),
+  ADD KEY `cohort_likes_score` (`cohort_id`,`like_count`,`score`),
+  ADD KEY `cohort_updated_at` (`cohort_id`,`updated_at`);
+
+-- Category statistics are kept per (cohort, category)
+ALTER TABLE `category_stats`
+  ADD COLUMN `cohort_id` int(11) NOT NULL DEFAULT 1 FIRST,
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (`cohort_id`,`category_id`);
+
+ALTER TABLE `category_score_counts`
+  ADD COLUMN `cohort_id` int(11) NOT NULL DEFAULT 1 FIRST,
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (`cohort_id`,`category_id`,`score`);
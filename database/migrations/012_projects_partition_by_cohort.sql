@@ -0,0 +1,18 @@
+-- OPTIONAL: one LIST partition of projects per cohort, so a cohort's scans
+-- only touch its own partition. Apply after 011, while cohort 1 is the only
+-- cohort; with more cohorts run `python cohorts.py partition` instead, which
+-- lists them all. Afterwards `python cohorts.py create` adds the partition of
+-- every new cohort.
+--
+-- MariaDB requires the partitioning column in every unique key, so the
+-- primary key becomes (id, cohort_id); id stays AUTO_INCREMENT and unique.
+-- Lookups by id alone then probe every partition, which is one index dive each.
+
+ALTER TABLE `projects`
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (`id`,`cohort_id`);
+
+ALTER TABLE `projects`
+  PARTITION BY LIST (`cohort_id`) (
+    PARTITION `p1` VALUES IN (1)
+  );
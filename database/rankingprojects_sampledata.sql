@@ -23,6 +23,31 @@ SET time_zone = "+00:00";
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `blob_mirrors`
+--
+
+CREATE TABLE `blob_mirrors` (
+  `url_hash` char(64) NOT NULL,
+  `url` text NOT NULL,
+  `sha256` char(64) NOT NULL,
+  `size` int NOT NULL,
+  `mirrored_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `cache_versions`
+--
+
+CREATE TABLE `cache_versions` (
+  `name` varchar(50) NOT NULL,
+  `version` int NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `categories`
 --
@@ -35,7 +60,8 @@ CREATE TABLE `categories` (
   `labelActiveShort` varchar(80) NOT NULL,
   `labelLong` varchar(200) NOT NULL,
   `rubric` varchar(200) NOT NULL,
-  `traits` varchar(1000) NOT NULL
+  `traits` varchar(1000) NOT NULL,
+  `cohort_id` int NOT NULL DEFAULT 1
 ) ENGINE=InnoDB DEFAULT CHARSET=latin1;
 
 --
@@ -54,6 +80,109 @@ INSERT INTO `categories` (`uid`, `id`, `color`, `labelShort`, `labelActiveShort`
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `category_score_counts`
+--
+
+CREATE TABLE `category_score_counts` (
+  `cohort_id` int NOT NULL DEFAULT 1,
+  `category_id` varchar(50) NOT NULL,
+  `score` int NOT NULL,
+  `projects` int NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `category_stats`
+--
+
+CREATE TABLE `category_stats` (
+  `cohort_id` int NOT NULL DEFAULT 1,
+  `category_id` varchar(50) NOT NULL,
+  `projects` int NOT NULL DEFAULT 0,
+  `evaluated` int NOT NULL DEFAULT 0,
+  `score_sum` bigint NOT NULL DEFAULT 0,
+  `likes` bigint NOT NULL DEFAULT 0,
+  `updated_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `change_events`
+--
+
+CREATE TABLE `change_events` (
+  `id` bigint NOT NULL,
+  `kind` varchar(30) NOT NULL,
+  `project_id` int DEFAULT NULL,
+  `data` text NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `cohorts`
+--
+
+CREATE TABLE `cohorts` (
+  `id` int NOT NULL,
+  `name` varchar(200) NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+--
+-- Dumping data for table `cohorts`
+--
+
+INSERT INTO `cohorts` (`id`, `name`, `created_at`) VALUES
+(1, 'Default', '2026-01-30 11:00:00');
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `evaluation_renderings`
+--
+
+CREATE TABLE `evaluation_renderings` (
+  `evaluation_hash` char(64) NOT NULL,
+  `lang` varchar(5) NOT NULL,
+  `rendering` mediumtext NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `evaluation_results`
+--
+
+CREATE TABLE `evaluation_results` (
+  `evaluation_hash` char(64) NOT NULL,
+  `score` int NOT NULL,
+  `result` mediumtext NOT NULL,
+  `model` varchar(100) NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `project_documents`
+--
+
+CREATE TABLE `project_documents` (
+  `project_id` int NOT NULL,
+  `kind` varchar(20) NOT NULL,
+  `url` varchar(200) NOT NULL,
+  `text` mediumtext NOT NULL,
+  `extracted_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `projects`
 --
@@ -77,7 +206,13 @@ CREATE TABLE `projects` (
   `conversation` mediumtext NOT NULL,
   `likes` text NOT NULL,
   `relationships_local` mediumtext NOT NULL,
-  `relationships_global` mediumtext NOT NULL
+  `relationships_global` mediumtext NOT NULL,
+  `like_count` int NOT NULL DEFAULT 0,
+  `content_updated_at` timestamp NULL DEFAULT NULL,
+  `relationships_local_at` timestamp NULL DEFAULT NULL,
+  `relationships_global_at` timestamp NULL DEFAULT NULL,
+  `updated_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  `cohort_id` int NOT NULL DEFAULT 1
 ) ENGINE=InnoDB DEFAULT CHARSET=latin1;
 
 --
@@ -135,6 +270,48 @@ INSERT INTO `projects` (`id`, `email`, `created_at`, `category_id`, `title`, `de
 INSERT INTO `projects` (`id`, `email`, `created_at`, `category_id`, `title`, `description`, `authors`, `link`, `pitch`, `canvas`, `summary`, `script`, `detail`, `score`, `evaluation`, `conversation`, `likes`, `relationships_local`, `relationships_global`) VALUES
 (26, 'esteban@workflowsimulator.com', '2026-01-30 19:10:47', 'saas', 'Workflow Simulator', 'An AI-powered SaaS that builds a digital twin of an office using 3D visualization and AI agents (plus real users) to simulate, analyze, and optimize team workflows, hiring and training before real-wor', 'Esteban Gallardo', 'https://www.workflowsimulator.com', 'https://youtu.be/2pbE_4iZB54', 'https://www.yourvrexperience.com/courses/spinuoc/Esteban_Gallardo_WorkflowSimulator_CANVAS.pdf', 'https://www.yourvrexperience.com/courses/spinuoc/Esteban_Gallardo_WorkflowSimulator_Resumen_Ejecutivo.pdf', 'Hello, my name is Esteban, and I’m the creator of Workflow Simulator.\n\nWhat is Workflow Simulator?\n\nWorkflow Simulator is an open-source platform that lets companies create a digital twin of their office.\nIt combines project management, 3D visualization, and AI agents to simulate how teams actually work together—before decisions are made in the real world.\n\nWhat problems does it solve?\n\nToday, organizations make critical decisions about workflows, team structures, or hiring based on assumptions, static tools, or trial and error.\nThat leads to inefficiencies, poor onboarding, and costly mistakes.\nWorkflow Simulator provides a safe environment where companies can test workflows, simulate teamwork, and evaluate outcomes—without real-world risk.\n\nWhat is the most innovative feature?\n\nThe key innovation is the AI simulation layer.\nAI agents behave like real team members: they collaborate, attend meetings, manage tasks, and react to changes over time.\nYou can even introduce a real candidate into the simulation and observe soft skills like communication, adaptability, and teamwork—something traditional tools can’t measure.\n\nWho can be interested?\n\nWorkflow Simulator is ideal for startups, HR departments, educators, and innovation teams—anyone who wants to improve collaboration, hiring, training, or project planning using realistic simulations.\n\nWorkflow Simulator is not just a tool—it’s a sandbox for the future of work.\n\nThank you.', 'Hello,\n<p>\nMy name is Esteban Gallardo. I am a computer engineer, and I would like to present my project, <strong>\"Workflow Simulator\"</strong>: a software solution that allows the simulation of a real office environment to carry out work methodology simulations. Its goal is to optimize productive processes, improve recruitment processes, and foster team dynamics and effective leadership.\n</p>\n<p>\n<ol>\n  <li>Video pitch: <a href=\"https://youtu.be/2pbE_4iZB54\">https://youtu.be/2pbE_4iZB54</a></li>\n  <li>Website: <a href=\"https://www.workflowsimulator.com\">https://www.workflowsimulator.com</a></li>\n</ol>\n</p>\n<p>\nOther featured projects (aligned with the proposals above):\n</p>\n<p>\n<ol>\n  <li><strong>Story Book Editor:</strong> A tool designed to help independent writers convert their works into audiobooks.</li>\n  <li><strong>Applied Technopedagogy:</strong> As part of the Master’s Degree in Technopedagogical Education (UOC), I develop courses based on technopedagogical criteria to maximize learning outcomes through the integration of digital tools.</li>\n</ol>\n</p>\n<p>\nExamples:\n</p>\n<p>\n<ol>\n  <li>Building a Professional Portfolio Website with GitHub Pages & AI: \n    <a href=\"https://www.yourvrexperience.com/learn-to-build-a-professional-portfolio-website-with-github-pages-artificial-intelligence/\">\n      https://www.yourvrexperience.com/learn-to-build-a-professional-portfolio-website-with-github-pages-artificial-intelligence/\n    </a>\n  </li>\n  <li>Learn to Build a Multiplayer VR Game with Unity & VRChat: \n    <a href=\"https://www.yourvrexperience.com/2026/01/11/learn-to-build-a-multiplayer-vr-game-with-unity-vrchat/\">\n      https://www.yourvrexperience.com/2026/01/11/learn-to-build-a-multiplayer-vr-game-with-unity-vrchat/\n    </a>\n  </li>\n</ol>\n</p>\n<p>\nBest regards,\n</p>\n<p>\nEsteban Gallardo\n</p>', 78, '{\"score\": 78, \"evaluation\": \"Scores by criterion (max 4 each): Value Proposition & Problem Addressed: 4 — Clear problem and differentiated AI-powered digital-twin solution addressing real decision risks. Product & Technical Viability: 4 — Functional platform and operational AI agents claimed, with SaaS architecture and scaling readiness described. Business Model & Monetization: 3 — Multiple monetization paths (subscriptions, usage, enterprise, services) but pricing, unit economics and cost assumptions need validation. Target Market & Customers: 3 — Well-identified segments (startups, HR, education, SMEs) with reasonable early-adopter fits but market sizing/segmentation assumptions are not detailed. Competitive Advantage & Differentiation: 3 — Clear differentiators (realistic simulations, soft-skill assessment, open-source) though some advantages may be replicable and need stronger defensibility. Founding Team: 2 — Technical founder with relevant experience; additional commercial, sales and domain expertise are not described. Maturity Level & Traction: 3 — Functional product and demos exist, but evidence of pilots, paying customers, or measurable user validation is limited. Scalability & Medium-Term Vision: 3 — SaaS and architecture planned for scale; AI cost control and commercial scaling strategies need further elaboration. Overall assessment: a viable early-to-mid stage SaaS with a strong, novel value proposition and an operational prototype, but requiring customer validation, commercial team expansion, and rigorous economics/AI-cost controls to reach scale.\", \"strengths\": [\"Clear, compelling value proposition: digital twin for work processes that reduces real-world risks.\", \"Operational prototype and AI agents already developed according to the documents.\", \"Unique combination of project management, 3D visualization and human+AI simulation.\", \"Open-source core enabling extensibility and community contributions.\", \"Diverse monetization channels (subscriptions, usage-based AI billing, enterprise, services).\"], \"weaknesses\": [\"Founding team appears underspecified beyond the technical founder; limited commercial/sales representation.\", \"Limited evidence of customer pilots, paying customers or measurable market traction.\", \"Business economics (pricing, CAC, LTV, AI cost per simulation) are not detailed.\", \"Competitive defensibility partially asserted but lacking clear IP, network effects, or hard-to-replicate moats.\", \"Operational risks around AI accuracy, simulation validity, data privacy/compliance and cost control are not fully addressed.\"], \"recommendations\": [\"Run structured pilot programs with 3–5 target customers (HR, startups, training institutions) and capture quantitative outcomes (time/cost savings, hiring accuracy, training improvement).\", \"Validate pricing and unit economics: model AI cost per simulation, set usage tiers, and test willingness-to-pay with pilot customers.\", \"Strengthen the team by recruiting business development/commercial lead, customer success, and domain experts in HR/organizational psychology.\", \"Document and harden competitive moats: pursue IP where possible, publish validation studies, and build partnerships with HR platforms or training institutions.\", \"Implement technical controls and monitoring for AI cost, simulation fidelity, and data privacy; prepare enterprise-grade security/compliance artifacts to enable larger deals.\", \"Develop a go-to-market playbook (channels, sales motions, target personas) and prioritize use cases with highest ROI to accelerate early customer acquisition.\"]}', '', '', '[{\"title\": \"FlowOps: Workflow Automation for Small Professional Services Firms\", \"match\": 50, \"similarities\": \"Both are SaaS platforms focused on improving how teams work, aimed at SME customers, emphasize integrations and templates/best-practices, provide guided onboarding and low-friction adoption, and monetize via subscription tiers.\", \"differences\": [\"Workflow Simulator centers on AI-powered digital twins and controlled simulations of office environments (including 3D visualization and AI agents) to test workflows and assess soft skills; FlowOps focuses on no-code workflow automation and industry-specific templates for professional services.\", \"Workflow Simulator emphasizes behavioral/soft-skill assessment and experimentation with human+AI agents; FlowOps emphasizes operational automation, repeatable processes, and reducing administrative time without autonomous AI decision-making.\", \"Workflow Simulator targets broader use cases (startups, HR, education, SMEs) and offers open-source core and consulting/custom simulation services; FlowOps targets small professional services firms (<20 employees) with plug-and-play templates and simpler integrations.\", \"Workflow Simulator explicitly manages AI usage costs and simulation analytics; FlowOps centers on ease-of-use, compliance and integration with email/calendar/cloud storage rather than immersive simulation or 3D UX.\"], \"collaboration\": [\"Use Workflow Simulator to validate and stress-test FlowOps workflow templates in realistic simulated office scenarios before deployment.\", \"Co-develop professional-services simulation templates that combine FlowOps automation flows with Workflow Simulator behavioral scenarios for onboarding and compliance training.\", \"Offer bundled pilots where FlowOps implements automation and Workflow Simulator measures employee workflow performance and soft-skill impacts.\", \"Share integration connectors and best-practice libraries so FlowOps users can export workflows to simulation scenarios and import validated process improvements back into FlowOps.\"]}, {\"title\": \"InsightPulse: Customer Feedback Analytics for Product Teams\", \"match\": 35, \"similarities\": \"Both are SaaS products that apply AI to help organizations make better decisions from behavioral or textual data, emphasize human-in-the-loop workflows, and target product/organizational improvement through actionable insights and traceability.\", \"differences\": [\"InsightPulse focuses on ingesting and analyzing qualitative customer feedback (NLP, theme clustering, traceability to roadmap decisions); Workflow Simulator builds a digital twin to simulate team workflows and assess soft skills and operational outcomes.\", \"InsightPulse\'s primary customers are product teams and SaaS companies; Workflow Simulator targets HR, startups, SMEs, educational institutions and organizational design use cases.\", \"InsightPulse centers on text analytics and decision traceability rather than real-time simulation, 3D visualization, or integrating AI agents into simulated task execution.\", \"InsightPulse emphasizes linking feedback to product roadmaps and tracking decisions over time; Workflow Simulator emphasizes risk-free experimentation with organizational changes before real-world deployment.\"], \"collaboration\": [\"Integrate InsightPulse to collect and analyze qualitative feedback from participants after simulations to improve scenario realism and measure perceived outcomes.\", \"Use InsightPulse traceability to connect simulation outcomes and participant feedback to product or training changes, enabling evidence-based iteration.\", \"Combine InsightPulse analytics with Workflow Simulator to provide richer post-simulation reports that blend behavioral metrics and free-text reflections.\", \"Pilot with product teams to simulate new product-development workflows and use InsightPulse to capture stakeholder feedback and link it to roadmap decisions.\"]}, {\"title\": \"EduAdmin Cloud: Administrative Management for Small Training Providers\", \"match\": 45, \"similarities\": \"Both are SaaS offerings that serve educational/training contexts among other markets, aim to reduce administrative overhead for organizations, emphasize simplicity and fast onboarding for non-technical users, and offer subscription-based pricing with potential add-on modules or services.\", \"differences\": [\"EduAdmin Cloud focuses on course, enrollment, certification, scheduling and compliance management for small training providers; Workflow Simulator provides immersive simulations, AI-driven performance analysis, and soft-skill assessment for teams and training scenarios.\", \"Workflow Simulator is built around AI agents, digital twins and experimentation before real-world changes; EduAdmin is an administrative platform prioritizing record-keeping, reporting and operational workflows without simulation or behavioral AI assessment.\", \"EduAdmin targets small training providers as its core customer; Workflow Simulator targets a broader set including HR departments, startups, SMEs and educational institutions interested in training evaluation and organizational design.\", \"Workflow Simulator includes an open-source core and consulting/custom simulation services; EduAdmin emphasizes modular simplicity and compliance-focused features with fast deployment.\"], \"collaboration\": [\"Embed Workflow Simulator modules into EduAdmin as an optional assessment/training add-on so training providers can run simulated scenarios and certify soft-skill outcomes alongside administrative records.\", \"Joint go-to-market pilots with vocational and training centers where EduAdmin handles admin workflows and Workflow Simulator provides practical assessment and simulated practice environments.\", \"Integrate certification and reporting outputs from Workflow Simulator into EduAdmin’s certificate issuance and compliance reports to provide evidence-based credentials.\", \"Co-create packaged offerings for training providers that combine administration, scheduling and simulated assessment for blended learning and workforce upskilling programs.\"]}]', '[{\"title\": \"MindAnchor: Evidence-Based Mental Health Support for Young Adults\", \"match\": 40, \"similarities\": \"Both are SaaS platforms focused on human behaviour and wellbeing in institutional contexts (education, employers). Both prioritize ethical positioning, evidence-informed analysis of human interaction, and partnerships with educational institutions and HR. Each offers guided programs and potential for blended human+AI support.\", \"differences\": [\"Domain focus: MindAnchor targets individual mental wellbeing while Workflow Simulator focuses on team workflows and organisational decisions.\", \"Regulatory profile: MindAnchor must operate within clinical/health ethics and GDPR boundaries more strictly.\", \"Product form: MindAnchor is programmatic CBT modules; Workflow Simulator is an interactive digital twin with 3D simulation and AI agents.\", \"Target customer: MindAnchor is D2C and institutional wellbeing buyers vs Workflow Simulator’s emphasis on startups, HR teams, and training organisations.\"], \"collaboration\": [\"Integrate short mental-wellbeing micro-modules from MindAnchor into Workflow Simulator scenarios to measure impact on team performance and stress responses.\", \"Co-run pilots with universities or SMEs where MindAnchor users join Workflow Simulator team exercises to validate cross-platform outcomes.\", \"Share anonymized behavioural metrics to improve MindAnchor’s detection of stress in collaborative contexts and to enrich Workflow Simulator’s soft-skill assessment models.\"]}, {\"title\": \"CareLink Home: Coordinated Support for Elderly People Living Alone\", \"match\": 25, \"similarities\": \"Both are platforms that coordinate human actors, emphasize dignity and human-in-the-loop decision-making, and target institutional buyers (municipalities/HR departments). Each values consent, transparency and multi-stakeholder dashboards for operations.\", \"differences\": [\"Domain and users: CareLink Home focuses on eldercare, IoT sensors and emergencies; Workflow Simulator models office teams and collaboration workflows.\", \"Data types: CareLink relies on sensor/time-series and privacy-preserving alerts; Workflow Simulator uses interaction logs, tasks, meetings and simulated agents.\", \"Business model: CareLink is B2G/service-contract heavy; Workflow Simulator is SaaS with tiered subscriptions and consulting.\", \"Intervention model: CareLink prioritizes low-intrusion monitoring and human follow-up; Workflow Simulator enables experimentation and training in virtual environments.\"], \"collaboration\": [\"Use Workflow Simulator to model and test care-coordination workflows, escalation protocols and multi-actor dashboards before field deployment of CareLink Home.\", \"Run joint pilot to train care coordinators in simulated scenarios (roleplay of emergency response and coordinated follow-up).\", \"Share UX and consent-by-design patterns (human-in-the-loop workflows and transparency design) to improve both platforms’ ethical interfaces.\"]}, {\"title\": \"MoveWell Rehab: Personalized Physical Rehabilitation for Chronic Conditions\", \"match\": 30, \"similarities\": \"Both deliver digital support to improve human performance and adherence, combine professional oversight with scalable digital delivery, and target institutions (clinics, employers, training providers). Both emphasize safe, professional-aligned interventions rather than automated medical decisions.\", \"differences\": [\"Clinical scope: MoveWell focuses on physiotherapy and health outcomes with professional oversight; Workflow Simulator focuses on workplace processes and soft-skill assessment.\", \"Interaction model: MoveWell centers on individual exercise adherence and video guidance; Workflow Simulator centers on multi-person interactions, meetings and organizational tasks.\", \"Regulation and liability: MoveWell has stronger clinical/regulatory constraints and professional accountability.\", \"Technology emphasis: MoveWell emphasizes video and progress-tracking; Workflow Simulator emphasizes AI agents, 3D virtual offices and simulation logic.\"], \"collaboration\": [\"Model clinic workflows and patient–clinician handoffs in Workflow Simulator to optimise service delivery and scheduling for MoveWell pilots.\", \"Embed MoveWell’s exercise adherence scenarios inside team simulations to assess how workplace routine affects rehabilitation outcomes and employee return-to-work programs.\", \"Co-develop training modules for physiotherapy clinic staff using simulated patient flows and resource allocation scenarios.\"]}, {\"title\": \"PathLearn: Personalized Learning Pathways for Secondary Education\", \"match\": 45, \"similarities\": \"Both target educational institutions and training contexts, use AI as decision support rather than replacement, and emphasize teacher/facilitator-in-the-loop design. Both provide analytics to improve human performance and learning outcomes and are SaaS platforms oriented to institutional adoption.\", \"differences\": [\"Target user: PathLearn focuses on secondary students and classroom differentiation; Workflow Simulator focuses on adult teams, organizational structure, and workflows.\", \"Use case: PathLearn adapts learning sequences and assessments; Workflow Simulator simulates multi-agent operational scenarios and soft-skill interactions.\", \"Pedagogical model: PathLearn uses mastery learning and formative assessment; Workflow Simulator uses simulated role-play and behavioural observation for hiring/training.\", \"Regulatory/market: PathLearn is B2G/B2B school-centric with curriculum alignment; Workflow Simulator targets HR, startups, SMEs and consulting clients.\"], \"collaboration\": [\"Integrate workplace-oriented learning pathways from PathLearn into Workflow Simulator for vocational tracks or career-oriented classroom projects.\", \"Pilot joint educational programs at universities or vocational schools combining PathLearn’s curriculum with Workflow Simulator scenarios to prepare students for team-based work.\", \"Share insights on teacher/facilitator-in-the-loop design to improve simulation debrief workflows and educator dashboards.\"]}, {\"title\": \"SkillBridge: Practice-Based Digital Training for Workforce Reskilling\", \"match\": 70, \"similarities\": \"High overlap: both aim to make workplace skills measurable through practice and simulation, target employers and training institutions, use competency-based assessment, and combine digital platforms with human feedback. Both monetize via B2B contracts, subscriptions and training services.\", \"differences\": [\"Primary approach: SkillBridge focuses on project-based, demonstrable competency via real tasks; Workflow Simulator uses immersive digital twin simulations of team workflows and behavioural interactions.\", \"Feature set: SkillBridge emphasizes submission/evaluation of real projects and rubrics; Workflow Simulator emphasizes AI agents, 3D office environments and soft-skill behaviour analytics.\", \"Partner network: SkillBridge leans on industry co-design and mentor networks; Workflow Simulator emphasizes AI integrations and open-source extensibility.\", \"Outcome focus: SkillBridge measures job-ready competencies; Workflow Simulator measures operational efficiency, decision impacts and soft skills in simulated contexts.\"], \"collaboration\": [\"Embed SkillBridge’s competency rubrics as evaluation metrics inside Workflow Simulator scenarios so learners demonstrate job-relevant behaviours within simulated teams.\", \"Co-design reskilling pilots with employers where SkillBridge supplies industry tasks and Workflow Simulator creates realistic team contexts for assessment.\", \"Develop joint enterprise offerings: combined simulation-based assessment + practice-based certification for reskilling programs.\"]}, {\"title\": \"ReadTogether: Inclusive Literacy Support for Early Learners\", \"match\": 20, \"similarities\": \"Both serve educational institutions and training contexts and aim to improve human skills through digital platforms. Each values pedagogical grounding and partnerships with schools and communities.\", \"differences\": [\"Age group and pedagogy: ReadTogether focuses on early literacy (children 5–8) with family engagement and phonics; Workflow Simulator targets adult workforce behaviours and organisational design.\", \"Assessment style: ReadTogether avoids algorithmic grading and emphasizes family-led practice; Workflow Simulator automates performance analysis via AI.\", \"Product form: ReadTogether is content- and audio-focused; Workflow Simulator is a simulation engine with 3D visualisation and AI agents.\", \"Channels and buyers: ReadTogether is school/community-led with grant funding; Workflow Simulator targets startups, SMEs and HR buyers.\"], \"collaboration\": [\"Use Workflow Simulator to create teacher and admin training scenarios for implementing ReadTogether programs at scale (logistics, classroom routines).\", \"Co-run pilots in schools to model staff workflows and family engagement processes that support ReadTogether adoption.\", \"Exchange expertise on low-friction onboarding and family/community engagement best practices for educational pilots.\"]}, {\"title\": \"LocalHands: Community-Based Support for Informal Caregivers\", \"match\": 25, \"similarities\": \"Both are platform-based initiatives that coordinate multiple human actors, emphasize dignity and community support, and seek partnerships with municipalities and social organizations. Both value facilitation, training and ongoing onboarding.\", \"differences\": [\"Primary mission: LocalHands focuses on peer support and community facilitation for informal caregivers; Workflow Simulator models workplace teams, training and hiring decisions.\", \"Operational model: LocalHands blends local facilitation and non-profit funding models; Workflow Simulator is commercial SaaS with consulting and enterprise licensing.\", \"Tech needs: LocalHands emphasizes community tools and moderation; Workflow Simulator needs simulation engine, AI agent integrations and visualisation.\", \"Target metrics: LocalHands measures caregiver wellbeing and community outcomes vs Workflow Simulator’s operational and soft-skill performance metrics.\"], \"collaboration\": [\"Simulate care coordination workflows and escalation scenarios in Workflow Simulator to train local facilitators and test platform features before field pilots.\", \"Develop joint training modules where community facilitators role-play using simulated cases to improve response and coordination.\", \"Share moderation, onboarding and community-engagement design principles to improve retention and ethical safeguards.\"]}, {\"title\": \"AccessPath: Inclusive Employment Pathways for People with Disabilities\", \"match\": 40, \"similarities\": \"Both address hiring, onboarding and workplace inclusion, work with employers and public employment services, and emphasize co-design/ human-centred approaches. Both provide tools to improve retention and job fit and target B2B/B2G contracts.\", \"differences\": [\"Co-creation emphasis: AccessPath centres people with disabilities leading role-design and accommodations; Workflow Simulator focuses on simulating workplaces and measuring general team dynamics.\", \"Service model: AccessPath is advisory and facilitation-heavy; Workflow Simulator is a simulation platform with AI analytics and customizable virtual environments.\", \"Outcomes measured: AccessPath measures job retention and accommodation effectiveness; Workflow Simulator measures workflow efficiency, collaboration and soft skills.\", \"User profiles: AccessPath involves deeper accessibility and legal accommodation processes.\"], \"collaboration\": [\"Use Workflow Simulator to create simulated on-the-job scenarios that test proposed accommodations and role adaptations before real-world placement.\", \"Co-develop onboarding simulations and employer training modules to sensitize teams and validate inclusive workflows.\", \"Integrate AccessPath’s co-design templates into Workflow Simulator’s scenario builder to capture candidate-defined needs and measure impact.\"]}, {\"title\": \"ReLoop Materials: Circular Packaging for Local Food Producers\", \"match\": 15, \"similarities\": \"Both serve SMEs and emphasise operational workflows and logistics. Each uses digital tooling to improve real-world operations and aims to integrate into existing routines of customers.\", \"differences\": [\"Business domain: ReLoop addresses physical packaging, logistics, cleaning operations and tangible assets; Workflow Simulator models office/team workflows and collaboration.\", \"Technology stack: ReLoop requires logistics, IoT and tracking hardware integration, while Workflow Simulator focuses on simulation engines and AI agents.\", \"Customer purchasing: ReLoop is operational-service and capital-heavy (containers) with B2B service contracts; Workflow Simulator is SaaS/consulting for HR and training.\", \"Primary metrics: ReLoop tracks reuse cycles and emissions avoided; Workflow Simulator tracks performance, soft skills and process efficiency.\"], \"collaboration\": [\"Simulate ReLoop’s collection and redistribution logistics workflows to optimise routes, handoffs and producer onboarding before pilots.\", \"Create joint case studies where Workflow Simulator models warehouse and producer workflows to improve container turnaround and producer convenience.\", \"Share UX and training modules for onboarding small producers to new circular workflows and digital tracking systems.\"]}, {\"title\": \"EnergySense Communities: Collective Energy Efficiency for Apartment Buildings\", \"match\": 20, \"similarities\": \"Both platforms emphasise behaviour change, community engagement, privacy-first dashboards and measurable operational outcomes. Both target institutional partners (housing co-ops, municipal programmes) and rely on engagement design to achieve impact.\", \"differences\": [\"Domain and data: EnergySense uses smart-meter energy data and building-level interventions; Workflow Simulator models human collaboration in office environments with task and meeting data.\", \"Customer type: EnergySense is B2G/B2B with building managers and municipal programs; Workflow Simulator targets HR, SMEs and training entities.\", \"Goal: EnergySense targets energy consumption reductions and emissions; Workflow Simulator targets productivity, team structure and soft skills assessment.\", \"Interaction model: EnergySense drives collective challenges and behaviour nudges; Workflow Simulator simulates team roles, agent interactions and decisions.\"], \"collaboration\": [\"Model resident engagement campaigns and community challenge workflows in Workflow Simulator to test messaging, incentives and coordination mechanics.\", \"Use Workflow Simulator to train building managers and resident-committees in operational procedures for rolling out EnergySense programs.\", \"Share anonymized engagement analytics patterns to inform better behaviour-change simulations in each platform.\"]}, {\"title\": \"SoilBack: Regenerative Practices for Small-Scale Agriculture\", \"match\": 15, \"similarities\": \"Both provide advisory and training support to practitioners, prioritise practical, incremental behaviour change, and include peer-learning/community elements. Both are service-plus-platform with partners and region-specific guidance.\", \"differences\": [\"Sector: SoilBack focuses on on-farm agronomy, soil health and field interventions; Workflow Simulator targets office workflows and team organisation.\", \"Data: SoilBack tracks agronomic and environmental indicators versus Workflow Simulator’s interaction and performance metrics.\", \"Delivery: SoilBack relies heavily on field facilitation and region adaptation; Workflow Simulator is a virtual simulation environment for teams.\", \"Outcome types: SoilBack measures soil and ecological indicators; Workflow Simulator measures process efficiency and human performance.\"], \"collaboration\": [\"Simulate farm-to-market operational workflows (cooperative coordination, distribution, advisory schedules) in Workflow Simulator to test support interventions.\", \"Co-develop training scenarios for extension workers and cooperatives using simulated farmer interactions and advisory cycles.\", \"Exchange methods for peer-learning communities and progressive adoption tracking to improve farmer engagement features.\"]}, {\"title\": \"FlowOps: Workflow Automation for Small Professional Services Firms\", \"match\": 75, \"similarities\": \"Very high overlap: both are workflow-focused SaaS products for small/medium teams, aim to improve operational clarity, reduce errors and save time. Both emphasise templates/best-practice workflows, easy onboarding and integration with existing tools. Each targets SMEs and professional services and values no-code configuration and human oversight.\", \"differences\": [\"Execution vs simulation: FlowOps focuses on live workflow automation and execution; Workflow Simulator focuses on simulating workflows, testing organisational changes and assessing human behaviour before deployment.\", \"Feature emphasis: FlowOps provides automation templates and integrations for day-to-day operations; Workflow Simulator provides AI-powered digital twins, 3D visualisations and soft-skill assessment.\", \"Monetization: FlowOps is subscription automation; Workflow Simulator bundles consulting, custom simulations, and pay-per-use AI consumption.\", \"Primary output: FlowOps delivers operational automation; Workflow Simulator delivers validated scenarios, risk reduction and training outcomes.\"], \"collaboration\": [\"Integrate FlowOps automation templates into Workflow Simulator scenarios to simulate and validate automation effects before rollout.\", \"Offer joint product bundle: simulation-driven change management (Workflow Simulator) followed by FlowOps live automation deployment for approved processes.\", \"Co-develop a feedback loop where simulation outcomes inform FlowOps template tuning and FlowOps usage data improves simulation realism.\"]}, {\"title\": \"InsightPulse: Customer Feedback Analytics for Product Teams\", \"match\": 50, \"similarities\": \"Both use AI to interpret human-generated data and turn qualitative signals into actionable decisions. Both are SaaS products aimed at improving organisational choices, embed human-in-the-loop workflows, and integrate with other productivity tools to influence roadmaps or operational changes.\", \"differences\": [\"Domain: InsightPulse focuses on customer feedback and product decisions using NLP; Workflow Simulator focuses on simulating team behaviour and organisational workflows.\", \"Primary output: InsightPulse produces traceable feedback-to-decision workflows; Workflow Simulator produces simulated scenarios, performance metrics and training insights.\", \"User base: InsightPulse targets product teams and UX researchers; Workflow Simulator targets HR, operations, and training teams.\", \"Data sources: InsightPulse ingests multi-channel feedback; Workflow Simulator synthesizes simulated interactions, task logs and AI agent behaviour.\"], \"collaboration\": [\"Feed transcripts and behavioural logs from Workflow Simulator exercises into InsightPulse to surface recurring human issues and inform simulation refinements.\", \"Use InsightPulse to analyse participant qualitative feedback from simulation debriefs to prioritise product or training improvements.\", \"Co-run pilots where product teams use InsightPulse insights to design simulation scenarios that validate customer-facing process changes.\"]}, {\"title\": \"EduAdmin Cloud: Administrative Management for Small Training Providers\", \"match\": 40, \"similarities\": \"Both target educational/training institutions, aim to reduce friction in operational processes, and provide SaaS tools that support onboarding, reporting and training workflows. Both emphasise simplicity, compliance and support for institutional customers.\", \"differences\": [\"Functional focus: EduAdmin Cloud centralizes course administration, enrollments and certification records; Workflow Simulator creates immersive simulations and evaluates soft skills and team processes.\", \"User: EduAdmin is admin-facing for training providers; Workflow Simulator is learner/HR-facing for experiential training and recruitment.\", \"Integration needs: EduAdmin focuses on reporting/compliance; Workflow Simulator focuses on simulation engines, AI models and visualization.\", \"Business model: EduAdmin is subscription-admin focused; Workflow Simulator includes pay-per-use AI and consulting services.\"], \"collaboration\": [\"Integrate Workflow Simulator scenarios as learning activities scheduled and tracked via EduAdmin Cloud for training providers.\", \"Offer combined packages: EduAdmin handles administrative workflows while Workflow Simulator supplies experiential training modules and assessment reports.\", \"Align certification and compliance records between platforms so simulation-based assessments are recorded in EduAdmin transcripts.\"]}, {\"title\": \"SkillSwap Local: Peer-to-Peer Services in Urban Neighborhoods\", \"match\": 20, \"similarities\": \"Both are platform businesses that rely on human interactions, trust systems and onboarding flows; both emphasise community and repeat interactions, and can benefit from simulation of onboarding and moderation processes.\", \"differences\": [\"Marketplace vs simulation: SkillSwap is a two-sided marketplace for local services; Workflow Simulator is a simulation engine for organisational workflows.\", \"Scale and geography: SkillSwap is hyperlocal and transaction-focused; Workflow Simulator addresses organisational-scale simulations.\", \"Revenue: SkillSwap relies on transaction fees and local growth; Workflow Simulator sells subscriptions, enterprise licensing and consulting.\", \"Trust mechanisms: SkillSwap emphasises identity verification and payments; Workflow Simulator emphasises behavioural analytics and training.\"], \"collaboration\": [\"Simulate provider onboarding, trust-building and dispute-resolution workflows in Workflow Simulator to refine SkillSwap’s moderation and identity flows.\", \"Run neighbourhood pilot scenarios where Workflow Simulator models demand/supply matching and incentives to improve provider retention.\", \"Exchange best practices on reputation systems and low-friction onboarding to improve both platforms’ user activation.\"]}, {\"title\": \"Farm2Table Hub: Direct Sourcing Marketplace for Independent Restaurants\", \"match\": 15, \"similarities\": \"Both aim to improve SME operations and reduce inefficiencies through a digital platform. Both benefit from modelling supply/demand coordination and onboarding workflows for small businesses.\", \"differences\": [\"Product: Farm2Table is a B2B marketplace for perishable goods and order logistics; Workflow Simulator models human collaboration, meetings and digital workflows.\", \"Operational complexity: Farm2Table concerns physical logistics, seasonal sourcing and inventory coordination; Workflow Simulator focuses on behavioural and process simulations.\", \"Primary buyers: Restaurants and farmers vs HR, innovation teams and educational institutions for Workflow Simulator.\", \"KPIs: Farm2Table measures supply reliability and order fulfilment; Workflow Simulator measures process efficiency and soft-skill performance.\"], \"collaboration\": [\"Model procurement, order aggregation and producer–restaurant coordination workflows in Workflow Simulator to identify friction points and staffing needs.\", \"Co-design onboarding and supplier support simulations that train restaurant buyers and producers on platform processes.\", \"Use simulation outputs to inform Farm2Table’s marketplace rules and expected lead times for operations.\"]}, {\"title\": \"ExpertMatch Pro: On-Demand Access to Independent Specialists\", \"match\": 50, \"similarities\": \"Both platforms are talent-oriented, B2B-focused and value trust and skill relevance. Each aims to match organisational needs with human capabilities and could use simulated assessments to validate candidate fit. Both sell to SMEs and innovation teams and combine platform tooling with curated human processes.\", \"differences\": [\"Core function: ExpertMatch is a curated marketplace and vetting engine for specialists; Workflow Simulator is a simulation environment to assess team dynamics and workflow impacts.\", \"Value chain: ExpertMatch centres discovery and contracting; Workflow Simulator centres evaluation, training and scenario testing.\", \"Revenue model: ExpertMatch takes commissions/subscriptions for matches; Workflow Simulator sells subscriptions, consulting and simulation services.\", \"Delivery: ExpertMatch connects to live engagements; Workflow Simulator provides virtual pre-hire simulation and training experiences.\"], \"collaboration\": [\"Integrate pre-engagement simulation: use Workflow Simulator to run short team-fit scenarios with candidate experts before contracting to reduce mis-hires.\", \"Offer a joint offering where ExpertMatch sources vetted specialists and Workflow Simulator provides simulated onboarding and team integration assessments.\", \"Share vetting signals and performance metrics to improve matching quality and create evidence-based profiles for experts.\"]}, {\"title\": \"Voices of the District: Digital Archive of Local Oral Histories\", \"match\": 10, \"similarities\": \"Both emphasise community involvement, educational/public value and careful ethical handling of human-generated content. Each values partnerships with cultural/educational institutions and long-term stewardship of resources.\", \"differences\": [\"Domain and output: Voices is an archival cultural platform focused on oral histories; Workflow Simulator is a business-oriented simulation tool for organisational behaviour.\", \"User interactions: Voices prioritises participant-controlled consent and archival preservation; Workflow Simulator prioritises interactive simulations and behavioural analytics.\", \"Monetization: Voices relies on grants and public funding; Workflow Simulator relies on SaaS and enterprise contracts.\", \"Technical needs: Voices focuses on archival metadata and content governance vs simulation engines and AI agents.\"], \"collaboration\": [\"Simulate archive-management and community engagement workflows (collection campaigns, consent workflows) in Workflow Simulator to improve project logistics.\", \"Co-develop training simulations for community facilitators to practice interviewing, consent-gathering and contextualisation workflows.\", \"Share approaches to ethical consent management and participant control that can inform simulation participant handling and research protocols.\"]}, {\"title\": \"StageNext: Hybrid Performance Platform for Independent Performing Arts\", \"match\": 20, \"similarities\": \"Both are digital platforms supporting human collaboration and experience delivery, emphasise artist/participant control and provide tools for expanding reach and training. Both value fair revenue models and partnerships with institutions (venues, schools).\", \"differences\": [\"Domain: StageNext targets performing arts, live/digital distribution and audience engagement; Workflow Simulator targets organisational workflows and workforce training.\", \"User journeys: StageNext handles streaming, ticketing and rights; Workflow Simulator handles role-play, recruitment simulation and organisational modelling.\", \"Success metrics: StageNext measures audience reach, ticket revenue and accessibility; Workflow Simulator measures team efficiency, decision outcomes and soft-skill metrics.\"], \"collaboration\": [\"Simulate production and event operations workflows (rehearsal schedules, load-in, hybrid delivery) to stress-test StageNext logistics before live events.\", \"Develop training modules for small arts organisations on hybrid programming, ticketing and audience moderation using Workflow Simulator scenarios.\", \"Pilot artist residencies where teams use Workflow Simulator to rehearse scheduling, technical handoffs and digital distribution plans.\"]}, {\"title\": \"Memory Trails: Cultural Routes for Territorial Memory and Education\", \"match\": 10, \"similarities\": \"Both projects engage with educational institutions and community stakeholders, and both combine physical processes with digital platforms to deliver learning and engagement experiences.\", \"differences\": [\"Product type: Memory Trails is territory-based cultural infrastructure combining signage and guided routes; Workflow Simulator is a virtual simulation engine for organisational contexts.\", \"Primary audiences: Memory Trails serves residents, schools and cultural tourists; Workflow Simulator serves employers, training teams and HR professionals.\", \"Operational focus: Memory Trails requires field research, signage production and place-based curation; Workflow Simulator requires digital modelling and AI agents.\"], \"collaboration\": [\"Model project coordination workflows for route research, stakeholder sign-off and content production in Workflow Simulator to improve rollout efficiency.\", \"Create educator training simulations that prepare teachers to run Memory Trails excursions and classroom debriefs.\", \"Share user-research methodologies for community co-creation and contextualization to strengthen both projects’ participatory approaches.\"]}, {\"title\": \"OpenCouncil: Transparent Decision Tracking for Local Governments\", \"match\": 45, \"similarities\": \"Both provide tools to make organizational decisions more visible and testable, target institutional buyers and prioritise traceability, clear dashboards and human-centred design. Each supports training and change management for institutions and values integration with existing administrative workflows.\", \"differences\": [\"Audience and scope: OpenCouncil is B2G and focused on public decision lifecycles and civic transparency; Workflow Simulator focuses on private-sector teams and operational simulation.\", \"Governance constraints: OpenCouncil must meet legal and accessibility compliance for public records; Workflow Simulator’s constraints are around ethical simulation and data privacy for employees.\", \"Core function: OpenCouncil surfaces actual decisions and implementation tracking; Workflow Simulator creates virtual scenarios to test potential organisational changes before they happen.\"], \"collaboration\": [\"Use Workflow Simulator to model hypothetical policy rollout and internal decision-implementation workflows for municipalities before publishing via OpenCouncil.\", \"Jointly pilot staff training where municipal teams practice procedural changes in simulated environments and then publish outcomes in OpenCouncil to improve public traceability.\", \"Share design patterns for plain-language explanations and timeline visualisations to increase citizen comprehension of complex decisions.\"]}, {\"title\": \"CivicPulse: Inclusive Digital Consultations for Public Policy Design\", \"match\": 45, \"similarities\": \"Both promote structured human-in-the-loop processes, emphasise inclusive facilitation and ethical AI use, target institutional customers and provide tooling for training moderators and participants. Both value offline inclusion channels and rigorous synthesis of human input.\", \"differences\": [\"Domain: CivicPulse focuses on public consultations and participatory policy-making; Workflow Simulator focuses on organisational workflows, hiring, training and internal decisions.\", \"User base: CivicPulse serves public institutions and citizens at large; Workflow Simulator serves employers, HR teams and educational institutions.\", \"Outcome focus: CivicPulse produces policy-relevant syntheses and inclusion metrics; Workflow Simulator produces simulated operational outcomes and soft-skill assessments.\"], \"collaboration\": [\"Model consultation logistics and moderator workflows inside Workflow Simulator to test facilitation scripts, timing and inclusion strategies before live consultations.\", \"Co-develop training scenarios for moderators and public servants to rehearse difficult deliberative situations and inclusion techniques.\", \"Integrate CivicPulse synthesis outputs into Workflow Simulator scenarios to simulate downstream implementation and organisational impact of consultation outcomes.\"]}, {\"title\": \"TrustVote Lab: Secure Pilots for Digital Voting Research\", \"match\": 20, \"similarities\": \"Both emphasise safe piloting, research-first approaches, careful ethical governance and human-in-the-loop evaluation. Each conducts controlled experiments and values independent audits and transparent reporting of limitations.\", \"differences\": [\"Domain: TrustVote Lab focuses on electoral technology, cryptographic security and non-binding pilot environments; Workflow Simulator focuses on organisational workflow simulation and soft-skill assessment.\", \"Stakeholders: TrustVote engages electoral researchers, legal experts and auditors; Workflow Simulator engages HR, trainers and business decision-makers.\", \"Technical foundations: TrustVote requires secure voting/proof systems and cryptography; Workflow Simulator requires simulation engines, AI agents and behavioural analytics.\"], \"collaboration\": [\"Simulate pilot logistics and participant flows for non-binding voting pilots (recruitment, instructions, audit trail handling) using Workflow Simulator.\", \"Use simulated actor scenarios to evaluate human factors (usability, misunderstanding, coercion risk) before conducting TrustVote Lab pilots.\", \"Share public-reporting and transparency workflows so simulation results and audit outputs are presented clearly to stakeholders.\"]}, {\"title\": \"NeighbourLab: Participatory Solutions for Urban Social Challenges\", \"match\": 50, \"similarities\": \"Both enable structured, multi-stakeholder collaboration and co-creation, emphasise facilitation, transparency and long-term engagement, and target public institutions and community groups. Each uses digital tools to coordinate ideas, deliberation and implementation while preserving human agency.\", \"differences\": [\"Primary remit: NeighbourLab is explicitly about participatory budgeting and neighbourhood-level decision power; Workflow Simulator focuses on organisational team dynamics, hiring and training.\", \"Scale and audience: NeighbourLab operates at neighborhood/municipal scale with deep public engagement; Workflow Simulator is company/team-focused.\", \"Governance model: NeighbourLab embeds community autonomy in decision-making; Workflow Simulator provides controlled experimentation for organisational change.\", \"Metrics: NeighbourLab measures civic participation and social cohesion; Workflow Simulator measures workflow efficiency, soft skills and process design outcomes.\"], \"collaboration\": [\"Co-develop simulation scenarios to rehearse neighbourhood co-creation processes, facilitation scripts and resource allocation decisions in a safe virtual environment.\", \"Use Workflow Simulator to train municipal staff and community facilitators in managing participatory cycles, conflict mediation and inclusive deliberation.\", \"Pilot a joint program where NeighbourLab conducts live participatory processes and Workflow Simulator models expected operational impacts for municipal service delivery.\"]}]');
 
+--
+-- Derived columns for table `projects`
+--
+
+UPDATE `projects` SET `created_at` = `created_at`, `like_count` = JSON_LENGTH(`likes`) WHERE JSON_VALID(`likes`);
+UPDATE `projects`
+SET `created_at` = `created_at`,
+    `content_updated_at` = `created_at`,
+    `relationships_local_at` = IF(`relationships_local` <> '', `created_at`, NULL),
+    `relationships_global_at` = IF(`relationships_global` <> '', `created_at`, NULL);
+
+--
+-- Derived rows for tables `category_stats` and `category_score_counts`
+--
+
+INSERT INTO `category_stats` (`cohort_id`, `category_id`, `projects`, `evaluated`, `score_sum`, `likes`)
+SELECT `cohort_id`, `category_id`, COUNT(*), SUM(`evaluation` <> ''), SUM(IF(`evaluation` <> '', `score`, 0)), SUM(`like_count`)
+FROM `projects` GROUP BY `cohort_id`, `category_id`;
+
+INSERT INTO `category_score_counts` (`cohort_id`, `category_id`, `score`, `projects`)
+SELECT `cohort_id`, `category_id`, `score`, COUNT(*) FROM `projects` WHERE `evaluation` <> ''
+GROUP BY `cohort_id`, `category_id`, `score`;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `relationship_schedule`
+--
+
+CREATE TABLE `relationship_schedule` (
+  `project_id` int NOT NULL,
+  `scope` varchar(10) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'pending',
+  `reason` varchar(20) NOT NULL DEFAULT '',
+  `candidates` text NOT NULL,
+  `attempts` int NOT NULL DEFAULT 0,
+  `estimated_tokens` int NOT NULL DEFAULT 0,
+  `last_error` varchar(500) NOT NULL DEFAULT '',
+  `planned_at` timestamp NULL DEFAULT NULL,
+  `finished_at` timestamp NULL DEFAULT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
 -- --------------------------------------------------------
 
 --
@@ -148,7 +325,9 @@ CREATE TABLE `users` (
   `password` varchar(255) NOT NULL,
   `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   `session` varchar(2048) NOT NULL,
-  `validated` tinyint(1) NOT NULL
+  `validated` tinyint(1) NOT NULL,
+  `session_version` int NOT NULL DEFAULT 0,
+  `cohort_id` int NOT NULL DEFAULT 1
 ) ENGINE=InnoDB DEFAULT CHARSET=latin1;
 
 --
@@ -186,29 +365,115 @@ INSERT INTO `users` (`id`, `name`, `email`, `password`, `created_at`, `session`,
 -- Indexes for dumped tables
 --
 
+--
+-- Indexes for table `blob_mirrors`
+--
+ALTER TABLE `blob_mirrors`
+  ADD PRIMARY KEY (`url_hash`),
+  ADD KEY `sha256` (`sha256`);
+
+--
+-- Indexes for table `cache_versions`
+--
+ALTER TABLE `cache_versions`
+  ADD PRIMARY KEY (`name`);
+
 --
 -- Indexes for table `categories`
 --
 ALTER TABLE `categories`
-  ADD PRIMARY KEY (`uid`);
+  ADD PRIMARY KEY (`uid`),
+  ADD KEY `cohort_id` (`cohort_id`,`uid`);
+
+--
+-- Indexes for table `category_score_counts`
+--
+ALTER TABLE `category_score_counts`
+  ADD PRIMARY KEY (`cohort_id`,`category_id`,`score`);
+
+--
+-- Indexes for table `category_stats`
+--
+ALTER TABLE `category_stats`
+  ADD PRIMARY KEY (`cohort_id`,`category_id`);
+
+--
+-- Indexes for table `change_events`
+--
+ALTER TABLE `change_events`
+  ADD PRIMARY KEY (`id`),
+  ADD KEY `created_at` (`created_at`);
+
+--
+-- Indexes for table `cohorts`
+--
+ALTER TABLE `cohorts`
+  ADD PRIMARY KEY (`id`);
+
+--
+-- Indexes for table `evaluation_renderings`
+--
+ALTER TABLE `evaluation_renderings`
+  ADD PRIMARY KEY (`evaluation_hash`,`lang`);
+
+--
+-- Indexes for table `evaluation_results`
+--
+ALTER TABLE `evaluation_results`
+  ADD PRIMARY KEY (`evaluation_hash`);
+
+--
+-- Indexes for table `project_documents`
+--
+ALTER TABLE `project_documents`
+  ADD PRIMARY KEY (`project_id`,`kind`),
+  ADD KEY `extracted_at` (`extracted_at`);
 
 --
 -- Indexes for table `projects`
 --
 ALTER TABLE `projects`
-  ADD PRIMARY KEY (`id`);
+  ADD PRIMARY KEY (`id`),
+  ADD KEY `cohort_id` (`cohort_id`,`id`),
+  ADD KEY `cohort_category_score` (`cohort_id`,`category_id`,`score`),
+  ADD KEY `cohort_category_likes` (`cohort_id`,`category_id`,`like_count`,`score`),
+  ADD KEY `cohort_score` (`cohort_id`,`score`),
+  ADD KEY `cohort_likes_score` (`cohort_id`,`like_count`,`score`),
+  ADD KEY `cohort_updated_at` (`cohort_id`,`updated_at`),
+  ADD KEY `updated_at` (`updated_at`);
+
+--
+-- Indexes for table `relationship_schedule`
+--
+ALTER TABLE `relationship_schedule`
+  ADD PRIMARY KEY (`project_id`,`scope`),
+  ADD KEY `status` (`status`,`planned_at`);
 
 --
 -- Indexes for table `users`
 --
 ALTER TABLE `users`
   ADD PRIMARY KEY (`id`),
-  ADD KEY `id` (`id`);
+  ADD UNIQUE KEY `email` (`email`),
+  ADD KEY `id` (`id`),
+  ADD KEY `cohort_id` (`cohort_id`,`id`);
 
 --
 -- AUTO_INCREMENT for dumped tables
 --
 
+--
+-- AUTO_INCREMENT for table `change_events`
+--
+ALTER TABLE `change_events`
+  MODIFY `id` bigint NOT NULL AUTO_INCREMENT;
+
+--
+-- AUTO_INCREMENT for table `cohorts`
+--
+ALTER TABLE `cohorts`
+  MODIFY `id` int NOT NULL AUTO_INCREMENT;
+
 --
 -- AUTO_INCREMENT for table `projects`
 --
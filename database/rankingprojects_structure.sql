@@ -23,6 +23,31 @@ SET time_zone = "+00:00";
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `blob_mirrors`
+--
+
+CREATE TABLE `blob_mirrors` (
+  `url_hash` char(64) NOT NULL,
+  `url` text NOT NULL,
+  `sha256` char(64) NOT NULL,
+  `size` int(11) NOT NULL,
+  `mirrored_at` timestamp NOT NULL DEFAULT current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `cache_versions`
+--
+
+CREATE TABLE `cache_versions` (
+  `name` varchar(50) NOT NULL,
+  `version` int(11) NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `categories`
 --
@@ -35,11 +60,115 @@ CREATE TABLE `categories` (
   `labelActiveShort` varchar(80) NOT NULL,
   `labelLong` varchar(200) NOT NULL,
   `rubric` varchar(200) NOT NULL,
-  `traits` varchar(1000) NOT NULL
+  `traits` varchar(1000) NOT NULL,
+  `cohort_id` int(11) NOT NULL DEFAULT 1
 ) ENGINE=InnoDB DEFAULT CHARSET=latin1 COLLATE=latin1_swedish_ci;
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `category_score_counts`
+--
+
+CREATE TABLE `category_score_counts` (
+  `cohort_id` int(11) NOT NULL DEFAULT 1,
+  `category_id` varchar(50) NOT NULL,
+  `score` int(11) NOT NULL,
+  `projects` int(11) NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `category_stats`
+--
+
+CREATE TABLE `category_stats` (
+  `cohort_id` int(11) NOT NULL DEFAULT 1,
+  `category_id` varchar(50) NOT NULL,
+  `projects` int(11) NOT NULL DEFAULT 0,
+  `evaluated` int(11) NOT NULL DEFAULT 0,
+  `score_sum` bigint(20) NOT NULL DEFAULT 0,
+  `likes` bigint(20) NOT NULL DEFAULT 0,
+  `updated_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `change_events`
+--
+
+CREATE TABLE `change_events` (
+  `id` bigint(20) NOT NULL,
+  `kind` varchar(30) NOT NULL,
+  `project_id` int(11) DEFAULT NULL,
+  `data` text NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `cohorts`
+--
+
+CREATE TABLE `cohorts` (
+  `id` int(11) NOT NULL,
+  `name` varchar(200) NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+--
+-- Dumping data for table `cohorts` (the cohort every row starts in)
+--
+
+INSERT INTO `cohorts` (`id`, `name`) VALUES
+(1, 'Default');
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `evaluation_renderings`
+--
+
+CREATE TABLE `evaluation_renderings` (
+  `evaluation_hash` char(64) NOT NULL,
+  `lang` varchar(5) NOT NULL,
+  `rendering` mediumtext NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `evaluation_results`
+--
+
+CREATE TABLE `evaluation_results` (
+  `evaluation_hash` char(64) NOT NULL,
+  `score` int(11) NOT NULL,
+  `result` mediumtext NOT NULL,
+  `model` varchar(100) NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `project_documents`
+--
+
+CREATE TABLE `project_documents` (
+  `project_id` int(11) NOT NULL,
+  `kind` varchar(20) NOT NULL,
+  `url` varchar(200) NOT NULL,
+  `text` mediumtext NOT NULL,
+  `extracted_at` timestamp NOT NULL DEFAULT current_timestamp()
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `projects`
 --
@@ -63,11 +192,36 @@ CREATE TABLE `projects` (
   `conversation` mediumtext NOT NULL,
   `likes` text NOT NULL,
   `relationships_local` mediumtext NOT NULL,
-  `relationships_global` mediumtext NOT NULL
+  `relationships_global` mediumtext NOT NULL,
+  `like_count` int(11) NOT NULL DEFAULT 0,
+  `content_updated_at` timestamp NULL DEFAULT NULL,
+  `relationships_local_at` timestamp NULL DEFAULT NULL,
+  `relationships_global_at` timestamp NULL DEFAULT NULL,
+  `updated_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+  `cohort_id` int(11) NOT NULL DEFAULT 1
 ) ENGINE=InnoDB DEFAULT CHARSET=latin1 COLLATE=latin1_swedish_ci;
 
 -- --------------------------------------------------------
 
+--
+-- Table structure for table `relationship_schedule`
+--
+
+CREATE TABLE `relationship_schedule` (
+  `project_id` int(11) NOT NULL,
+  `scope` varchar(10) NOT NULL,
+  `status` varchar(10) NOT NULL DEFAULT 'pending',
+  `reason` varchar(20) NOT NULL DEFAULT '',
+  `candidates` text NOT NULL,
+  `attempts` int(11) NOT NULL DEFAULT 0,
+  `estimated_tokens` int(11) NOT NULL DEFAULT 0,
+  `last_error` varchar(500) NOT NULL DEFAULT '',
+  `planned_at` timestamp NULL DEFAULT NULL,
+  `finished_at` timestamp NULL DEFAULT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=latin1;
+
+-- --------------------------------------------------------
+
 --
 -- Table structure for table `users`
 --
@@ -79,36 +233,124 @@ CREATE TABLE `users` (
   `password` varchar(255) NOT NULL,
   `created_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
   `session` varchar(2048) NOT NULL,
-  `validated` tinyint(1) NOT NULL
+  `validated` tinyint(1) NOT NULL,
+  `session_version` int(11) NOT NULL DEFAULT 0,
+  `cohort_id` int(11) NOT NULL DEFAULT 1
 ) ENGINE=InnoDB DEFAULT CHARSET=latin1 COLLATE=latin1_swedish_ci;
 
 --
 -- Indexes for dumped tables
 --
 
+--
+-- Indexes for table `blob_mirrors`
+--
+ALTER TABLE `blob_mirrors`
+  ADD PRIMARY KEY (`url_hash`),
+  ADD KEY `sha256` (`sha256`);
+
+--
+-- Indexes for table `cache_versions`
+--
+ALTER TABLE `cache_versions`
+  ADD PRIMARY KEY (`name`);
+
 --
 -- Indexes for table `categories`
 --
 ALTER TABLE `categories`
-  ADD PRIMARY KEY (`uid`);
+  ADD PRIMARY KEY (`uid`),
+  ADD KEY `cohort_id` (`cohort_id`,`uid`);
+
+--
+-- Indexes for table `category_score_counts`
+--
+ALTER TABLE `category_score_counts`
+  ADD PRIMARY KEY (`cohort_id`,`category_id`,`score`);
+
+--
+-- Indexes for table `category_stats`
+--
+ALTER TABLE `category_stats`
+  ADD PRIMARY KEY (`cohort_id`,`category_id`);
+
+--
+-- Indexes for table `change_events`
+--
+ALTER TABLE `change_events`
+  ADD PRIMARY KEY (`id`),
+  ADD KEY `created_at` (`created_at`);
+
+--
+-- Indexes for table `cohorts`
+--
+ALTER TABLE `cohorts`
+  ADD PRIMARY KEY (`id`);
+
+--
+-- Indexes for table `evaluation_renderings`
+--
+ALTER TABLE `evaluation_renderings`
+  ADD PRIMARY KEY (`evaluation_hash`,`lang`);
+
+--
+-- Indexes for table `evaluation_results`
+--
+ALTER TABLE `evaluation_results`
+  ADD PRIMARY KEY (`evaluation_hash`);
+
+--
+-- Indexes for table `project_documents`
+--
+ALTER TABLE `project_documents`
+  ADD PRIMARY KEY (`project_id`,`kind`),
+  ADD KEY `extracted_at` (`extracted_at`);
 
 --
 -- Indexes for table `projects`
 --
 ALTER TABLE `projects`
-  ADD PRIMARY KEY (`id`);
+  ADD PRIMARY KEY (`id`),
+  ADD KEY `cohort_id` (`cohort_id`,`id`),
+  ADD KEY `cohort_category_score` (`cohort_id`,`category_id`,`score`),
+  ADD KEY `cohort_category_likes` (`cohort_id`,`category_id`,`like_count`,`score`),
+  ADD KEY `cohort_score` (`cohort_id`,`score`),
+  ADD KEY `cohort_likes_score` (`cohort_id`,`like_count`,`score`),
+  ADD KEY `cohort_updated_at` (`cohort_id`,`updated_at`),
+  ADD KEY `updated_at` (`updated_at`);
+
+--
+-- Indexes for table `relationship_schedule`
+--
+ALTER TABLE `relationship_schedule`
+  ADD PRIMARY KEY (`project_id`,`scope`),
+  ADD KEY `status` (`status`,`planned_at`);
 
 --
 -- Indexes for table `users`
 --
 ALTER TABLE `users`
   ADD PRIMARY KEY (`id`),
-  ADD KEY `id` (`id`);
+  ADD UNIQUE KEY `email` (`email`),
+  ADD KEY `id` (`id`),
+  ADD KEY `cohort_id` (`cohort_id`,`id`);
 
 --
 -- AUTO_INCREMENT for dumped tables
 --
 
+--
+-- AUTO_INCREMENT for table `change_events`
+--
+ALTER TABLE `change_events`
+  MODIFY `id` bigint(20) NOT NULL AUTO_INCREMENT;
+
+--
+-- AUTO_INCREMENT for table `cohorts`
+--
+ALTER TABLE `cohorts`
+  MODIFY `id` int(11) NOT NULL AUTO_INCREMENT;
+
 --
 -- AUTO_INCREMENT for table `projects`
 --
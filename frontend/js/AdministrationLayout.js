@@ -278,7 +278,7 @@ export class AdministrationLayout {
       }
 
       const preview = promptingFindOutCategory.buildFindCategoryPromptPreview(this.CATEGORIES);
-      const realPrompt = promptingFindOutCategory.buildFindCategoryPromptReal(this.CATEGORIES);
+      const realPrompt = promptingFindOutCategory.buildFindCategoryPromptReal();
 
       promptingFindOutCategory.openEvalOverlay(
         this.document,
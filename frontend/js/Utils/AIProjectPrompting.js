@@ -181,22 +181,17 @@ ${promptFindOutCategory7}
     `.trim();
   }
 
-  buildFindCategoryPromptReal(categories) {
+  // The backend appends the cohort's category list (the same one the preview shows)
+  buildFindCategoryPromptReal() {
     const ctx = this.getContext();
 
-    const categoriesAvailable = (Array.isArray(categories) ? categories : [])
-      .map(c => `{ category_id:${c.uid}, category_name:${c.id}, category_description:${c.labelLong} }`)
-      .join("\n");
-      
-    const promptFindOutCategory1 = window.languageManager.t("prompt.find.out.category.prompt.1");
+    const promptFindOutCategory1 = window.languageManager.t("prompt.find.out.category.prompt.4");
     const promptFindOutCategory2 = window.languageManager.t("prompt.find.out.category.prompt.2");
     const promptFindOutCategory3 = window.languageManager.t("prompt.rubric.expert.prompt.2");
     
     return `
 ${promptFindOutCategory1}
 
-${categoriesAvailable}
-
 ${promptFindOutCategory2}
 ${promptFindOutCategory3} ${ctx.title}
     `.trim();
@@ -161,7 +161,7 @@ export class UserManager {
   }
 
   // ---- authenticated requests (used by admin page) ----
-  async authedFetch(path, { method = "GET", body = null } = {}) {
+  async authedFetch(path, { method = "GET", body = null, headers = {} } = {}) {
     const { token } = this.getSession();
     if (!token) return { res: null, data: null, error: "NO_TOKEN" };
 
@@ -169,7 +169,8 @@ export class UserManager {
       method,
       headers: {
         "Content-Type": "application/json",
-        "Authorization": `Bearer ${token}`
+        "Authorization": `Bearer ${token}`,
+        ...headers
       },
       body: body ? JSON.stringify(body) : null
     });
@@ -328,6 +329,21 @@ export class UserManager {
     return { ok: true, session: data?.session || {} };
   }
 
+  // Sends only the changed keys (RFC 7396 merge patch); null removes a key.
+  // With a version, the patch only applies if the session has not changed since.
+  async patchBackendSession(patch, version = null) {
+    const headers = { "Content-Type": "application/merge-patch+json" };
+    if (version !== null) headers["If-Match"] = `"${version}"`;
+    const { res, data, error } = await this.authedFetch("/me/session", {
+      method: "PATCH",
+      body: patch || {},
+      headers,
+    });
+    if (error === "NO_TOKEN") return { ok: false, error: "NO_TOKEN" };
+    if (!res?.ok) return { ok: false, error: data?.error || "FAILED_TO_SAVE_SESSION", version: data?.version };
+    return { ok: true, version: data?.version };
+  }
+
   async #syncPromptQuotaToBackend() {
     if (!this.isLoggedIn()) return;
 
@@ -340,14 +356,8 @@ export class UserManager {
     }
     if (!local || typeof local.date !== "string" || typeof local.count !== "number") return;
 
-    // Get current backend session, merge promptQuota, then PUT
-    const sessRes = await this.getBackendSession();
-    if (!sessRes.ok) return;
-
-    const nextSession = { ...(sessRes.session || {}) };
-    nextSession.promptQuota = { date: local.date, count: local.count };
-
-    await this.putBackendSession(nextSession);
+    // Only promptQuota changes: merge it server-side
+    await this.patchBackendSession({ promptQuota: { date: local.date, count: local.count } });
   }
 
 }